@@ -0,0 +1,189 @@
+"""Precompiled clip sampling for the Motion Library (AV04).
+
+A MotionClip stores keyframes as lists of pydantic models, which is fine for
+editing but slow to evaluate: every lookup would sort and scan the track.
+``compile_clip`` turns the rotation tracks into sorted NumPy arrays once, with
+the per-segment slerp terms precomputed, so a pose is a binary search plus a
+handful of vector ops and whole timelines can be sampled in one call.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from engines.animation_kernel.schemas import Keyframe, LoopMode, MotionClip
+
+# Below this angle between neighbouring keys slerp is numerically noisy and
+# indistinguishable from a normalised lerp.
+NLERP_THRESHOLD = 1e-4
+
+
+def wrap_times(times: np.ndarray, duration: float, loop_mode: LoopMode) -> np.ndarray:
+    """Maps playback times into clip-local time according to the loop mode."""
+    times = np.asarray(times, dtype=np.float64)
+    if loop_mode == LoopMode.NONE:
+        return np.minimum(times, duration)
+    if loop_mode == LoopMode.PING_PONG:
+        cycle = duration * 2 if duration > 0 else 1.0
+        in_cycle = np.mod(times, cycle)
+        return np.where(in_cycle > duration, duration - (in_cycle - duration), in_cycle)
+    if duration <= 0:
+        return np.zeros_like(times)
+    return np.mod(times, duration)
+
+
+@dataclass
+class CompiledTrack:
+    """Rotation keys sorted by time, with per-segment slerp terms.
+
+    Holds one or more bones that share the same key times (the common case for
+    baked or exported clips), so they are searched and interpolated together.
+    Arrays are key-major so gathering a frame's segments copies contiguous rows.
+    """
+    times: np.ndarray           # (K,)
+    rotations: np.ndarray       # (K, B, 4) unit xyzw quaternions
+    next_rotations: np.ndarray  # (K-1, B, 4) end of each segment, flipped onto the start's hemisphere
+    theta: np.ndarray           # (K-1, B) angle between segment endpoints
+    inv_sin_theta: np.ndarray   # (K-1, B) 1/sin(theta), 0 where the segment falls back to nlerp
+    linear: np.ndarray          # (K-1, B) segments too short for a stable slerp
+
+    @classmethod
+    def from_keyframes(cls, keyframes: Sequence[Keyframe]) -> Optional["CompiledTrack"]:
+        keyed = [kf for kf in keyframes if kf.rotation]
+        if not keyed:
+            return None
+        times = np.array([kf.time for kf in keyed], dtype=np.float64)
+        rotations = np.array([kf.rotation[:4] for kf in keyed], dtype=np.float64)
+        order = np.argsort(times, kind="stable")
+        return cls.from_arrays(times[order], rotations[order][:, None])
+
+    @classmethod
+    def from_arrays(cls, times: np.ndarray, rotations: np.ndarray) -> "CompiledTrack":
+        norms = np.linalg.norm(rotations, axis=-1, keepdims=True)
+        identity = np.broadcast_to([0.0, 0.0, 0.0, 1.0], rotations.shape)
+        rotations = np.divide(rotations, norms, out=identity.copy(), where=norms > 0)
+
+        start, end = rotations[:-1], rotations[1:]
+        dot = np.einsum("kbi,kbi->kb", start, end)
+        # q and -q are the same rotation; take the short way round.
+        end = np.where((dot < 0)[..., None], -end, end)
+        theta = np.arccos(np.clip(np.abs(dot), 0.0, 1.0))
+        sin_theta = np.sin(theta)
+        linear = sin_theta <= NLERP_THRESHOLD
+        inv_sin = np.divide(1.0, sin_theta, out=np.zeros_like(sin_theta), where=~linear)
+        return cls(times, rotations, end, theta, inv_sin, linear)
+
+    @classmethod
+    def stack(cls, tracks: Sequence["CompiledTrack"]) -> "CompiledTrack":
+        """Merges tracks with identical key times into one multi-bone track."""
+        return cls(
+            tracks[0].times,
+            np.concatenate([t.rotations for t in tracks], axis=1),
+            np.concatenate([t.next_rotations for t in tracks], axis=1),
+            np.concatenate([t.theta for t in tracks], axis=1),
+            np.concatenate([t.inv_sin_theta for t in tracks], axis=1),
+            np.concatenate([t.linear for t in tracks], axis=1),
+        )
+
+    def sample(self, times: np.ndarray) -> np.ndarray:
+        """(T,) clip-local times -> (T, B, 4) quaternions."""
+        times = np.asarray(times, dtype=np.float64)
+        count = len(self.times)
+        if count == 1:
+            return np.repeat(self.rotations, len(times), axis=0)
+
+        # Last key at or before t; keys past either end hold the boundary value.
+        index = np.searchsorted(self.times, times, side="right") - 1
+        before = index < 0
+        after = index >= count - 1
+        segment = np.clip(index, 0, count - 2)
+
+        t0 = self.times[segment]
+        span = self.times[segment + 1] - t0
+        u = np.divide(times - t0, span, out=np.zeros_like(times), where=span > 0)
+        u = np.clip(u, 0.0, 1.0)[:, None]
+
+        theta = self.theta[segment]
+        inv_sin = self.inv_sin_theta[segment]
+        w0 = np.sin((1.0 - u) * theta)
+        w0 *= inv_sin
+        w1 = np.sin(u * theta)
+        w1 *= inv_sin
+        linear = self.linear[segment]
+        if linear.any():
+            w0 = np.where(linear, 1.0 - u, w0)
+            w1 = np.where(linear, u, w1)
+
+        out = self.rotations[segment]
+        out *= w0[..., None]
+        end = self.next_rotations[segment]
+        end *= w1[..., None]
+        out += end
+        out /= np.sqrt(np.einsum("tbi,tbi->tb", out, out))[..., None]
+        # Clamped ends return the stored key exactly (not its hemisphere-flipped twin).
+        out[before] = self.rotations[0]
+        out[after] = self.rotations[-1]
+        return out
+
+
+class CompiledClip:
+    """All rotation tracks of a MotionClip, ready for batch evaluation."""
+
+    def __init__(self, clip: MotionClip):
+        self.duration = clip.duration
+        self.loop_mode = clip.loop_mode
+        self.bone_ids: List[str] = []
+        groups: Dict[bytes, List[Tuple[str, CompiledTrack]]] = {}
+        for bone_id, keyframes in clip.bone_tracks.items():
+            track = CompiledTrack.from_keyframes(keyframes)
+            if track is not None:
+                self.bone_ids.append(bone_id)
+                groups.setdefault(track.times.tobytes(), []).append((bone_id, track))
+
+        row = {bone_id: i for i, bone_id in enumerate(self.bone_ids)}
+        self.groups: List[Tuple[np.ndarray, CompiledTrack]] = [
+            (np.array([row[bone_id] for bone_id, _ in members]), CompiledTrack.stack([t for _, t in members]))
+            for members in groups.values()
+        ]
+
+    def sample(self, times: Union[float, Sequence[float], np.ndarray], wrap: bool = True) -> np.ndarray:
+        """Evaluates every bone at every time: returns (bones, T, 4) in ``bone_ids`` order.
+
+        Times are playback times and go through the clip's loop mode unless
+        ``wrap`` is False.
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=np.float64))
+        if wrap:
+            times = wrap_times(times, self.duration, self.loop_mode)
+        out = np.empty((len(times), len(self.bone_ids), 4))
+        for rows, track in self.groups:
+            out[:, rows] = track.sample(times)
+        return out.transpose(1, 0, 2)
+
+    def pose(self, time: float) -> Dict[str, List[float]]:
+        """Single-time evaluation as {bone_id: [qx, qy, qz, qw]}."""
+        samples = self.sample([time])[:, 0].tolist()
+        return dict(zip(self.bone_ids, samples))
+
+
+def compile_clip(clip: MotionClip) -> CompiledClip:
+    return CompiledClip(clip)
+
+
+def slerp(a: np.ndarray, b: np.ndarray, weight: Union[float, np.ndarray]) -> np.ndarray:
+    """Shortest-path slerp between (..., 4) quaternion arrays."""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    weight = np.asarray(weight, dtype=np.float64)[..., None]
+    dot = np.sum(a * b, axis=-1, keepdims=True)
+    b = np.where(dot < 0, -b, b)
+    theta = np.arccos(np.clip(np.abs(dot), 0.0, 1.0))
+    sin_theta = np.sin(theta)
+    use_slerp = sin_theta > NLERP_THRESHOLD
+    safe_sin = np.where(use_slerp, sin_theta, 1.0)
+    w0 = np.where(use_slerp, np.sin((1.0 - weight) * theta) / safe_sin, 1.0 - weight)
+    w1 = np.where(use_slerp, np.sin(weight * theta) / safe_sin, weight)
+    out = w0 * a + w1 * b
+    return out / np.linalg.norm(out, axis=-1, keepdims=True)
@@ -1,13 +1,18 @@
 """Animation Service for Phase 3-4 (AV01-AV04)."""
+import bisect
 import uuid
 import math
-from typing import Dict, Optional, List
+import weakref
+from typing import Dict, Optional, List, Sequence, Tuple
+
+import numpy as np
 
 from engines.animation_kernel.schemas import (
     AgentAnimInstruction, Skeleton, Bone, AnimationClip, AnimOpCode,
     MotionLibrary, MotionClip, Keyframe, LoopMode, FKIKBoneMask, AnimationBlend,
     ExportMetadata
 )
+from engines.animation_kernel.sampler import CompiledClip, compile_clip, slerp
 
 class AnimationService:
     def __init__(self):
@@ -231,6 +236,7 @@ class MotionLibraryService:
     def __init__(self):
         self._libraries: Dict[str, MotionLibrary] = {}
         self._clips: Dict[str, MotionClip] = {}
+        self._compiled: Dict[int, Tuple[weakref.ref, tuple, CompiledClip]] = {}
     
     def create_library(self, name: str) -> MotionLibrary:
         """Create a new motion library."""
@@ -245,12 +251,38 @@ class MotionLibraryService:
         lib = self._libraries[library_id]
         lib.clips[clip.id] = clip
         self._clips[clip.id] = clip
+        self.invalidate_clip(clip)
         return clip
     
     def get_clip(self, clip_id: str) -> Optional[MotionClip]:
         """Retrieve a motion clip by ID."""
         return self._clips.get(clip_id)
     
+    def compile_clip(self, clip: MotionClip) -> CompiledClip:
+        """
+        Compiled (array-backed) form of a clip, built once and reused.
+
+        Entries are tied to the clip object and its track layout; call
+        invalidate_clip after editing keyframe values in place.
+        """
+        signature = (clip.duration, clip.loop_mode, tuple((bone_id, id(kfs), len(kfs)) for bone_id, kfs in clip.bone_tracks.items()))
+        cached = self._compiled.get(id(clip))
+        if cached is not None:
+            ref, cached_signature, compiled = cached
+            if ref() is clip and cached_signature == signature:
+                return compiled
+        compiled = compile_clip(clip)
+        clip_ref = id(clip)
+        self._compiled[clip_ref] = (weakref.ref(clip, lambda _r, k=clip_ref: self._compiled.pop(k, None)), signature, compiled)
+        return compiled
+    
+    def invalidate_clip(self, clip: Optional[MotionClip] = None) -> None:
+        """Drop the compiled form of a clip (or of all clips)."""
+        if clip is None:
+            self._compiled.clear()
+        else:
+            self._compiled.pop(id(clip), None)
+    
     def playback_at_time(self, clip: MotionClip, time: float, skeleton: Optional[Skeleton] = None) -> Dict[str, List[float]]:
         """
         Evaluate animation at specific time.
@@ -263,88 +295,23 @@ class MotionLibraryService:
         Returns:
             Dict mapping bone_id to [qx, qy, qz, qw] quaternion
         """
-        # Handle looping
-        if clip.loop_mode == LoopMode.NONE:
-            # Clamp to duration
-            eval_time = min(time, clip.duration)
-        elif clip.loop_mode == LoopMode.LOOP:
-            # Standard loop
-            eval_time = time % clip.duration if clip.duration > 0 else 0.0
-        elif clip.loop_mode == LoopMode.PING_PONG:
-            # Ping pong - go forward then backward
-            cycle_duration = clip.duration * 2 if clip.duration > 0 else 1.0
-            t_in_cycle = time % cycle_duration
-            if t_in_cycle > clip.duration:
-                eval_time = clip.duration - (t_in_cycle - clip.duration)
-            else:
-                eval_time = t_in_cycle
-        else:
-            eval_time = time % clip.duration if clip.duration > 0 else 0.0
-        
-        # Interpolate keyframes for each bone
-        pose = {}
-        for bone_id, keyframes in clip.bone_tracks.items():
-            quat = self._interpolate_bone_at_time(keyframes, eval_time)
-            if quat:
-                pose[bone_id] = quat
-        
-        return pose
+        return self.compile_clip(clip).pose(time)
     
-    def _interpolate_bone_at_time(self, keyframes: List[Keyframe], time: float) -> Optional[List[float]]:
+    def sample(self, clip: MotionClip, times: Sequence[float], skeleton: Optional[Skeleton] = None) -> Dict[str, np.ndarray]:
         """
-        Interpolate rotation at time t.
+        Evaluate every bone at many times at once (baking/export).
         
         Args:
-            keyframes: List of keyframes for a bone
-            time: Time to evaluate at
+            clip: MotionClip to play
+            times: Playback times in seconds (loop mode applied as in playback_at_time)
+            skeleton: Optional skeleton for validation
         
         Returns:
-            [qx, qy, qz, qw] quaternion or None
+            Dict mapping bone_id to a (len(times), 4) array of [qx, qy, qz, qw]
         """
-        if not keyframes:
-            return None
-        
-        # Sort keyframes by time
-        sorted_kf = sorted(keyframes, key=lambda k: k.time)
-        
-        # Find surrounding keyframes
-        before = None
-        after = None
-        
-        for kf in sorted_kf:
-            if kf.time <= time:
-                before = kf
-            if kf.time >= time and after is None:
-                after = kf
-        
-        # If exactly on a keyframe
-        if before and before.time == time and before.rotation:
-            return before.rotation
-        if after and after.time == time and after.rotation:
-            return after.rotation
-        
-        # Interpolate between before and after
-        if before and after and before.rotation and after.rotation:
-            # Linear interpolation in quaternion space (slerp would be better but lerp works for many cases)
-            t_ratio = (time - before.time) / (after.time - before.time) if after.time != before.time else 0.0
-            t_ratio = max(0.0, min(1.0, t_ratio))
-            
-            # Simple lerp (not proper slerp)
-            result = []
-            for i in range(4):
-                val = before.rotation[i] * (1 - t_ratio) + after.rotation[i] * t_ratio
-                result.append(val)
-            return result
-        
-        # If only before exists, return it
-        if before and before.rotation:
-            return before.rotation
-        
-        # If only after exists, return it
-        if after and after.rotation:
-            return after.rotation
-        
-        return None
+        compiled = self.compile_clip(clip)
+        samples = compiled.sample(times)
+        return {bone_id: samples[i] for i, bone_id in enumerate(compiled.bone_ids)}
     
     def blend_clips(self, clip1: MotionClip, clip2: MotionClip, blend_time: float, skeleton: Optional[Skeleton] = None) -> MotionClip:
         """
@@ -363,7 +330,10 @@ class MotionLibraryService:
         blended_name = f"blend_{clip1.name}_to_{clip2.name}"
         blended_duration = clip1.duration + blend_time
         
-        blended_tracks = {}
+        blend_start_time = clip1.duration
+        blend_end_time = blend_start_time + blend_time
+        
+        blended_tracks: Dict[str, List[Keyframe]] = {}
         
         # Collect all bone IDs from both clips
         all_bones = set(clip1.bone_tracks.keys()) | set(clip2.bone_tracks.keys())
@@ -375,22 +345,46 @@ class MotionLibraryService:
             if bone_id in clip1.bone_tracks:
                 blended_tracks[bone_id].extend(clip1.bone_tracks[bone_id])
             
-            # Add transition keyframes at blend boundary
-            # At clip1.duration, fade out clip1, fade in clip2
-            blend_start_time = clip1.duration
-            blend_end_time = blend_start_time + blend_time
-            
-            # For simplicity, we just append clip2's keyframes shifted in time
+            # Append clip2's keyframes shifted to start at the blend boundary
             if bone_id in clip2.bone_tracks:
                 for kf in clip2.bone_tracks[bone_id]:
-                    shifted_kf = Keyframe(
+                    blended_tracks[bone_id].append(Keyframe(
                         time=blend_start_time + kf.time,
                         bone_id=kf.bone_id,
                         position=kf.position,
                         rotation=kf.rotation,
                         scale=kf.scale
-                    )
-                    blended_tracks[bone_id].append(shifted_kf)
+                    ))
+        
+        # Crossfade: over [blend_start, blend_end] rotations are baked at clip1.fps
+        # as slerp(clip1 continuing past its end, clip2 from its start, fade weight).
+        if blend_time > 0:
+            frames = max(2, int(math.ceil(blend_time * clip1.fps)) + 1)
+            local = np.linspace(0.0, blend_time, frames)
+            weights = local / blend_time
+            from_samples = self.sample(clip1, blend_start_time + local)
+            to_samples = self.sample(clip2, local)
+            
+            for bone_id in from_samples.keys() | to_samples.keys():
+                if bone_id in from_samples and bone_id in to_samples:
+                    baked = slerp(from_samples[bone_id], to_samples[bone_id], weights)
+                else:
+                    baked = from_samples.get(bone_id, to_samples.get(bone_id))
+                
+                # Keys inside the window give up their rotation to the baked curve
+                track = []
+                for kf in blended_tracks[bone_id]:
+                    if blend_start_time <= kf.time <= blend_end_time and kf.rotation:
+                        if kf.position is None and kf.scale is None:
+                            continue
+                        kf = kf.model_copy(update={"rotation": None})
+                    track.append(kf)
+                track.extend(
+                    Keyframe(time=float(blend_start_time + t), bone_id=bone_id, rotation=q)
+                    for t, q in zip(local, baked.tolist())
+                )
+                track.sort(key=lambda k: k.time)
+                blended_tracks[bone_id] = track
         
         blended_clip = MotionClip(
             id=blended_id,
@@ -485,36 +479,31 @@ class MotionLibraryService:
 
                 l1, l2 = _estimate_lengths(root_id, mid_id, end_id)
 
-                # For each keyframe time, solve IK and insert/update mid bone positions
-                times = set()
-                for kf in mixed_tracks.get(end_id, []):
-                    times.add(kf.time)
-                for t in sorted(times):
-                    # Solve IK for this instant
-                    # Use simple two-bone analytic solver
-                    # Need root position and end target
-                    root_pos = None
-                    # Try to find root position from tracks
-                    if root_id in mixed_tracks and mixed_tracks[root_id]:
-                        # Use first sample position if present
-                        if mixed_tracks[root_id][0].position:
-                            root_pos = tuple(mixed_tracks[root_id][0].position)
-                    if root_pos is None:
-                        # fallback root at origin
-                        root_pos = (0.0, 0.0, 0.0)
+                # Root position, lengths and target are fixed for the whole clip, so the
+                # analytic solve is done once and written at every end-bone key time.
+                root_pos = None
+                # Try to find root position from tracks
+                if root_id in mixed_tracks and mixed_tracks[root_id]:
+                    # Use first sample position if present
+                    if mixed_tracks[root_id][0].position:
+                        root_pos = tuple(mixed_tracks[root_id][0].position)
+                if root_pos is None:
+                    # fallback root at origin
+                    root_pos = (0.0, 0.0, 0.0)
 
-                    elbow_pos, joint2_angle = solve_two_bone_ik(root_pos, l1, l2, tuple(target))
+                elbow_pos, joint2_angle = solve_two_bone_ik(root_pos, l1, l2, tuple(target))
 
-                    # Update/append mid bone keyframe with elbow position
-                    mid_kfs = mixed_tracks.setdefault(mid_id, [])
-                    # Replace or insert keyframe at time t
-                    replaced = False
-                    for kf in mid_kfs:
-                        if abs(kf.time - t) < 1e-6:
-                            kf.position = list(elbow_pos)
-                            replaced = True
-                            break
-                    if not replaced:
+                # Update/append mid bone keyframe with elbow position at each end-bone key time
+                times = {kf.time for kf in mixed_tracks.get(end_id, [])}
+                mid_kfs = mixed_tracks.setdefault(mid_id, [])
+                by_time = sorted(mid_kfs, key=lambda k: k.time)
+                mid_times = [kf.time for kf in by_time]
+                for t in sorted(times):
+                    # Replace the keyframe at time t if there is one, else insert
+                    i = bisect.bisect_left(mid_times, t - 1e-6)
+                    if i < len(mid_times) and abs(mid_times[i] - t) < 1e-6:
+                        by_time[i].position = list(elbow_pos)
+                    else:
                         mid_kfs.append(Keyframe(time=t, bone_id=mid_id, position=list(elbow_pos)))
 
             elif len(chain) > 3:
@@ -507,3 +507,151 @@ class TestMotionLibraryIntegration:
         assert "root" in pose_0
         assert "spine" in pose_mid
         assert "head" in pose_end
+
+
+class TestCompiledSampler:
+    """Test the precompiled (array-backed) clip sampler."""
+    
+    def _yaw(self, degrees):
+        import math
+        half = math.radians(degrees) / 2
+        return [0.0, math.sin(half), 0.0, math.cos(half)]
+    
+    def test_slerp_keeps_constant_angular_velocity(self):
+        """Interpolated rotations are unit slerps, not lerps."""
+        import math
+        service = MotionLibraryService()
+        clip = MotionClip(
+            id="turn",
+            name="Turn",
+            duration=1.0,
+            loop_mode=LoopMode.NONE,
+            bone_tracks={"root": [
+                # Deliberately unsorted
+                Keyframe(time=1.0, bone_id="root", rotation=self._yaw(120)),
+                Keyframe(time=0.0, bone_id="root", rotation=self._yaw(0)),
+            ]}
+        )
+        
+        for t in (0.25, 0.5, 0.75):
+            q = service.playback_at_time(clip, t)["root"]
+            assert math.isclose(sum(c * c for c in q), 1.0, abs_tol=1e-9)
+            expected = self._yaw(120 * t)
+            assert all(math.isclose(a, b, abs_tol=1e-9) for a, b in zip(q, expected))
+    
+    def test_slerp_takes_shortest_path(self):
+        """Keys on opposite quaternion hemispheres interpolate the short way."""
+        import math
+        service = MotionLibraryService()
+        q1 = [-c for c in self._yaw(20)]  # Same rotation as yaw(20)
+        clip = MotionClip(
+            id="flip",
+            name="Flip",
+            duration=1.0,
+            loop_mode=LoopMode.NONE,
+            bone_tracks={"root": [
+                Keyframe(time=0.0, bone_id="root", rotation=self._yaw(0)),
+                Keyframe(time=1.0, bone_id="root", rotation=q1),
+            ]}
+        )
+        
+        q = service.playback_at_time(clip, 0.5)["root"]
+        assert all(math.isclose(a, b, abs_tol=1e-9) for a, b in zip(q, self._yaw(10)))
+    
+    def test_batch_sample_matches_playback(self):
+        """sample() agrees with playback_at_time for every loop mode."""
+        import numpy as np
+        service = MotionLibraryService()
+        tracks = {
+            "spine": [Keyframe(time=k * 0.25, bone_id="spine", rotation=self._yaw(k * 15)) for k in range(5)],
+            "head": [Keyframe(time=0.5, bone_id="head", rotation=self._yaw(30))],
+            "hand": [Keyframe(time=0.0, bone_id="hand", position=[0, 1, 0])],
+        }
+        times = np.linspace(-0.5, 3.3, 97)
+        for mode in (LoopMode.NONE, LoopMode.LOOP, LoopMode.PING_PONG):
+            clip = MotionClip(id=f"c_{mode.value}", name="C", duration=1.0, loop_mode=mode, bone_tracks=tracks)
+            samples = service.sample(clip, times)
+            
+            # Bones without rotation keys are skipped, as in playback
+            assert set(samples) == {"spine", "head"}
+            assert samples["spine"].shape == (len(times), 4)
+            for i, t in enumerate(times):
+                pose = service.playback_at_time(clip, float(t))
+                for bone_id, q in pose.items():
+                    assert np.allclose(samples[bone_id][i], q)
+    
+    def test_compiled_clip_is_reused_until_invalidated(self):
+        """Clips compile once; structural edits and invalidate_clip recompile."""
+        service = MotionLibraryService()
+        clip = MotionClip(
+            id="idle",
+            name="Idle",
+            duration=1.0,
+            bone_tracks={"root": [Keyframe(time=0.0, bone_id="root", rotation=self._yaw(0))]}
+        )
+        
+        compiled = service.compile_clip(clip)
+        assert service.compile_clip(clip) is compiled
+        
+        clip.bone_tracks["root"].append(Keyframe(time=1.0, bone_id="root", rotation=self._yaw(90)))
+        recompiled = service.compile_clip(clip)
+        assert recompiled is not compiled
+        
+        clip.bone_tracks["root"][1].rotation = self._yaw(45)
+        assert service.compile_clip(clip) is recompiled
+        service.invalidate_clip(clip)
+        assert service.compile_clip(clip) is not recompiled
+    
+    def test_blend_crossfades_between_clips(self):
+        """The blend window is baked as a slerp from clip1 into clip2."""
+        import numpy as np
+        service = MotionLibraryService()
+        clip1 = MotionClip(
+            id="a", name="A", duration=1.0, fps=10.0, loop_mode=LoopMode.NONE,
+            bone_tracks={"root": [
+                Keyframe(time=0.0, bone_id="root", rotation=self._yaw(0)),
+                Keyframe(time=1.0, bone_id="root", rotation=self._yaw(0)),
+            ]}
+        )
+        clip2 = MotionClip(
+            id="b", name="B", duration=1.0, fps=10.0,
+            bone_tracks={"root": [
+                Keyframe(time=0.0, bone_id="root", rotation=self._yaw(60)),
+                Keyframe(time=1.0, bone_id="root", rotation=self._yaw(60)),
+            ]}
+        )
+        
+        blended = service.blend_clips(clip1, clip2, blend_time=0.5)
+        track = blended.bone_tracks["root"]
+        assert [kf.time for kf in track] == sorted(kf.time for kf in track)
+        window = [kf for kf in track if 1.0 <= kf.time <= 1.5]
+        assert len(window) == 6  # 0.5 s at 10 fps, both ends included
+        
+        mid = service.playback_at_time(blended, 1.25)["root"]
+        assert np.allclose(mid, self._yaw(30))
+        assert np.allclose(service.playback_at_time(blended, 1.0)["root"], self._yaw(0))
+        assert np.allclose(service.playback_at_time(blended, 1.5)["root"], self._yaw(60))
+    
+    def test_bake_long_clip_is_fast(self):
+        """Baking 2 minutes at 60 fps on a 70-bone rig stays well under a second."""
+        import time
+        import numpy as np
+        service = MotionLibraryService()
+        tracks = {
+            f"bone_{b}": [
+                Keyframe(time=k / 30.0, bone_id=f"bone_{b}", rotation=self._yaw((k * 7 + b) % 360))
+                for k in range(120 * 30 + 1)
+            ]
+            for b in range(70)
+        }
+        clip = MotionClip(id="long", name="Long", duration=120.0, fps=60.0, bone_tracks=tracks)
+        times = np.arange(120 * 60) / 60.0
+        
+        service.compile_clip(clip)
+        start = time.perf_counter()
+        samples = service.sample(clip, times)
+        elapsed = time.perf_counter() - start
+        
+        assert len(samples) == 70
+        assert samples["bone_0"].shape == (7200, 4)
+        assert elapsed < 1.0
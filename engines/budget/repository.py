@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import fcntl
 import json
 import os
+import shutil
 import tempfile
-from datetime import datetime, timezone
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import Dict, List, Optional, Protocol
+from typing import Dict, Iterator, List, Optional, Protocol
 
+from engines.budget import rollups
 from engines.budget.models import BudgetPolicy, UsageEvent
 
 
@@ -52,6 +57,7 @@ class InMemoryBudgetUsageRepository:
         env: str,
         surface: Optional[str] = None,
         provider: Optional[str] = None,
+        tool_id: Optional[str] = None,
         model_or_plan_id: Optional[str] = None,
         tool_type: Optional[str] = None,
         since: Optional[datetime] = None,
@@ -69,6 +75,8 @@ class InMemoryBudgetUsageRepository:
                 continue
             if provider and ev.provider != provider:
                 continue
+            if tool_id and ev.tool_id != tool_id:
+                continue
             if model_or_plan_id and ev.model_or_plan_id != model_or_plan_id:
                 continue
             if tool_type and ev.tool_type != tool_type:
@@ -87,26 +95,31 @@ class InMemoryBudgetUsageRepository:
         surface: Optional[str] = None,
         group_by: Optional[str] = None,
     ) -> Dict[str, object]:
-        events = self.list_usage(tenant_id, env, surface=surface, since=since, until=until, limit=10_000)
-        total_cost = sum([ev.cost for ev in events], start=0)
-        total_calls = len(events)
-        grouped: Dict[str, Dict[str, object]] = {}
-        if group_by:
-            for ev in events:
-                key = getattr(ev, group_by, None) or "unknown"
-                agg = grouped.setdefault(key, {"cost": 0, "count": 0})
-                agg["cost"] += ev.cost
-                agg["count"] += 1
-        return {"total_cost": total_cost, "total_events": total_calls, "grouped": grouped}
+        events = self.list_usage(tenant_id, env, surface=surface, since=since, until=until, limit=len(self._items))
+        return rollups.UsageTotals(group_by=group_by).add_events(events).result()
 
 
 class FilesystemBudgetUsageRepository(BudgetUsageRepository):
-    """Filesystem-backed usage repo (testable durable backend)."""
+    """Filesystem-backed usage repo (testable durable backend).
+
+    Next to each ``{tenant}_{env}.jsonl`` sits a ``.rollups`` directory holding
+    one JSON document per UTC day (day bucket plus its hour buckets), per-hour
+    files of JSONL byte offsets for reading raw edge events, and the number of
+    JSONL bytes already indexed. Any unindexed tail (data written before
+    rollups existed, or an interrupted write) is indexed on the next access.
+
+    Appends and indexing for a tenant/env run under an flock on
+    ``{tenant}_{env}.lock``, so several processes can share a root. Indexing is
+    idempotent: each day document records the JSONL offset it has absorbed up
+    to and is replaced atomically, and offsets are deduplicated on read, so a
+    crash at any point is repaired by re-indexing from the marker.
+    """
 
     def __init__(self, root: Optional[str] = None) -> None:
         dir_path = root or os.getenv("BUDGET_BACKEND_FS_DIR")
         self._root = Path(dir_path or Path(tempfile.gettempdir()) / "budget_usage")
         self._root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
 
     def _file_path(self, tenant_id: str, env: str) -> Path:
         name = f"{tenant_id}_{env}.jsonl"
@@ -145,6 +158,8 @@ class FilesystemBudgetUsageRepository(BudgetUsageRepository):
                 continue
             if provider and ev.provider != provider:
                 continue
+            if tool_id and ev.tool_id != tool_id:
+                continue
             if model_or_plan_id and ev.model_or_plan_id != model_or_plan_id:
                 continue
             if tool_type and ev.tool_type != tool_type:
@@ -154,10 +169,121 @@ class FilesystemBudgetUsageRepository(BudgetUsageRepository):
             filtered.append(ev)
         return filtered
 
+    def _rollup_dir(self, tenant_id: str, env: str) -> Path:
+        return self._root / f"{tenant_id}_{env}.rollups"
+
+    @contextmanager
+    def _locked(self, tenant_id: str, env: str) -> Iterator[None]:
+        """Serialise appends and rollup indexing across threads and processes."""
+        with self._lock, (self._root / f"{tenant_id}_{env}.lock").open("a") as fh:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            yield
+
+    @staticmethod
+    def _write_json(path: Path, raw: Dict[str, object]) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(raw, fh)
+        os.replace(tmp, path)
+
+    def _read_day(self, rollup_dir: Path, day: str) -> Dict[str, object]:
+        path = rollup_dir / f"{day}.json"
+        if not path.exists():
+            return {"day": {}, "hours": {}, "indexed_to": 0}
+        with path.open("r", encoding="utf-8") as fh:
+            raw = json.load(fh)
+        return {
+            "day": rollups.bucket_from_json(raw.get("day", {})),
+            "hours": {hour: rollups.bucket_from_json(bucket) for hour, bucket in raw.get("hours", {}).items()},
+            "indexed_to": int(raw.get("indexed_to", 0)),
+        }
+
+    def _write_day(self, rollup_dir: Path, day: str, doc: Dict[str, object]) -> None:
+        raw = {
+            "day": rollups.bucket_to_json(doc["day"]),
+            "hours": {hour: rollups.bucket_to_json(bucket) for hour, bucket in doc["hours"].items()},
+            "indexed_to": doc["indexed_to"],
+        }
+        self._write_json(rollup_dir / f"{day}.json", raw)
+
+    def _index_events(self, rollup_dir: Path, entries: List[tuple[int, UsageEvent]], end: int) -> None:
+        """Fold entries (JSONL offset, event) read up to byte `end` into the day docs."""
+        by_day: Dict[str, List[tuple[int, UsageEvent]]] = {}
+        for offset, event in entries:
+            by_day.setdefault(rollups.day_key(event.created_at), []).append((offset, event))
+        for day, items in by_day.items():
+            doc = self._read_day(rollup_dir, day)
+            # A crash after this doc was replaced but before the marker was: skip what it already holds.
+            items = [(offset, event) for offset, event in items if offset >= doc["indexed_to"]]
+            if not items:
+                continue
+            offsets: Dict[str, List[int]] = {}
+            for offset, event in items:
+                hour = rollups.hour_key(event.created_at)
+                rollups.add_event(doc["day"], event)
+                rollups.add_event(doc["hours"].setdefault(hour[-2:], {}), event)
+                offsets.setdefault(hour, []).append(offset)
+            # Offsets go first; re-appending them after a crash is harmless since reads dedupe.
+            for hour, hour_offsets in offsets.items():
+                with (rollup_dir / f"{hour}.offsets").open("a", encoding="utf-8") as fh:
+                    fh.write("".join(f"{offset}\n" for offset in hour_offsets))
+            doc["indexed_to"] = end
+            self._write_day(rollup_dir, day, doc)
+
+    def _sync_rollups(self, tenant_id: str, env: str) -> Path:
+        """Fold any JSONL bytes not yet reflected in the rollups into them (caller holds _locked)."""
+        path = self._file_path(tenant_id, env)
+        rollup_dir = self._rollup_dir(tenant_id, env)
+        marker = rollup_dir / "indexed.json"
+        size = path.stat().st_size if path.exists() else 0
+        indexed = 0
+        if marker.exists():
+            with marker.open("r", encoding="utf-8") as fh:
+                indexed = int(json.load(fh).get("bytes", 0))
+        if size < indexed:
+            # The usage file was truncated or replaced; rebuild from scratch.
+            shutil.rmtree(rollup_dir)
+            indexed = 0
+        rollup_dir.mkdir(parents=True, exist_ok=True)
+        if size == indexed:
+            return rollup_dir
+        entries: List[tuple[int, UsageEvent]] = []
+        offset = indexed
+        with path.open("rb") as fh:
+            fh.seek(indexed)
+            for raw in fh:
+                if not raw.endswith(b"\n"):
+                    break  # partial line from a writer still appending
+                if raw.strip():
+                    entries.append((offset, UsageEvent(**json.loads(raw))))
+                offset += len(raw)
+        self._index_events(rollup_dir, entries, offset)
+        self._write_json(marker, {"bytes": offset})
+        return rollup_dir
+
+    def _edge_events(self, tenant_id: str, env: str, rollup_dir: Path, start: datetime, end: datetime) -> List[UsageEvent]:
+        offsets: List[int] = []
+        for hour in rollups.edge_hours(start, end):
+            offsets_path = rollup_dir / f"{hour}.offsets"
+            if offsets_path.exists():
+                offsets.extend(int(line) for line in offsets_path.read_text(encoding="utf-8").split())
+        events: List[UsageEvent] = []
+        if not offsets:
+            return events
+        with self._file_path(tenant_id, env).open("rb") as fh:
+            for offset in sorted(set(offsets)):
+                fh.seek(offset)
+                event = UsageEvent(**json.loads(fh.readline()))
+                if rollups.in_edge(event, start, end):
+                    events.append(event)
+        return events
+
     def record_usage(self, event: UsageEvent) -> UsageEvent:
         path = self._file_path(event.tenant_id, event.env)
-        with path.open("a", encoding="utf-8") as fh:
-            fh.write(event.model_dump_json() + "\n")
+        with self._locked(event.tenant_id, event.env):
+            with path.open("a", encoding="utf-8") as fh:
+                fh.write(event.model_dump_json() + "\n")
+            self._sync_rollups(event.tenant_id, event.env)
         return event
 
     def list_usage(
@@ -166,6 +292,7 @@ class FilesystemBudgetUsageRepository(BudgetUsageRepository):
         env: str,
         surface: Optional[str] = None,
         provider: Optional[str] = None,
+        tool_id: Optional[str] = None,
         model_or_plan_id: Optional[str] = None,
         tool_type: Optional[str] = None,
         since: Optional[datetime] = None,
@@ -186,28 +313,38 @@ class FilesystemBudgetUsageRepository(BudgetUsageRepository):
         surface: Optional[str] = None,
         group_by: Optional[str] = None,
     ) -> Dict[str, object]:
-        events = self.list_usage(
-            tenant_id,
-            env,
-            surface=surface,
-            since=since,
-            until=until,
-            limit=10_000,
-        )
-        total_cost = sum([ev.cost for ev in events], start=0)
-        total_calls = len(events)
-        grouped: Dict[str, Dict[str, object]] = {}
-        if group_by:
-            for ev in events:
-                key = getattr(ev, group_by, None) or "unknown"
-                agg = grouped.setdefault(key, {"cost": 0, "count": 0})
-                agg["cost"] += ev.cost
-                agg["count"] += 1
-        return {"total_cost": total_cost, "total_events": total_calls, "grouped": grouped}
+        totals = rollups.UsageTotals(surface=surface, group_by=group_by)
+        if not rollups.rollup_supported(group_by):
+            events = self._apply_filters(self._load_events(tenant_id, env), surface, None, None, None, None, since, until)
+            return totals.add_events(events).result()
+        with self._locked(tenant_id, env):
+            rollup_dir = self._sync_rollups(tenant_id, env)
+        plan = rollups.plan_window(since, until)
+        days: Dict[str, Dict[str, object]] = {}
+
+        def _day(day: str) -> Dict[str, object]:
+            if day not in days:
+                days[day] = self._read_day(rollup_dir, day)
+            return days[day]
+
+        for day in plan.days:
+            totals.add_bucket(_day(day)["day"])
+        for hour in plan.hours:
+            totals.add_bucket(_day(hour[:10])["hours"].get(hour[-2:], {}))
+        for start, end in plan.edges:
+            totals.add_events(self._edge_events(tenant_id, env, rollup_dir, start, end))
+        return totals.result()
 
 
 class FirestoreBudgetUsageRepository(InMemoryBudgetUsageRepository):
-    """Firestore-backed usage repo."""
+    """Firestore-backed usage repo.
+
+    Each event write also increments an hour and a day rollup document under
+    ``budget_usage/{tenant}_{env}/rollups`` in the same transaction. The
+    increments are applied only when the event document is new, so a retried
+    record_usage for the same event id is counted once. Rollup costs are
+    integer nano-units because Firestore increments are not decimal-exact.
+    """
 
     def __init__(self, client: Optional[object] = None) -> None:  # pragma: no cover - optional dep
         try:
@@ -220,22 +357,60 @@ class FirestoreBudgetUsageRepository(InMemoryBudgetUsageRepository):
         if not project:
             raise RuntimeError("GCP project is required for Firestore budget usage repo")
         self._client = client or firestore.Client(project=project)  # type: ignore[arg-type]
+        self._increment = firestore.Increment
+        self._transactional = firestore.transactional
         self._root_collection = "budget_usage"
 
     def _events_col(self, tenant_id: str, env: str):
         doc = self._client.collection(self._root_collection).document(f"{tenant_id}_{env}")
         return doc.collection("events")
 
+    def _rollups_col(self, tenant_id: str, env: str):
+        doc = self._client.collection(self._root_collection).document(f"{tenant_id}_{env}")
+        return doc.collection("rollups")
+
+    def _add_to_rollups(self, writer, event: UsageEvent) -> None:
+        """Queue the rollup increments for event on a batch or transaction."""
+        rollups_col = self._rollups_col(event.tenant_id, event.env)
+        payload = rollups.bucket_increments(event, self._increment)
+        writer.set(rollups_col.document(f"h_{rollups.hour_key(event.created_at)}"), payload, merge=True)
+        writer.set(rollups_col.document(f"d_{rollups.day_key(event.created_at)}"), payload, merge=True)
+
     def record_usage(self, event: UsageEvent) -> UsageEvent:
-        self._events_col(event.tenant_id, event.env).document(event.id).set(event.model_dump())
+        event_ref = self._events_col(event.tenant_id, event.env).document(event.id)
+
+        @self._transactional
+        def _record(transaction) -> None:
+            if event_ref.get(transaction=transaction).exists:
+                return  # a client retry: the event and its increments are already stored
+            transaction.set(event_ref, event.model_dump())
+            self._add_to_rollups(transaction, event)
+
+        _record(self._client.transaction())
         return event
 
+    def rebuild_rollups(self, tenant_id: str, env: str) -> int:
+        """Recompute rollups from raw events (backfill for pre-rollup data); returns events indexed."""
+        for snap in self._rollups_col(tenant_id, env).stream():
+            snap.reference.delete()
+        count = 0
+        batch = self._client.batch()
+        for doc in self._events_col(tenant_id, env).stream():
+            self._add_to_rollups(batch, UsageEvent(**doc.to_dict()))
+            count += 1
+            if count % 200 == 0:  # two rollup writes per event; stay under the 500-op batch limit
+                batch.commit()
+                batch = self._client.batch()
+        batch.commit()
+        return count
+
     def list_usage(
         self,
         tenant_id: str,
         env: str,
         surface: Optional[str] = None,
         provider: Optional[str] = None,
+        tool_id: Optional[str] = None,
         model_or_plan_id: Optional[str] = None,
         tool_type: Optional[str] = None,
         since: Optional[datetime] = None,
@@ -263,6 +438,10 @@ class FirestoreBudgetUsageRepository(InMemoryBudgetUsageRepository):
         events = [UsageEvent(**d.to_dict()) for d in docs]
         return events[offset : offset + limit]
 
+    def _stream_range(self, tenant_id: str, env: str, start: datetime, end: datetime) -> List[UsageEvent]:
+        query = self._events_col(tenant_id, env).where("created_at", ">=", start).where("created_at", "<", end)
+        return [UsageEvent(**d.to_dict()) for d in query.stream()]
+
     def get_totals(
         self,
         tenant_id: str,
@@ -272,17 +451,21 @@ class FirestoreBudgetUsageRepository(InMemoryBudgetUsageRepository):
         surface: Optional[str] = None,
         group_by: Optional[str] = None,
     ) -> Dict[str, object]:
-        events = self.list_usage(tenant_id, env, surface=surface, since=since, until=until, limit=10_000)
-        total_cost = sum([ev.cost for ev in events], start=0)
-        total_calls = len(events)
-        grouped: Dict[str, Dict[str, object]] = {}
-        if group_by:
-            for ev in events:
-                key = getattr(ev, group_by, None) or "unknown"
-                agg = grouped.setdefault(key, {"cost": 0, "count": 0})
-                agg["cost"] += ev.cost
-                agg["count"] += 1
-        return {"total_cost": total_cost, "total_events": total_calls, "grouped": grouped}
+        totals = rollups.UsageTotals(surface=surface, group_by=group_by)
+        if not rollups.rollup_supported(group_by):
+            events = self._stream_range(tenant_id, env, since, until + timedelta(microseconds=1))
+            return totals.add_events(events).result()
+        plan = rollups.plan_window(since, until)
+        rollups_col = self._rollups_col(tenant_id, env)
+        refs = [rollups_col.document(f"d_{day}") for day in plan.days]
+        refs += [rollups_col.document(f"h_{hour}") for hour in plan.hours]
+        if refs:
+            for snap in self._client.get_all(refs):
+                if snap.exists:
+                    totals.add_bucket(rollups.bucket_from_nanos(snap.to_dict() or {}))
+        for start, end in plan.edges:
+            totals.add_events(self._stream_range(tenant_id, env, start, end))
+        return totals.result()
 
 
 class BudgetPolicyRepository(Protocol):
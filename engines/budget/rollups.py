@@ -0,0 +1,257 @@
+"""Pre-aggregated usage rollups for budget totals.
+
+Usage repos maintain one bucket per tenant/env per UTC hour and per UTC day at
+record time. A bucket is keyed by surface (budget checks filter on it) and each
+surface cell carries cost/count totals plus a breakdown per dimension in
+ROLLUP_DIMENSIONS, so ``get_totals`` can answer ``surface=`` and ``group_by=``
+without touching raw events.
+
+An arbitrary [since, until] window is split by ``plan_window`` into whole days,
+whole hours and at most two sub-hour edges. Buckets answer the whole periods;
+only the edges are read from raw events, which keeps totals exact at a cost of
+O(buckets + events in the edge hours).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from engines.budget.models import UsageEvent
+
+ROLLUP_DIMENSIONS = ("surface", "provider", "tool_id", "tool_type", "model_or_plan_id")
+
+# Cell key for events without a surface; never a valid surface filter value.
+NO_SURFACE = "~"
+
+# Firestore increments are integer-only, so costs are rolled up in nano-units there.
+COST_NANOS = Decimal(10) ** 9
+
+_HOUR = timedelta(hours=1)
+_DAY = timedelta(days=1)
+_TICK = timedelta(microseconds=1)
+
+Bucket = Dict[str, Dict[str, Any]]
+
+
+def _utc(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def hour_key(ts: datetime) -> str:
+    return _utc(ts).strftime("%Y-%m-%dT%H")
+
+
+def day_key(ts: datetime) -> str:
+    return _utc(ts).strftime("%Y-%m-%d")
+
+
+def floor_hour(ts: datetime) -> datetime:
+    return _utc(ts).replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(ts: datetime) -> datetime:
+    floored = floor_hour(ts)
+    return floored if floored == ts else floored + _HOUR
+
+
+def _floor_day(ts: datetime) -> datetime:
+    return floor_hour(ts).replace(hour=0)
+
+
+def _ceil_day(ts: datetime) -> datetime:
+    floored = _floor_day(ts)
+    return floored if floored == ts else floored + _DAY
+
+
+def _span(start: datetime, end: datetime, step: timedelta) -> List[datetime]:
+    out = []
+    while start < end:
+        out.append(start)
+        start += step
+    return out
+
+
+@dataclass
+class WindowPlan:
+    """Whole-day and whole-hour bucket keys plus half-open raw edge ranges."""
+
+    days: List[str] = field(default_factory=list)
+    hours: List[str] = field(default_factory=list)
+    edges: List[Tuple[datetime, datetime]] = field(default_factory=list)
+
+
+def plan_window(since: datetime, until: datetime) -> WindowPlan:
+    """Split an inclusive [since, until] window into rollup buckets and raw edges."""
+    start = _utc(since)
+    end = _utc(until) + _TICK  # datetimes are microsecond resolution
+    plan = WindowPlan()
+    if start >= end:
+        return plan
+    h0, h1 = _ceil_hour(start), floor_hour(end)
+    if h0 >= h1:
+        plan.edges.append((start, end))
+        return plan
+    if start < h0:
+        plan.edges.append((start, h0))
+    if h1 < end:
+        plan.edges.append((h1, end))
+    d0, d1 = _ceil_day(h0), _floor_day(h1)
+    if d0 < d1:
+        plan.days = [day_key(ts) for ts in _span(d0, d1, _DAY)]
+        hours = _span(h0, d0, _HOUR) + _span(d1, h1, _HOUR)
+    else:
+        hours = _span(h0, h1, _HOUR)
+    plan.hours = [hour_key(ts) for ts in hours]
+    return plan
+
+
+def edge_hours(start: datetime, end: datetime) -> List[str]:
+    """Hour keys overlapping a half-open edge range."""
+    return [hour_key(ts) for ts in _span(floor_hour(start), end, _HOUR)]
+
+
+def surface_key(surface: Optional[str]) -> str:
+    return surface or NO_SURFACE
+
+
+def _dimension_value(event: UsageEvent, dimension: str) -> str:
+    return getattr(event, dimension, None) or "unknown"
+
+
+def _new_cell() -> Dict[str, Any]:
+    return {"cost": Decimal("0"), "count": 0, "dims": {}}
+
+
+def add_event(bucket: Bucket, event: UsageEvent) -> None:
+    cell = bucket.setdefault(surface_key(event.surface), _new_cell())
+    cell["cost"] += event.cost
+    cell["count"] += 1
+    for dimension in ROLLUP_DIMENSIONS:
+        values = cell["dims"].setdefault(dimension, {})
+        agg = values.setdefault(_dimension_value(event, dimension), {"cost": Decimal("0"), "count": 0})
+        agg["cost"] += event.cost
+        agg["count"] += 1
+
+
+def bucket_to_json(bucket: Bucket) -> Dict[str, Any]:
+    return {
+        surface: {
+            "cost": str(cell["cost"]),
+            "count": cell["count"],
+            "dims": {
+                dimension: {value: {"cost": str(agg["cost"]), "count": agg["count"]} for value, agg in values.items()}
+                for dimension, values in cell["dims"].items()
+            },
+        }
+        for surface, cell in bucket.items()
+    }
+
+
+def bucket_from_json(raw: Dict[str, Any]) -> Bucket:
+    return {
+        surface: {
+            "cost": Decimal(cell["cost"]),
+            "count": int(cell["count"]),
+            "dims": {
+                dimension: {
+                    value: {"cost": Decimal(agg["cost"]), "count": int(agg["count"])} for value, agg in values.items()
+                }
+                for dimension, values in cell.get("dims", {}).items()
+            },
+        }
+        for surface, cell in raw.items()
+    }
+
+
+def cost_to_nanos(cost: Decimal) -> int:
+    return int((Decimal(cost) * COST_NANOS).to_integral_value())
+
+
+def bucket_increments(event: UsageEvent, increment: Any) -> Dict[str, Any]:
+    """Nested merge payload that adds one event to a Firestore rollup document."""
+    nanos = cost_to_nanos(event.cost)
+    return {
+        "cells": {
+            surface_key(event.surface): {
+                "cost_nanos": increment(nanos),
+                "count": increment(1),
+                "dims": {
+                    dimension: {
+                        _dimension_value(event, dimension): {"cost_nanos": increment(nanos), "count": increment(1)}
+                    }
+                    for dimension in ROLLUP_DIMENSIONS
+                },
+            }
+        }
+    }
+
+
+def bucket_from_nanos(raw: Dict[str, Any]) -> Bucket:
+    def _cost(node: Dict[str, Any]) -> Decimal:
+        return Decimal(int(node.get("cost_nanos", 0))) / COST_NANOS
+
+    return {
+        surface: {
+            "cost": _cost(cell),
+            "count": int(cell.get("count", 0)),
+            "dims": {
+                dimension: {value: {"cost": _cost(agg), "count": int(agg.get("count", 0))} for value, agg in values.items()}
+                for dimension, values in cell.get("dims", {}).items()
+            },
+        }
+        for surface, cell in (raw.get("cells") or {}).items()
+    }
+
+
+def in_edge(event: UsageEvent, start: datetime, end: datetime) -> bool:
+    return start <= _utc(event.created_at) < end
+
+
+class UsageTotals:
+    """Accumulates buckets and raw edge events into a get_totals result."""
+
+    def __init__(self, surface: Optional[str] = None, group_by: Optional[str] = None) -> None:
+        self._surface = surface
+        self._group_by = group_by
+        self.total_cost = Decimal("0")
+        self.total_events = 0
+        self.grouped: Dict[str, Dict[str, object]] = {}
+
+    def _group(self, key: str, cost: Decimal, count: int) -> None:
+        agg = self.grouped.setdefault(key, {"cost": Decimal("0"), "count": 0})
+        agg["cost"] += cost
+        agg["count"] += count
+
+    def add_bucket(self, bucket: Bucket) -> None:
+        for surface, cell in bucket.items():
+            if self._surface and surface != self._surface:
+                continue
+            self.total_cost += cell["cost"]
+            self.total_events += cell["count"]
+            if self._group_by:
+                for value, agg in cell["dims"].get(self._group_by, {}).items():
+                    self._group(value, agg["cost"], agg["count"])
+
+    def add_event(self, event: UsageEvent) -> None:
+        if self._surface and event.surface != self._surface:
+            return
+        self.total_cost += event.cost
+        self.total_events += 1
+        if self._group_by:
+            self._group(_dimension_value(event, self._group_by), event.cost, 1)
+
+    def add_events(self, events: Iterable[UsageEvent]) -> "UsageTotals":
+        for event in events:
+            self.add_event(event)
+        return self
+
+    def result(self) -> Dict[str, object]:
+        return {"total_cost": self.total_cost, "total_events": self.total_events, "grouped": self.grouped}
+
+
+def rollup_supported(group_by: Optional[str]) -> bool:
+    return group_by is None or group_by in ROLLUP_DIMENSIONS
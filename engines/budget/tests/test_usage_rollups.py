@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from engines.budget import rollups
+from engines.budget.models import UsageEvent
+from engines.budget.repository import (
+    FilesystemBudgetUsageRepository,
+    FirestoreBudgetUsageRepository,
+    InMemoryBudgetUsageRepository,
+)
+
+BASE = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _event(created_at: datetime, cost: str, surface=None, provider="openai", model=None) -> UsageEvent:
+    return UsageEvent(
+        tenant_id="t_demo",
+        env="dev",
+        surface=surface,
+        provider=provider,
+        model_or_plan_id=model,
+        cost=Decimal(cost),
+        created_at=created_at,
+    )
+
+
+def _brute(events, since, until, surface=None, group_by=None):
+    selected = [ev for ev in events if since <= ev.created_at <= until and (not surface or ev.surface == surface)]
+    return rollups.UsageTotals(group_by=group_by).add_events(selected).result()
+
+
+def test_plan_window_splits_days_hours_and_edges():
+    since = datetime(2026, 3, 1, 22, 15, tzinfo=timezone.utc)
+    until = datetime(2026, 3, 4, 1, 30, tzinfo=timezone.utc)
+    plan = rollups.plan_window(since, until)
+    assert plan.days == ["2026-03-02", "2026-03-03"]
+    assert plan.hours == ["2026-03-01T23", "2026-03-04T00"]
+    assert plan.edges[0] == (since, datetime(2026, 3, 1, 23, tzinfo=timezone.utc))
+    assert plan.edges[1][0] == datetime(2026, 3, 4, 1, tzinfo=timezone.utc)
+
+    short = rollups.plan_window(since, since + timedelta(minutes=50))
+    assert short.days == [] and short.hours == [] and len(short.edges) == 1
+
+
+def test_filesystem_totals_match_raw_scan(tmp_path):
+    repo = FilesystemBudgetUsageRepository(root=str(tmp_path))
+    rng = random.Random(7)
+    events = []
+    for _ in range(300):
+        ev = _event(
+            BASE + timedelta(seconds=rng.randrange(0, 4 * 86400)),
+            f"{rng.randrange(1, 5000)}.{rng.randrange(0, 999999):06d}",
+            surface=rng.choice([None, "squared", "cubed"]),
+            provider=rng.choice(["openai", "vertex", "aws"]),
+            model=rng.choice([None, "gpt-4o", "gemini"]),
+        )
+        repo.record_usage(ev)
+        events.append(ev)
+    # Events exactly on hour/day boundaries, and windows that start or end on
+    # them, exercise inclusive bounds at the rollup bucket edges.
+    boundaries = [BASE + timedelta(days=1), BASE + timedelta(days=2, hours=5), BASE + timedelta(days=3)]
+    for at in boundaries:
+        ev = _event(at, "1.25", surface="squared")
+        repo.record_usage(ev)
+        events.append(ev)
+    windows = [
+        (boundaries[0], boundaries[1]),
+        (boundaries[0], boundaries[2]),
+        (boundaries[1], boundaries[1]),
+        (events[0].created_at, events[1].created_at),
+    ]
+    for _ in range(40):
+        a = BASE + timedelta(seconds=rng.randrange(-3600, 5 * 86400))
+        b = a + timedelta(seconds=rng.randrange(0, 3 * 86400))
+        windows.append((a, b))
+    for since, until in windows:
+        since, until = min(since, until), max(since, until)
+        for surface, group_by in [(None, None), ("squared", "provider"), (None, "model_or_plan_id"), ("cubed", "mode")]:
+            assert repo.get_totals("t_demo", "dev", since, until, surface=surface, group_by=group_by) == _brute(
+                events, since, until, surface=surface, group_by=group_by
+            )
+
+
+def test_filesystem_rollups_backfill_existing_usage_without_cap(tmp_path):
+    events = [_event(BASE + timedelta(seconds=i * 7), "0.01") for i in range(10_050)]
+    path = tmp_path / "t_demo_dev.jsonl"
+    path.write_text("".join(ev.model_dump_json() + "\n" for ev in events), encoding="utf-8")
+
+    repo = FilesystemBudgetUsageRepository(root=str(tmp_path))
+    totals = repo.get_totals("t_demo", "dev", BASE - timedelta(days=1), BASE + timedelta(days=2), group_by="provider")
+    assert totals["total_events"] == 10_050
+    assert totals["total_cost"] == Decimal("100.50")
+    assert totals["grouped"]["openai"]["count"] == 10_050
+
+    # New writes after the backfill are folded in incrementally.
+    repo.record_usage(_event(BASE + timedelta(hours=5), "1.25"))
+    again = FilesystemBudgetUsageRepository(root=str(tmp_path))
+    totals = again.get_totals("t_demo", "dev", BASE - timedelta(days=1), BASE + timedelta(days=2))
+    assert totals["total_events"] == 10_051
+    assert totals["total_cost"] == Decimal("101.75")
+
+
+def _record_from_process(root: str, worker: int, count: int) -> None:
+    repo = FilesystemBudgetUsageRepository(root=root)
+    for i in range(count):
+        repo.record_usage(_event(BASE + timedelta(minutes=worker * 97 + i * 13), "0.5"))
+
+
+def test_filesystem_rollups_stay_consistent_across_processes(tmp_path):
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_record_from_process, args=(str(tmp_path), w, 40)) for w in range(4)]
+    for proc in workers:
+        proc.start()
+    for proc in workers:
+        proc.join(60)
+        assert proc.exitcode == 0
+
+    repo = FilesystemBudgetUsageRepository(root=str(tmp_path))
+    raw = repo.list_usage("t_demo", "dev", limit=1000)
+    totals = repo.get_totals("t_demo", "dev", BASE - timedelta(days=1), BASE + timedelta(days=2))
+    assert len(raw) == totals["total_events"] == 160
+    assert totals["total_cost"] == Decimal("80.0")
+
+
+def test_filesystem_reindex_after_crash_does_not_double_count(tmp_path):
+    repo = FilesystemBudgetUsageRepository(root=str(tmp_path))
+    for i in range(30):
+        repo.record_usage(_event(BASE + timedelta(minutes=i * 70), "1"))
+    since, until = BASE + timedelta(minutes=10), BASE + timedelta(days=2)
+    expected = repo.get_totals("t_demo", "dev", since, until)
+
+    # Simulate a crash after the day docs and offsets were written but before the marker was.
+    marker = tmp_path / "t_demo_dev.rollups" / "indexed.json"
+    marker.write_text(json.dumps({"bytes": 0}), encoding="utf-8")
+    assert FilesystemBudgetUsageRepository(root=str(tmp_path)).get_totals("t_demo", "dev", since, until) == expected
+
+
+def test_in_memory_totals_are_not_capped():
+    repo = InMemoryBudgetUsageRepository()
+    for i in range(10_005):
+        repo.record_usage(_event(BASE + timedelta(seconds=i), "1"))
+    totals = repo.get_totals("t_demo", "dev", BASE, BASE + timedelta(days=1))
+    assert totals["total_events"] == 10_005
+
+
+class _Increment:
+    def __init__(self, value):
+        self.value = value
+
+
+class _Snap:
+    def __init__(self, db, path):
+        self._data = db.docs.get(path)
+        self.exists = self._data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class _Ref:
+    def __init__(self, db, path):
+        self.db, self.path = db, path
+
+    def collection(self, name):
+        return _Collection(self.db, f"{self.path}/{name}")
+
+    def get(self, transaction=None):
+        return _Snap(self.db, self.path)
+
+
+class _Collection:
+    _OPS = {">=": lambda a, b: a >= b, "<=": lambda a, b: a <= b, "<": lambda a, b: a < b, "==": lambda a, b: a == b}
+
+    def __init__(self, db, path, filters=()):
+        self.db, self.path, self.filters = db, path, filters
+
+    def document(self, name):
+        return _Ref(self.db, f"{self.path}/{name}")
+
+    def where(self, field, op, value):
+        return _Collection(self.db, self.path, self.filters + ((field, op, value),))
+
+    def limit(self, count):
+        return self
+
+    def order_by(self, *args, **kwargs):
+        return self
+
+    def stream(self):
+        prefix = self.path + "/"
+        for path, data in list(self.db.docs.items()):
+            if path.startswith(prefix) and "/" not in path[len(prefix):]:
+                if all(self._OPS[op](data[field], value) for field, op, value in self.filters):
+                    yield _Snap(self.db, path)
+
+
+class _Writer:
+    def __init__(self, db):
+        self.db = db
+
+    def set(self, ref, data, merge=False):
+        self.db.docs[ref.path] = self._merge(self.db.docs.get(ref.path, {}) if merge else {}, data)
+
+    def _merge(self, current, data):
+        out = dict(current)
+        for key, value in data.items():
+            if isinstance(value, dict):
+                out[key] = self._merge(out.get(key, {}), value)
+            elif isinstance(value, _Increment):
+                out[key] = out.get(key, 0) + value.value
+            else:
+                out[key] = value
+        return out
+
+    def commit(self):
+        pass
+
+
+class _FakeFirestore:
+    def __init__(self):
+        self.docs = {}
+
+    def collection(self, name):
+        return _Collection(self, name)
+
+    def transaction(self):
+        return _Writer(self)
+
+    def batch(self):
+        return _Writer(self)
+
+    def get_all(self, refs):
+        return [ref.get() for ref in refs]
+
+
+def _firestore_repo():
+    repo = FirestoreBudgetUsageRepository.__new__(FirestoreBudgetUsageRepository)
+    repo._client = _FakeFirestore()
+    repo._increment = _Increment
+    repo._transactional = lambda fn: fn
+    repo._root_collection = "budget_usage"
+    return repo
+
+
+def test_firestore_recording_the_same_event_twice_counts_it_once():
+    repo = _firestore_repo()
+    events = [_event(BASE + timedelta(hours=h, minutes=10), "2.5", provider=p) for h, p in [(1, "openai"), (3, "aws"), (30, "vertex")]]
+    for ev in events:
+        repo.record_usage(ev)
+    repo.record_usage(events[1])  # client retry of an already recorded event
+
+    since, until = BASE, BASE + timedelta(days=2)
+    totals = repo.get_totals("t_demo", "dev", since, until, group_by="provider")
+    assert totals == _brute(events, since, until, group_by="provider")
+    assert totals["total_events"] == 3
+    assert len(repo.list_usage("t_demo", "dev", since=since, until=until)) == 3
@@ -65,6 +65,8 @@ from engines.config_store.routes import router as config_store_router
 from engines.registry.routes import router as registry_router
 
 from engines.routing.manager import startup_validation_check
+from engines.event_spine.write_behind import shutdown_write_behind
+from engines.video_render.scheduler import start_render_worker_pool, stop_render_worker_pool
 
 
 def create_app() -> FastAPI:
@@ -85,6 +87,9 @@ def create_app() -> FastAPI:
         # P0 Phase 0 Closeout: Validate routing configuration before mounting services
         # This ensures fail-fast behavior if required services are not properly configured
         startup_validation_check()
+        app.add_event_handler("shutdown", shutdown_write_behind)
+        app.add_event_handler("startup", start_render_worker_pool)
+        app.add_event_handler("shutdown", stop_render_worker_pool)
         
         app.include_router(ws_router)
         app.include_router(sse_router)
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from engines.chat.contracts import Contact
+from engines.chat.service import transport_layer
+from engines.chat.service.transport_layer import publish_message, subscribe_async
+from engines.common.identity import RequestContext
+from engines.realtime.timeline import InMemoryTimelineStore, set_timeline_store
+from tests.chat_store_stub import install_chat_store_stub
+
+
+class CountingStore:
+    def __init__(self, inner):
+        self._inner = inner
+        self.list_calls = 0
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+    def list_messages(self, *args, **kwargs):
+        self.list_calls += 1
+        return self._inner.list_messages(*args, **kwargs)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    set_timeline_store(InMemoryTimelineStore({}))
+    counting = CountingStore(install_chat_store_stub(monkeypatch))
+    monkeypatch.setattr(transport_layer, "chat_store_or_503", lambda ctx: counting)
+    return counting
+
+
+def _ctx():
+    return RequestContext(tenant_id="t_alpha", env="dev", mode="saas", project_id="p_chat", request_id="r1", user_id="u1")
+
+
+async def _take(gen, count):
+    out = []
+    try:
+        for _ in range(count):
+            out.append(await asyncio.wait_for(gen.__anext__(), timeout=2))
+        return out
+    finally:
+        await gen.aclose()
+
+
+def test_subscribers_share_one_hub_and_store_reads(store):
+    async def scenario():
+        subs = [subscribe_async("thread-hub", context=_ctx()) for _ in range(50)]
+        tasks = [asyncio.ensure_future(_take(gen, 3)) for gen in subs]
+        await asyncio.sleep(0.05)
+        assert len(transport_layer._HUBS) == 1
+        idle_reads = store.list_calls
+        await asyncio.sleep(0.3)
+        assert store.list_calls == idle_reads  # idle subscribers cost no store reads
+        sent = [publish_message("thread-hub", Contact(id="u1"), f"m{i}", context=_ctx()) for i in range(3)]
+        results = await asyncio.gather(*tasks)
+        reads_for_messages = store.list_calls - idle_reads
+        return sent, results, reads_for_messages
+
+    sent, results, reads = asyncio.run(scenario())
+    for received in results:
+        assert [m.id for m in received] == [m.id for m in sent]
+    assert reads <= 3
+    assert transport_layer._HUBS == {}
+
+
+def test_replay_then_live_without_duplicates(store):
+    first = publish_message("thread-replay", Contact(id="u1"), "first", context=_ctx())
+    second = publish_message("thread-replay", Contact(id="u1"), "second", context=_ctx())
+
+    async def scenario():
+        gen = subscribe_async("thread-replay", last_event_id=first.id, context=_ctx())
+        task = asyncio.ensure_future(_take(gen, 3))
+        await asyncio.sleep(0.05)
+        live = publish_message("thread-replay", Contact(id="u1"), "third", context=_ctx())
+        transport_layer.bus.add_message("thread-replay", live)  # redelivery must be deduped
+        fourth = publish_message("thread-replay", Contact(id="u1"), "fourth", context=_ctx())
+        return live, fourth, await task
+
+    live, fourth, received = asyncio.run(scenario())
+    assert [m.id for m in received] == [second.id, live.id, fourth.id]
+
+
+def test_overflowing_subscriber_recovers_from_store(store, monkeypatch):
+    monkeypatch.setattr(transport_layer, "SUBSCRIBER_QUEUE_SIZE", 2)
+
+    async def scenario():
+        gen = subscribe_async("thread-slow", context=_ctx())
+        task = asyncio.ensure_future(_take(gen, 6))
+        await asyncio.sleep(0.05)
+        sent = [publish_message("thread-slow", Contact(id="u1"), f"m{i}", context=_ctx()) for i in range(6)]
+        return sent, await task
+
+    sent, received = asyncio.run(scenario())
+    assert [m.id for m in received] == [m.id for m in sent]
@@ -3,7 +3,9 @@ from __future__ import annotations
 
 import asyncio
 import json
+import threading
 import uuid
+from collections import OrderedDict
 from typing import Any, Callable, Dict, List, Tuple
 
 from engines.chat.contracts import Message, Thread, Contact, ChatScope
@@ -177,42 +179,176 @@ def publish_message(
     return msg
 
 
+SUBSCRIBER_QUEUE_SIZE = 256
+_DEDUP_WINDOW = 1024
+_REPLAY_PAGE_SIZE = 100
+_FALLBACK_POLL_INTERVAL = 0.25
+
+# Sentinel queued for a subscriber whose queue overflowed; it re-reads the store from its own cursor.
+_LAGGED = object()
+
+
+def _remember(seen: "OrderedDict[str, None]", message_id: str) -> bool:
+    """Record message_id in a bounded dedup window; False if it was already there."""
+    if message_id in seen:
+        return False
+    seen[message_id] = None
+    if len(seen) > _DEDUP_WINDOW:
+        seen.popitem(last=False)
+    return True
+
+
+def _read_tail(store: Any, thread_id: str, cursor: str | None) -> Tuple[List[Message], str | None]:
+    """Read every stored message after cursor, returning them with the advanced cursor."""
+    out: List[Message] = []
+    while True:
+        records = store.list_messages(thread_id=thread_id, after_cursor=cursor, limit=_REPLAY_PAGE_SIZE)
+        for rec in records:
+            cursor = rec.cursor
+            out.append(
+                Message(
+                    id=rec.message_id,
+                    thread_id=thread_id,
+                    sender=Contact(id=rec.sender_id),
+                    text=rec.text,
+                    role=rec.role,
+                )
+            )
+        if len(records) < _REPLAY_PAGE_SIZE:
+            return out, cursor
+
+
+class _HubSubscriber:
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.lagged = False
+
+    def offer(self, msg: Message) -> None:
+        if self.lagged:
+            return
+        try:
+            self.queue.put_nowait(msg)
+        except asyncio.QueueFull:
+            # Drop the backlog rather than block the hub; the subscriber catches up from the store.
+            self.lagged = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_LAGGED)
+
+
+class _ThreadFanoutHub:
+    """Single bus subscription per (event loop, tenant scope, thread) shared by all local subscribers.
+
+    Bus deliveries are marshalled onto the owning loop and dispatched to bounded
+    per-subscriber queues, deduplicated by message id. Idle subscribers cost no
+    store reads; only when the bus is unavailable does the hub tail the store,
+    once for all of its subscribers.
+    """
+
+    def __init__(self, key: Tuple[Any, ...], thread_id: str, store: Any, loop: asyncio.AbstractEventLoop) -> None:
+        self.key = key
+        self.thread_id = thread_id
+        self.store = store
+        self.loop = loop
+        self.subscribers: List[_HubSubscriber] = []
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._bus_sub_id: str | None = None
+        self._poll_task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        try:
+            self._bus_sub_id = bus.subscribe(self.thread_id, self._on_bus_message)
+        except Exception:
+            self._bus_sub_id = None
+        if self._bus_sub_id is None:
+            self._poll_task = self.loop.create_task(self._poll_store())
+
+    def stop(self) -> None:
+        if self._bus_sub_id:
+            try:
+                bus.unsubscribe(self.thread_id, self._bus_sub_id)
+            except Exception:
+                pass
+            self._bus_sub_id = None
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+
+    def _on_bus_message(self, msg: Message) -> None:
+        # Bus callbacks may run on a listener thread (RedisBus); hop onto the hub loop.
+        try:
+            self.loop.call_soon_threadsafe(self.dispatch, msg)
+        except RuntimeError:
+            pass
+
+    def dispatch(self, msg: Message) -> None:
+        if not _remember(self._seen, msg.id):
+            return
+        for sub in list(self.subscribers):
+            sub.offer(msg)
+
+    async def _poll_store(self) -> None:
+        cursor = self.store.latest_cursor(self.thread_id)
+        while True:
+            await asyncio.sleep(_FALLBACK_POLL_INTERVAL)
+            try:
+                messages, cursor = _read_tail(self.store, self.thread_id, cursor)
+            except Exception:
+                continue
+            for msg in messages:
+                self.dispatch(msg)
+
+
+_HUBS: Dict[Tuple[Any, ...], _ThreadFanoutHub] = {}
+_HUBS_LOCK = threading.Lock()
+
+
+def _attach_subscriber(thread_id: str, store: Any, context: RequestContext) -> Tuple[_ThreadFanoutHub, _HubSubscriber]:
+    loop = asyncio.get_running_loop()
+    key = (id(loop), context.tenant_id, context.env, context.project_id, thread_id)
+    sub = _HubSubscriber()
+    with _HUBS_LOCK:
+        hub = _HUBS.get(key)
+        created = hub is None
+        if created:
+            hub = _ThreadFanoutHub(key, thread_id, store, loop)
+            _HUBS[key] = hub
+        hub.subscribers.append(sub)
+    if created:
+        hub.start()
+    return hub, sub
+
+
+def _detach_subscriber(hub: _ThreadFanoutHub, sub: _HubSubscriber) -> None:
+    with _HUBS_LOCK:
+        if sub in hub.subscribers:
+            hub.subscribers.remove(sub)
+        if hub.subscribers or _HUBS.get(hub.key) is not hub:
+            return
+        del _HUBS[hub.key]
+    hub.stop()
+
+
 async def subscribe_async(thread_id: str, last_event_id: str | None = None, context: RequestContext | None = None):
     if context is None:
         raise RuntimeError("RequestContext is required for stream replay")
     store = chat_store_or_503(context)
+    # Attach before the replay read so nothing published in between is missed; dedup drops the overlap.
+    hub, sub = _attach_subscriber(thread_id, store, context)
+    delivered: "OrderedDict[str, None]" = OrderedDict()
     cursor = last_event_id
-    poll_interval = 0.25
-    sub_id: str | None = None
-    queue: asyncio.Queue[Message] = asyncio.Queue()
-    try:
-        sub_id = bus.subscribe(thread_id, lambda m: queue.put_nowait(m))
-    except Exception:
-        sub_id = None
     try:
+        pending, cursor = _read_tail(store, thread_id, cursor)
         while True:
-            messages = store.list_messages(thread_id=thread_id, after_cursor=cursor, limit=100)
-            if messages:
-                for rec in messages:
-                    cursor = rec.cursor
-                    yield Message(
-                        id=rec.message_id,
-                        thread_id=thread_id,
-                        sender=Contact(id=rec.sender_id),
-                        text=rec.text,
-                        role=rec.role,
-                    )
-            try:
-                msg = queue.get_nowait()
-                yield msg
-                cursor = msg.id
-            except asyncio.QueueEmpty:
-                await asyncio.sleep(poll_interval)
-            except Exception:
-                await asyncio.sleep(poll_interval)
+            for msg in pending:
+                if _remember(delivered, msg.id):
+                    cursor = msg.id
+                    yield msg
+            item = await sub.queue.get()
+            if item is _LAGGED:
+                sub.lagged = False
+                pending, cursor = _read_tail(store, thread_id, cursor)
+            else:
+                pending = [item]
     finally:
-        if sub_id:
-            try:
-                bus.unsubscribe(thread_id, sub_id)
-            except Exception:
-                pass
+        _detach_subscriber(hub, sub)
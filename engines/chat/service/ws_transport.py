@@ -4,8 +4,11 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import os
+import time
 import uuid
-from typing import Any, Dict, Optional
+from collections import deque
+from typing import Any, Deque, Dict, Optional
 
 from fastapi import (
     APIRouter,
@@ -199,12 +202,79 @@ def _build_routing_keys(
     )
 
 
+WS_SEND_QUEUE_MAX_ENV = "CHAT_WS_SEND_QUEUE_MAX"
+WS_SLOW_CONSUMER_POLICY_ENV = "CHAT_WS_SLOW_CONSUMER_POLICY"
+DEFAULT_WS_SEND_QUEUE_MAX = 256
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+SLOW_CONSUMER_CLOSE_CODE = 1013  # "Try Again Later": the client should reconnect with last_event_id
+
+
+def _env_send_queue_max() -> int:
+    try:
+        return max(1, int(os.getenv(WS_SEND_QUEUE_MAX_ENV, str(DEFAULT_WS_SEND_QUEUE_MAX))))
+    except ValueError:
+        return DEFAULT_WS_SEND_QUEUE_MAX
+
+
+def _env_slow_consumer_policy() -> str:
+    policy = os.getenv(WS_SLOW_CONSUMER_POLICY_ENV, "drop_oldest").lower()
+    return policy if policy in SLOW_CONSUMER_POLICIES else "drop_oldest"
+
+
+def _coalesce_key(event: StreamEvent) -> Optional[tuple]:
+    """Ephemeral events supersede earlier ones of the same type from the same actor."""
+    if event.meta.persist != PersistPolicy.NEVER:
+        return None
+    return (event.type, event.routing.actor_id)
+
+
+class _Outbound:
+    """Outbound buffer plus writer task for a single socket."""
+
+    def __init__(self, websocket: WebSocket, thread_id: Optional[str]) -> None:
+        self.websocket = websocket
+        self.thread_id = thread_id
+        self.buffer: Deque[tuple[Optional[tuple], str]] = deque()
+        self.ready = asyncio.Event()
+        self.space = asyncio.Event()
+        self.space.set()
+        self.closed = False
+        self.loop = asyncio.get_running_loop()
+        self.writer: Optional[asyncio.Task] = None
+
+
 class ConnectionManager:
-    def __init__(self) -> None:
+    """Per-thread socket registry with non-blocking, per-connection delivery.
+
+    Every socket gets its own outbound buffer drained by a dedicated writer task,
+    so ``broadcast_event`` only enqueues and a slow client never delays the rest
+    of the thread. When a buffer reaches its high watermark the slow-consumer
+    policy applies: ``drop_oldest`` discards the oldest queued frame,
+    ``coalesce`` replaces a queued ephemeral event of the same type and actor
+    (falling back to dropping the oldest frame), and ``disconnect`` closes the
+    socket so the client resumes from its last event id.
+    """
+
+    def __init__(self, max_queue: Optional[int] = None, policy: Optional[str] = None) -> None:
         self.active: Dict[str, list[tuple[WebSocket, str]]] = {}
+        self.max_queue = max_queue or _env_send_queue_max()
+        self.policy = policy or _env_slow_consumer_policy()
+        if self.policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {self.policy}")
+        self._outbound: Dict[int, _Outbound] = {}
+        self._stats: Dict[str, float] = {
+            "sent": 0,
+            "send_errors": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "slow_disconnects": 0,
+            "send_seconds_total": 0.0,
+            "send_seconds_max": 0.0,
+        }
 
     async def connect(self, thread_id: str, websocket: WebSocket, user_id: str) -> None:
         self.active.setdefault(thread_id, []).append((websocket, user_id))
+        self._outbound_for(websocket, thread_id)
         logger.info(f"WS Connect: thread={thread_id} user={user_id}")
 
     def disconnect(self, thread_id: str, websocket: WebSocket) -> None:
@@ -214,21 +284,125 @@ class ConnectionManager:
             ]
             if not self.active[thread_id]:
                 del self.active[thread_id]
+        out = self._outbound.pop(id(websocket), None)
+        if out is not None:
+            out.closed = True
+            if out.writer is not None and out.writer is not asyncio.current_task():
+                out.writer.cancel()
 
     async def broadcast_event(self, thread_id: str, event: StreamEvent) -> None:
         connections = self.active.get(thread_id, [])[:]
         payload = event.json()
+        key = _coalesce_key(event)
         for ws, _ in connections:
+            self._enqueue(self._outbound_for(ws, thread_id), payload, key)
+        # Give writers a turn so frames go out promptly; never wait on a socket here.
+        await asyncio.sleep(0)
+
+    async def send_personal(self, websocket: WebSocket, payload: dict) -> None:
+        out = self._outbound.get(id(websocket))
+        if out is None or out.closed:
             try:
-                await ws.send_text(payload)
+                await websocket.send_text(json.dumps(payload))
             except Exception:
                 pass
+            return
+        # Direct replies (replay, pong) wait for room instead of being shed.
+        while len(out.buffer) >= self.max_queue and not out.closed:
+            out.space.clear()
+            await out.space.wait()
+        if not out.closed:
+            out.buffer.append((None, json.dumps(payload)))
+            out.ready.set()
+
+    def stats(self) -> Dict[str, Any]:
+        depths = [len(out.buffer) for out in self._outbound.values()]
+        sent = int(self._stats["sent"])
+        return {
+            "connections": len(depths),
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "sent": sent,
+            "send_errors": int(self._stats["send_errors"]),
+            "dropped": int(self._stats["dropped"]),
+            "coalesced": int(self._stats["coalesced"]),
+            "slow_disconnects": int(self._stats["slow_disconnects"]),
+            "send_latency_ms_avg": (self._stats["send_seconds_total"] / sent * 1000.0) if sent else 0.0,
+            "send_latency_ms_max": self._stats["send_seconds_max"] * 1000.0,
+        }
+
+    def _outbound_for(self, websocket: WebSocket, thread_id: Optional[str]) -> _Outbound:
+        out = self._outbound.get(id(websocket))
+        loop = asyncio.get_running_loop()
+        if out is None or out.closed or out.loop is not loop:
+            out = _Outbound(websocket, thread_id)
+            self._outbound[id(websocket)] = out
+        if out.writer is None or out.writer.done():
+            out.writer = loop.create_task(self._writer(out))
+        return out
+
+    def _enqueue(self, out: _Outbound, payload: str, key: Optional[tuple]) -> None:
+        if out.closed:
+            return
+        if len(out.buffer) >= self.max_queue:
+            if self.policy == "disconnect":
+                self._drop_slow_consumer(out)
+                return
+            if self.policy == "coalesce" and key is not None:
+                for idx, (queued_key, _) in enumerate(out.buffer):
+                    if queued_key == key:
+                        del out.buffer[idx]
+                        out.buffer.append((key, payload))
+                        self._stats["coalesced"] += 1
+                        return
+            out.buffer.popleft()
+            self._stats["dropped"] += 1
+        out.buffer.append((key, payload))
+        out.ready.set()
 
-    async def send_personal(self, websocket: WebSocket, payload: dict) -> None:
-        try:
-            await websocket.send_text(json.dumps(payload))
-        except Exception:
-            pass
+    def _drop_slow_consumer(self, out: _Outbound) -> None:
+        self._stats["slow_disconnects"] += 1
+        logger.warning(f"WS slow consumer disconnected: thread={out.thread_id} queued={len(out.buffer)}")
+        self._forget(out)
+
+        async def _close() -> None:
+            try:
+                await out.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="slow_consumer")
+            except Exception:
+                pass
+
+        out.loop.create_task(_close())
+
+    def _forget(self, out: _Outbound) -> None:
+        if out.thread_id is not None:
+            self.disconnect(out.thread_id, out.websocket)
+        else:
+            self._outbound.pop(id(out.websocket), None)
+        out.closed = True
+        out.buffer.clear()
+        out.space.set()
+
+    async def _writer(self, out: _Outbound) -> None:
+        while not out.closed:
+            if not out.buffer:
+                out.ready.clear()
+                await out.ready.wait()
+                continue
+            _, payload = out.buffer.popleft()
+            out.space.set()
+            started = time.perf_counter()
+            try:
+                await out.websocket.send_text(payload)
+            except Exception:
+                # Dead socket: stop delivering to it instead of failing every broadcast.
+                self._stats["send_errors"] += 1
+                self._forget(out)
+                return
+            elapsed = time.perf_counter() - started
+            self._stats["sent"] += 1
+            self._stats["send_seconds_total"] += elapsed
+            if elapsed > self._stats["send_seconds_max"]:
+                self._stats["send_seconds_max"] = elapsed
 
 
 manager = ConnectionManager()
@@ -238,7 +412,7 @@ async def heartbeat(websocket: WebSocket):
     try:
         while True:
             await asyncio.sleep(30)
-            await websocket.send_text(json.dumps({"type": "ping"}))
+            await manager.send_personal(websocket, {"type": "ping"})
     except Exception:
         pass
 
@@ -492,4 +666,5 @@ async def websocket_endpoint(
         manager.disconnect(thread_id, websocket)
     finally:
         hb_task.cancel()
+        manager.disconnect(thread_id, websocket)
         bus.unsubscribe(thread_id, sub_id)
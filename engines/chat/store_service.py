@@ -7,12 +7,8 @@ from typing import List, Optional, Dict, Any
 from engines.common.identity import RequestContext
 from engines.common.error_envelope import missing_route_error, cursor_invalid_error
 from engines.routing.registry import routing_registry, MissingRoutingConfig
-from engines.event_spine.cloud_event_spine_store import (
-    SpineEvent,
-    FirestoreEventSpineStore,
-    DynamoDBEventSpineStore,
-    CosmosEventSpineStore,
-)
+from engines.event_spine.adapter_pool import pooled_adapter
+from engines.event_spine.cloud_event_spine_store import SpineEvent
 
 
 class MissingChatStoreRoute(Exception):
@@ -58,23 +54,10 @@ class ChatStoreServiceRejectOnMissing:
             if not route:
                 raise MissingChatStoreRoute(self._context)
 
-            backend_type = (route.backend_type or "").lower()
-            config = route.config or {}
-
-            if backend_type == "firestore":
-                project = config.get("project")
-                return FirestoreEventSpineStore(project=project)
-            if backend_type == "dynamodb":
-                table_name = config.get("table_name", "chat_store")
-                region = config.get("region", "us-west-2")
-                return DynamoDBEventSpineStore(table_name=table_name, region=region)
-            if backend_type == "cosmos":
-                endpoint = config.get("endpoint")
-                key = config.get("key")
-                database = config.get("database", "chat_store")
-                return CosmosEventSpineStore(endpoint=endpoint, key=key, database=database)
-
-            raise MissingChatStoreRoute(self._context)
+            adapter = pooled_adapter(route, default_name="chat_store")
+            if adapter is None:
+                raise MissingChatStoreRoute(self._context)
+            return adapter
         except MissingRoutingConfig:
             raise MissingChatStoreRoute(self._context)
 
@@ -53,3 +53,103 @@ def test_connection_manager_broadcasts_event() -> None:
     payload = json.loads(ws.sent[0])
     assert payload["trace_id"] == "trace-ws-1"
     assert payload["routing"]["tenant_id"] == "t_demo"
+
+
+class _SlowWebSocket(_FakeWebSocket):
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = asyncio.Event()
+        self.closed_with: int | None = None
+
+    async def send_text(self, payload: str) -> None:
+        await self.gate.wait()
+        self.sent.append(payload)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.closed_with = code
+
+
+class _BrokenWebSocket(_FakeWebSocket):
+    async def send_text(self, payload: str) -> None:
+        raise RuntimeError("socket gone")
+
+
+def _gesture(actor_id: str, x: int) -> StreamEvent:
+    return StreamEvent(
+        type="gesture",
+        routing=RoutingKeys(
+            tenant_id="t_demo",
+            env="dev",
+            thread_id="thread-ws-clean",
+            actor_id=actor_id,
+            actor_type=ActorType.HUMAN,
+        ),
+        data={"x": x},
+        meta=EventMeta(priority=EventPriority.GESTURE, persist=PersistPolicy.NEVER),
+    )
+
+
+def test_slow_client_does_not_delay_fast_clients() -> None:
+    async def scenario():
+        manager = ConnectionManager(max_queue=4, policy="drop_oldest")
+        fast, slow = _FakeWebSocket(), _SlowWebSocket()
+        await manager.connect("thread-ws-clean", fast, "u1")
+        await manager.connect("thread-ws-clean", slow, "u2")
+        for _ in range(10):
+            await asyncio.wait_for(manager.broadcast_event("thread-ws-clean", _build_event()), timeout=1)
+        stats = manager.stats()
+        slow.gate.set()
+        await asyncio.sleep(0.01)
+        return fast, slow, stats
+
+    fast, slow, stats = asyncio.run(scenario())
+    assert len(fast.sent) == 10
+    # One frame was already in flight when the watermark kicked in.
+    assert len(slow.sent) == 5
+    assert stats["dropped"] == 5
+    assert stats["queue_depth_max"] == 4
+
+
+def test_coalesce_policy_keeps_latest_ephemeral_event() -> None:
+    async def scenario():
+        manager = ConnectionManager(max_queue=2, policy="coalesce")
+        slow = _SlowWebSocket()
+        await manager.connect("thread-ws-clean", slow, "u1")
+        for x in range(6):
+            await manager.broadcast_event("thread-ws-clean", _gesture("u2" if x % 2 else "u3", x))
+        slow.gate.set()
+        await asyncio.sleep(0.01)
+        return manager.stats(), [json.loads(p)["data"]["x"] for p in slow.sent]
+
+    stats, xs = asyncio.run(scenario())
+    assert xs == [0, 4, 5]
+    assert stats["coalesced"] == 3
+
+
+def test_disconnect_policy_closes_slow_consumer() -> None:
+    async def scenario():
+        manager = ConnectionManager(max_queue=1, policy="disconnect")
+        slow = _SlowWebSocket()
+        await manager.connect("thread-ws-clean", slow, "u1")
+        for _ in range(3):
+            await manager.broadcast_event("thread-ws-clean", _build_event())
+        await asyncio.sleep(0)
+        return manager, slow
+
+    manager, slow = asyncio.run(scenario())
+    assert slow.closed_with == 1013
+    assert "thread-ws-clean" not in manager.active
+    assert manager.stats()["slow_disconnects"] == 1
+
+
+def test_failed_send_removes_dead_socket() -> None:
+    async def scenario():
+        manager = ConnectionManager()
+        await manager.connect("thread-ws-clean", _BrokenWebSocket(), "u1")
+        await manager.broadcast_event("thread-ws-clean", _build_event())
+        await asyncio.sleep(0)
+        return manager
+
+    manager = asyncio.run(scenario())
+    assert "thread-ws-clean" not in manager.active
+    assert manager.stats()["send_errors"] == 1
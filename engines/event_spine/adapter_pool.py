@@ -0,0 +1,135 @@
+"""Process-wide pool of event spine backend adapters.
+
+Constructing a Firestore/DynamoDB/Cosmos client dominates the cost of a single
+emit, so adapters are shared across request contexts. The pool is keyed by the
+resolved route's backend type plus the config values that reach the
+constructor; contexts that route to the same backend reuse one client.
+
+Each route scope (resource_kind/tenant/env/project) remembers which adapter it
+resolved to last. When the route for a scope changes, the next lookup builds a
+fresh adapter and the old one is dropped once no other scope references it.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from engines.event_spine import cloud_event_spine_store
+from engines.routing.registry import ResourceRoute
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_BACKENDS = ("firestore", "dynamodb", "cosmos")
+
+AdapterKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+ScopeKey = Tuple[str, str, str, Optional[str]]
+
+
+def _constructor_args(backend_type: str, config: Dict[str, Any], default_name: str) -> Dict[str, Any]:
+    if backend_type == "firestore":
+        return {"project": config.get("project")}
+    if backend_type == "dynamodb":
+        return {
+            "table_name": config.get("table_name", default_name),
+            "region": config.get("region", "us-west-2"),
+        }
+    return {
+        "endpoint": config.get("endpoint"),
+        "key": config.get("key"),
+        "database": config.get("database", default_name),
+    }
+
+
+def _build_adapter(backend_type: str, kwargs: Dict[str, Any]):
+    # Resolve classes at call time so tests can patch the store module.
+    if backend_type == "firestore":
+        return cloud_event_spine_store.FirestoreEventSpineStore(**kwargs)
+    if backend_type == "dynamodb":
+        return cloud_event_spine_store.DynamoDBEventSpineStore(**kwargs)
+    return cloud_event_spine_store.CosmosEventSpineStore(**kwargs)
+
+
+class EventSpineAdapterPool:
+    """Thread-safe cache of backend adapters keyed by resolved route."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._adapters: Dict[AdapterKey, Any] = {}
+        self._scopes: Dict[ScopeKey, AdapterKey] = {}
+
+    def get(self, route: ResourceRoute, default_name: str = "event_spine"):
+        """Return the shared adapter for route, or None if its backend is unsupported.
+
+        Construction errors propagate and nothing is cached for the route.
+        """
+        backend_type = (route.backend_type or "").lower()
+        if backend_type not in SUPPORTED_BACKENDS:
+            return None
+        kwargs = _constructor_args(backend_type, route.config or {}, default_name)
+        key: AdapterKey = (backend_type, tuple(sorted(kwargs.items())))
+        scope: ScopeKey = (route.resource_kind, route.tenant_id, route.env, route.project_id)
+
+        with self._lock:
+            adapter = self._adapters.get(key)
+            if adapter is not None:
+                self._bind_scope(scope, key)
+                return adapter
+
+        # Build outside the lock; client construction can take a network round trip.
+        adapter = _build_adapter(backend_type, kwargs)
+        with self._lock:
+            existing = self._adapters.setdefault(key, adapter)
+            self._bind_scope(scope, key)
+            return existing
+
+    def _bind_scope(self, scope: ScopeKey, key: AdapterKey) -> None:
+        previous = self._scopes.get(scope)
+        self._scopes[scope] = key
+        if previous is None or previous == key:
+            return
+        if previous not in self._scopes.values():
+            self._adapters.pop(previous, None)
+            logger.info(f"event_spine route changed for {scope[0]} tenant={scope[1]} env={scope[2]}; released old adapter")
+
+    def key_for(self, adapter: Any) -> Optional[AdapterKey]:
+        """Return the pool key an adapter was built for, or None if it is not pooled."""
+        with self._lock:
+            for key, pooled in self._adapters.items():
+                if pooled is adapter:
+                    return key
+        return None
+
+    def invalidate(
+        self,
+        resource_kind: str,
+        tenant_id: str,
+        env: str,
+        project_id: Optional[str] = None,
+    ) -> None:
+        """Forget the adapter bound to a route scope (e.g. after a route delete)."""
+        with self._lock:
+            key = self._scopes.pop((resource_kind, tenant_id, env, project_id), None)
+            if key is not None and key not in self._scopes.values():
+                self._adapters.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._adapters.clear()
+            self._scopes.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._adapters)
+
+
+_pool = EventSpineAdapterPool()
+
+
+def adapter_pool() -> EventSpineAdapterPool:
+    return _pool
+
+
+def pooled_adapter(route: ResourceRoute, default_name: str = "event_spine"):
+    """Shortcut for adapter_pool().get(route, default_name)."""
+    return _pool.get(route, default_name)
@@ -105,6 +105,13 @@ class SpineEvent:
         return cls(**{k: v for k, v in data.items() if k != "route"})
 
 
+def _require_append_fields(event: SpineEvent) -> None:
+    if not event.event_id:
+        raise ValueError("event_id is required")
+    if not event.tenant_id or not event.mode or not event.run_id:
+        raise ValueError("tenant_id, mode, and run_id are required")
+
+
 # ===== Firestore Implementation =====
 
 class FirestoreEventSpineStore:
@@ -127,10 +134,7 @@ class FirestoreEventSpineStore:
     
     def append(self, event: SpineEvent, context: RequestContext) -> None:
         """Append event to spine (insert only, no updates)."""
-        if not event.event_id:
-            raise ValueError("event_id is required")
-        if not event.tenant_id or not event.mode or not event.run_id:
-            raise ValueError("tenant_id, mode, and run_id are required")
+        _require_append_fields(event)
         
         try:
             doc_data = event.to_dict()
@@ -139,6 +143,24 @@ class FirestoreEventSpineStore:
         except Exception as exc:
             logger.error(f"Failed to append event to Firestore event spine: {exc}")
             raise RuntimeError(f"Event append failed: {exc}") from exc
+
+    _batch_limit = 500  # Firestore caps a batched write at 500 operations
+
+    def append_batch(self, events: List[SpineEvent]) -> None:
+        """Append many events using batched writes (one commit per 500 docs)."""
+        for event in events:
+            _require_append_fields(event)
+        try:
+            collection = self._client.collection(self._collection)
+            for start in range(0, len(events), self._batch_limit):
+                batch = self._client.batch()
+                for event in events[start : start + self._batch_limit]:
+                    batch.set(collection.document(event.event_id), event.to_dict())
+                batch.commit()
+            logger.debug(f"Appended {len(events)} events to Firestore event spine")
+        except Exception as exc:
+            logger.error(f"Failed to batch append to Firestore event spine: {exc}")
+            raise RuntimeError(f"Event batch append failed: {exc}") from exc
     
     def list_events(
         self,
@@ -213,10 +235,7 @@ class DynamoDBEventSpineStore:
     
     def append(self, event: SpineEvent, context: RequestContext) -> None:
         """Append event to spine (insert only)."""
-        if not event.event_id:
-            raise ValueError("event_id is required")
-        if not event.tenant_id or not event.mode or not event.run_id:
-            raise ValueError("tenant_id, mode, and run_id are required")
+        _require_append_fields(event)
         
         try:
             item = event.to_dict()
@@ -228,6 +247,21 @@ class DynamoDBEventSpineStore:
         except Exception as exc:
             logger.error(f"Failed to append event to DynamoDB event spine: {exc}")
             raise RuntimeError(f"Event append failed: {exc}") from exc
+
+    def append_batch(self, events: List[SpineEvent]) -> None:
+        """Append many events via BatchWriteItem (boto3 chunks by 25 and retries unprocessed items)."""
+        for event in events:
+            _require_append_fields(event)
+        try:
+            with self._table.batch_writer() as batch:
+                for event in events:
+                    item = event.to_dict()
+                    item["tenant_run_idx"] = f"{event.tenant_id}#{event.run_id}"
+                    batch.put_item(Item=item)
+            logger.debug(f"Appended {len(events)} events to DynamoDB event spine")
+        except Exception as exc:
+            logger.error(f"Failed to batch append to DynamoDB event spine: {exc}")
+            raise RuntimeError(f"Event batch append failed: {exc}") from exc
     
     def list_events(
         self,
@@ -296,10 +330,7 @@ class CosmosEventSpineStore:
     
     def append(self, event: SpineEvent, context: RequestContext) -> None:
         """Append event to spine (insert only)."""
-        if not event.event_id:
-            raise ValueError("event_id is required")
-        if not event.tenant_id or not event.mode or not event.run_id:
-            raise ValueError("tenant_id, mode, and run_id are required")
+        _require_append_fields(event)
         
         try:
             item = event.to_dict()
@@ -311,6 +342,36 @@ class CosmosEventSpineStore:
         except Exception as exc:
             logger.error(f"Failed to append event to Cosmos event spine: {exc}")
             raise RuntimeError(f"Event append failed: {exc}") from exc
+
+    _batch_limit = 100  # Cosmos transactional batches hold at most 100 operations
+
+    def append_batch(self, events: List[SpineEvent]) -> None:
+        """Append many events as per-partition transactional batches.
+
+        Upserts keep a replayed write-behind batch idempotent.
+        """
+        for event in events:
+            _require_append_fields(event)
+        by_partition: Dict[str, List[Dict[str, Any]]] = {}
+        for event in events:
+            item = event.to_dict()
+            item["id"] = event.event_id
+            item["partition_key"] = event.tenant_id
+            by_partition.setdefault(event.tenant_id, []).append(item)
+        try:
+            execute_batch = getattr(self._container, "execute_item_batch", None)
+            for partition_key, items in by_partition.items():
+                if execute_batch is None:
+                    for item in items:
+                        self._container.upsert_item(body=item)
+                    continue
+                for start in range(0, len(items), self._batch_limit):
+                    operations = [("upsert", (item,)) for item in items[start : start + self._batch_limit]]
+                    execute_batch(batch_operations=operations, partition_key=partition_key)
+            logger.debug(f"Appended {len(events)} events to Cosmos event spine")
+        except Exception as exc:
+            logger.error(f"Failed to batch append to Cosmos event spine: {exc}")
+            raise RuntimeError(f"Event batch append failed: {exc}") from exc
     
     def list_events(
         self,
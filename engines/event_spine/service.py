@@ -11,12 +11,9 @@ from typing import Any, Dict, List, Optional
 
 from engines.common.identity import RequestContext
 from engines.routing.registry import MissingRoutingConfig, routing_registry
-from engines.event_spine.cloud_event_spine_store import (
-    SpineEvent,
-    FirestoreEventSpineStore,
-    DynamoDBEventSpineStore,
-    CosmosEventSpineStore,
-)
+from engines.event_spine.adapter_pool import pooled_adapter
+from engines.event_spine.cloud_event_spine_store import SpineEvent
+from engines.event_spine.write_behind import append_event, flush_pending
 
 logger = logging.getLogger(__name__)
 
@@ -49,29 +46,13 @@ class EventSpineService:
                     f"Configure via /routing/routes with backend_type=firestore|dynamodb|cosmos."
                 )
             
-            backend_type = (route.backend_type or "").lower()
-            config = route.config or {}
-            
-            if backend_type == "firestore":
-                # Cloud: Firestore
-                project = config.get("project")
-                return FirestoreEventSpineStore(project=project)
-            elif backend_type == "dynamodb":
-                # Cloud: DynamoDB
-                table_name = config.get("table_name", "event_spine")
-                region = config.get("region", "us-west-2")
-                return DynamoDBEventSpineStore(table_name=table_name, region=region)
-            elif backend_type == "cosmos":
-                # Cloud: Cosmos
-                endpoint = config.get("endpoint")
-                key = config.get("key")
-                database = config.get("database", "event_spine")
-                return CosmosEventSpineStore(endpoint=endpoint, key=key, database=database)
-            else:
+            adapter = pooled_adapter(route)
+            if adapter is None:
                 raise RuntimeError(
-                    f"Unsupported event_spine backend_type='{backend_type}'. "
+                    f"Unsupported event_spine backend_type='{(route.backend_type or '').lower()}'. "
                     f"Use 'firestore', 'dynamodb', or 'cosmos'."
                 )
+            return adapter
         except MissingRoutingConfig as e:
             raise RuntimeError(str(e)) from e
     
@@ -116,7 +97,7 @@ class EventSpineService:
         )
         
         # Append to backend
-        self._adapter.append(event, self._context)
+        append_event(self._adapter, event, self._context)
         
         logger.debug(
             f"Emitted event {event.event_id} (type={event_type}, run={run_id}) to event_spine"
@@ -132,6 +113,7 @@ class EventSpineService:
         
         Tenant/mode/user identity enforced server-side.
         """
+        flush_pending(self._adapter)
         return self._adapter.list_events(
             tenant_id=self._context.tenant_id,
             run_id=run_id,
@@ -11,6 +11,7 @@ from typing import Any, Dict, List, Optional
 
 from engines.common.identity import RequestContext
 from engines.routing.registry import MissingRoutingConfig, routing_registry
+from engines.event_spine.adapter_pool import pooled_adapter
 from engines.event_spine.cloud_event_spine_store import SpineEvent
 from engines.event_spine.validation_service import EventSpineValidator
 
@@ -62,26 +63,10 @@ class EventSpineServiceRejectOnMissing:
             if not route:
                 raise MissingEventSpineRoute(self._context)
             
-            backend_type = (route.backend_type or "").lower()
-            config = route.config or {}
-            
-            if backend_type == "firestore":
-                from engines.event_spine.cloud_event_spine_store import FirestoreEventSpineStore
-                project = config.get("project")
-                return FirestoreEventSpineStore(project=project)
-            elif backend_type == "dynamodb":
-                from engines.event_spine.cloud_event_spine_store import DynamoDBEventSpineStore
-                table_name = config.get("table_name", "event_spine")
-                region = config.get("region", "us-west-2")
-                return DynamoDBEventSpineStore(table_name=table_name, region=region)
-            elif backend_type == "cosmos":
-                from engines.event_spine.cloud_event_spine_store import CosmosEventSpineStore
-                endpoint = config.get("endpoint")
-                key = config.get("key")
-                database = config.get("database", "event_spine")
-                return CosmosEventSpineStore(endpoint=endpoint, key=key, database=database)
-            else:
+            adapter = pooled_adapter(route)
+            if adapter is None:
                 raise MissingEventSpineRoute(self._context)
+            return adapter
         except MissingEventSpineRoute:
             raise
         except MissingRoutingConfig:
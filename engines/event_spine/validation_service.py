@@ -12,7 +12,9 @@ from enum import Enum
 
 from engines.common.identity import RequestContext
 from engines.routing.registry import MissingRoutingConfig, routing_registry
+from engines.event_spine.adapter_pool import pooled_adapter
 from engines.event_spine.cloud_event_spine_store import SpineEvent
+from engines.event_spine.write_behind import append_event, flush_pending
 
 logger = logging.getLogger(__name__)
 
@@ -153,32 +155,11 @@ class EventSpineServiceWithValidation:
     def _initialize_adapter(self, route):
         """Initialize the backend adapter given a route."""
         try:
-            from engines.event_spine.cloud_event_spine_store import (
-                FirestoreEventSpineStore,
-                DynamoDBEventSpineStore,
-                CosmosEventSpineStore,
-            )
-            
-            backend_type = (route.backend_type or "").lower()
-            config = route.config or {}
-            
-            if backend_type == "firestore":
-                self._adapter = FirestoreEventSpineStore(project=config.get("project"))
-            elif backend_type == "dynamodb":
-                self._adapter = DynamoDBEventSpineStore(
-                    table_name=config.get("table_name", "event_spine"),
-                    region=config.get("region", "us-west-2"),
-                )
-            elif backend_type == "cosmos":
-                self._adapter = CosmosEventSpineStore(
-                    endpoint=config.get("endpoint"),
-                    key=config.get("key"),
-                    database=config.get("database", "event_spine"),
-                )
-            else:
+            self._adapter = pooled_adapter(route)
+            if self._adapter is None:
                 self._route_missing = True
                 logger.warning(
-                    f"Unsupported event_spine backend_type='{backend_type}'. "
+                    f"Unsupported event_spine backend_type='{(route.backend_type or '').lower()}'. "
                     f"Use 'firestore', 'dynamodb', or 'cosmos'."
                 )
         except Exception as e:
@@ -263,7 +244,7 @@ class EventSpineServiceWithValidation:
                 payload=payload,
             )
             
-            self._adapter.append(event, self._context)
+            append_event(self._adapter, event, self._context)
             logger.debug(f"Emitted event {event.event_id} to event_spine")
             return event.event_id
         except Exception as e:
@@ -283,6 +264,7 @@ class EventSpineServiceWithValidation:
             return []
         
         try:
+            flush_pending(self._adapter)
             return self._adapter.list_events(
                 tenant_id=self._context.tenant_id,
                 run_id=run_id,
@@ -0,0 +1,399 @@
+"""Optional write-behind mode for event spine appends.
+
+With EVENT_SPINE_WRITE_MODE=write_behind, emits no longer do a synchronous
+single-document append on the request path. Events are journalled to a local
+spill file, queued in-process, and flushed in batches by a background thread
+(Firestore batched writes, DynamoDB BatchWriteItem, Cosmos transactional
+batches). A batch goes out when it reaches EVENT_SPINE_BATCH_SIZE events or
+when its oldest event is EVENT_SPINE_FLUSH_INTERVAL_MS old.
+
+Crash safety: each writer journals to its own segment files
+(`<backend>-<digest>.<pid>-<token>.<n>.jsonl`) held under an exclusive flock, so
+processes sharing a spill dir never truncate or replay each other's events.
+After every successful batch the active segment is sealed and sealed segments
+whose events are all written are deleted, so the journal stays bounded by what
+is still queued. A starting writer claims only the segments whose lock it can
+take (their owner has exited) and replays them. Replays are idempotent because
+every backend batch path writes by event_id.
+
+Event types listed in EVENT_SPINE_SYNC_EVENT_TYPES (default safety, audit)
+always append synchronously. A full queue also falls back to a synchronous
+append. Events are validated before they are queued, so a malformed event
+raises to the emitter as in sync mode; a batch the backend still rejects with
+ValueError is not retried (see WriteBehindWriter._reject).
+"""
+from __future__ import annotations
+
+import atexit
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, TextIO, Tuple
+
+from engines.common.identity import RequestContext
+from engines.event_spine.adapter_pool import AdapterKey, adapter_pool
+from engines.event_spine.cloud_event_spine_store import SpineEvent, _require_append_fields
+
+logger = logging.getLogger(__name__)
+
+WRITE_MODE_ENV = "EVENT_SPINE_WRITE_MODE"
+SYNC_EVENT_TYPES_ENV = "EVENT_SPINE_SYNC_EVENT_TYPES"
+BATCH_SIZE_ENV = "EVENT_SPINE_BATCH_SIZE"
+FLUSH_INTERVAL_MS_ENV = "EVENT_SPINE_FLUSH_INTERVAL_MS"
+QUEUE_MAX_ENV = "EVENT_SPINE_QUEUE_MAX"
+SPILL_DIR_ENV = "EVENT_SPINE_SPILL_DIR"
+
+DEFAULT_SYNC_EVENT_TYPES = "safety,audit"
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL_MS = 200
+DEFAULT_QUEUE_MAX = 10_000
+_MAX_RETRY_BACKOFF = 5.0
+_REPLACED_WRITER_CLOSE_TIMEOUT = 10.0
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def write_behind_enabled() -> bool:
+    return os.getenv(WRITE_MODE_ENV, "sync").lower() == "write_behind"
+
+
+def sync_event_types() -> set[str]:
+    raw = os.getenv(SYNC_EVENT_TYPES_ENV, DEFAULT_SYNC_EVENT_TYPES)
+    return {part.strip() for part in raw.split(",") if part.strip()}
+
+
+def _spill_dir() -> Path:
+    return Path(os.getenv(SPILL_DIR_ENV) or Path(tempfile.gettempdir()) / "event_spine_spill")
+
+
+class _Segment:
+    """One journal file owned (flocked) by this writer."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.handle: TextIO = open(path, "a", encoding="utf-8")
+        fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self.lines = 0
+        self.outstanding = 0
+
+    def write(self, line: str) -> None:
+        self.handle.write(line + "\n")
+        self.handle.flush()
+        self.lines += 1
+        self.outstanding += 1
+
+    def close(self, remove: bool) -> None:
+        if remove:
+            self.path.unlink(missing_ok=True)
+        self.handle.close()  # releases the lock
+
+
+class WriteBehindWriter:
+    """Bounded queue + background batch flusher for one backend adapter.
+
+    `spill_path` names the journal; this writer's segments live next to it and
+    share its stem. A journal left at `spill_path` itself is replayed as well.
+    """
+
+    def __init__(
+        self,
+        adapter: Any,
+        spill_path: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_MS / 1000.0,
+        queue_max: int = DEFAULT_QUEUE_MAX,
+    ) -> None:
+        self._adapter = adapter
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue_max = queue_max
+        self._cond = threading.Condition()
+        self._pending: Deque[Tuple[_Segment, SpineEvent]] = deque()
+        self._oldest_at: Optional[float] = None
+        self._in_flight = 0
+        self._flush_requested = False
+        self._closed = False
+        self._stats: Dict[str, int] = {
+            "queued": 0, "written": 0, "batches": 0, "failures": 0, "rejected": 0, "recovered": 0, "segments": 0,
+        }
+
+        spill_path.parent.mkdir(parents=True, exist_ok=True)
+        self._spill_path = spill_path
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._segment_no = 0
+        self._sealed: List[_Segment] = []
+        self._active = self._open_segment()
+        self._recover()
+        self._thread = threading.Thread(target=self._run, name="event-spine-write-behind", daemon=True)
+        self._thread.start()
+
+    def _open_segment(self) -> _Segment:
+        self._segment_no += 1
+        self._stats["segments"] += 1
+        stem = self._spill_path.stem
+        return _Segment(self._spill_path.with_name(f"{stem}.{self._owner}.{self._segment_no:06d}.jsonl"))
+
+    def _orphans(self) -> List[Path]:
+        stem = self._spill_path.stem
+        own = f"{stem}.{self._owner}."
+        paths = sorted(p for p in self._spill_path.parent.glob(f"{stem}.*.jsonl") if not p.name.startswith(own))
+        if self._spill_path.exists():
+            paths.insert(0, self._spill_path)
+        return paths
+
+    def _recover(self) -> None:
+        for path in self._orphans():
+            try:
+                handle = open(path, "r", encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            with handle:
+                try:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    continue  # a live writer owns it
+                try:
+                    if os.fstat(handle.fileno()).st_ino != os.stat(path).st_ino:
+                        continue
+                except FileNotFoundError:
+                    continue  # drained and removed by its owner while we waited
+                recovered = 0
+                for line in handle:
+                    try:
+                        event = SpineEvent.from_dict(json.loads(line))
+                    except Exception:
+                        # A torn final line from a crash mid-write; the emit never returned.
+                        continue
+                    # Re-journal before dropping the orphan so a crash here loses nothing.
+                    self._active.write(line.rstrip("\n"))
+                    self._pending.append((self._active, event))
+                    recovered += 1
+                path.unlink(missing_ok=True)
+            if recovered:
+                self._stats["recovered"] += recovered
+                logger.info(f"Recovered {recovered} unflushed event_spine events from {path}")
+        if self._pending:
+            self._oldest_at = time.monotonic()
+
+    def submit(self, event: SpineEvent) -> bool:
+        """Queue an event; False means the caller must append synchronously."""
+        line = json.dumps(event.to_dict(), default=str)
+        with self._cond:
+            if self._closed or len(self._pending) + self._in_flight >= self._queue_max:
+                return False
+            self._active.write(line)
+            if not self._pending:
+                self._oldest_at = time.monotonic()
+            self._pending.append((self._active, event))
+            self._stats["queued"] += 1
+            if len(self._pending) == 1 or len(self._pending) >= self._batch_size:
+                self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is written (or timeout)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._pending or self._in_flight:
+                if not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        with self._cond:
+            drained = flushed and not self._pending and not self._in_flight
+            for segment in self._sealed + [self._active]:
+                # Segments with unwritten events stay behind for the next process to replay.
+                segment.close(remove=drained or segment.outstanding == 0)
+            self._sealed = []
+        return flushed
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {**self._stats, "pending": len(self._pending) + self._in_flight}
+
+    def _next_batch(self) -> Optional[List[SpineEvent]]:
+        with self._cond:
+            while True:
+                if self._pending and (
+                    self._closed
+                    or self._flush_requested
+                    or len(self._pending) >= self._batch_size
+                    or time.monotonic() - (self._oldest_at or 0.0) >= self._flush_interval
+                ):
+                    break
+                if self._closed:
+                    return None
+                if not self._pending:
+                    self._flush_requested = False
+                    self._cond.wait()
+                else:
+                    self._cond.wait(self._flush_interval - (time.monotonic() - (self._oldest_at or 0.0)))
+            batch = [self._pending.popleft() for _ in range(min(self._batch_size, len(self._pending)))]
+            self._in_flight = len(batch)
+            self._oldest_at = time.monotonic() if self._pending else None
+            return batch
+
+    def _run(self) -> None:
+        backoff = 0.1
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                self._adapter.append_batch([event for _, event in batch])
+            except ValueError as exc:
+                self._reject(batch, exc)
+                continue
+            except Exception as exc:
+                logger.error(f"event_spine write-behind flush of {len(batch)} events failed: {exc}")
+                with self._cond:
+                    self._stats["failures"] += 1
+                    self._pending.extendleft(reversed(batch))
+                    self._in_flight = 0
+                    self._oldest_at = time.monotonic()
+                    if self._closed:
+                        # Leave the spill file for the next process to replay.
+                        self._pending.clear()
+                        self._cond.notify_all()
+                        return
+                time.sleep(backoff)
+                backoff = min(backoff * 2, _MAX_RETRY_BACKOFF)
+                continue
+            backoff = 0.1
+            with self._cond:
+                self._in_flight = 0
+                self._stats["written"] += len(batch)
+                self._stats["batches"] += 1
+                self._rotate([segment for segment, _ in batch])
+                self._cond.notify_all()
+
+    def _reject(self, batch: List[Tuple[_Segment, SpineEvent]], exc: ValueError) -> None:
+        """A ValueError fails every retry the same way: drop the invalid events, requeue the rest."""
+        keep = []
+        for item in batch:
+            try:
+                _require_append_fields(item[1])
+            except ValueError:
+                continue
+            keep.append(item)
+        if len(keep) == len(batch):
+            keep = []  # nothing to single out, so the backend rejects the batch as a whole
+        kept = {id(item) for item in keep}
+        dropped = [item for item in batch if id(item) not in kept]
+        logger.error(f"event_spine write-behind dropped {len(dropped)} events rejected by the backend: {exc}")
+        with self._cond:
+            self._stats["rejected"] += len(dropped)
+            self._pending.extendleft(reversed(keep))
+            self._in_flight = 0
+            if self._pending and self._oldest_at is None:
+                self._oldest_at = time.monotonic()
+            self._rotate([segment for segment, _ in dropped])
+            self._cond.notify_all()
+
+    def _rotate(self, written: List[_Segment]) -> None:
+        """Seal the active segment and drop sealed ones whose events are all written."""
+        for segment in written:
+            segment.outstanding -= 1
+        if self._active.lines:
+            self._sealed.append(self._active)
+            self._active = self._open_segment()
+        live = []
+        for segment in self._sealed:
+            if segment.outstanding:
+                live.append(segment)
+            else:
+                segment.close(remove=True)
+        self._sealed = live
+
+
+_writers: Dict[AdapterKey, WriteBehindWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _writer_for(adapter: Any) -> Optional[WriteBehindWriter]:
+    if not hasattr(adapter, "append_batch"):
+        return None
+    key = adapter_pool().key_for(adapter)
+    if key is None:
+        return None
+    replaced: Optional[WriteBehindWriter] = None
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is not None and writer._adapter is not adapter:
+            # The pool rebuilt this adapter; the old writer drains outside the lock below.
+            replaced, writer = writer, None
+        if writer is None:
+            digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:16]
+            writer = WriteBehindWriter(
+                adapter,
+                _spill_dir() / f"{key[0]}-{digest}.jsonl",
+                batch_size=_env_int(BATCH_SIZE_ENV, DEFAULT_BATCH_SIZE),
+                flush_interval=_env_int(FLUSH_INTERVAL_MS_ENV, DEFAULT_FLUSH_INTERVAL_MS) / 1000.0,
+                queue_max=_env_int(QUEUE_MAX_ENV, DEFAULT_QUEUE_MAX),
+            )
+            _writers[key] = writer
+    if replaced is not None:
+        # Bounded and off the emit path: a dead backend must not stall every route; whatever
+        # the old writer cannot flush stays in its segments for replay.
+        threading.Thread(
+            target=replaced.close, args=(_REPLACED_WRITER_CLOSE_TIMEOUT,), name="event-spine-write-behind-close", daemon=True
+        ).start()
+    return writer
+
+
+def append_event(adapter: Any, event: SpineEvent, context: RequestContext) -> None:
+    """Append through the write-behind queue when enabled, else synchronously."""
+    if write_behind_enabled() and event.event_type not in sync_event_types():
+        # Validate now: queued, a malformed event would only fail later inside a batch.
+        _require_append_fields(event)
+        writer = _writer_for(adapter)
+        if writer is not None and writer.submit(event):
+            return
+    adapter.append(event, context)
+
+
+def flush_pending(adapter: Any, timeout: Optional[float] = None) -> None:
+    """Flush queued events for adapter so reads observe prior emits."""
+    key = adapter_pool().key_for(adapter)
+    with _writers_lock:
+        writer = _writers.get(key) if key is not None else None
+    if writer is not None:
+        writer.flush(timeout)
+
+
+def shutdown_write_behind(timeout: Optional[float] = 10.0) -> None:
+    """Flush and stop every writer; registered with atexit and app shutdown."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        if not writer.close(timeout):
+            logger.warning("event_spine write-behind shutdown left events in the spill file for replay")
+
+
+atexit.register(shutdown_write_behind)
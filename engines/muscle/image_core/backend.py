@@ -1,22 +1,45 @@
 import io
 import json
 import hashlib
+from dataclasses import dataclass, field
 from typing import Optional, Tuple, Dict, Any, List
-from PIL import Image, ImageEnhance, ImageChops, ImageColor, ImageFilter, ImageOps
-from engines.image_core.models import ImageComposition, ImageLayer, BlendMode, FilterMode
+from PIL import Image, ImageEnhance, ImageColor, ImageFilter, ImageOps
+from engines.image_core.models import ImageComposition, ImageLayer, FilterMode
 from pydantic import BaseModel
+from engines.media_v2.models import DerivedArtifact, MediaAsset
 from engines.media_v2.service import MediaService
 from engines.typography_core.renderer import TypographyRenderer
 from engines.typography_core.models import TextLayoutRequest
 
 from engines.vector_core.renderer import VectorRenderer
+from engines.image_core.compositing import canvas_to_image, composite_layer, new_canvas
+from engines.image_core.render_cache import RenderCache, decode_key, get_decode_cache, source_version
+
+# Layer fields that decide the decoded source pixels (asset layers also key on the asset's source_uri).
+_SOURCE_FIELDS = (
+    "asset_id", "color", "text", "text_font", "text_preset", "text_size", "text_color",
+    "text_tracking", "text_variation_settings", "vector_scene",
+)
+_GEOMETRY_FIELDS = ("width", "height", "scale", "rotation")
+_ADJUSTMENT_FIELDS = ("adjustments", "filter_mode", "filter_strength")
+_PLACEMENT_FIELDS = ("x", "y", "opacity", "mask", "mask_artifact_id", "blend_mode")
+
+
+@dataclass
+class _MediaRefs:
+    """Assets and mask artifacts of one composition, fetched once before rendering."""
+
+    assets: Dict[str, MediaAsset] = field(default_factory=dict)
+    artifacts: Dict[str, DerivedArtifact] = field(default_factory=dict)
+
 
 class ImageCoreBackend:
-    def __init__(self, media_service: MediaService):
+    def __init__(self, media_service: MediaService, cache: Optional[RenderCache] = None):
         self.media_service = media_service
         self.text_renderer = TypographyRenderer()
         self.vector_renderer = VectorRenderer()
-        self._cache: Dict[str, bytes] = {}
+        # Byte-bounded LRU shared by final PNGs, per-layer stages and prefix composites.
+        self._cache = cache if cache is not None else RenderCache.from_env()
 
     def compute_pipeline_hash(self, comp: ImageComposition) -> str:
         payload = self._composition_payload(comp)
@@ -69,53 +92,60 @@ class ImageCoreBackend:
                 pass
         return img
 
-    def _apply_blend_mode(self, base: Image.Image, top: Image.Image, mode: BlendMode) -> Image.Image:
-        # Both images must be RGBA
-        if mode == "normal":
-            # Pillow's paste/alpha_composite handles normal with opacity
-            return base # handled by alpha_composite outside
-        
-        # For blend modes, we use ImageChops
-        # ImageChops expects same size images usually
-        # Crop/resize top to match base or vice versa is usually required for Chops
-        # But here 'top' is a layer placed on 'base' canvas.
-        # So we should crop the relevant part of base, blend, and paste back?
-        # Or faster: Composite full size transparent layer?
-        # Creating full size layer for blend is safer for correctness.
-        
-        # Ensure proper mode
-        top = top.convert("RGBA")
-        base = base.convert("RGBA")
-        
-        # NOTE: PIL Chops often don't respect alpha correctly for "overlay" etc in standard Photoshop way
-        # But let's try standard mapping
-        
-        blended = top
-        if mode == "multiply":
-            blended = ImageChops.multiply(base, top)
-        elif mode == "screen":
-            blended = ImageChops.screen(base, top)
-        elif mode == "darken":
-            blended = ImageChops.darker(base, top)
-        elif mode == "lighten":
-            blended = ImageChops.lighter(base, top)
-        elif mode == "add":
-            blended = ImageChops.add(base, top)
-        elif mode == "overlay":
-            # Overlay is hard in vanilla PIL without numpy
-            # Fallback to overlay simulation or soft light
-            blended = ImageChops.overlay(base, top)
-            
-        return blended
-
-    def _load_layer_content(self, layer: ImageLayer) -> Optional[Image.Image]:
+    def _fetch_media_refs(self, comp: ImageComposition) -> _MediaRefs:
+        asset_ids = list(dict.fromkeys(layer.asset_id for layer in comp.layers if layer.asset_id))
+        artifact_ids = list(dict.fromkeys(
+            layer.mask_artifact_id for layer in comp.layers if layer.mask_artifact_id and not layer.mask
+        ))
+        if isinstance(self.media_service, MediaService):
+            return _MediaRefs(
+                assets=self.media_service.get_assets(asset_ids) if asset_ids else {},
+                artifacts=self.media_service.get_artifacts(artifact_ids) if artifact_ids else {},
+            )
+        # Duck-typed media services only promise the single-item getters.
+        refs = _MediaRefs()
+        for asset_id in asset_ids:
+            asset = self.media_service.get_asset(asset_id)
+            if asset:
+                refs.assets[asset_id] = asset
+        for artifact_id in artifact_ids:
+            artifact = self.media_service.get_artifact(artifact_id)
+            if artifact:
+                refs.artifacts[artifact_id] = artifact
+        return refs
+
+    def _asset_decode_size(self, layer: ImageLayer) -> Optional[Tuple[int, int]]:
+        """Pre-rotation size an asset layer is drawn at, when it is known without decoding."""
+        if not (layer.width and layer.height):
+            return None
+        if layer.scale != 1.0:
+            return max(1, int(layer.width * layer.scale)), max(1, int(layer.height * layer.scale))
+        return layer.width, layer.height
+
+    def _load_asset_image(self, asset: MediaAsset, size: Optional[Tuple[int, int]]) -> Optional[Image.Image]:
+        cache = get_decode_cache()
+        key = decode_key(asset.id, source_version(asset.source_uri), size, "RGBA")
+        img = cache.get(key)
+        if img is not None:
+            return img
+        try:
+            with Image.open(asset.source_uri) as src:
+                if size:
+                    # Let JPEG decode at a reduced DCT scale when the layer is much smaller.
+                    src.draft("RGB", size)
+                img = src.convert("RGBA")
+        except Exception:
+            return None
+        if size and img.size != size:
+            img = img.resize(size, Image.Resampling.LANCZOS)
+        cache.put(key, img)
+        return img
+
+    def _load_layer_content(self, layer: ImageLayer, refs: Optional[_MediaRefs] = None) -> Optional[Image.Image]:
         if layer.asset_id:
-            asset = self.media_service.get_asset(layer.asset_id)
+            asset = refs.assets.get(layer.asset_id) if refs else self.media_service.get_asset(layer.asset_id)
             if asset and asset.source_uri:
-                try:
-                    return Image.open(asset.source_uri).convert("RGBA")
-                except Exception:
-                    return None
+                return self._load_asset_image(asset, self._asset_decode_size(layer))
         if layer.color:
             color = ImageColor.getcolor(layer.color, "RGBA")
             width = layer.width or 100
@@ -188,68 +218,134 @@ class ImageCoreBackend:
             return img.filter(ImageFilter.UnsharpMask(radius=1, percent=percent, threshold=3))
         return img
 
-    def _load_mask(self, layer: ImageLayer, width: int, height: int) -> Optional[Image.Image]:
+    def _load_mask(self, layer: ImageLayer, width: int, height: int, refs: Optional[_MediaRefs] = None) -> Optional[Image.Image]:
         mask_img = None
         if layer.mask:
             from engines.image_core.selections import rasterize_selection
             mask_img = rasterize_selection(layer.mask, width, height)
         elif layer.mask_artifact_id:
-            mask_img = self._load_mask_artifact(layer.mask_artifact_id, width, height)
+            art = refs.artifacts.get(layer.mask_artifact_id) if refs else None
+            mask_img = self._load_mask_artifact(layer.mask_artifact_id, width, height, art=art)
         return mask_img
 
-    def _load_mask_artifact(self, artifact_id: str, width: int, height: int) -> Optional[Image.Image]:
-        art = self.media_service.get_artifact(artifact_id)
+    def _load_mask_artifact(
+        self, artifact_id: str, width: int, height: int, art: Optional[DerivedArtifact] = None
+    ) -> Optional[Image.Image]:
+        art = art or self.media_service.get_artifact(artifact_id)
         if not art or not art.uri:
             return None
+        cache = get_decode_cache()
+        key = decode_key(artifact_id, source_version(art.uri), (width, height), "L")
+        mask_img = cache.get(key)
+        if mask_img is not None:
+            return mask_img
         try:
             mask_img = Image.open(art.uri).convert("L")
             if mask_img.size != (width, height):
                 mask_img = mask_img.resize((width, height), Image.Resampling.BILINEAR)
-            return mask_img
         except Exception:
             return None
+        cache.put(key, mask_img)
+        return mask_img
 
     def render(self, comp: ImageComposition, pipeline_hash: Optional[str] = None) -> bytes:
         if pipeline_hash is None:
             pipeline_hash = self.compute_pipeline_hash(comp)
-        cached = self._cache.get(pipeline_hash)
+        png_key = f"png:{pipeline_hash}"
+        cached = self._cache.get(png_key)
         if cached is not None:
             return cached
         payload = self._render_internal(comp)
-        self._cache[pipeline_hash] = payload
+        self._cache.put(png_key, payload)
         return payload
 
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {"render": self._cache.stats(), "decode": get_decode_cache().stats()}
+
+    def _stage_hash(self, *parts: Any) -> str:
+        serialized = json.dumps(self._normalize_value(list(parts)), sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
+    def _layer_stage_keys(self, layer: ImageLayer, refs: _MediaRefs) -> Tuple[str, str, str]:
+        """Cache keys for the decoded source, post-geometry and post-adjustment stages of a layer."""
+        data = layer.model_dump()
+        source = {k: data.get(k) for k in _SOURCE_FIELDS}
+        if layer.asset_id:
+            asset = refs.assets.get(layer.asset_id)
+            source["source_version"] = source_version(asset.source_uri) if asset else None
+            source["size"] = self._asset_decode_size(layer)
+        else:
+            # Generated content (colour fills, text boxes, vectors) is sized at load time.
+            source["size"] = [layer.width, layer.height]
+        source_key = "src:" + self._stage_hash(source)
+        geometry_key = "geo:" + self._stage_hash(source_key, {k: data.get(k) for k in _GEOMETRY_FIELDS})
+        adjusted_key = "adj:" + self._stage_hash(geometry_key, {k: data.get(k) for k in _ADJUSTMENT_FIELDS})
+        return source_key, geometry_key, adjusted_key
+
+    def _prepare_layer(self, layer: ImageLayer, keys: Tuple[str, str, str], refs: _MediaRefs) -> Optional[Image.Image]:
+        """Source -> geometry -> adjustments, resuming from the deepest cached stage."""
+        source_key, geometry_key, adjusted_key = keys
+        adjusted = self._cache.get(adjusted_key)
+        if adjusted is not None:
+            return adjusted
+        geometry = self._cache.get(geometry_key)
+        if geometry is None:
+            source = self._cache.get(source_key)
+            if source is None:
+                source = self._load_layer_content(layer, refs)
+                if not source:
+                    return None
+                self._cache.put(source_key, source)
+            geometry = self._adjust_layer_geometry(source, layer)
+            if geometry is not source:
+                self._cache.put(geometry_key, geometry)
+        adjusted = self._apply_adjustments_and_filters(geometry, layer)
+        if adjusted is not geometry:
+            self._cache.put(adjusted_key, adjusted)
+        return adjusted
+
     def _render_internal(self, comp: ImageComposition) -> bytes:
-        bg_color = ImageColor.getcolor(comp.background_color, "RGBA")
-        canvas = Image.new("RGBA", (comp.width, comp.height), bg_color)
-        for layer in comp.layers:
-            src_img = self._load_layer_content(layer)
-            if not src_img:
-                continue
-
-            src_img = self._adjust_layer_geometry(src_img, layer)
-            src_img = self._apply_adjustments_and_filters(src_img, layer)
-            opacity = max(0.0, min(layer.opacity, 1.0))
-            if opacity < 1.0:
-                r, g, b, a = src_img.split()
-                a = a.point(lambda p: int(p * opacity))
-                src_img = Image.merge("RGBA", (r, g, b, a))
-
-            layer_canvas = Image.new("RGBA", (comp.width, comp.height), (0, 0, 0, 0))
-            layer_canvas.paste(src_img, (layer.x, layer.y), src_img)
-
-            mask_img = self._load_mask(layer, comp.width, comp.height)
-            if mask_img:
-                r, g, b, a = layer_canvas.split()
-                a = ImageChops.multiply(a, mask_img)
-                layer_canvas = Image.merge("RGBA", (r, g, b, a))
-
-            if layer.blend_mode == "normal":
-                canvas = Image.alpha_composite(canvas, layer_canvas)
-            else:
-                blended = self._apply_blend_mode(canvas, layer_canvas, layer.blend_mode)
-                canvas = Image.alpha_composite(canvas, blended)
+        # Prefix keys chain: prefix_keys[i] identifies the canvas after compositing layers[:i].
+        # Only the canvas below the top layer is snapshotted: it serves the common edit
+        # (restyling or moving the top layer) for one full-canvas copy per render, where
+        # per-layer snapshots would crowd the per-layer stage entries out of the budget.
+        refs = self._fetch_media_refs(comp)
+        layer_keys = [self._layer_stage_keys(layer, refs) for layer in comp.layers]
+        prefix_keys = ["cmp:" + self._stage_hash(comp.width, comp.height, comp.background_color)]
+        for layer, keys in zip(comp.layers, layer_keys):
+            placement = {k: getattr(layer, k) for k in _PLACEMENT_FIELDS}
+            if layer.mask_artifact_id and layer.mask_artifact_id in refs.artifacts:
+                placement["mask_version"] = source_version(refs.artifacts[layer.mask_artifact_id].uri)
+            prefix_keys.append("cmp:" + self._stage_hash(prefix_keys[-1], keys[2], placement))
+
+        canvas = None
+        start = 0
+        for depth in range(len(comp.layers), 0, -1):
+            cached = self._cache.get(prefix_keys[depth])
+            if cached is not None:
+                # Cached snapshots are shared; composite into a private copy.
+                canvas = cached.copy()
+                start = depth
+                break
+        if canvas is None:
+            canvas = new_canvas(comp.width, comp.height, ImageColor.getcolor(comp.background_color, "RGBA"))
+
+        top = len(comp.layers) - 1
+        for idx in range(start, len(comp.layers)):
+            layer = comp.layers[idx]
+            if idx == top and idx > 0 and idx > start:
+                self._cache.put(prefix_keys[idx], canvas.copy())
+            src_img = self._prepare_layer(layer, layer_keys[idx], refs)
+            if src_img:
+                composite_layer(
+                    canvas,
+                    src_img,
+                    (layer.x, layer.y),
+                    opacity=layer.opacity,
+                    mask=self._load_mask(layer, comp.width, comp.height, refs),
+                    blend_mode=layer.blend_mode,
+                )
 
         out_io = io.BytesIO()
-        canvas.save(out_io, format="PNG")
+        canvas_to_image(canvas).save(out_io, format="PNG")
         return out_io.getvalue()
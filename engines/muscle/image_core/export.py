@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import io
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+EXPORT_WORKERS_ENV = "IMAGE_CORE_EXPORT_WORKERS"
+UPLOAD_CONCURRENCY_ENV = "IMAGE_CORE_UPLOAD_CONCURRENCY"
+DEFAULT_UPLOAD_CONCURRENCY = 4
+
+Size = Tuple[int, int]
+
+
+def _env_workers(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def default_export_workers() -> int:
+    return _env_workers(EXPORT_WORKERS_ENV, min(8, os.cpu_count() or 1))
+
+
+def default_upload_concurrency() -> int:
+    return _env_workers(UPLOAD_CONCURRENCY_ENV, DEFAULT_UPLOAD_CONCURRENCY)
+
+
+def preset_target_size(preset: Dict[str, Any], source: Size) -> Size:
+    """Output size of a preset; a missing dimension keeps the source aspect ratio."""
+    src_w, src_h = source
+    target_w = preset.get("width")
+    target_h = preset.get("height")
+    if not target_w and not target_h:
+        return src_w, src_h
+    if not target_h:
+        target_h = max(1, int(src_h * (target_w / src_w)))
+    if not target_w:
+        target_w = max(1, int(src_w * (target_h / src_h)))
+    return int(target_w), int(target_h)
+
+
+def encode_preset(img: Image.Image, preset: Dict[str, Any]) -> bytes:
+    out_format = preset["format"]
+    save_kwargs: Dict[str, Any] = {}
+    if preset.get("quality"):
+        save_kwargs["quality"] = preset["quality"]
+    if preset.get("dpi"):
+        save_kwargs["dpi"] = (preset["dpi"], preset["dpi"])
+    # Convert modes for formats that don't support alpha
+    if out_format.upper() in {"JPEG", "JPG"} and img.mode in ("RGBA", "LA"):
+        img = img.convert("RGB")
+    out_io = io.BytesIO()
+    img.save(out_io, format=out_format, **save_kwargs)
+    return out_io.getvalue()
+
+
+@dataclass
+class PresetExport:
+    preset_id: str
+    format: str
+    width: int
+    height: int
+    artifact_id: Optional[str] = None
+    error: Optional[str] = None
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000.0, 3)
+
+
+class ResizePyramid:
+    """Downscaled levels of one decoded image, built lazily and shared between presets.
+
+    Each level is resampled from the smallest already-planned level that is at least as
+    large in both dimensions (the source itself when none is), so twenty presets cost one
+    full-resolution resample plus a chain of progressively cheaper ones.
+    """
+
+    def __init__(self, source: Image.Image, sizes: List[Size], executor: ThreadPoolExecutor) -> None:
+        self.source = source
+        self._levels: Dict[Size, Future] = {}
+        self._resize_ms: Dict[Size, float] = {}
+        # Largest first, so every level's parent is submitted (and dequeued) before it.
+        for size in sorted(set(sizes), key=lambda s: (s[0] * s[1], s), reverse=True):
+            if size == source.size:
+                continue
+            parent = self._parent_for(size)
+            self._levels[size] = executor.submit(self._build, size, parent)
+
+    def _parent_for(self, size: Size) -> Optional[Future]:
+        candidates = [s for s in self._levels if s[0] >= size[0] and s[1] >= size[1]]
+        if not candidates:
+            return None
+        return self._levels[min(candidates, key=lambda s: s[0] * s[1])]
+
+    def _build(self, size: Size, parent: Optional[Future]) -> Image.Image:
+        base = parent.result() if parent is not None else self.source
+        started = time.perf_counter()
+        level = base.resize(size, Image.Resampling.LANCZOS)
+        self._resize_ms[size] = _elapsed_ms(started)
+        return level
+
+    def level(self, size: Size) -> Image.Image:
+        if size == self.source.size:
+            return self.source
+        return self._levels[size].result()
+
+    def resize_ms(self, size: Size) -> float:
+        return self._resize_ms.get(size, 0.0)
+
+
+def export_presets(
+    png_bytes: bytes,
+    presets: Dict[str, Dict[str, Any]],
+    upload: Callable[[PresetExport, bytes], str],
+    *,
+    max_workers: Optional[int] = None,
+    upload_concurrency: Optional[int] = None,
+) -> Dict[str, PresetExport]:
+    """Decode once, resize through a shared pyramid, encode in parallel, upload with bounded concurrency.
+
+    `upload(export, payload)` stores one encoded preset and returns its artifact id. Failures
+    are recorded per preset on `PresetExport.error` instead of aborting the batch.
+    """
+    started = time.perf_counter()
+    source = Image.open(io.BytesIO(png_bytes))
+    source.load()
+    decode_ms = _elapsed_ms(started)
+
+    exports: Dict[str, PresetExport] = {}
+    for preset_id, preset in presets.items():
+        width, height = preset_target_size(preset, source.size)
+        exports[preset_id] = PresetExport(
+            preset_id=preset_id, format=preset["format"], width=width, height=height, timings_ms={"decode": decode_ms}
+        )
+
+    def _encode(export: PresetExport) -> bytes:
+        img = pyramid.level((export.width, export.height))
+        encode_started = time.perf_counter()
+        payload = encode_preset(img, presets[export.preset_id])
+        export.timings_ms["encode"] = _elapsed_ms(encode_started)
+        export.timings_ms["resize"] = pyramid.resize_ms((export.width, export.height))
+        return payload
+
+    def _upload(export: PresetExport, payload: bytes) -> str:
+        upload_started = time.perf_counter()
+        artifact_id = upload(export, payload)
+        export.timings_ms["upload"] = _elapsed_ms(upload_started)
+        export.timings_ms["total"] = _elapsed_ms(started)
+        return artifact_id
+
+    with ThreadPoolExecutor(max_workers=max_workers or default_export_workers(), thread_name_prefix="image-export") as encoders, \
+            ThreadPoolExecutor(max_workers=upload_concurrency or default_upload_concurrency(), thread_name_prefix="image-upload") as uploaders:
+        pyramid = ResizePyramid(source, [(e.width, e.height) for e in exports.values()], encoders)
+        encoding = {encoders.submit(_encode, export): export for export in exports.values()}
+        uploading: Dict[Future, PresetExport] = {}
+        for future in as_completed(encoding):
+            export = encoding[future]
+            try:
+                payload = future.result()
+            except Exception as exc:
+                export.error = f"encode failed: {exc}"
+                continue
+            uploading[uploaders.submit(_upload, export, payload)] = export
+        for future in as_completed(uploading):
+            export = uploading[future]
+            try:
+                export.artifact_id = future.result()
+            except Exception as exc:
+                export.error = f"upload failed: {exc}"
+
+    return exports
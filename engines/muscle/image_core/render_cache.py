@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+CACHE_BYTES_ENV = "IMAGE_CORE_CACHE_BYTES"
+CACHE_SPILL_DIR_ENV = "IMAGE_CORE_CACHE_SPILL_DIR"
+CACHE_SPILL_BYTES_ENV = "IMAGE_CORE_CACHE_SPILL_BYTES"
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_SPILL_BYTES = 2 * 1024 * 1024 * 1024
+
+CacheValue = Union[bytes, Image.Image, np.ndarray]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def value_nbytes(value: CacheValue) -> int:
+    if isinstance(value, Image.Image):
+        return value.width * value.height * len(value.getbands())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return len(value)
+
+
+class RenderCache:
+    """Byte-budgeted LRU for rendered PNG bytes, intermediate PIL images and canvas arrays.
+
+    Cached images and arrays are shared, so callers must treat them as read-only (every Pillow op
+    used by the backend returns a new image). When `spill_dir` is set, entries evicted
+    from memory are written there as raw pixel dumps (bounded by `max_spill_bytes`) and
+    promoted back on the next hit.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        *,
+        spill_dir: Optional[Union[str, Path]] = None,
+        max_spill_bytes: int = DEFAULT_SPILL_BYTES,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.max_spill_bytes = max_spill_bytes
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: "OrderedDict[str, Tuple[CacheValue, int]]" = OrderedDict()
+        self._spilled: "OrderedDict[str, Tuple[Path, int]]" = OrderedDict()
+        self._bytes = 0
+        self._spill_bytes = 0
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "spills": 0, "spill_hits": 0}
+
+    @classmethod
+    def from_env(cls) -> "RenderCache":
+        return cls(
+            _env_int(CACHE_BYTES_ENV, DEFAULT_CACHE_BYTES),
+            spill_dir=os.getenv(CACHE_SPILL_DIR_ENV) or None,
+            max_spill_bytes=_env_int(CACHE_SPILL_BYTES_ENV, DEFAULT_SPILL_BYTES),
+        )
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries or key in self._spilled
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[CacheValue]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[0]
+            spilled = self._spilled.pop(key, None)
+            if spilled is None:
+                self._stats["misses"] += 1
+                return None
+            path, size = spilled
+            self._spill_bytes -= size
+        value = self._read_spill(path)
+        if value is None:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        with self._lock:
+            self._stats["hits"] += 1
+            self._stats["spill_hits"] += 1
+        self.put(key, value)
+        return value
+
+    def put(self, key: str, value: CacheValue) -> None:
+        size = value_nbytes(value)
+        if size > self.max_bytes:
+            return
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                old_key, (old_value, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self._stats["evictions"] += 1
+                evicted.append((old_key, old_value, old_size))
+        if self.spill_dir:
+            for old_key, old_value, old_size in evicted:
+                self._spill(old_key, old_value, old_size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            spilled = list(self._spilled.values())
+            self._spilled.clear()
+            self._bytes = 0
+            self._spill_bytes = 0
+        for path, _ in spilled:
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "spilled_entries": len(self._spilled),
+                "spill_bytes": self._spill_bytes,
+            }
+
+    # --- disk spill ---------------------------------------------------
+
+    def _spill_path(self, key: str) -> Path:
+        assert self.spill_dir is not None
+        return self.spill_dir / hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _spill(self, key: str, value: CacheValue, size: int) -> None:
+        if size > self.max_spill_bytes:
+            return
+        path = self._spill_path(key)
+        try:
+            with open(path, "wb") as fh:
+                if isinstance(value, Image.Image):
+                    fh.write(f"img:{value.mode}:{value.width}:{value.height}\n".encode("ascii"))
+                    fh.write(value.tobytes())
+                elif isinstance(value, np.ndarray):
+                    shape = ",".join(str(dim) for dim in value.shape)
+                    fh.write(f"arr:{value.dtype.str}:{shape}\n".encode("ascii"))
+                    fh.write(np.ascontiguousarray(value).tobytes())
+                else:
+                    fh.write(b"raw\n")
+                    fh.write(value)
+        except OSError:
+            return
+        stale = []
+        with self._lock:
+            self._spilled[key] = (path, size)
+            self._spill_bytes += size
+            self._stats["spills"] += 1
+            while self._spill_bytes > self.max_spill_bytes and self._spilled:
+                _, (old_path, old_size) = self._spilled.popitem(last=False)
+                self._spill_bytes -= old_size
+                stale.append(old_path)
+        for old_path in stale:
+            old_path.unlink(missing_ok=True)
+
+    def _read_spill(self, path: Path) -> Optional[CacheValue]:
+        try:
+            with open(path, "rb") as fh:
+                header = fh.readline().decode("ascii").strip()
+                payload = fh.read()
+            path.unlink(missing_ok=True)
+        except OSError:
+            return None
+        if header == "raw":
+            return payload
+        if header.startswith("arr:"):
+            _, dtype, shape = header.split(":")
+            return np.frombuffer(payload, dtype=np.dtype(dtype)).reshape([int(dim) for dim in shape.split(",")]).copy()
+        _, mode, width, height = header.split(":")
+        return Image.frombytes(mode, (int(width), int(height)), payload)
+
+
+DECODE_CACHE_BYTES_ENV = "IMAGE_CORE_DECODE_CACHE_BYTES"
+DEFAULT_DECODE_CACHE_BYTES = 512 * 1024 * 1024
+
+# Process-wide cache of decoded source assets and mask artifacts, shared by every backend.
+_decode_cache: Optional[RenderCache] = None
+_decode_cache_lock = threading.Lock()
+
+
+def source_version(uri: Optional[str]) -> str:
+    """Cheap identity of a source file's content: path plus size/mtime when it is local."""
+    if not uri:
+        return ""
+    try:
+        st = os.stat(uri)
+    except (OSError, ValueError):
+        return uri
+    return f"{uri}|{st.st_size}|{st.st_mtime_ns}"
+
+
+def decode_key(source_id: str, version: str, size: Optional[Tuple[int, int]], mode: str) -> str:
+    digest = hashlib.sha256(version.encode("utf-8")).hexdigest()[:16]
+    dims = f"{size[0]}x{size[1]}" if size else "full"
+    return f"decode:{source_id}:{digest}:{dims}:{mode}"
+
+
+def get_decode_cache() -> RenderCache:
+    global _decode_cache
+    with _decode_cache_lock:
+        if _decode_cache is None:
+            _decode_cache = RenderCache(_env_int(DECODE_CACHE_BYTES_ENV, DEFAULT_DECODE_CACHE_BYTES))
+        return _decode_cache
+
+
+def set_decode_cache(cache: Optional[RenderCache]) -> None:
+    global _decode_cache
+    with _decode_cache_lock:
+        _decode_cache = cache
@@ -10,6 +10,7 @@ from engines.media_v2.service import MediaService, get_media_service
 from engines.media_v2.models import ArtifactCreateRequest, MediaUploadRequest, DerivedArtifact
 from engines.image_core.models import ImageAdjustment, ImageLayer, ImageComposition, ImageSelection
 from engines.image_core.backend import ImageCoreBackend
+from engines.image_core.export import PresetExport, encode_preset, export_presets, preset_target_size
 from engines.typography_core.models import TextLayoutRequest
 from engines.typography_core.renderer import TextLayoutMetadata
 from engines.typography_core.service import TypographyService
@@ -248,27 +249,12 @@ class ImageCoreService:
             preset = self.PRESETS.get(preset_id)
             if not preset:
                 raise ValueError("Unknown preset_id")
-            from PIL import Image
             img = Image.open(io.BytesIO(png_bytes))
-            target_w = preset.get("width")
-            target_h = preset.get("height")
-            if target_w or target_h:
-                if not target_h:
-                    ratio = target_w / img.width
-                    target_h = max(1, int(img.height * ratio))
-                img = img.resize((int(target_w), int(target_h)), Image.Resampling.LANCZOS)
+            target_size = preset_target_size(preset, img.size)
+            if target_size != img.size:
+                img = img.resize(target_size, Image.Resampling.LANCZOS)
             out_format = preset["format"]
-            out_io = io.BytesIO()
-            save_kwargs = {}
-            if preset.get("quality"):
-                save_kwargs["quality"] = preset["quality"]
-            if preset.get("dpi"):
-                save_kwargs["dpi"] = (preset["dpi"], preset["dpi"])
-            # Convert modes for formats that don't support alpha
-            if out_format.upper() in {"JPEG", "JPG"} and img.mode in ("RGBA", "LA"):
-                img = img.convert("RGB")
-            img.save(out_io, format=out_format, **save_kwargs)
-            out_bytes = out_io.getvalue()
+            out_bytes = encode_preset(img, preset)
 
         ext = out_format.lower()
         filename = f"image_render_{uuid.uuid4().hex[:8]}.{ext}"
@@ -323,6 +309,28 @@ class ImageCoreService:
         Returns:
             Dict mapping preset_id → artifact_id
         """
+        exports = self.batch_export(comp, preset_ids, parent_asset_id=parent_asset_id)
+        results: Dict[str, str] = {}
+        for preset_id, export in exports.items():
+            if export.artifact_id:
+                results[preset_id] = export.artifact_id
+            else:
+                print(f"Warning: batch_render failed for preset {preset_id}: {export.error}")
+        return results
+
+    def batch_export(
+        self,
+        comp: ImageComposition,
+        preset_ids: List[str],
+        parent_asset_id: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        upload_concurrency: Optional[int] = None,
+    ) -> Dict[str, PresetExport]:
+        """
+        Render once and export every known preset through the shared export pipeline:
+        one PNG decode, a resize pyramid, concurrent encodes and bounded-concurrency uploads.
+        Returns per-preset results including `timings_ms` (decode/resize/encode/upload/total).
+        """
         if not preset_ids:
             raise ValueError("preset_ids cannot be empty")
         if len(preset_ids) > 20:
@@ -341,82 +349,62 @@ class ImageCoreService:
         pipeline_hash = self.backend.compute_pipeline_hash(comp)
         png_bytes = self.backend.render(comp, pipeline_hash=pipeline_hash)
         blend_modes = sorted({layer.blend_mode for layer in comp.layers})
-        
-        results: Dict[str, str] = {}
-        
-        for preset_id in preset_ids:
-            try:
-                preset = self.PRESETS.get(preset_id)
-                if not preset:
-                    continue  # Skip unknown presets
-                
-                from PIL import Image
-                img = Image.open(io.BytesIO(png_bytes))
-                target_w = preset.get("width")
-                target_h = preset.get("height")
-                if target_w or target_h:
-                    if not target_h:
-                        ratio = target_w / img.width
-                        target_h = max(1, int(img.height * ratio))
-                    img = img.resize((int(target_w), int(target_h)), Image.Resampling.LANCZOS)
-                
-                out_format = preset["format"]
-                out_io = io.BytesIO()
-                save_kwargs = {}
-                if preset.get("quality"):
-                    save_kwargs["quality"] = preset["quality"]
-                if preset.get("dpi"):
-                    save_kwargs["dpi"] = (preset["dpi"], preset["dpi"])
-                
-                # Convert modes for formats that don't support alpha
-                if out_format.upper() in {"JPEG", "JPG"} and img.mode in ("RGBA", "LA"):
-                    img = img.convert("RGB")
-                img.save(out_io, format=out_format, **save_kwargs)
-                out_bytes = out_io.getvalue()
-                
-                ext = out_format.lower()
-                filename = f"image_render_{preset_id}_{uuid.uuid4().hex[:8]}.{ext}"
-                
-                up_req = MediaUploadRequest(
+
+        presets = {pid: self.PRESETS[pid] for pid in dict.fromkeys(preset_ids) if pid in self.PRESETS}  # Skip unknown presets
+        if not presets:
+            return {}
+
+        def _upload(export: PresetExport, out_bytes: bytes) -> str:
+            preset_id = export.preset_id
+            ext = export.format.lower()
+            filename = f"image_render_{preset_id}_{uuid.uuid4().hex[:8]}.{ext}"
+            up_req = MediaUploadRequest(
+                tenant_id=comp.tenant_id,
+                env=comp.env,
+                kind="image",
+                source_uri="pending",
+                tags=["generated", "image_core", "composition", f"preset_{preset_id}"],
+                meta={"pipeline_hash": pipeline_hash, "blend_modes": blend_modes, "preset_id": preset_id, "format": export.format},
+            )
+            new_asset = self.media_service.register_upload(up_req, filename, out_bytes)
+            pid = parent_asset_id or new_asset.id
+            art_meta = {
+                "width": comp.width,
+                "height": comp.height,
+                "layers_count": len(comp.layers),
+                "blend_modes": blend_modes,
+                "pipeline_hash": pipeline_hash,
+                "background_color": comp.background_color,
+                "preset_id": preset_id,
+                "format": export.format,
+                "timings_ms": dict(export.timings_ms),
+            }
+            art = self.media_service.register_artifact(
+                ArtifactCreateRequest(
                     tenant_id=comp.tenant_id,
                     env=comp.env,
-                    kind="image",
-                    source_uri="pending",
-                    tags=["generated", "image_core", "composition", f"preset_{preset_id}"],
-                    meta={"pipeline_hash": pipeline_hash, "blend_modes": blend_modes, "preset_id": preset_id, "format": out_format},
+                    parent_asset_id=pid,
+                    kind="image_render",
+                    uri=new_asset.source_uri,
+                    meta=art_meta,
                 )
-                
-                new_asset = self.media_service.register_upload(up_req, filename, out_bytes)
-                pid = parent_asset_id or new_asset.id
-                
-                art_meta = {
-                    "width": comp.width,
-                    "height": comp.height,
-                    "layers_count": len(comp.layers),
-                    "blend_modes": blend_modes,
-                    "pipeline_hash": pipeline_hash,
-                    "background_color": comp.background_color,
-                    "preset_id": preset_id,
-                    "format": out_format,
-                }
-                
-                art = self.media_service.register_artifact(
-                    ArtifactCreateRequest(
-                        tenant_id=comp.tenant_id,
-                        env=comp.env,
-                        parent_asset_id=pid,
-                        kind="image_render",
-                        uri=new_asset.source_uri,
-                        meta=art_meta,
-                    )
-                )
-                results[preset_id] = art.id
-                
-            except Exception as e:
-                print(f"Warning: batch_render failed for preset {preset_id}: {e}")
-                continue
-        
-        return results
+            )
+            return art.id
+
+        try:
+            return export_presets(
+                png_bytes,
+                presets,
+                _upload,
+                max_workers=max_workers,
+                upload_concurrency=upload_concurrency,
+            )
+        except Exception as e:
+            # The base render could not be decoded; every preset fails the same way.
+            return {
+                pid: PresetExport(preset_id=pid, format=preset["format"], width=0, height=0, error=f"decode failed: {e}")
+                for pid, preset in presets.items()
+            }
 
     def get_social_thumbnail_preset(self, preset_id: str) -> Optional[Dict[str, Any]]:
         config = self.SOCIAL_THUMBNAIL_PRESETS.get(preset_id)
@@ -0,0 +1,119 @@
+"""Tests for the decode-once preset export pipeline behind batch_render."""
+
+import io
+import threading
+import unittest
+from unittest.mock import patch
+
+from PIL import Image
+
+from engines.image_core import export as export_mod
+from engines.image_core.export import ResizePyramid, export_presets, preset_target_size
+from engines.image_core.models import ImageComposition, ImageLayer
+from engines.image_core.service import ImageCoreService
+from engines.media_v2.service import InMemoryMediaRepository, LocalMediaStorage, MediaService
+
+
+def _png(size=(400, 300)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGBA", size, (200, 10, 10, 255)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class TestExportPipeline(unittest.TestCase):
+    def test_preset_target_size_keeps_aspect_for_missing_dimension(self):
+        self.assertEqual(preset_target_size({"width": 200, "height": None}, (400, 300)), (200, 150))
+        self.assertEqual(preset_target_size({"width": None, "height": 150}, (400, 300)), (200, 150))
+        self.assertEqual(preset_target_size({"width": None, "height": None}, (400, 300)), (400, 300))
+
+    def test_pyramid_resamples_from_nearest_larger_level(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        source = Image.new("RGB", (400, 400))
+        resized_from = []
+        real_resize = Image.Image.resize
+
+        def _tracking_resize(img, size, *args, **kwargs):
+            resized_from.append((img.size, tuple(size)))
+            return real_resize(img, size, *args, **kwargs)
+
+        with patch.object(Image.Image, "resize", _tracking_resize), ThreadPoolExecutor(max_workers=2) as pool:
+            pyramid = ResizePyramid(source, [(50, 50), (200, 200), (100, 100), (400, 400)], pool)
+            self.assertEqual(pyramid.level((50, 50)).size, (50, 50))
+            self.assertIs(pyramid.level((400, 400)), source)
+        self.assertCountEqual(
+            resized_from,
+            [((400, 400), (200, 200)), ((200, 200), (100, 100)), ((100, 100), (50, 50))],
+        )
+
+    def test_decodes_once_and_bounds_upload_concurrency(self):
+        presets = {f"p{i}": {"format": "PNG", "width": 20 * (i + 1), "height": None, "quality": None} for i in range(6)}
+        active = []
+        peak = []
+        payloads = {}
+        lock = threading.Lock()
+
+        def _upload(export, payload):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            try:
+                payloads[export.preset_id] = payload
+                return f"art-{export.preset_id}"
+            finally:
+                with lock:
+                    active.pop()
+
+        with patch.object(export_mod.Image, "open", wraps=Image.open) as opened:
+            exports = export_presets(_png(), presets, _upload, max_workers=4, upload_concurrency=2)
+        self.assertEqual(opened.call_count, 1)
+        self.assertLessEqual(max(peak), 2)
+        for preset_id, result in exports.items():
+            self.assertEqual(result.artifact_id, f"art-{preset_id}")
+            self.assertEqual(Image.open(io.BytesIO(payloads[preset_id])).size, (result.width, result.height))
+            self.assertTrue({"decode", "resize", "encode", "upload", "total"} <= set(result.timings_ms))
+
+    def test_upload_failure_is_reported_per_preset(self):
+        presets = {
+            "ok": {"format": "JPEG", "width": 100, "height": 100, "quality": 80},
+            "bad": {"format": "PNG", "width": 50, "height": 50, "quality": None},
+        }
+
+        def _upload(export, payload):
+            if export.preset_id == "bad":
+                raise RuntimeError("storage down")
+            return "art-ok"
+
+        exports = export_presets(_png(), presets, _upload)
+        self.assertEqual(exports["ok"].artifact_id, "art-ok")
+        self.assertIsNone(exports["bad"].artifact_id)
+        self.assertIn("storage down", exports["bad"].error)
+
+
+class TestBatchExportService(unittest.TestCase):
+    def setUp(self):
+        media_svc = MediaService(repo=InMemoryMediaRepository(), storage=LocalMediaStorage())
+        self.service = ImageCoreService(media_service=media_svc)
+        self.comp = ImageComposition(
+            tenant_id="t_test",
+            env="dev",
+            width=640,
+            height=480,
+            layers=[ImageLayer(color="#00FF00", width=320, height=240)],
+        )
+
+    def test_batch_export_registers_artifacts_with_timings(self):
+        exports = self.service.batch_export(self.comp, ["avatar_64x64", "web_small", "instagram_1080", "unknown"])
+        self.assertEqual(set(exports), {"avatar_64x64", "web_small", "instagram_1080"})
+        art = self.service.media_service.get_artifact(exports["web_small"].artifact_id)
+        self.assertEqual(art.meta["preset_id"], "web_small")
+        self.assertIn("encode", art.meta["timings_ms"])
+        self.assertEqual((exports["web_small"].width, exports["web_small"].height), (640, 480))
+
+    def test_batch_render_returns_artifact_ids(self):
+        results = self.service.batch_render(self.comp, ["avatar_64x64", "thumbnail_200"])
+        self.assertEqual(set(results), {"avatar_64x64", "thumbnail_200"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import io
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+from PIL import Image
+
+from engines.image_core.backend import ImageCoreBackend
+from engines.image_core.compositing import composite_layer, layer_region, new_canvas
+from engines.image_core.models import ImageComposition, ImageLayer
+
+
+def _solid(rgba, size=(4, 4)):
+    return Image.new("RGBA", size, rgba)
+
+
+class TestCompositing(unittest.TestCase):
+    def test_layer_region_clips_to_canvas(self):
+        self.assertIsNone(layer_region((10, 10), (20, 0), (5, 5)))
+        cy, cx, ly, lx = layer_region((10, 10), (-2, 8), (5, 5))
+        self.assertEqual((cy, cx), (slice(8, 10), slice(0, 3)))
+        self.assertEqual((ly, lx), (slice(0, 2), slice(2, 5)))
+
+    def test_only_bbox_pixels_change(self):
+        canvas = new_canvas(16, 16, (10, 20, 30, 255))
+        before = canvas.copy()
+        composite_layer(canvas, _solid((255, 255, 255, 255)), (14, 14))
+        self.assertEqual(tuple(canvas[15, 15]), (255, 255, 255, 255))
+        np.testing.assert_array_equal(canvas[:14], before[:14])
+        np.testing.assert_array_equal(canvas[:, :14], before[:, :14])
+
+    def test_blend_kernels_on_opaque_base(self):
+        cases = {
+            "normal": (102, 102, 102),
+            "multiply": (51, 51, 51),
+            "screen": (179, 179, 179),
+            "darken": (102, 102, 102),
+            "lighten": (128, 128, 128),
+            "add": (230, 230, 230),
+            "overlay": (103, 103, 103),
+        }
+        for mode, expected in cases.items():
+            canvas = new_canvas(4, 4, (128, 128, 128, 255))
+            composite_layer(canvas, _solid((102, 102, 102, 255)), (0, 0), blend_mode=mode)
+            self.assertEqual(tuple(canvas[0, 0, :3]), expected, mode)
+            self.assertEqual(canvas[0, 0, 3], 255)
+
+    def test_blend_over_transparent_canvas_is_plain_source(self):
+        canvas = new_canvas(4, 4, (0, 0, 0, 0))
+        composite_layer(canvas, _solid((200, 100, 50, 255)), (0, 0), blend_mode="multiply")
+        self.assertEqual(tuple(canvas[0, 0]), (200, 100, 50, 255))
+
+    def test_opacity_and_mask_scale_alpha(self):
+        canvas = new_canvas(4, 4, (0, 0, 0, 0))
+        mask = Image.new("L", (4, 4), 0)
+        mask.putpixel((1, 1), 255)
+        composite_layer(canvas, _solid((255, 255, 255, 255)), (0, 0), opacity=0.5, mask=mask)
+        self.assertEqual(tuple(canvas[1, 1]), (255, 255, 255, 128))
+        self.assertEqual(tuple(canvas[0, 0]), (0, 0, 0, 0))
+
+    def test_backend_small_layer_on_large_canvas(self):
+        comp = ImageComposition(tenant_id="t", env="e", width=512, height=512, background_color="#000000")
+        comp.layers.append(ImageLayer(color="#FF0000", width=8, height=8, x=500, y=500, blend_mode="screen"))
+        img = Image.open(io.BytesIO(ImageCoreBackend(MagicMock()).render(comp))).convert("RGBA")
+        self.assertEqual(img.getpixel((505, 505)), (255, 0, 0, 255))
+        self.assertEqual(img.getpixel((0, 0)), (0, 0, 0, 255))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from PIL import Image
+
+from engines.image_core.backend import ImageCoreBackend
+from engines.image_core.models import ImageComposition, ImageLayer
+from engines.image_core.render_cache import RenderCache, get_decode_cache, set_decode_cache
+from engines.media_v2.models import DerivedArtifact, MediaAsset
+from engines.media_v2.service import InMemoryMediaRepository, LocalMediaStorage, MediaService
+
+
+class TestDecodeCache(unittest.TestCase):
+    def setUp(self):
+        set_decode_cache(RenderCache(max_bytes=16 * 1024 * 1024))
+        self.tmp = tempfile.TemporaryDirectory()
+        self.logo_path = os.path.join(self.tmp.name, "logo.png")
+        Image.new("RGBA", (80, 40), (0, 128, 255, 255)).save(self.logo_path)
+        self.mask_path = os.path.join(self.tmp.name, "mask.png")
+        Image.new("L", (64, 64), 255).save(self.mask_path)
+
+        self.repo = InMemoryMediaRepository()
+        self.media = MediaService(repo=self.repo, storage=LocalMediaStorage())
+        self.repo.create_asset(MediaAsset(id="logo", tenant_id="t", env="e", kind="image", source_uri=self.logo_path))
+        self.repo.create_artifact(
+            DerivedArtifact(id="mask", parent_asset_id="logo", tenant_id="t", env="e", kind="mask", uri=self.mask_path)
+        )
+
+    def tearDown(self):
+        set_decode_cache(None)
+        self.tmp.cleanup()
+
+    def _comp(self, x=0):
+        return ImageComposition(
+            tenant_id="t",
+            env="e",
+            width=64,
+            height=64,
+            background_color="#000000",
+            layers=[
+                ImageLayer(asset_id="logo", width=40, height=20, x=x),
+                ImageLayer(asset_id="logo", width=40, height=20, y=30, mask_artifact_id="mask"),
+            ],
+        )
+
+    def test_decoded_assets_are_shared_across_backends(self):
+        ImageCoreBackend(self.media).render(self._comp())
+        with patch("engines.image_core.backend.Image.open", wraps=Image.open) as opened:
+            png = ImageCoreBackend(self.media).render(self._comp(x=5))
+        opened.assert_not_called()
+        img = Image.open(io.BytesIO(png)).convert("RGBA")
+        self.assertEqual(img.getpixel((10, 10)), (0, 128, 255, 255))
+        stats = get_decode_cache().stats()
+        self.assertGreaterEqual(stats["hits"], 2)
+        self.assertEqual(stats["entries"], 2)  # one sized logo decode + one mask
+
+    def test_metadata_is_fetched_in_one_batch(self):
+        backend = ImageCoreBackend(self.media)
+        with patch.object(self.media, "get_asset") as get_asset, patch.object(self.media, "get_artifact") as get_artifact, \
+                patch.object(self.media, "get_assets", wraps=self.media.get_assets) as get_assets:
+            backend.render(self._comp())
+        get_asset.assert_not_called()
+        get_artifact.assert_not_called()
+        get_assets.assert_called_once_with(["logo"])
+
+    def test_changed_source_file_misses_the_cache(self):
+        backend = ImageCoreBackend(self.media)
+        backend.render(self._comp())
+        Image.new("RGBA", (80, 40), (255, 0, 0, 255)).save(self.logo_path)
+        os.utime(self.logo_path, ns=(0, 1))
+        png = backend.render(self._comp(x=1))
+        self.assertEqual(Image.open(io.BytesIO(png)).convert("RGBA").getpixel((10, 10)), (255, 0, 0, 255))
+
+    def test_budget_evicts_and_counts(self):
+        set_decode_cache(RenderCache(max_bytes=64 * 64))  # room for the mask alone
+        ImageCoreBackend(self.media).render(self._comp())
+        self.assertGreaterEqual(get_decode_cache().stats()["evictions"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import io
+import unittest
+from unittest.mock import MagicMock, patch
+
+from PIL import Image
+
+from engines.image_core.backend import ImageCoreBackend
+from engines.image_core.models import ImageComposition, ImageLayer
+from engines.image_core.render_cache import RenderCache
+
+
+def _comp(*layers: ImageLayer) -> ImageComposition:
+    return ImageComposition(tenant_id="t", env="e", width=64, height=64, background_color="#000000", layers=list(layers))
+
+
+class TestRenderCache(unittest.TestCase):
+    def test_lru_evicts_to_byte_budget(self):
+        cache = RenderCache(max_bytes=100)
+        cache.put("a", b"x" * 40)
+        cache.put("b", b"x" * 40)
+        self.assertIsNotNone(cache.get("a"))  # "a" becomes most recent
+        cache.put("c", b"x" * 40)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertLessEqual(cache.nbytes, 100)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_oversized_values_are_not_cached(self):
+        cache = RenderCache(max_bytes=10)
+        cache.put("big", b"x" * 11)
+        self.assertNotIn("big", cache)
+
+    def test_evicted_images_spill_to_disk_and_come_back(self):
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = RenderCache(max_bytes=4 * 8 * 8, spill_dir=tmp)
+            first = Image.new("RGBA", (8, 8), (10, 20, 30, 255))
+            cache.put("first", first)
+            cache.put("second", Image.new("RGBA", (8, 8), (0, 0, 0, 255)))
+            self.assertEqual(cache.stats()["spilled_entries"], 1)
+            restored = cache.get("first")
+            self.assertEqual(restored.tobytes(), first.tobytes())
+            self.assertEqual(cache.stats()["spill_hits"], 1)
+
+
+class TestBackendLayerCache(unittest.TestCase):
+    def setUp(self):
+        self.backend = ImageCoreBackend(MagicMock(), cache=RenderCache(max_bytes=64 * 1024 * 1024))
+
+    def test_top_layer_edit_reuses_lower_prefix(self):
+        bottom = ImageLayer(color="#FF0000", width=64, height=64)
+        middle = ImageLayer(color="#00FF00", width=32, height=32, opacity=0.5)
+        self.backend.render(_comp(bottom, middle, ImageLayer(color="#0000FF", width=8, height=8)))
+
+        with patch.object(self.backend, "_load_layer_content", wraps=self.backend._load_layer_content) as load:
+            png = self.backend.render(_comp(bottom, middle, ImageLayer(color="#FFFFFF", width=8, height=8)))
+        self.assertEqual(load.call_count, 1)
+        img = Image.open(io.BytesIO(png)).convert("RGBA")
+        self.assertEqual(img.getpixel((0, 0)), (255, 255, 255, 255))
+        self.assertEqual(img.getpixel((60, 60)), (255, 0, 0, 255))
+
+    def test_only_the_canvas_below_the_top_layer_is_snapshotted(self):
+        layers = [ImageLayer(color=f"#{i:02x}0000", width=64 - i, height=64 - i) for i in range(10)]
+        self.backend.render(_comp(*layers))
+        snapshots = [key for key in self.backend._cache._entries if key.startswith("cmp:")]
+        self.assertEqual(len(snapshots), 1)
+
+    def test_cached_render_matches_uncached(self):
+        layers = [
+            ImageLayer(color="#336699", width=40, height=40, adjustments={"contrast": 1.5}),
+            ImageLayer(color="#FFCC00", width=20, height=20, x=10, y=10, blend_mode="multiply", rotation=15),
+        ]
+        self.backend.render(_comp(*layers))
+        layers[1] = layers[1].model_copy(update={"x": 30})
+        cached = self.backend.render(_comp(*layers))
+        fresh = ImageCoreBackend(MagicMock(), cache=RenderCache(max_bytes=64 * 1024 * 1024)).render(_comp(*layers))
+        self.assertEqual(
+            Image.open(io.BytesIO(cached)).tobytes(),
+            Image.open(io.BytesIO(fresh)).tobytes(),
+        )
+
+    def test_moving_a_layer_reuses_its_adjusted_stage(self):
+        layer = ImageLayer(color="#808080", width=16, height=16, filter_mode="blur", filter_strength=2.0)
+        self.backend.render(_comp(layer))
+        with patch.object(self.backend, "_apply_adjustments_and_filters", wraps=self.backend._apply_adjustments_and_filters) as adjust:
+            self.backend.render(_comp(layer.model_copy(update={"x": 20, "y": 20})))
+        adjust.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -177,8 +177,7 @@ async def create_media_asset(
             tags=_parse_tags(tags),
             meta={},
         )
-        content = await file.read()
-        return service.register_upload(ctx, file.filename, content)
+        return service.register_upload_stream(ctx, file.filename, file.file)
     if payload:
         assert_context_matches(request_context, payload.tenant_id, payload.env)
         payload_data = payload.model_dump()
@@ -6,9 +6,11 @@ import os
 import shutil
 import subprocess
 import tempfile
+import threading
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Protocol, Tuple
+from typing import BinaryIO, Dict, List, Optional, Protocol, Tuple
 
 from engines.media_v2.models import (
     ArtifactCreateRequest,
@@ -20,8 +22,23 @@ from engines.media_v2.models import (
 )
 from engines.config import runtime_config
 
+UPLOAD_PART_BYTES_ENV = "MEDIA_V2_UPLOAD_PART_BYTES"
+UPLOAD_CONCURRENCY_ENV = "MEDIA_V2_UPLOAD_CONCURRENCY"
+DEFAULT_UPLOAD_PART_BYTES = 16 * 1024 * 1024
+DEFAULT_UPLOAD_CONCURRENCY = 4
+S3_MIN_PART_BYTES = 5 * 1024 * 1024
+
+
 def _backend_version() -> str:
     return os.getenv("MEDIA_V2_BACKEND_VERSION", "media_v2_unknown")
+
+
+def _env_positive_int(name: str, default: int) -> int:
+    try:
+        value = int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+    return value if value > 0 else default
 try:
     from google.cloud import firestore  # type: ignore
 except Exception:  # pragma: no cover
@@ -49,6 +66,36 @@ class MediaRepository:
     def get_artifact(self, artifact_id: str) -> Optional[DerivedArtifact]:
         raise NotImplementedError
 
+    def get_assets(self, asset_ids: List[str]) -> Dict[str, MediaAsset]:
+        """Batch lookup; missing ids are omitted. Backends override with a single round trip."""
+        found = {}
+        for asset_id in dict.fromkeys(asset_ids):
+            asset = self.get_asset(asset_id)
+            if asset:
+                found[asset_id] = asset
+        return found
+
+    def get_artifacts(self, artifact_ids: List[str]) -> Dict[str, DerivedArtifact]:
+        found = {}
+        for artifact_id in dict.fromkeys(artifact_ids):
+            artifact = self.get_artifact(artifact_id)
+            if artifact:
+                found[artifact_id] = artifact
+        return found
+
+
+class MultipartUpload(Protocol):
+    """One in-progress multipart upload; parts may be uploaded concurrently and in any order."""
+
+    def upload_part(self, part_number: int, data: bytes) -> None:
+        ...
+
+    def complete(self) -> str:
+        ...
+
+    def abort(self) -> None:
+        ...
+
 
 class MediaStorage(Protocol):
     """Abstract media blob storage."""
@@ -108,11 +155,48 @@ class S3MediaStorage:
         except Exception as exc:  # pragma: no cover - network error path
             raise RuntimeError(f"S3 upload failed: {exc}") from exc
 
+    def start_multipart(self, tenant_id: str, env: str, asset_id: str, filename: str, part_size: int) -> "S3MultipartUpload":
+        if part_size < S3_MIN_PART_BYTES:
+            raise ValueError(f"S3 multipart parts must be at least {S3_MIN_PART_BYTES} bytes")
+        key = self._key(tenant_id, env, asset_id, filename)
+        resp = self.client.create_multipart_upload(Bucket=self.bucket_name, Key=key)
+        return S3MultipartUpload(self.client, self.bucket_name, key, resp["UploadId"])
+
+
+class S3MultipartUpload:
+    def __init__(self, client: object, bucket: str, key: str, upload_id: str) -> None:
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.upload_id = upload_id
+        self._etags: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def upload_part(self, part_number: int, data: bytes) -> None:
+        resp = self.client.upload_part(  # type: ignore[attr-defined]
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, PartNumber=part_number, Body=data
+        )
+        with self._lock:
+            self._etags[part_number] = resp["ETag"]
+
+    def complete(self) -> str:
+        parts = [{"PartNumber": n, "ETag": self._etags[n]} for n in sorted(self._etags)]
+        self.client.complete_multipart_upload(  # type: ignore[attr-defined]
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, MultipartUpload={"Parts": parts}
+        )
+        return f"s3://{self.bucket}/{self.key}"
+
+    def abort(self) -> None:
+        try:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)  # type: ignore[attr-defined]
+        except Exception:  # pragma: no cover - best effort cleanup
+            pass
+
 
 class LocalMediaStorage:
     """Local tmp fallback to keep tests/dev working without S3."""
 
-    def upload_bytes(self, tenant_id: str, env: str, asset_id: str, filename: str, content: bytes) -> str:
+    def _path(self, tenant_id: str, env: str, asset_id: str, filename: str) -> Path:
         safe_name = Path(filename).name or "upload.bin"
         dest = (
             Path(tempfile.gettempdir())
@@ -123,10 +207,42 @@ class LocalMediaStorage:
             / asset_id
         )
         dest.mkdir(parents=True, exist_ok=True)
-        path = dest / safe_name
+        return dest / safe_name
+
+    def upload_bytes(self, tenant_id: str, env: str, asset_id: str, filename: str, content: bytes) -> str:
+        path = self._path(tenant_id, env, asset_id, filename)
         path.write_bytes(content)
         return str(path)
 
+    def start_multipart(self, tenant_id: str, env: str, asset_id: str, filename: str, part_size: int) -> "LocalMultipartUpload":
+        return LocalMultipartUpload(self._path(tenant_id, env, asset_id, filename), part_size)
+
+
+class LocalMultipartUpload:
+    """Filesystem stand-in for S3 multipart: parts land at their offsets in a `.partial` file."""
+
+    def __init__(self, path: Path, part_size: int) -> None:
+        self.path = path
+        self.part_size = part_size
+        self.partial = path.with_name(path.name + ".partial")
+        self.parts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.partial.write_bytes(b"")
+
+    def upload_part(self, part_number: int, data: bytes) -> None:
+        with self._lock:
+            with open(self.partial, "r+b") as fh:
+                fh.seek((part_number - 1) * self.part_size)
+                fh.write(data)
+            self.parts[part_number] = len(data)
+
+    def complete(self) -> str:
+        os.replace(self.partial, self.path)
+        return str(self.path)
+
+    def abort(self) -> None:
+        self.partial.unlink(missing_ok=True)
+
 
 class InMemoryMediaRepository(MediaRepository):
     def __init__(self) -> None:
@@ -161,6 +277,12 @@ class InMemoryMediaRepository(MediaRepository):
     def get_artifact(self, artifact_id: str) -> Optional[DerivedArtifact]:
         return self.artifacts.get(artifact_id)
 
+    def get_assets(self, asset_ids: List[str]) -> Dict[str, MediaAsset]:
+        return {aid: self.assets[aid] for aid in asset_ids if aid in self.assets}
+
+    def get_artifacts(self, artifact_ids: List[str]) -> Dict[str, DerivedArtifact]:
+        return {aid: self.artifacts[aid] for aid in artifact_ids if aid in self.artifacts}
+
 
 class FirestoreMediaRepository(MediaRepository):
     """Firestore-backed media repository (tenant/env scoped collections)."""
@@ -230,6 +352,22 @@ class FirestoreMediaRepository(MediaRepository):
                 return DerivedArtifact(**snap.to_dict())
         return None
 
+    def get_assets(self, asset_ids: List[str]) -> Dict[str, MediaAsset]:
+        tenant = runtime_config.get_tenant_id()
+        if not tenant or not asset_ids:
+            return {}
+        col = self._assets_collection(tenant)
+        refs = [col.document(aid) for aid in dict.fromkeys(asset_ids)]
+        return {snap.id: MediaAsset(**snap.to_dict()) for snap in self._client.get_all(refs) if snap.exists}
+
+    def get_artifacts(self, artifact_ids: List[str]) -> Dict[str, DerivedArtifact]:
+        tenant = runtime_config.get_tenant_id()
+        if not tenant or not artifact_ids:
+            return {}
+        col = self._artifacts_collection(tenant)
+        refs = [col.document(aid) for aid in dict.fromkeys(artifact_ids)]
+        return {snap.id: DerivedArtifact(**snap.to_dict()) for snap in self._client.get_all(refs) if snap.exists}
+
 
 def _probe_media(path: Path) -> Tuple[Optional[float], Optional[float], Optional[int], Optional[int], Optional[str], Optional[int]]:
     """Return duration_ms, fps, channels, sample_rate, codec_info, size_bytes."""
@@ -281,6 +419,30 @@ def _probe_media(path: Path) -> Tuple[Optional[float], Optional[float], Optional
     return duration_ms, fps, channels, sample_rate, codec, size_bytes
 
 
+def _read_part(stream: BinaryIO, part_size: int) -> bytes:
+    """Read exactly `part_size` bytes unless the stream ends first (raw streams may return short reads)."""
+    chunks = []
+    remaining = part_size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _iter_parts(stream: BinaryIO, part_size: int, *already_read: bytes):
+    for chunk in already_read:
+        if chunk:
+            yield chunk
+    while True:
+        chunk = _read_part(stream, part_size)
+        if not chunk:
+            return
+        yield chunk
+
+
 class MediaService:
     def __init__(self, repo: Optional[MediaRepository] = None, storage: Optional[MediaStorage] = None) -> None:
         self.repo = repo or self._default_repo()
@@ -336,7 +498,90 @@ class MediaService:
             tmp_path.write_bytes(content)
         except Exception:
             tmp_path = None
-        return self._build_asset(req, uri, tmp_path, asset_id)
+        try:
+            return self._build_asset(req, uri, tmp_path, asset_id)
+        finally:
+            if tmp_path:
+                tmp_path.unlink(missing_ok=True)
+
+    def register_upload_stream(
+        self,
+        req: MediaUploadRequest,
+        filename: str,
+        stream: BinaryIO,
+        *,
+        part_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> MediaAsset:
+        """Register an upload read from a file-like object without holding it in memory.
+
+        The stream is read one part at a time: each part is hashed, appended to a spool file
+        (ffprobe needs a seekable file, e.g. for MP4s with a trailing moov atom) and uploaded
+        as a multipart part, with at most `max_concurrency` parts in flight. Inputs that fit
+        in a single part, or storages without multipart support, use `upload_bytes`.
+        The asset records `meta["sha256"]` and the exact `size_bytes`.
+        """
+        part_size = part_size or _env_positive_int(UPLOAD_PART_BYTES_ENV, DEFAULT_UPLOAD_PART_BYTES)
+        max_concurrency = max_concurrency or _env_positive_int(UPLOAD_CONCURRENCY_ENV, DEFAULT_UPLOAD_CONCURRENCY)
+        asset_id = uuid.uuid4().hex
+        digest = hashlib.sha256()
+        spool_fd, spool_name = tempfile.mkstemp(prefix="probe_")
+        spool_path = Path(spool_name)
+        try:
+            with os.fdopen(spool_fd, "wb") as spool:
+                first = _read_part(stream, part_size)
+                second = _read_part(stream, part_size) if len(first) == part_size else b""
+                start_multipart = getattr(self.storage, "start_multipart", None)
+                if second and start_multipart is not None:
+                    uri = self._upload_multipart(
+                        start_multipart(req.tenant_id, req.env, asset_id, filename, part_size),
+                        _iter_parts(stream, part_size, first, second),
+                        digest,
+                        spool,
+                        max_concurrency,
+                    )
+                else:
+                    # Single part, or a storage without multipart support: spool and upload once.
+                    for chunk in _iter_parts(stream, part_size, first, second):
+                        digest.update(chunk)
+                        spool.write(chunk)
+                    spool.flush()
+                    uri = self._store_upload(req, asset_id, filename, first if not second else spool_path.read_bytes())
+            meta = dict(req.meta or {})
+            meta["sha256"] = digest.hexdigest()
+            return self._build_asset(req.model_copy(update={"meta": meta}), uri, spool_path, asset_id)
+        finally:
+            spool_path.unlink(missing_ok=True)
+
+    def _upload_multipart(
+        self,
+        upload: MultipartUpload,
+        parts,
+        digest,
+        spool: BinaryIO,
+        max_concurrency: int,
+    ) -> str:
+        """Feed parts to a multipart upload with at most `max_concurrency` parts in flight."""
+        in_flight = threading.BoundedSemaphore(max_concurrency)
+        futures: List[Future] = []
+        try:
+            with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="media-upload") as pool:
+                for part_number, chunk in enumerate(parts, start=1):
+                    digest.update(chunk)
+                    spool.write(chunk)
+                    in_flight.acquire()
+                    future = pool.submit(upload.upload_part, part_number, chunk)
+                    future.add_done_callback(lambda _f: in_flight.release())
+                    futures.append(future)
+                    failed = next((f for f in futures if f.done() and f.exception()), None)
+                    if failed is not None:
+                        raise failed.exception()
+                for future in futures:
+                    future.result()
+            return upload.complete()
+        except Exception as exc:
+            upload.abort()
+            raise RuntimeError("media storage unavailable: " + str(exc)) from exc
 
     def list_assets(self, tenant_id: str, kind: Optional[MediaKind] = None, tag: Optional[str] = None, source_ref: Optional[str] = None) -> List[MediaAsset]:
         return self.repo.list_assets(tenant_id=tenant_id, kind=kind, tag=tag, source_ref=source_ref)
@@ -370,6 +615,12 @@ class MediaService:
     def get_artifact(self, artifact_id: str) -> Optional[DerivedArtifact]:
         return self.repo.get_artifact(artifact_id)
 
+    def get_assets(self, asset_ids: List[str]) -> Dict[str, MediaAsset]:
+        return self.repo.get_assets(asset_ids)
+
+    def get_artifacts(self, artifact_ids: List[str]) -> Dict[str, DerivedArtifact]:
+        return self.repo.get_artifacts(artifact_ids)
+
     def list_artifacts_for_asset(self, asset_id: str) -> List[DerivedArtifact]:
         return self.repo.list_artifacts_for_asset(asset_id)
 
@@ -0,0 +1,110 @@
+import hashlib
+import io
+import threading
+from pathlib import Path
+
+import pytest
+
+from engines.media_v2.models import MediaUploadRequest
+from engines.media_v2.service import InMemoryMediaRepository, LocalMediaStorage, MediaService
+
+
+class _TrickleStream(io.RawIOBase):
+    """Raw stream that returns short reads, like a socket."""
+
+    def __init__(self, data: bytes, max_read: int = 7):
+        self._buf = io.BytesIO(data)
+        self._max_read = max_read
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self._buf.read(min(size, self._max_read) if size and size > 0 else self._max_read)
+
+
+class _RecordingStorage(LocalMediaStorage):
+    def __init__(self, fail_part=None):
+        self.parts = []
+        self.single_uploads = 0
+        self.peak_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.fail_part = fail_part
+        self.aborted = False
+
+    def upload_bytes(self, tenant_id, env, asset_id, filename, content):
+        self.single_uploads += 1
+        return super().upload_bytes(tenant_id, env, asset_id, filename, content)
+
+    def start_multipart(self, tenant_id, env, asset_id, filename, part_size):
+        upload = super().start_multipart(tenant_id, env, asset_id, filename, part_size)
+        storage = self
+        real_upload_part, real_abort = upload.upload_part, upload.abort
+
+        def upload_part(part_number, data):
+            with storage._lock:
+                storage._in_flight += 1
+                storage.peak_in_flight = max(storage.peak_in_flight, storage._in_flight)
+            try:
+                if part_number == storage.fail_part:
+                    raise IOError("part rejected")
+                storage.parts.append((part_number, len(data)))
+                real_upload_part(part_number, data)
+            finally:
+                with storage._lock:
+                    storage._in_flight -= 1
+
+        def abort():
+            storage.aborted = True
+            real_abort()
+
+        upload.upload_part = upload_part
+        upload.abort = abort
+        return upload
+
+
+def _req(**meta):
+    return MediaUploadRequest(tenant_id="t_stream", env="dev", kind="video", source_uri="pending", meta=meta)
+
+
+def test_multipart_stream_upload_reassembles_and_hashes():
+    data = bytes(range(256)) * 40  # 10240 bytes
+    storage = _RecordingStorage()
+    svc = MediaService(repo=InMemoryMediaRepository(), storage=storage)
+
+    asset = svc.register_upload_stream(_req(origin="camera"), "clip.mp4", _TrickleStream(data), part_size=1024, max_concurrency=3)
+
+    assert Path(asset.source_uri).read_bytes() == data
+    assert asset.meta["sha256"] == hashlib.sha256(data).hexdigest()
+    assert asset.meta["origin"] == "camera"
+    assert asset.size_bytes == len(data)
+    assert sorted(storage.parts) == [(n, 1024) for n in range(1, 11)]
+    assert storage.peak_in_flight <= 3
+    assert storage.single_uploads == 0
+
+
+def test_small_stream_uses_single_upload():
+    storage = _RecordingStorage()
+    svc = MediaService(repo=InMemoryMediaRepository(), storage=storage)
+    asset = svc.register_upload_stream(_req(), "small.bin", io.BytesIO(b"tiny"), part_size=1024)
+    assert storage.single_uploads == 1 and not storage.parts
+    assert Path(asset.source_uri).read_bytes() == b"tiny"
+
+
+def test_failed_part_aborts_upload_and_cleans_up(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    storage = _RecordingStorage(fail_part=2)
+    svc = MediaService(repo=InMemoryMediaRepository(), storage=storage)
+    with pytest.raises(RuntimeError, match="media storage unavailable"):
+        svc.register_upload_stream(_req(), "clip.mp4", io.BytesIO(b"x" * 5000), part_size=1024, max_concurrency=2)
+    assert storage.aborted
+    assert not list(tmp_path.glob("probe_*"))
+    assert not list(tmp_path.rglob("*.partial"))
+
+
+def test_register_upload_removes_probe_file(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    svc = MediaService(repo=InMemoryMediaRepository(), storage=LocalMediaStorage())
+    svc.register_upload(_req(), "f.bin", b"data")
+    assert not list(tmp_path.glob("probe_*"))
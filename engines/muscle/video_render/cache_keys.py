@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from engines.video_render.models import RenderRequest
+from engines.video_render.planner import _clip_timeline_duration_ms
+from engines.video_render.profiles import PROFILE_MAP
+
+# Request fields that change where/how a render is delivered but not the pixels/samples produced.
+_NON_CONTENT_REQUEST_FIELDS = {"user_id", "output_path", "dry_run", "storage_target", "segment_index"}
+# Bookkeeping fields on timeline/media records that must not invalidate a cached render.
+_VOLATILE_FIELDS = {"created_at", "updated_at", "user_id"}
+
+
+def _canonical(record: Any) -> Any:
+    if record is None:
+        return None
+    return record.model_dump(mode="json", exclude=_VOLATILE_FIELDS)
+
+
+def _digest(payload: Any) -> str:
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def segment_lead_in_ms(start_ms: Optional[float], overlap_ms: Optional[float], fps: Optional[float] = None) -> float:
+    """Overlap rendered ahead of a segment's start; the render window is clamped at 0.
+
+    With `fps` (keyframe-aligned segments) the lead-in is a whole number of frames, so
+    the forced keyframe, the render window start and the stitch inpoint are one frame.
+    """
+    start = start_ms or 0.0
+    lead_in = max(0.0, min(overlap_ms or 0.0, start))
+    if fps:
+        lead_in = min(round(lead_in * fps / 1000.0) * 1000.0 / fps, start)
+    return lead_in
+
+
+def keyframe_fps(render_profile: str, keyframe_aligned: bool) -> Optional[float]:
+    """Frame rate lead-ins snap to, or None when segments are not keyframe aligned."""
+    return PROFILE_MAP[render_profile]["fps"] if keyframe_aligned else None
+
+
+def render_window(req: RenderRequest) -> Tuple[float, Optional[float]]:
+    """Timeline window actually rendered for a request, overlap included."""
+    if req.start_ms is not None:
+        fps = keyframe_fps(req.render_profile, req.keyframe_aligned)
+        window_start = req.start_ms - segment_lead_in_ms(req.start_ms, req.overlap_ms, fps)
+    else:
+        window_start = 0.0
+    window_end = req.end_ms + req.overlap_ms if req.end_ms is not None else None
+    return window_start, window_end
+
+
+def clip_span_ms(clip: Any) -> Tuple[float, float]:
+    start = clip.start_ms_on_timeline
+    return start, start + _clip_timeline_duration_ms(clip)
+
+
+def clip_in_window(clip: Any, window_start: float, window_end: Optional[float]) -> bool:
+    clip_start, clip_end = clip_span_ms(clip)
+    if window_end is not None and clip_start >= window_end:
+        return False
+    return clip_end > window_start
+
+
+@dataclass
+class TimelineFingerprint:
+    """Canonical render inputs of one project, loaded once and hashed per window.
+
+    `shared` holds state that applies to every window (sequence and track level filters,
+    automations and flags); each clip record carries its own filter stack, automations and
+    source asset version, so editing a clip only changes the keys of windows it touches.
+    """
+
+    project_id: str
+    shared: Dict[str, Any]
+    clips: List[Tuple[float, float, str, Dict[str, Any]]] = field(default_factory=list)
+    transitions: List[Dict[str, Any]] = field(default_factory=list)
+
+    def window_digest(self, req: RenderRequest) -> str:
+        window_start, window_end = render_window(req)
+        clip_records = []
+        clip_ids = set()
+        for start, end, clip_id, record in self.clips:
+            if window_end is not None and start >= window_end:
+                continue
+            if end <= window_start:
+                continue
+            clip_ids.add(clip_id)
+            clip_records.append(record)
+        transitions = [t for t in self.transitions if t["from_clip_id"] in clip_ids or t["to_clip_id"] in clip_ids]
+        return _digest(
+            {
+                "request": request_fields(req),
+                "shared": self.shared,
+                "clips": clip_records,
+                "transitions": transitions,
+            }
+        )
+
+
+def request_fields(req: RenderRequest) -> Dict[str, Any]:
+    return req.model_dump(mode="json", exclude=_NON_CONTENT_REQUEST_FIELDS)
+
+
+def request_digest(req: RenderRequest) -> str:
+    return _digest({"request": request_fields(req)})
+
+
+def _asset_version(media_service: Any, asset_id: str) -> Dict[str, Any]:
+    asset = media_service.get_asset(asset_id)
+    artifacts: Iterable[Any] = media_service.list_artifacts_for_asset(asset_id) if asset else []
+    return {
+        "asset": _canonical(asset),
+        "artifacts": sorted(
+            ({"id": a.id, "kind": a.kind, "uri": a.uri, "start_ms": a.start_ms, "end_ms": a.end_ms} for a in artifacts),
+            key=lambda a: a["id"],
+        ),
+    }
+
+
+def build_timeline_fingerprint(timeline_service: Any, media_service: Any, project_id: str) -> Optional[TimelineFingerprint]:
+    project = timeline_service.get_project(project_id)
+    if not project:
+        return None
+    sequences = timeline_service.list_sequences_for_project(project.id)
+    if not sequences:
+        return None
+    sequence = sequences[0]
+    tracks = sorted(timeline_service.list_tracks_for_sequence(sequence.id), key=lambda t: (t.order, t.id))
+    track_records = []
+    clips = []
+    for track in tracks:
+        track_records.append(
+            {
+                "track": _canonical(track),
+                "filters": _canonical(timeline_service.get_filter_stack_for_target("track", track.id)),
+                "automation": [_canonical(a) for a in timeline_service.list_automation("track", track.id)],
+            }
+        )
+        clips.extend(timeline_service.list_clips_for_track(track.id))
+    shared = {
+        "sequence": _canonical(sequence),
+        "sequence_filters": _canonical(timeline_service.get_filter_stack_for_target("sequence", sequence.id)),
+        "tracks": track_records,
+    }
+
+    asset_versions: Dict[str, Dict[str, Any]] = {}
+    clip_entries: List[Tuple[float, float, str, Dict[str, Any]]] = []
+    for clip in sorted(clips, key=lambda c: (c.start_ms_on_timeline, c.id)):
+        if clip.asset_id not in asset_versions:
+            asset_versions[clip.asset_id] = _asset_version(media_service, clip.asset_id)
+        start, end = clip_span_ms(clip)
+        record = {
+            "clip": _canonical(clip),
+            "filters": _canonical(timeline_service.get_filter_stack_for_target("clip", clip.id)),
+            "automation": [_canonical(a) for a in timeline_service.list_automation("clip", clip.id)],
+            "source": asset_versions[clip.asset_id],
+        }
+        clip_entries.append((start, end, clip.id, record))
+
+    transitions = sorted(
+        (_canonical(t) for t in timeline_service.list_transitions_for_sequence(sequence.id)),
+        key=lambda t: t["id"],
+    )
+    return TimelineFingerprint(project_id=project_id, shared=shared, clips=clip_entries, transitions=transitions)
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import json
+import shutil
 import subprocess
 import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import IO, Any, Callable, Deque, Dict, List, Optional
 
 from engines.video_render.models import RenderPlan
 
@@ -25,6 +31,10 @@ class FFmpegError(RuntimeError):
 
 _HW_ENCODERS_CACHE: Optional[set[str]] = None
 
+DEFAULT_STALL_TIMEOUT = 120.0
+WATCHDOG_POLL_SEC = 0.5
+STDERR_TAIL_LINES = 200
+
 
 def get_available_hardware_encoders() -> set[str]:
     """Detect available hardware encoders via ffmpeg -encoders."""
@@ -51,9 +61,143 @@ def get_available_hardware_encoders() -> set[str]:
         return set()
 
 
-def run_ffmpeg(plan: RenderPlan, timeout: int = 120, *, stage: str = "ffmpeg", hint: str | None = None) -> str:
+# Stream fields that must match for segments to be joined with the concat demuxer + `-c copy`.
+_SIGNATURE_FIELDS = {
+    "video": ("codec_name", "profile", "width", "height", "pix_fmt", "r_frame_rate", "time_base"),
+    "audio": ("codec_name", "profile", "sample_rate", "channels", "channel_layout"),
+}
+
+
+def probe_stream_signature(path: str, timeout: int = 15) -> Optional[Dict[str, Any]]:
+    """Return the codec parameters relevant to stream-copy concatenation.
+
+    Returns None when ffprobe is unavailable or the file cannot be probed.
+    """
+    if shutil.which("ffprobe") is None or not Path(path).exists():
+        return None
+    cmd = ["ffprobe", "-v", "error", "-show_streams", "-of", "json", str(path)]
+    try:
+        res = subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=timeout)
+        streams = json.loads(res.stdout or "{}").get("streams", [])
+    except Exception:
+        return None
+    signature: Dict[str, Any] = {}
+    for stream in streams:
+        kind = stream.get("codec_type")
+        fields = _SIGNATURE_FIELDS.get(kind or "")
+        if not fields or kind in signature:
+            continue
+        signature[kind] = {field: stream.get(field) for field in fields}
+    return signature or None
+
+
+@dataclass
+class FFmpegProgress:
+    out_time_ms: float = 0.0
+    frame: int = 0
+    fps: float = 0.0
+    speed: float = 0.0
+    fraction: Optional[float] = None
+    done: bool = False
+
+
+def _with_progress_args(args: List[str]) -> List[str]:
+    if "-progress" in args:
+        return list(args)
+    # Progress goes to stdout as key=value blocks; -nostats keeps stderr down to real log lines.
+    return [args[0], "-progress", "pipe:1", "-nostats", *args[1:]]
+
+
+def _expected_duration_ms(plan: RenderPlan, args: List[str]) -> Optional[float]:
+    expected = plan.meta.get("expected_duration_ms")
+    if expected:
+        return float(expected)
+    if "-t" in args:
+        try:
+            return float(args[args.index("-t") + 1]) * 1000.0
+        except (IndexError, ValueError):
+            return None
+    return None
+
+
+def _parse_float(raw: Optional[str]) -> float:
+    try:
+        return float((raw or "").rstrip("x"))
+    except ValueError:
+        return 0.0
+
+
+class _ProgressReader:
+    """Parses `-progress` key=value blocks and tracks when output time last advanced."""
+
+    def __init__(self, expected_ms: Optional[float], on_progress: Optional[Callable[[FFmpegProgress], None]]) -> None:
+        self.expected_ms = expected_ms
+        self.on_progress = on_progress
+        self.last_advance = time.monotonic()
+        self.latest = FFmpegProgress()
+
+    def __call__(self, stream: IO[str]) -> None:
+        block: Dict[str, str] = {}
+        for line in stream:
+            key, sep, value = line.strip().partition("=")
+            if not sep:
+                continue
+            block[key] = value
+            if key == "progress":
+                self._emit(block)
+                block = {}
+
+    def _emit(self, block: Dict[str, str]) -> None:
+        # out_time_ms is (historically) microseconds too; prefer the explicit out_time_us.
+        out_us = _parse_float(block.get("out_time_us") or block.get("out_time_ms"))
+        frame = int(_parse_float(block.get("frame")))
+        progress = FFmpegProgress(
+            out_time_ms=out_us / 1000.0,
+            frame=frame,
+            fps=_parse_float(block.get("fps")),
+            speed=_parse_float(block.get("speed")),
+            done=block.get("progress") == "end",
+        )
+        if progress.out_time_ms > self.latest.out_time_ms or progress.frame > self.latest.frame or progress.done:
+            self.last_advance = time.monotonic()
+        if self.expected_ms:
+            progress.fraction = 1.0 if progress.done else max(0.0, min(1.0, progress.out_time_ms / self.expected_ms))
+        self.latest = progress
+        if self.on_progress:
+            try:
+                self.on_progress(progress)
+            except Exception:
+                pass
+
+
+def _drain_lines(stream: IO[str], sink: Deque[str]) -> None:
+    for line in stream:
+        sink.append(line.rstrip("\n"))
+
+
+def _kill(proc: subprocess.Popen) -> None:
+    proc.kill()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        pass
+
+
+def run_ffmpeg(
+    plan: RenderPlan,
+    timeout: Optional[float] = None,
+    *,
+    stage: str = "ffmpeg",
+    hint: str | None = None,
+    stall_timeout: Optional[float] = DEFAULT_STALL_TIMEOUT,
+    on_progress: Optional[Callable[[FFmpegProgress], None]] = None,
+) -> str:
     """Execute the first step of a render plan via ffmpeg.
 
+    Progress is streamed from `-progress pipe:1` to `on_progress`. The encode is aborted
+    when output time stops advancing for `stall_timeout` seconds; `timeout` is an optional
+    hard wall-clock cap. Only the last STDERR_TAIL_LINES lines of stderr are retained.
+
     Returns the output path. Raises FFmpegError on failure.
     """
     if not plan.steps:
@@ -64,16 +208,42 @@ def run_ffmpeg(plan: RenderPlan, timeout: int = 120, *, stage: str = "ffmpeg", h
     # Ensure output directory exists
     out_path = Path(plan.output_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
+    args = _with_progress_args(step.ffmpeg_args)
+    reader = _ProgressReader(_expected_duration_ms(plan, args), on_progress)
+    stderr_tail: Deque[str] = deque(maxlen=STDERR_TAIL_LINES)
     try:
-        # Capture stderr for better error reporting
-        subprocess.run(step.ffmpeg_args, check=True, timeout=timeout, capture_output=True, text=True)
-    except subprocess.TimeoutExpired as exc:
-        raise FFmpegError(f"ffmpeg timed out: {exc}", stage=stage, hint=hint) from exc
-    except subprocess.CalledProcessError as exc:
-        # Extract last few lines of stderr
-        err_log = exc.stderr or ""
-        tail = "\n".join(err_log.splitlines()[-10:])
-        raise FFmpegError(f"ffmpeg failed (code {exc.returncode}):\n{tail}", stage=stage, stderr_tail=tail, hint=hint) from exc
+        proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1)
     except Exception as exc:
         raise FFmpegError(f"ffmpeg failed: {exc}", stage=stage, hint=hint) from exc
+    readers = [
+        threading.Thread(target=reader, args=(proc.stdout,), daemon=True),
+        threading.Thread(target=_drain_lines, args=(proc.stderr, stderr_tail), daemon=True),
+    ]
+    for thread in readers:
+        thread.start()
+    started = time.monotonic()
+    while True:
+        try:
+            proc.wait(timeout=WATCHDOG_POLL_SEC)
+            break
+        except subprocess.TimeoutExpired:
+            now = time.monotonic()
+            if stall_timeout and now - reader.last_advance > stall_timeout:
+                _kill(proc)
+                tail = "\n".join(list(stderr_tail)[-10:])
+                raise FFmpegError(
+                    f"ffmpeg stalled: no progress for {stall_timeout}s at {reader.latest.out_time_ms / 1000.0:.2f}s",
+                    stage=stage,
+                    stderr_tail=tail,
+                    hint=hint,
+                )
+            if timeout and now - started > timeout:
+                _kill(proc)
+                raise FFmpegError(f"ffmpeg timed out after {timeout}s", stage=stage, hint=hint)
+    for thread in readers:
+        thread.join(timeout=5)
+    if proc.returncode != 0:
+        # Extract last few lines of stderr
+        tail = "\n".join(list(stderr_tail)[-10:])
+        raise FFmpegError(f"ffmpeg failed (code {proc.returncode}):\n{tail}", stage=stage, stderr_tail=tail, hint=hint)
     return str(out_path)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -17,6 +17,9 @@ except Exception:  # pragma: no cover
 RenderStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
 RenderJobType = Literal["full", "segment"]
 
+# Firestore caps the number of values in an `in` filter.
+FIRESTORE_IN_QUERY_LIMIT = 30
+
 
 def _uuid() -> str:
     return uuid.uuid4().hex
@@ -62,20 +65,73 @@ class RenderJobRepository:
     def find_by_cache_key(self, tenant_id: str, cache_key: str, job_type: Optional[RenderJobType] = None, statuses: Optional[List[str]] = None) -> Optional[VideoRenderJob]:
         raise NotImplementedError
 
+    def find_many_by_cache_keys(
+        self,
+        tenant_id: str,
+        cache_keys: Iterable[str],
+        job_type: Optional[RenderJobType] = None,
+        statuses: Optional[List[str]] = None,
+    ) -> Dict[str, List[VideoRenderJob]]:
+        """All jobs matching each cache key (oldest first); keys with no match are omitted."""
+        results: Dict[str, List[VideoRenderJob]] = {}
+        for key in dict.fromkeys(cache_keys):
+            for status in statuses or ["succeeded"]:
+                job = self.find_by_cache_key(tenant_id, key, job_type=job_type, statuses=[status])
+                if job:
+                    results.setdefault(key, []).append(job)
+        return results
+
+
+_IndexEntry = Tuple[str, Optional[str], str, str]  # tenant, cache_key, job_type, status
+
 
 class InMemoryRenderJobRepository(RenderJobRepository):
+    """Dict-backed repository with secondary indexes.
+
+    Index buckets are insertion-ordered dicts of job ids. Callers mutate jobs in place
+    before calling update(), so reads re-check the live fields instead of trusting a
+    bucket that update() has not refreshed yet.
+    """
+
     def __init__(self) -> None:
         self.jobs: Dict[str, VideoRenderJob] = {}
+        self._by_tenant: Dict[str, Dict[str, None]] = {}
+        self._by_status: Dict[Tuple[str, str], Dict[str, None]] = {}
+        self._by_cache_key: Dict[Tuple[str, str, str], Dict[str, None]] = {}
+        self._indexed: Dict[str, _IndexEntry] = {}
+
+    def _unindex(self, job_id: str) -> None:
+        entry = self._indexed.pop(job_id, None)
+        if not entry:
+            return
+        tenant, cache_key, job_type, status = entry
+        self._by_status.get((tenant, status), {}).pop(job_id, None)
+        if cache_key is not None:
+            self._by_cache_key.get((tenant, cache_key, job_type), {}).pop(job_id, None)
+
+    def _index(self, job: VideoRenderJob) -> None:
+        self._unindex(job.id)
+        self._by_tenant.setdefault(job.tenant_id, {})[job.id] = None
+        self._by_status.setdefault((job.tenant_id, job.status), {})[job.id] = None
+        if job.render_cache_key is not None:
+            self._by_cache_key.setdefault((job.tenant_id, job.render_cache_key, job.job_type), {})[job.id] = None
+        self._indexed[job.id] = (job.tenant_id, job.render_cache_key, job.job_type, job.status)
 
     def create(self, job: VideoRenderJob) -> VideoRenderJob:
         self.jobs[job.id] = job
+        self._index(job)
         return job
 
     def get(self, job_id: str) -> Optional[VideoRenderJob]:
         return self.jobs.get(job_id)
 
     def list(self, tenant_id: str, env: Optional[str] = None, status: Optional[str] = None, project_id: Optional[str] = None) -> List[VideoRenderJob]:
-        results = [j for j in self.jobs.values() if j.tenant_id == tenant_id]
+        if status:
+            bucket = self._by_status.get((tenant_id, status), {})
+        else:
+            bucket = self._by_tenant.get(tenant_id, {})
+        results = [self.jobs[jid] for jid in list(bucket)]
+        results = [j for j in results if j.tenant_id == tenant_id]
         if env:
             results = [j for j in results if j.env == env]
         if status:
@@ -86,22 +142,39 @@ class InMemoryRenderJobRepository(RenderJobRepository):
 
     def update(self, job: VideoRenderJob) -> VideoRenderJob:
         self.jobs[job.id] = job
+        self._index(job)
         return job
 
+    def _cache_key_matches(self, tenant_id: str, cache_key: str, job_type: Optional[RenderJobType]) -> Iterator[VideoRenderJob]:
+        job_types = [job_type] if job_type else ["full", "segment"]
+        for jt in job_types:
+            for jid in list(self._by_cache_key.get((tenant_id, cache_key, jt), {})):
+                job = self.jobs[jid]
+                if job.render_cache_key == cache_key and job.job_type == jt:
+                    yield job
+
     def find_by_cache_key(self, tenant_id: str, cache_key: str, job_type: Optional[RenderJobType] = None, statuses: Optional[List[str]] = None) -> Optional[VideoRenderJob]:
         target_statuses = set(statuses) if statuses else {"succeeded"}
-        for job in self.jobs.values():
-            if job.tenant_id != tenant_id:
-                continue
-            if job.render_cache_key != cache_key:
-                continue
-            if job.status not in target_statuses:
-                continue
-            if job_type and job.job_type != job_type:
-                continue
-            return job
+        for job in self._cache_key_matches(tenant_id, cache_key, job_type):
+            if job.status in target_statuses:
+                return job
         return None
 
+    def find_many_by_cache_keys(
+        self,
+        tenant_id: str,
+        cache_keys: Iterable[str],
+        job_type: Optional[RenderJobType] = None,
+        statuses: Optional[List[str]] = None,
+    ) -> Dict[str, List[VideoRenderJob]]:
+        target_statuses = set(statuses) if statuses else {"succeeded"}
+        results: Dict[str, List[VideoRenderJob]] = {}
+        for key in dict.fromkeys(cache_keys):
+            matches = [job for job in self._cache_key_matches(tenant_id, key, job_type) if job.status in target_statuses]
+            if matches:
+                results[key] = matches
+        return results
+
 
 class FirestoreRenderJobRepository(RenderJobRepository):
     def __init__(self, client: Optional[object] = None) -> None:
@@ -152,3 +225,27 @@ class FirestoreRenderJobRepository(RenderJobRepository):
         for d in docs:
             return VideoRenderJob(**d.to_dict())
         return None
+
+    def find_many_by_cache_keys(
+        self,
+        tenant_id: str,
+        cache_keys: Iterable[str],
+        job_type: Optional[RenderJobType] = None,
+        statuses: Optional[List[str]] = None,
+    ) -> Dict[str, List[VideoRenderJob]]:
+        # One `in` query per FIRESTORE_IN_QUERY_LIMIT keys; status is filtered client-side because
+        # Firestore allows a single `in` clause per query.
+        target_statuses = set(statuses) if statuses else {"succeeded"}
+        keys = list(dict.fromkeys(cache_keys))
+        results: Dict[str, List[VideoRenderJob]] = {}
+        for offset in range(0, len(keys), FIRESTORE_IN_QUERY_LIMIT):
+            query = self._col(tenant_id).where("render_cache_key", "in", keys[offset : offset + FIRESTORE_IN_QUERY_LIMIT])
+            if job_type:
+                query = query.where("job_type", "==", job_type)
+            for d in query.stream():
+                job = VideoRenderJob(**d.to_dict())
+                if job.status in target_statuses and job.render_cache_key:
+                    results.setdefault(job.render_cache_key, []).append(job)
+        for matches in results.values():
+            matches.sort(key=lambda j: j.created_at)
+        return results
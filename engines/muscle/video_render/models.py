@@ -33,6 +33,7 @@ class RenderRequest(BaseModel):
     voice_enhance_if_available_only: bool = True
     use_proxies: bool = False
     burn_in_captions: Optional[Dict[str, Any]] = None  # e.g. {"artifact_id": "...", "style": "default"}
+    keyframe_aligned: bool = False  # force closed-GOP keyframes at segment boundaries so stitching can stream-copy
 
 
 class PlanStep(BaseModel):
@@ -75,6 +76,8 @@ class RenderSegment(BaseModel):
     overlap_ms: float
     profile: RenderProfile
     cache_key: Optional[str] = None
+    keyframe_aligned: bool = False
+    lead_in_ms: float = 0.0  # overlap actually rendered before start_ms (0 for the first segment)
 
 
 class ChunkPlanRequest(BaseModel):
@@ -85,6 +88,7 @@ class ChunkPlanRequest(BaseModel):
     render_profile: RenderProfile = "social_1080p_h264"
     segment_duration_ms: int = 15000
     overlap_ms: int = 750
+    keyframe_aligned: bool = True
 
 
 class SegmentJobsRequest(BaseModel):
@@ -103,3 +107,4 @@ class StitchRequest(BaseModel):
     storage_target: Literal["local", "gcs"] = "local"
     normalize_audio: bool = False
     target_loudness_lufs: Optional[float] = None
+    stream_copy: bool = True  # concat-demuxer copy when segments are keyframe-aligned with matching codecs
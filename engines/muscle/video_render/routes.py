@@ -20,6 +20,7 @@ from engines.video_render.models import (
     StitchRequest,
 )
 from engines.video_render.jobs import VideoRenderJob
+from engines.video_render.scheduler import get_render_worker_pool
 from engines.video_render.service import get_render_service
 
 
@@ -134,9 +135,11 @@ def create_render_job(
         env=req.env,
     )
     try:
-        return get_render_service().create_job(req)
+        job = get_render_service().create_job(req)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
+    get_render_worker_pool().watch_tenant(req.tenant_id, req.env)
+    return job
 
 
 @router.get("/render/jobs/{job_id}", response_model=VideoRenderJob)
@@ -178,9 +181,11 @@ def create_segment_render_jobs(
         env=req.render_request.env,
     )
     try:
-        return get_render_service().create_segment_jobs(req.render_request, req.segments)
+        jobs = get_render_service().create_segment_jobs(req.render_request, req.segments)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
+    get_render_worker_pool().watch_tenant(req.render_request.tenant_id, req.render_request.env)
+    return jobs
 
 
 @router.post("/render/jobs/chunked", response_model=list[VideoRenderJob])
@@ -196,9 +201,12 @@ def create_chunked_jobs(
         env=req.env,
     )
     try:
-        return get_render_service().create_chunked_jobs(req)
+        # The pool runs the segments and stitches them once every one has succeeded.
+        run = get_render_worker_pool().submit_chunked(req)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
+    repo = get_render_service().job_repo
+    return [repo.get(job_id) for job_id in run.job_ids]
 
 
 @router.post("/render/jobs/{job_id}/run", response_model=VideoRenderJob)
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from engines.video_render.jobs import VideoRenderJob
+from engines.video_render.models import ChunkPlanRequest, RenderResult, StitchRequest
+from engines.video_render.service import RenderService, get_render_service
+
+logger = logging.getLogger(__name__)
+
+WORKERS_ENV = "VIDEO_RENDER_WORKERS"
+PER_TENANT_WORKERS_ENV = "VIDEO_RENDER_WORKERS_PER_TENANT"
+POLL_INTERVAL_SEC = 1.0
+DEFAULT_THREADS_PER_JOB = 4
+
+
+def default_worker_count(threads_per_job: int = DEFAULT_THREADS_PER_JOB) -> int:
+    """CPU-aware worker limit: each ffmpeg encode already uses `threads_per_job` cores."""
+    raw = os.getenv(WORKERS_ENV)
+    if raw:
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            pass
+    cpus = os.cpu_count() or 1
+    return max(1, cpus // max(1, threads_per_job))
+
+
+@dataclass
+class ChunkPlanRun:
+    id: str
+    stitch_template: StitchRequest
+    job_ids: List[str]
+    status: str = "running"  # running | stitching | succeeded | failed
+    result: Optional[RenderResult] = None
+    error_message: Optional[str] = None
+    failed_job_ids: List[str] = field(default_factory=list)
+
+
+class RenderWorkerPool:
+    """In-process scheduler that runs queued render jobs concurrently.
+
+    Each worker supervises one ffmpeg subprocess, so the encode itself runs in its own
+    process while plan building and result registration stay on the shared services.
+    Tenants are served round-robin (fewest running jobs first) and each tenant is
+    capped at `per_tenant_limit` concurrent jobs (VIDEO_RENDER_WORKERS_PER_TENANT,
+    else VIDEO_RENDER_MAX_CONCURRENT_JOBS) so one large chunked render cannot starve
+    everyone else. The stitch of a finished chunk plan runs as a pool job too and
+    takes a worker slot like any segment.
+    """
+
+    def __init__(
+        self,
+        service: Optional[RenderService] = None,
+        *,
+        max_workers: Optional[int] = None,
+        per_tenant_limit: Optional[int] = None,
+        poll_interval: float = POLL_INTERVAL_SEC,
+    ) -> None:
+        # Without an explicit service the pool follows set_render_service, like the routes do.
+        self._service = service
+        self.max_workers = max_workers or default_worker_count()
+        if per_tenant_limit is None:
+            try:
+                per_tenant_limit = int(os.getenv(PER_TENANT_WORKERS_ENV, "0"))
+            except ValueError:
+                per_tenant_limit = 0
+        if per_tenant_limit <= 0:
+            per_tenant_limit = getattr(self.service, "_max_concurrent_jobs", 0)
+        self.per_tenant_limit = min(per_tenant_limit, self.max_workers) if per_tenant_limit > 0 else self.max_workers
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="video-render")
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._tenants: Set[Tuple[str, Optional[str]]] = set()
+        self._running: Dict[str, Future] = {}
+        self._running_by_tenant: Dict[str, int] = {}
+        self._served_at: Dict[str, int] = {}
+        self._serve_seq = 0
+        self._plans: Dict[str, ChunkPlanRun] = {}
+        self._plan_by_job: Dict[str, str] = {}
+        self._stitches: Deque[str] = deque()
+
+    @property
+    def service(self) -> RenderService:
+        return self._service or get_render_service()
+
+    # --- registration -------------------------------------------------
+
+    def watch_tenant(self, tenant_id: str, env: Optional[str] = None) -> None:
+        with self._lock:
+            self._tenants.add((tenant_id, env))
+        self._wake.set()
+
+    def submit_chunked(self, req: ChunkPlanRequest, stitch: Optional[Dict[str, Any]] = None) -> ChunkPlanRun:
+        """Create segment jobs for a chunk plan and stitch them once every segment succeeds."""
+        jobs = self.service.create_chunked_jobs(req)
+        template = StitchRequest(
+            tenant_id=req.tenant_id,
+            env=req.env,
+            user_id=req.user_id,
+            project_id=req.project_id,
+            render_profile=req.render_profile,
+            segment_job_ids=[job.id for job in jobs],
+            **(stitch or {}),
+        )
+        return self.track_chunk_plan(jobs, template)
+
+    def track_chunk_plan(self, jobs: List[VideoRenderJob], stitch_template: StitchRequest) -> ChunkPlanRun:
+        run = ChunkPlanRun(id=uuid.uuid4().hex, stitch_template=stitch_template, job_ids=[job.id for job in jobs])
+        with self._lock:
+            self._plans[run.id] = run
+            for job in jobs:
+                self._plan_by_job[job.id] = run.id
+            self._tenants.add((stitch_template.tenant_id, stitch_template.env))
+            # Segments may all be cache hits already.
+            self._maybe_finish_plan(run.id)
+        self._wake.set()
+        return run
+
+    def get_chunk_plan(self, plan_id: str) -> Optional[ChunkPlanRun]:
+        with self._lock:
+            return self._plans.get(plan_id)
+
+    # --- lifecycle ----------------------------------------------------
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="video-render-dispatch", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread and wait:
+            self._thread.join()
+        self._executor.shutdown(wait=wait)
+
+    def run_until_idle(self, timeout: Optional[float] = None) -> None:
+        """Dispatch on the calling thread until no job is queued or running."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            dispatched = self.dispatch_once()
+            with self._lock:
+                pending = bool(self._running or self._stitches)
+            if not dispatched and not pending:
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError("render worker pool did not become idle")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.dispatch_once()
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    # --- scheduling ---------------------------------------------------
+
+    def _queued_by_tenant(self) -> Dict[str, List[VideoRenderJob]]:
+        with self._lock:
+            tenants = list(self._tenants)
+            claimed = set(self._running)
+        queued: Dict[str, List[VideoRenderJob]] = {}
+        for tenant_id, env in tenants:
+            jobs = [j for j in self.service.job_repo.list(tenant_id=tenant_id, env=env, status="queued") if j.id not in claimed]
+            if jobs:
+                # Oldest first; segments of one plan in timeline order.
+                jobs.sort(key=lambda j: (j.created_at, j.segment_index or 0))
+                queued.setdefault(tenant_id, []).extend(jobs)
+        return queued
+
+    def _tenant_has_slot(self, tenant: str) -> bool:
+        return self._running_by_tenant.get(tenant, 0) < self.per_tenant_limit
+
+    def _pick(self, queued: Dict[str, List[VideoRenderJob]]) -> Optional[VideoRenderJob]:
+        eligible = [tenant for tenant, jobs in queued.items() if jobs and self._tenant_has_slot(tenant)]
+        if not eligible:
+            return None
+        tenant = min(eligible, key=lambda t: (self._running_by_tenant.get(t, 0), self._served_at.get(t, 0)))
+        self._serve_seq += 1
+        self._served_at[tenant] = self._serve_seq
+        return queued[tenant].pop(0)
+
+    def _pick_stitch(self) -> Optional[ChunkPlanRun]:
+        # A waiting stitch goes ahead of its tenant's segments: it is what finishes the plan.
+        for plan_id in list(self._stitches):
+            run = self._plans[plan_id]
+            if self._tenant_has_slot(run.stitch_template.tenant_id):
+                self._stitches.remove(plan_id)
+                return run
+        return None
+
+    def _claim(self, key: str, tenant: str, fn: Callable[..., Any], *args: Any) -> Future:
+        self._running_by_tenant[tenant] = self._running_by_tenant.get(tenant, 0) + 1
+        future = self._executor.submit(fn, *args)
+        self._running[key] = future
+        return future
+
+    def _release(self, key: str, tenant: str) -> None:
+        self._running.pop(key, None)
+        self._running_by_tenant[tenant] = max(0, self._running_by_tenant.get(tenant, 1) - 1)
+
+    def dispatch_once(self) -> int:
+        """Fill free worker slots from the queue; returns the number of jobs started."""
+        queued = self._queued_by_tenant()
+        started: List[Tuple[Future, Callable[[Future], None]]] = []
+        with self._lock:
+            while len(self._running) < self.max_workers:
+                run = self._pick_stitch()
+                if run is not None:
+                    future = self._claim(
+                        f"stitch:{run.id}", run.stitch_template.tenant_id, self.service.stitch_segments, run.stitch_template
+                    )
+                    started.append((future, lambda fut, run=run: self._on_stitch_done(run, fut)))
+                    continue
+                job = self._pick(queued)
+                if not job:
+                    break
+                future = self._claim(job.id, job.tenant_id, self.service.run_job, job.id)
+                started.append((future, lambda fut, job=job: self._on_done(job, fut)))
+        # Attach callbacks outside the lock; an already finished future runs its callback inline.
+        for future, callback in started:
+            future.add_done_callback(callback)
+        return len(started)
+
+    def _on_done(self, job: VideoRenderJob, future: Future) -> None:
+        if future.exception() is not None:
+            stored = self.service.job_repo.get(job.id)
+            if stored and stored.status == "running":
+                stored.status = "failed"
+                stored.error_message = str(future.exception())
+                self.service.job_repo.update(stored)
+        with self._lock:
+            self._release(job.id, job.tenant_id)
+            plan_id = self._plan_by_job.get(job.id)
+            if plan_id:
+                # Under the lock so run_until_idle never sees the slot freed before the stitch is queued.
+                self._maybe_finish_plan(plan_id)
+        self._wake.set()
+
+    def _on_stitch_done(self, run: ChunkPlanRun, future: Future) -> None:
+        exc = future.exception()
+        with self._lock:
+            self._release(f"stitch:{run.id}", run.stitch_template.tenant_id)
+            if exc is not None:
+                logger.error(f"chunk plan {run.id} stitch failed: {exc}")
+                run.status = "failed"
+                run.error_message = str(exc)
+            else:
+                run.result = future.result()
+                run.status = "succeeded"
+        self._wake.set()
+
+    def _maybe_finish_plan(self, plan_id: str) -> None:
+        """Caller holds the lock; queues the stitch once every segment has succeeded."""
+        run = self._plans.get(plan_id)
+        if not run or run.status != "running":
+            return
+        jobs = [self.service.job_repo.get(jid) for jid in run.job_ids]
+        failed = [jid for jid, job in zip(run.job_ids, jobs) if not job or job.status in {"failed", "cancelled"}]
+        if failed:
+            run.status = "failed"
+            run.failed_job_ids = failed
+            run.error_message = "segment jobs did not succeed"
+            # No stitch is coming, so don't spend workers on the remaining segments.
+            for job in jobs:
+                if job and job.status == "queued" and job.id not in self._running:
+                    self.service.cancel_job(job.id)
+            return
+        if any(job.status != "succeeded" for job in jobs if job):
+            return
+        run.status = "stitching"
+        self._stitches.append(plan_id)
+
+
+_default_pool: Optional[RenderWorkerPool] = None
+
+
+def get_render_worker_pool() -> RenderWorkerPool:
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = RenderWorkerPool()
+    return _default_pool
+
+
+def set_render_worker_pool(pool: Optional[RenderWorkerPool]) -> None:
+    global _default_pool
+    _default_pool = pool
+
+
+def start_render_worker_pool() -> None:
+    """App startup hook: begin dispatching queued render jobs in this process."""
+    get_render_worker_pool().start()
+
+
+def stop_render_worker_pool() -> None:
+    """App shutdown hook: stop dispatching and wait for running encodes."""
+    global _default_pool
+    if _default_pool is not None:
+        _default_pool.stop()
+        _default_pool = None
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import math
 import os
 import shutil
 import subprocess
 import tempfile
+import threading
+import time
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
@@ -12,7 +15,16 @@ from typing import Any, Dict, List, Optional
 from engines.media_v2.models import ArtifactCreateRequest, DerivedArtifact, MediaAsset, MediaUploadRequest
 from engines.media_v2.service import get_media_service
 from engines.storage.gcs_client import GcsClient
-from engines.video_render.ffmpeg_runner import FFmpegError, run_ffmpeg, get_available_hardware_encoders
+from engines.video_render.cache_keys import (
+    TimelineFingerprint,
+    build_timeline_fingerprint,
+    clip_in_window,
+    keyframe_fps,
+    render_window,
+    segment_lead_in_ms,
+    request_digest,
+)
+from engines.video_render.ffmpeg_runner import FFmpegError, FFmpegProgress, run_ffmpeg, get_available_hardware_encoders, probe_stream_signature
 from engines.video_render.jobs import VideoRenderJob, RenderJobRepository, InMemoryRenderJobRepository, FirestoreRenderJobRepository, RenderJobType
 from engines.video_render.models import (
     ChunkPlanRequest,
@@ -48,6 +60,25 @@ def _clamp(value: float, min_value: Optional[float], max_value: Optional[float])
     return value
 
 
+def _job_lead_in_ms(job: VideoRenderJob) -> float:
+    fps = keyframe_fps(job.render_profile, bool(job.request_payload.get("keyframe_aligned")))
+    return segment_lead_in_ms(job.segment_start_ms, job.overlap_ms, fps)
+
+
+def _ts_floor(seconds: float) -> str:
+    """Microsecond timestamp at or before `seconds` (keyframe times, outpoints)."""
+    return f"{math.floor(seconds * 1e6 + 1e-6) / 1e6:.6f}"
+
+
+def _ts_ceil(seconds: float) -> str:
+    """Microsecond timestamp at or after `seconds`; an inpoint here seeks to the frame's own keyframe."""
+    return f"{math.ceil(seconds * 1e6 - 1e-6) / 1e6:.6f}"
+
+
+def _concat_escape(path: str) -> str:
+    return path.replace("'", "'\\''")
+
+
 def _float_param(params: Dict[str, Any], key: str, default: float, *, min_value: Optional[float] = None, max_value: Optional[float] = None) -> float:
     raw = params.get(key, default)
     try:
@@ -79,6 +110,8 @@ CHUNK_TIMEOUT_ENV = "VIDEO_RENDER_CHUNK_TIMEOUT"
 DEFAULT_PLAN_TIMEOUT = 120
 CHUNK_PLAN_TIMEOUT = 90
 DEFAULT_MAX_CONCURRENT_JOBS = 4
+PROGRESS_UPDATE_INTERVAL_SEC = 2.0
+PROGRESS_MIN_DELTA = 0.01
 
 PROXY_LADDER = [
     {
@@ -201,6 +234,8 @@ class RenderService:
             self._chunk_timeout = int(os.getenv(CHUNK_TIMEOUT_ENV, str(CHUNK_PLAN_TIMEOUT)))
         except ValueError:
             self._chunk_timeout = CHUNK_PLAN_TIMEOUT
+        # Per-thread progress sink so concurrent run_job calls report into their own job.
+        self._progress_local = threading.local()
 
     def _default_job_repo(self) -> RenderJobRepository:
         try:
@@ -208,15 +243,17 @@ class RenderService:
         except Exception:
             return InMemoryRenderJobRepository()
 
-    def _assert_job_capacity(self, tenant_id: str, env: Optional[str]) -> None:
+    def _running_job_count(self, tenant_id: str, env: Optional[str]) -> int:
+        return len(self.job_repo.list(tenant_id=tenant_id, env=env, status="running"))
+
+    def _assert_job_capacity(self, tenant_id: str, env: Optional[str], running: Optional[int] = None) -> None:
+        # Queued jobs wait for a worker (see scheduler.RenderWorkerPool, which also uses this
+        # limit as its per-tenant concurrency); only jobs actually encoding count here.
         if self._max_concurrent_jobs <= 0:
             return
-        active = [
-            job
-            for job in self.job_repo.list(tenant_id=tenant_id, env=env)
-            if job.status in {"queued", "running"}
-        ]
-        if len(active) >= self._max_concurrent_jobs:
+        if running is None:
+            running = self._running_job_count(tenant_id, env)
+        if running >= self._max_concurrent_jobs:
             raise RuntimeError(f"max concurrent render jobs reached ({self._max_concurrent_jobs})")
 
     def get_transition_presets(self) -> Dict[str, Dict[str, Any]]:
@@ -258,6 +295,14 @@ class RenderService:
              args.extend(["-b:a", prof["audio_bitrate"]])
         return args
 
+    def _keyframe_args(self, vcodec: str, keyframe_times_s: List[float]) -> List[str]:
+        """Force closed-GOP keyframes at the given output timestamps (segment boundaries)."""
+        times = ",".join(_ts_floor(t) for t in sorted(set(keyframe_times_s)))
+        args = ["-force_key_frames", times or "0", "-flags", "+cgop"]
+        if "nvenc" in vcodec:
+            args.extend(["-forced-idr", "1"])
+        return args
+
     def _resolve_hardware_encoder(self, profile: RenderProfile) -> str:
         base_codec = PROFILE_MAP[profile]["vcodec"]
         if self._force_cpu_enc:
@@ -525,20 +570,8 @@ class RenderService:
             for auto in self.timeline_service.list_automation("clip", clip.id):
                 automation_map.setdefault(clip.id, []).append(auto)
 
-        window_start = max(0.0, (req.start_ms or 0) - req.overlap_ms if req.start_ms is not None else 0.0)
-        window_end = req.end_ms + req.overlap_ms if req.end_ms is not None else None
-
-        filtered_clips = []
-        for clip in clips:
-            clip_speed = clip.speed if getattr(clip, "speed", 1.0) else 1.0
-            clip_duration = max(0.0, (clip.out_ms - clip.in_ms) / clip_speed if clip_speed > 0 else 0.0)
-            clip_start = clip.start_ms_on_timeline
-            clip_end = clip_start + clip_duration
-            if window_end is not None and clip_start >= window_end:
-                continue
-            if clip_end <= window_start:
-                continue
-            filtered_clips.append(clip)
+        window_start, window_end = render_window(req)
+        filtered_clips = [clip for clip in clips if clip_in_window(clip, window_start, window_end)]
 
         sorted_clips = sorted(filtered_clips, key=lambda c: c.start_ms_on_timeline)
         artifact_cache: dict[str, List[DerivedArtifact]] = {}
@@ -1010,6 +1043,15 @@ class RenderService:
             post_mix_filters.append(f"loudnorm=I={target}:TP=-1.5:LRA=11:dual_mono=true")
             
         args.extend(profile_args)
+        keyframe_meta: Optional[Dict[str, Any]] = None
+        if req.keyframe_aligned and req.start_ms is not None:
+            # Keyframes at the lead-in edge and the content end let the stitcher cut the overlap without re-encoding.
+            lead_in_ms = req.start_ms - window_start
+            keyframe_times_ms = [0.0, lead_in_ms]
+            if req.end_ms is not None:
+                keyframe_times_ms.append(lead_in_ms + max(0.0, req.end_ms - req.start_ms))
+            args.extend(self._keyframe_args(selected_encoder, [t / 1000.0 for t in keyframe_times_ms]))
+            keyframe_meta = {"lead_in_ms": lead_in_ms, "keyframe_times_ms": sorted(set(keyframe_times_ms))}
         filter_complex_parts = list(vf_filters)
         filter_complex_parts.extend(transition_audio_filters)
         
@@ -1058,6 +1100,12 @@ class RenderService:
             meta["source_assets"] = source_asset_ids
         if req.segment_index is not None:
             meta["stage_timeout"] = self._chunk_timeout
+        if keyframe_meta:
+            meta["keyframe_aligned"] = keyframe_meta
+        if window_end is not None:
+            meta["expected_duration_ms"] = max(0.0, window_end - window_start)
+        else:
+            meta["expected_duration_ms"] = max(0.0, self._sequence_duration_ms(sequence, clips) - window_start)
         if voice_enhance_warnings:
             meta["voice_enhance_warnings"] = voice_enhance_warnings
         if audio_semantic_sources:
@@ -1186,13 +1234,15 @@ class RenderService:
             return str(dest)
         if not _ffmpeg_available():
             raise FFmpegError("ffmpeg not available")
-        timeout = plan.meta.get("stage_timeout") or self._default_timeout
+        # stage_timeout is a no-progress watchdog, so long renders are fine as long as ffmpeg keeps advancing.
+        stall_timeout = plan.meta.get("stage_timeout") or self._default_timeout
         try:
             return run_ffmpeg(
                 plan,
-                timeout=timeout,
                 stage=stage,
                 hint=hint or "validate assets and filter graph",
+                stall_timeout=stall_timeout,
+                on_progress=getattr(self._progress_local, "sink", None),
             )
         except FFmpegError as err:
             self._cleanup_output(plan.output_path)
@@ -1217,12 +1267,16 @@ class RenderService:
             max_end = max(max_end, clip.start_ms_on_timeline + dur)
         return max_end
 
-    def _cache_key(self, req: RenderRequest) -> str:
-        project = self.timeline_service.get_project(req.project_id)
-        updated = getattr(project, "updated_at", None) if project else None
-        norm = f"norm:{int(req.normalize_audio)}:{req.target_loudness_lufs if req.target_loudness_lufs is not None else 'na'}"
+    def _timeline_fingerprint(self, project_id: str) -> Optional[TimelineFingerprint]:
+        return build_timeline_fingerprint(self.timeline_service, self.media_service, project_id)
+
+    def _cache_key(self, req: RenderRequest, fingerprint: Optional[TimelineFingerprint] = None) -> str:
+        """Content-addressed key: only timeline state intersecting the render window is hashed."""
+        if fingerprint is None:
+            fingerprint = self._timeline_fingerprint(req.project_id)
+        digest = fingerprint.window_digest(req) if fingerprint else request_digest(req)
         window = f"{req.start_ms}-{req.end_ms}-ol:{req.overlap_ms}"
-        return f"{req.project_id}:{req.render_profile}:{norm}:{updated.isoformat() if updated else 'na'}:{window}"
+        return f"{req.project_id}:{req.render_profile}:{window}:{digest[:32]}"
 
     def _register_render_output(self, req: RenderRequest, output_uri: str, cache_val: str, artifact_kind: str = "render", meta: Optional[dict] = None):
         upload_req = MediaUploadRequest(
@@ -1291,11 +1345,18 @@ class RenderService:
         for track in tracks:
             clips.extend(self.timeline_service.list_clips_for_track(track.id))
         total_duration = self._sequence_duration_ms(sequence, clips)
+        fingerprint = self._timeline_fingerprint(req.project_id)
+        step_ms = float(req.segment_duration_ms)
+        if req.keyframe_aligned:
+            # Snap boundaries to whole frames so forced keyframes land exactly on them.
+            fps = PROFILE_MAP[req.render_profile]["fps"]
+            frames_per_segment = max(1, round(req.segment_duration_ms * fps / 1000.0))
+            step_ms = frames_per_segment * 1000.0 / fps
         segments: List[RenderSegment] = []
         idx = 0
         start = 0.0
         while start < total_duration:
-            end = min(start + req.segment_duration_ms, total_duration)
+            end = min((idx + 1) * step_ms, total_duration)
             seg = RenderSegment(
                 tenant_id=req.tenant_id,
                 env=req.env,
@@ -1322,6 +1383,8 @@ class RenderService:
                 end_ms=end,
                 overlap_ms=req.overlap_ms,
                 segment_index=idx,
+                keyframe_aligned=req.keyframe_aligned,
+                lead_in_ms=segment_lead_in_ms(start, req.overlap_ms, keyframe_fps(req.render_profile, req.keyframe_aligned)),
             )
             seg_req = RenderRequest(
                 tenant_id=req.tenant_id,
@@ -1333,8 +1396,9 @@ class RenderService:
                 end_ms=end,
                 overlap_ms=req.overlap_ms,
                 segment_index=idx,
+                keyframe_aligned=req.keyframe_aligned,
             )
-            seg.cache_key = self._cache_key(seg_req)
+            seg.cache_key = self._cache_key(seg_req, fingerprint)
             segments.append(seg)
             start = end
             idx += 1
@@ -1342,6 +1406,8 @@ class RenderService:
 
     def create_segment_jobs(self, base_req: RenderRequest, segments: List[RenderSegment]) -> List[VideoRenderJob]:
         jobs: List[VideoRenderJob] = []
+        fingerprint = self._timeline_fingerprint(base_req.project_id)
+        planned: List[tuple[RenderSegment, RenderRequest, str]] = []
         for seg in segments:
             seg_req = base_req.model_copy(
                 update={
@@ -1349,14 +1415,25 @@ class RenderService:
                     "end_ms": seg.end_ms,
                     "overlap_ms": seg.overlap_ms,
                     "segment_index": seg.segment_index,
+                    "keyframe_aligned": seg.keyframe_aligned or base_req.keyframe_aligned,
                 }
             )
-            cache_val = self._cache_key(seg_req)
-            cached = self.job_repo.find_by_cache_key(seg_req.tenant_id, cache_val, job_type="segment", statuses=["queued", "running"])
+            planned.append((seg, seg_req, self._cache_key(seg_req, fingerprint)))
+        # One batched lookup for every segment instead of two per segment.
+        existing = self.job_repo.find_many_by_cache_keys(
+            base_req.tenant_id,
+            [cache_val for _, _, cache_val in planned],
+            job_type="segment",
+            statuses=["queued", "running", "succeeded"],
+        )
+        running_count: Optional[int] = None
+        for seg, seg_req, cache_val in planned:
+            matches = existing.get(cache_val, [])
+            cached = next((j for j in matches if j.status in {"queued", "running"}), None)
             if cached:
                 jobs.append(cached)
                 continue
-            cached = self.job_repo.find_by_cache_key(seg_req.tenant_id, cache_val, job_type="segment", statuses=["succeeded"])
+            cached = next((j for j in matches if j.status == "succeeded"), None)
             if cached:
                 job = VideoRenderJob(
                     tenant_id=seg_req.tenant_id,
@@ -1378,7 +1455,9 @@ class RenderService:
                 )
                 jobs.append(self.job_repo.create(job))
                 continue
-            self._assert_job_capacity(seg_req.tenant_id, seg_req.env)
+            if self._max_concurrent_jobs > 0 and running_count is None:
+                running_count = self._running_job_count(seg_req.tenant_id, seg_req.env)
+            self._assert_job_capacity(seg_req.tenant_id, seg_req.env, running=running_count)
             plan_snapshot = self._build_plan(seg_req.model_copy(update={"dry_run": True}))
             job = VideoRenderJob(
                 tenant_id=seg_req.tenant_id,
@@ -1450,6 +1529,26 @@ class RenderService:
         )
         return self.job_repo.create(job)
 
+    def _job_progress_sink(self, job: VideoRenderJob):
+        """Throttled ffmpeg progress -> job repository updates."""
+        last_write = [0.0]
+
+        def sink(progress: FFmpegProgress) -> None:
+            if progress.fraction is None:
+                return
+            value = min(0.99, max(job.progress, progress.fraction))
+            now = time.monotonic()
+            if value - job.progress < PROGRESS_MIN_DELTA and not progress.done:
+                return
+            if now - last_write[0] < PROGRESS_UPDATE_INTERVAL_SEC and not progress.done:
+                return
+            last_write[0] = now
+            job.progress = value
+            job.updated_at = datetime.now(timezone.utc)
+            self.job_repo.update(job)
+
+        return sink
+
     def run_job(self, job_id: str) -> VideoRenderJob:
         job = self.job_repo.get(job_id)
         if not job:
@@ -1460,6 +1559,7 @@ class RenderService:
         job.progress = 0.1
         job.updated_at = datetime.now(timezone.utc)
         self.job_repo.update(job)
+        self._progress_local.sink = self._job_progress_sink(job)
         try:
             req = RenderRequest(**job.request_payload)
             if job.job_type == "segment":
@@ -1473,6 +1573,8 @@ class RenderService:
         except Exception as exc:  # pragma: no cover
             job.status = "failed"
             job.error_message = str(exc)
+        finally:
+            self._progress_local.sink = None
         job.updated_at = datetime.now(timezone.utc)
         self.job_repo.update(job)
         return job
@@ -1514,24 +1616,141 @@ class RenderService:
         segments = sorted(segments, key=lambda j: j.segment_index or 0)
         input_paths: List[str] = []
         input_meta: List[dict] = []
-        vf_filters: List[str] = []
-        afilters: List[str] = []
-        for idx, job in enumerate(segments):
+        artifacts: List[DerivedArtifact] = []
+        for job in segments:
             if not job.result_artifact_id:
                 raise ValueError(f"job {job.id} missing artifact")
             artifact = self.media_service.get_artifact(job.result_artifact_id)
             if not artifact:
                 raise ValueError(f"artifact {job.result_artifact_id} missing")
-            uri = self._ensure_local(artifact.uri)
-            input_paths.append(uri)
+            artifacts.append(artifact)
+            input_paths.append(self._ensure_local(artifact.uri))
             input_meta.append({"kind": "segment", "segment_index": job.segment_index})
+        out_path = stitch.output_path or str(Path(tempfile.gettempdir()) / f"{stitch.project_id}_stitched.mp4")
+        copy_blocker = self._stream_copy_blocker(stitch, segments, artifacts, input_paths)
+        if copy_blocker is None:
+            plan = self._stitch_copy_plan(stitch, segments, input_paths, input_meta, out_path)
+        else:
+            plan = self._stitch_reencode_plan(stitch, segments, input_paths, input_meta, out_path)
+            plan.meta["stream_copy_fallback"] = copy_blocker
+        try:
+            output_uri = self._execute_plan(plan, stage="stitch segments", hint="concat segment artifacts")
+        finally:
+            if plan.meta.get("concat_list"):
+                shutil.rmtree(Path(plan.meta["concat_list"]).parent, ignore_errors=True)
+        output_uri = self._maybe_upload_output(stitch.tenant_id, output_uri, stitch.storage_target)
+        cache_val = self._cache_key(
+            RenderRequest(
+                tenant_id=stitch.tenant_id,
+                env=stitch.env,
+                user_id=stitch.user_id,
+                project_id=stitch.project_id,
+                render_profile=stitch.render_profile,
+                normalize_audio=stitch.normalize_audio,
+                target_loudness_lufs=stitch.target_loudness_lufs,
+            )
+        )
+        asset, artifact = self._register_render_output(
+            RenderRequest(
+                tenant_id=stitch.tenant_id,
+                env=stitch.env,
+                user_id=stitch.user_id,
+                project_id=stitch.project_id,
+                render_profile=stitch.render_profile,
+            ),
+            output_uri,
+            cache_val,
+            artifact_kind="render",
+            meta={"stitched_from": [j.id for j in segments], "stitch_mode": plan.meta.get("stitch_mode")},
+        )
+        return RenderResult(asset_id=asset.id, artifact_id=artifact.id, uri=output_uri, render_profile=stitch.render_profile, plan_preview=plan)
+
+    def _stream_copy_blocker(
+        self,
+        stitch: StitchRequest,
+        segments: List[VideoRenderJob],
+        artifacts: List[DerivedArtifact],
+        input_paths: List[str],
+    ) -> Optional[str]:
+        """Return why the segments cannot be joined with `-c copy`, or None when they can."""
+        if not stitch.stream_copy:
+            return "stream_copy_disabled"
+        for job in segments:
+            if not job.request_payload.get("keyframe_aligned"):
+                return f"segment_{job.segment_index}_not_keyframe_aligned"
+            if job.render_profile != stitch.render_profile:
+                return f"segment_{job.segment_index}_profile_mismatch"
+        signatures = [probe_stream_signature(path) for path in input_paths]
+        if any(sig is None for sig in signatures):
+            # No ffprobe: compare the encode settings recorded when each segment was rendered.
+            signatures = [
+                {"render_profile": art.meta.get("render_profile"), "encoder_used": art.meta.get("encoder_used")}
+                for art in artifacts
+            ]
+        if any(sig != signatures[0] for sig in signatures[1:]):
+            return "codec_parameters_differ"
+        return None
+
+    def _stitch_copy_plan(
+        self,
+        stitch: StitchRequest,
+        segments: List[VideoRenderJob],
+        input_paths: List[str],
+        input_meta: List[dict],
+        out_path: str,
+    ) -> RenderPlan:
+        # Segments carry keyframes at their lead-in edge and content end, so in/out points cut cleanly on copy.
+        lines: List[str] = []
+        for job, uri in zip(segments, input_paths):
+            lead_in = _job_lead_in_ms(job) / 1000.0
+            seg_duration = max(0.0, (job.segment_end_ms or 0) - (job.segment_start_ms or 0)) / 1000.0
+            lines.append(f"file '{_concat_escape(str(Path(uri).resolve()))}'")
+            if lead_in > 0:
+                lines.append(f"inpoint {_ts_ceil(lead_in)}")
+            lines.append(f"outpoint {_ts_floor(lead_in + seg_duration)}")
+        list_path = Path(tempfile.mkdtemp(prefix="stitch_")) / "segments.txt"
+        list_path.write_text("\n".join(lines) + "\n")
+
+        args = ["ffmpeg", "-f", "concat", "-safe", "0", "-i", str(list_path), "-map", "0:v", "-map", "0:a?"]
+        audio_filters: List[str] = []
+        if stitch.normalize_audio:
+            # Loudness normalisation needs decoded audio; video still stream-copies.
+            target = stitch.target_loudness_lufs or -16.0
+            audio_filters.append(f"loudnorm=I={target}:TP=-1.5:LRA=11:dual_mono=true")
+            prof = PROFILE_MAP[stitch.render_profile]
+            args.extend(["-c:v", "copy", "-af", audio_filters[0], "-c:a", prof["acodec"]])
+            if prof.get("audio_bitrate"):
+                args.extend(["-b:a", prof["audio_bitrate"]])
+        else:
+            args.extend(["-c", "copy"])
+        args.extend(["-movflags", "+faststart", "-y", out_path])
+        return RenderPlan(
+            inputs=input_paths,
+            input_meta=input_meta,
+            steps=[PlanStep(description="stitch segments", ffmpeg_args=args)],
+            output_path=out_path,
+            profile=stitch.render_profile,
+            filters=list(audio_filters),
+            audio_filters=audio_filters,
+            meta={"stitch_mode": "stream_copy", "concat_list": str(list_path)},
+        )
+
+    def _stitch_reencode_plan(
+        self,
+        stitch: StitchRequest,
+        segments: List[VideoRenderJob],
+        input_paths: List[str],
+        input_meta: List[dict],
+        out_path: str,
+    ) -> RenderPlan:
+        vf_filters: List[str] = []
+        afilters: List[str] = []
         args = ["ffmpeg"]
         for uri in input_paths:
             args.extend(["-i", uri])
         for idx, job in enumerate(segments):
             seg_duration = max(0.0, (job.segment_end_ms or 0) - (job.segment_start_ms or 0)) / 1000.0
-            overlap = (job.overlap_ms or 0) / 1000.0
-            trim_start = overlap if idx > 0 else 0.0
+            trim_start = _job_lead_in_ms(job) / 1000.0
             trim_end = trim_start + seg_duration
             vf_filters.append(f"[{idx}:v]trim=start={trim_start}:end={trim_end},setpts=PTS-STARTPTS[v{idx}]")
             afilters.append(f"[{idx}:a]atrim=start={trim_start}:end={trim_end},asetpts=PTS-STARTPTS[a{idx}]")
@@ -1543,7 +1762,6 @@ class RenderService:
             target = stitch.target_loudness_lufs or -16.0
             filter_parts.append(f"[acat]loudnorm=I={target}:TP=-1.5:LRA=11:dual_mono=true[aout]")
             audio_out_label = "[aout]"
-        profile_args = self._profile_args(stitch.render_profile)
         args.extend(
             [
                 "-filter_complex",
@@ -1554,12 +1772,9 @@ class RenderService:
                 audio_out_label,
             ]
         )
-        args.extend(profile_args)
-        out_path = stitch.output_path or str(Path(tempfile.gettempdir()) / f"{stitch.project_id}_stitched.mp4")
+        args.extend(self._profile_args(stitch.render_profile))
         args.extend(["-y", out_path])
-        from engines.video_render.models import PlanStep
-
-        plan = RenderPlan(
+        return RenderPlan(
             inputs=input_paths,
             input_meta=input_meta,
             steps=[PlanStep(description="stitch segments", ffmpeg_args=args)],
@@ -1567,34 +1782,8 @@ class RenderService:
             profile=stitch.render_profile,
             filters=filter_parts,
             audio_filters=[f for f in filter_parts if "atrim" in f or "loudnorm" in f],
+            meta={"stitch_mode": "reencode"},
         )
-        output_uri = self._execute_plan(plan, stage="stitch segments", hint="concat segment artifacts")
-        output_uri = self._maybe_upload_output(stitch.tenant_id, output_uri, stitch.storage_target)
-        cache_val = self._cache_key(
-            RenderRequest(
-                tenant_id=stitch.tenant_id,
-                env=stitch.env,
-                user_id=stitch.user_id,
-                project_id=stitch.project_id,
-                render_profile=stitch.render_profile,
-                normalize_audio=stitch.normalize_audio,
-                target_loudness_lufs=stitch.target_loudness_lufs,
-            )
-        )
-        asset, artifact = self._register_render_output(
-            RenderRequest(
-                tenant_id=stitch.tenant_id,
-                env=stitch.env,
-                user_id=stitch.user_id,
-                project_id=stitch.project_id,
-                render_profile=stitch.render_profile,
-            ),
-            output_uri,
-            cache_val,
-            artifact_kind="render",
-            meta={"stitched_from": [j.id for j in segments]},
-        )
-        return RenderResult(asset_id=asset.id, artifact_id=artifact.id, uri=output_uri, render_profile=stitch.render_profile, plan_preview=plan)
 
     def create_chunked_jobs(self, req: ChunkPlanRequest) -> List[VideoRenderJob]:
         base_req = RenderRequest(
@@ -1603,6 +1792,7 @@ class RenderService:
             user_id=req.user_id,
             project_id=req.project_id,
             render_profile=req.render_profile,
+            keyframe_aligned=req.keyframe_aligned,
         )
         segments = self.plan_segments(req)
         return self.create_segment_jobs(base_req, segments)
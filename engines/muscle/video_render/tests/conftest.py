@@ -1,9 +1,17 @@
-import pytest
+import types
 from pathlib import Path
+from typing import List, NamedTuple
+
+import pytest
 
 import engines.identity.auth as auth_module
 from engines.identity.jwt_service import AuthContext
-from engines.video_render.service import AssetAccessError, RenderService
+from engines.media_v2.models import MediaUploadRequest
+from engines.media_v2.service import InMemoryMediaRepository, LocalMediaStorage, MediaService, set_media_service
+from engines.video_render.jobs import InMemoryRenderJobRepository
+from engines.video_render.service import AssetAccessError, RenderService, set_render_service
+from engines.video_timeline.models import Clip, Sequence, Track, VideoProject
+from engines.video_timeline.service import InMemoryTimelineRepository, TimelineService, set_timeline_service
 
 
 def _default_video_render_auth():
@@ -45,3 +53,51 @@ def _video_render_test_env(monkeypatch):
     monkeypatch.setenv("DATASETS_BUCKET", "test-datasets-bucket")
     monkeypatch.setattr(auth_module, "get_auth_context", _stub_get_auth_context)
     monkeypatch.setattr(RenderService, "_ensure_local", _stub_ensure_local)
+
+
+class SeededProject(NamedTuple):
+    project: VideoProject
+    render_service: RenderService
+    timeline_service: TimelineService
+    media_service: MediaService
+    clips: List[Clip]
+
+
+@pytest.fixture
+def seed_project(tmp_path):
+    """Factory wiring in-memory services and a 30fps project with back-to-back clips.
+
+    Each clip gets its own source asset. Plan execution is stubbed to return the
+    output path; the render service keeps its default job admission limit.
+    """
+
+    def _seed(*clip_durations_ms: int, title: str = "Test") -> SeededProject:
+        media_service = MediaService(repo=InMemoryMediaRepository(), storage=LocalMediaStorage())
+        timeline_service = TimelineService(repo=InMemoryTimelineRepository())
+        set_media_service(media_service)
+        set_timeline_service(timeline_service)
+        render_service = RenderService(job_repo=InMemoryRenderJobRepository())
+        set_render_service(render_service)
+        render_service._execute_plan = types.MethodType(
+            lambda self, plan, *, stage="render timeline", hint=None: plan.output_path,
+            render_service,
+        )
+        ids = dict(tenant_id="t_test", env="dev", user_id="u1")
+        project = timeline_service.create_project(VideoProject(**ids, title=title))
+        sequence = timeline_service.create_sequence(Sequence(**ids, project_id=project.id, name="Seq", timebase_fps=30))
+        track = timeline_service.create_track(Track(**ids, sequence_id=sequence.id, kind="video", order=0))
+        clips = []
+        start_ms = 0
+        for idx, duration_ms in enumerate(clip_durations_ms or (1000,)):
+            src = tmp_path / f"clip{idx}.mp4"
+            src.write_bytes(b"video")
+            asset = media_service.register_remote(MediaUploadRequest(**ids, kind="video", source_uri=str(src)))
+            clips.append(
+                timeline_service.create_clip(
+                    Clip(**ids, track_id=track.id, asset_id=asset.id, in_ms=0, out_ms=duration_ms, start_ms_on_timeline=start_ms)
+                )
+            )
+            start_ms += duration_ms
+        return SeededProject(project, render_service, timeline_service, media_service, clips)
+
+    return _seed
@@ -0,0 +1,62 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from engines.video_render.ffmpeg_runner import FFmpegError, run_ffmpeg
+from engines.video_render.models import PlanStep, RenderPlan
+
+
+def _fake_ffmpeg(body: str) -> str:
+    path = Path(tempfile.mkdtemp()) / "ffmpeg"
+    path.write_text("#!/bin/sh\n" + body)
+    path.chmod(0o755)
+    return str(path)
+
+
+def _plan(binary: str, **meta) -> RenderPlan:
+    out = Path(tempfile.mkdtemp()) / "out.mp4"
+    return RenderPlan(
+        output_path=str(out),
+        profile="social_1080p_h264",
+        steps=[PlanStep(description="test", ffmpeg_args=[binary, "-i", "in.mp4", "-t", "4.000", "-y", str(out)])],
+        meta=meta,
+    )
+
+
+def test_progress_blocks_are_streamed_with_fraction():
+    binary = _fake_ffmpeg(
+        "for t in 1000000 2000000 4000000; do\n"
+        "  printf 'frame=30\\nfps=29.5\\nout_time_us=%s\\nspeed=1.5x\\nprogress=continue\\n' $t\n"
+        "done\n"
+        "printf 'out_time_us=4000000\\nprogress=end\\n'\n"
+    )
+    updates = []
+    run_ffmpeg(_plan(binary), on_progress=updates.append)
+
+    assert [round(u.fraction, 2) for u in updates] == [0.25, 0.5, 1.0, 1.0]
+    assert updates[0].speed == 1.5
+    assert updates[0].fps == 29.5
+    assert updates[-1].done
+
+
+def test_progress_args_are_injected():
+    binary = _fake_ffmpeg('echo "$@" >&2\nexit 3\n')
+    with pytest.raises(FFmpegError) as exc:
+        run_ffmpeg(_plan(binary))
+    assert "-progress pipe:1 -nostats" in exc.value.stderr_tail
+
+
+def test_stalled_encode_is_aborted_by_watchdog():
+    binary = _fake_ffmpeg("printf 'out_time_us=1000000\\nprogress=continue\\n'\nexec sleep 30\n")
+    with pytest.raises(FFmpegError) as exc:
+        run_ffmpeg(_plan(binary), stall_timeout=1)
+    assert "stalled" in str(exc.value)
+
+
+def test_stderr_is_bounded():
+    binary = _fake_ffmpeg("i=0\nwhile [ $i -lt 1000 ]; do echo \"line $i\" >&2; i=$((i+1)); done\nexit 1\n")
+    with pytest.raises(FFmpegError) as exc:
+        run_ffmpeg(_plan(binary))
+    assert exc.value.stderr_tail.splitlines()[-1] == "line 999"
+    assert len(exc.value.stderr_tail.splitlines()) == 10
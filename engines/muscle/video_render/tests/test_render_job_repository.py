@@ -0,0 +1,76 @@
+from engines.video_render import jobs as jobs_module
+from engines.video_render.jobs import FirestoreRenderJobRepository, InMemoryRenderJobRepository, VideoRenderJob
+
+
+def _job(**overrides) -> VideoRenderJob:
+    payload = dict(tenant_id="t1", env="dev", project_id="p1", render_profile="social_1080p_h264", job_type="segment")
+    payload.update(overrides)
+    return VideoRenderJob(**payload)
+
+
+def test_indexes_follow_status_updates():
+    repo = InMemoryRenderJobRepository()
+    job = repo.create(_job(render_cache_key="k1"))
+    repo.create(_job(tenant_id="t2", render_cache_key="k1"))
+    assert [j.id for j in repo.list("t1", status="queued")] == [job.id]
+    assert repo.find_by_cache_key("t1", "k1", job_type="segment") is None
+
+    job.status = "succeeded"
+    repo.update(job)
+    assert repo.list("t1", status="queued") == []
+    assert [j.id for j in repo.list("t1", status="succeeded")] == [job.id]
+    assert repo.find_by_cache_key("t1", "k1", job_type="segment").id == job.id
+    assert repo.find_by_cache_key("t1", "k1", job_type="full") is None
+    assert repo.find_by_cache_key("t1", "k1").id == job.id
+
+
+def test_in_place_mutation_before_update_is_not_returned_stale():
+    repo = InMemoryRenderJobRepository()
+    job = repo.create(_job())
+    job.status = "running"
+    assert repo.list("t1", status="queued") == []
+
+
+def test_find_many_by_cache_keys_groups_matches():
+    repo = InMemoryRenderJobRepository()
+    done = repo.create(_job(render_cache_key="a", status="succeeded"))
+    active = repo.create(_job(render_cache_key="a", status="running"))
+    repo.create(_job(render_cache_key="b", status="failed"))
+    found = repo.find_many_by_cache_keys("t1", ["a", "b", "c"], job_type="segment", statuses=["running", "succeeded"])
+    assert list(found) == ["a"]
+    assert [j.id for j in found["a"]] == [done.id, active.id]
+
+
+class _FakeQuery:
+    def __init__(self, store, calls, filters=()):
+        self.store, self.calls, self.filters = store, calls, list(filters)
+
+    def where(self, field, op, value):
+        return _FakeQuery(self.store, self.calls, self.filters + [(field, op, value)])
+
+    def stream(self):
+        self.calls.append(self.filters)
+        for doc in self.store:
+            if all(doc.get(f) in v if op == "in" else doc.get(f) == v for f, op, v in self.filters):
+                yield type("Snap", (), {"to_dict": lambda self, d=doc: d})()
+
+
+class _FakeClient:
+    def __init__(self, store):
+        self.store, self.calls = store, []
+
+    def collection(self, name):
+        return _FakeQuery(self.store, self.calls)
+
+
+def test_firestore_find_many_batches_in_queries(monkeypatch):
+    monkeypatch.setattr(jobs_module, "firestore", object())
+    store = [_job(render_cache_key=f"k{i}", status="succeeded").model_dump() for i in range(65)]
+    client = _FakeClient(store)
+    repo = FirestoreRenderJobRepository(client=client)
+
+    found = repo.find_many_by_cache_keys("t1", [f"k{i}" for i in range(65)], job_type="segment", statuses=["succeeded"])
+
+    assert len(found) == 65
+    assert len(client.calls) == 3  # ceil(65 / 30) round trips
+    assert all(("job_type", "==", "segment") in call for call in client.calls)
@@ -99,6 +99,15 @@ def test_backpressure():
         assert job1.status == "queued"
         assert job2.status == "queued"
         
-        # Third one should fail
+        # Queued jobs wait for a worker and do not count against the limit
+        job3 = service.create_job(req3)
+        assert job3.status == "queued"
+        service.cancel_job(job3.id)
+        
+        for job in (job1, job2):
+            job.status = "running"
+            service.job_repo.update(job)
+        
+        # Third one should fail while two are running
         with pytest.raises(RuntimeError, match="max concurrent render jobs reached"):
             service.create_job(req3)
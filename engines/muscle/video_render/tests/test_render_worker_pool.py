@@ -0,0 +1,169 @@
+import threading
+import types
+
+from engines.video_render.jobs import InMemoryRenderJobRepository, VideoRenderJob
+from engines.video_render.models import ChunkPlanRequest
+from engines.video_render.scheduler import RenderWorkerPool, default_worker_count, set_render_worker_pool
+
+
+
+def test_default_worker_count_is_cpu_aware(monkeypatch):
+    monkeypatch.delenv("VIDEO_RENDER_WORKERS", raising=False)
+    monkeypatch.setattr("os.cpu_count", lambda: 32)
+    assert default_worker_count(threads_per_job=4) == 8
+    monkeypatch.setenv("VIDEO_RENDER_WORKERS", "3")
+    assert default_worker_count() == 3
+
+
+def test_chunk_plan_runs_segments_and_auto_stitches(seed_project):
+    project, render_service, *_ = seed_project(3000, title="Pool")
+    pool = RenderWorkerPool(render_service, max_workers=3, poll_interval=0.01)
+    try:
+        run = pool.submit_chunked(
+            ChunkPlanRequest(tenant_id="t_test", env="dev", user_id="u1", project_id=project.id, segment_duration_ms=1000, overlap_ms=100)
+        )
+        pool.run_until_idle(timeout=10)
+    finally:
+        pool.stop()
+
+    assert len(run.job_ids) == 3
+    assert all(render_service.job_repo.get(jid).status == "succeeded" for jid in run.job_ids)
+    assert run.status == "succeeded"
+    assert run.result is not None
+    assert run.result.plan_preview.meta["stitch_mode"] == "stream_copy"
+
+
+def test_long_chunk_plan_runs_under_the_default_job_cap(monkeypatch, seed_project):
+    monkeypatch.delenv("VIDEO_RENDER_MAX_CONCURRENT_JOBS", raising=False)
+    monkeypatch.delenv("VIDEO_RENDER_WORKERS_PER_TENANT", raising=False)
+    project, render_service, *_ = seed_project(10000, title="Pool")
+    lock = threading.Lock()
+    running, peak = [0], [0]
+    run_job = render_service.run_job
+
+    def _counting_run_job(job_id):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        try:
+            return run_job(job_id)
+        finally:
+            with lock:
+                running[0] -= 1
+
+    render_service.run_job = _counting_run_job
+    pool = RenderWorkerPool(render_service, max_workers=8, poll_interval=0.01)
+    assert pool.per_tenant_limit == 4  # VIDEO_RENDER_MAX_CONCURRENT_JOBS default
+    try:
+        run = pool.submit_chunked(
+            ChunkPlanRequest(tenant_id="t_test", env="dev", user_id="u1", project_id=project.id, segment_duration_ms=1000, overlap_ms=100)
+        )
+        pool.run_until_idle(timeout=20)
+    finally:
+        pool.stop()
+
+    assert len(run.job_ids) == 10
+    assert run.status == "succeeded"
+    assert peak[0] <= 4
+
+
+def test_stitch_runs_as_a_pool_job_holding_a_slot(seed_project):
+    project, render_service, *_ = seed_project(3000, title="Pool")
+    pool = RenderWorkerPool(render_service, max_workers=1, poll_interval=0.01)
+    seen = {}
+    stitch_segments = render_service.stitch_segments
+
+    def _observing_stitch(stitch):
+        with pool._lock:
+            seen["running"] = list(pool._running)
+        seen["thread"] = threading.current_thread().name
+        return stitch_segments(stitch)
+
+    render_service.stitch_segments = _observing_stitch
+    try:
+        run = pool.submit_chunked(
+            ChunkPlanRequest(tenant_id="t_test", env="dev", user_id="u1", project_id=project.id, segment_duration_ms=1000, overlap_ms=100)
+        )
+        pool.run_until_idle(timeout=10)
+    finally:
+        pool.stop()
+
+    assert run.status == "succeeded"
+    assert seen["running"] == [f"stitch:{run.id}"]
+    assert seen["thread"].startswith("video-render")
+
+
+def test_chunked_route_submits_through_the_pool(seed_project):
+    from engines.common.identity import RequestContext
+    from engines.identity.jwt_service import AuthContext
+    from engines.video_render import routes
+
+    project, render_service, *_ = seed_project(3000, title="Pool")
+    pool = RenderWorkerPool(max_workers=2, poll_interval=0.01)
+    set_render_worker_pool(pool)
+    try:
+        jobs = routes.create_chunked_jobs(
+            ChunkPlanRequest(tenant_id="t_test", env="dev", user_id="u1", project_id=project.id, segment_duration_ms=1000, overlap_ms=100),
+            request_context=RequestContext(tenant_id="t_test", env="dev", mode="lab", project_id=project.id, user_id="u1"),
+            auth_context=AuthContext(user_id="u1", email="u1@example.com", tenant_ids=["t_test"], default_tenant_id="t_test", role_map={"t_test": "owner"}),
+        )
+        pool.run_until_idle(timeout=10)
+    finally:
+        pool.stop()
+        set_render_worker_pool(None)
+
+    assert len(jobs) == 3
+    assert all(render_service.job_repo.get(job.id).status == "succeeded" for job in jobs)
+    assert [plan.status for plan in pool._plans.values()] == ["succeeded"]
+
+
+def test_chunk_plan_not_stitched_when_segment_fails(seed_project):
+    project, render_service, *_ = seed_project(3000, title="Pool")
+    render_service.render_segment = types.MethodType(lambda self, req, cache_key=None: (_ for _ in ()).throw(ValueError("boom")), render_service)
+    pool = RenderWorkerPool(render_service, max_workers=2, poll_interval=0.01)
+    try:
+        run = pool.submit_chunked(
+            ChunkPlanRequest(tenant_id="t_test", env="dev", user_id="u1", project_id=project.id, segment_duration_ms=1000, overlap_ms=100)
+        )
+        pool.run_until_idle(timeout=10)
+    finally:
+        pool.stop()
+
+    assert run.status == "failed"
+    assert run.result is None
+    assert run.failed_job_ids
+    assert all(render_service.job_repo.get(jid).status in {"failed", "cancelled"} for jid in run.job_ids)
+
+
+def test_tenants_share_workers_fairly():
+    repo = InMemoryRenderJobRepository()
+    for idx in range(4):
+        repo.create(VideoRenderJob(tenant_id="t_big", env="dev", project_id="p", render_profile="social_1080p_h264", segment_index=idx))
+    repo.create(VideoRenderJob(tenant_id="t_small", env="dev", project_id="p", render_profile="social_1080p_h264"))
+
+    release = threading.Event()
+    started: list[str] = []
+
+    class _BlockingService:
+        job_repo = repo
+
+        def run_job(self, job_id: str):
+            job = repo.get(job_id)
+            started.append(job.tenant_id)
+            job.status = "running"
+            release.wait(5)
+            job.status = "succeeded"
+            return job
+
+    pool = RenderWorkerPool(_BlockingService(), max_workers=2, poll_interval=0.01)
+    pool.watch_tenant("t_big", "dev")
+    pool.watch_tenant("t_small", "dev")
+    try:
+        assert pool.dispatch_once() == 2
+        release.set()
+        pool.run_until_idle(timeout=10)
+    finally:
+        pool.stop()
+
+    assert sorted(started[:2]) == ["t_big", "t_small"]
+    assert started.count("t_big") == 4
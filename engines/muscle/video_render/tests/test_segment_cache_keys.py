@@ -0,0 +1,79 @@
+from engines.media_v2.models import ArtifactCreateRequest
+from engines.video_render.models import ChunkPlanRequest, RenderRequest
+from engines.video_render.service import RenderService
+from engines.video_timeline.models import Filter, FilterStack
+
+
+
+def _chunk_req(project_id: str) -> ChunkPlanRequest:
+    return ChunkPlanRequest(tenant_id="t_test", env="dev", user_id="u1", project_id=project_id, segment_duration_ms=1000, overlap_ms=100)
+
+
+def _keys(render_service: RenderService, project_id: str) -> list[str]:
+    return [seg.cache_key for seg in render_service.plan_segments(_chunk_req(project_id))]
+
+
+def test_clip_edit_only_invalidates_intersecting_segments(seed_project):
+    project, render_service, timeline_service, _, clips = seed_project(1000, 1000, 1000, title="Keys")
+    before = _keys(render_service, project.id)
+    assert len(set(before)) == 3
+
+    last = clips[2]
+    last.out_ms = 900
+    timeline_service.update_clip(last)
+    after = _keys(render_service, project.id)
+
+    # Segment 1 renders 100ms of overlap into clip 2, so it is dirty too; segment 0 is untouched.
+    assert after[0] == before[0]
+    assert after[1] != before[1]
+    assert after[2] != before[2]
+
+
+def test_clip_filters_change_keys_but_project_metadata_does_not(seed_project):
+    project, render_service, timeline_service, _, clips = seed_project(1000, 1000, 1000, title="Keys")
+    before = _keys(render_service, project.id)
+
+    project.title = "Renamed"
+    timeline_service.update_project(project)
+    timeline_service.create_filter_stack(
+        FilterStack(tenant_id="t_test", env="dev", target_type="clip", target_id=clips[0].id, filters=[Filter(type="skin_smooth", params={"intensity": 0.5})])
+    )
+    after = _keys(render_service, project.id)
+    # Segment 1's lead-in overlaps clip 0; segment 2 never sees it.
+    assert after[0] != before[0]
+    assert after[1] != before[1]
+    assert after[2] == before[2]
+
+
+def test_source_asset_version_is_part_of_key(seed_project):
+    project, render_service, _, media_service, clips = seed_project(1000, 1000, 1000, title="Keys")
+    before = _keys(render_service, project.id)
+    media_service.register_artifact(
+        ArtifactCreateRequest(tenant_id="t_test", env="dev", parent_asset_id=clips[0].asset_id, kind="video_proxy", uri="/tmp/proxy.mp4")
+    )
+    after = _keys(render_service, project.id)
+    assert after[0] != before[0]
+    assert after[2] == before[2]
+
+
+def test_segment_jobs_reuse_clean_segments_after_edit(seed_project):
+    project, render_service, timeline_service, _, clips = seed_project(1000, 1000, 1000, title="Keys")
+    first = render_service.create_chunked_jobs(_chunk_req(project.id))
+    for job in first:
+        assert render_service.run_job(job.id).status == "succeeded"
+
+    clips[2].volume_db = -6.0
+    timeline_service.update_clip(clips[2])
+    second = render_service.create_chunked_jobs(_chunk_req(project.id))
+
+    assert [job.status for job in second] == ["succeeded", "queued", "queued"]
+    assert second[0].result_artifact_id == first[0].result_artifact_id
+
+
+def test_delivery_fields_are_not_part_of_key(seed_project):
+    project, render_service, *_ = seed_project(1000, 1000, 1000, title="Keys")
+    base = RenderRequest(tenant_id="t_test", env="dev", user_id="u1", project_id=project.id)
+    moved = base.model_copy(update={"user_id": "u2", "output_path": "/tmp/elsewhere.mp4", "storage_target": "gcs"})
+    normalized = base.model_copy(update={"normalize_audio": True})
+    assert render_service._cache_key(base) == render_service._cache_key(moved)
+    assert render_service._cache_key(base) != render_service._cache_key(normalized)
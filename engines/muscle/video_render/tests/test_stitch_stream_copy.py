@@ -0,0 +1,124 @@
+import types
+from pathlib import Path
+
+import pytest
+
+from engines.video_render import service as render_service_module
+from engines.video_render.models import ChunkPlanRequest, StitchRequest
+from engines.video_render.service import RenderService
+
+
+
+def _chunk_req(project_id: str, **overrides) -> ChunkPlanRequest:
+    payload = dict(tenant_id="t_test", env="dev", user_id="u1", project_id=project_id, segment_duration_ms=1000, overlap_ms=100)
+    payload.update(overrides)
+    return ChunkPlanRequest(**payload)
+
+
+def _run_all(render_service: RenderService, jobs):
+    for job in jobs:
+        assert render_service.run_job(job.id).status == "succeeded"
+
+
+def test_keyframe_aligned_segments_force_boundary_keyframes(seed_project):
+    project, render_service, *_ = seed_project(2500, title="Stitch")
+    segments = render_service.plan_segments(_chunk_req(project.id, segment_duration_ms=1010))
+    # 1010ms at 30fps snaps to 30 frames.
+    assert [seg.start_ms for seg in segments] == [0.0, 1000.0, 2000.0]
+    assert segments[0].lead_in_ms == 0.0
+    assert segments[1].lead_in_ms == 100.0
+
+    jobs = render_service.create_chunked_jobs(_chunk_req(project.id))
+    args = jobs[1].plan_snapshot["steps"][0]["ffmpeg_args"]
+    assert args[args.index("-force_key_frames") + 1] == "0.000000,0.100000,1.100000"
+    assert "+cgop" in args
+    assert jobs[1].plan_snapshot["meta"]["keyframe_aligned"]["lead_in_ms"] == 100.0
+
+
+def test_default_overlap_lead_in_is_whole_frames_end_to_end(seed_project):
+    project, render_service, *_ = seed_project(2500, title="Stitch")
+    # 750ms at 30fps is 22.5 frames; the lead-in snaps to 22 frames everywhere.
+    lead_in_s = 22 / 30
+    req = ChunkPlanRequest(tenant_id="t_test", env="dev", user_id="u1", project_id=project.id, segment_duration_ms=1000)
+    assert req.overlap_ms == 750
+    segments = render_service.plan_segments(req)
+    assert [seg.lead_in_ms for seg in segments] == pytest.approx([0.0, lead_in_s * 1000, lead_in_s * 1000])
+
+    jobs = render_service.create_chunked_jobs(req)
+    snapshot = jobs[1].plan_snapshot
+    assert snapshot["meta"]["keyframe_aligned"]["lead_in_ms"] == pytest.approx(lead_in_s * 1000)
+    args = snapshot["steps"][0]["ffmpeg_args"]
+    keyframes = [float(t) for t in args[args.index("-force_key_frames") + 1].split(",")]
+    # Keyframe times round down and inpoints round up, so both resolve to frame 22 itself.
+    assert -1e-6 <= keyframes[1] - lead_in_s <= 0
+
+    _run_all(render_service, jobs)
+    listings = []
+
+    def _execute(self, plan, *, stage="render timeline", hint=None):
+        listings.append(Path(plan.meta["concat_list"]).read_text().splitlines())
+        return plan.output_path
+
+    render_service._execute_plan = types.MethodType(_execute, render_service)
+    render_service.stitch_segments(
+        StitchRequest(tenant_id="t_test", env="dev", user_id="u1", project_id=project.id, segment_job_ids=[j.id for j in jobs])
+    )
+    inpoints = [float(line.split()[1]) for line in listings[0] if line.startswith("inpoint ")]
+    assert len(inpoints) == 2
+    assert all(0 <= point - lead_in_s <= 1e-6 for point in inpoints)
+
+
+def test_stitch_uses_concat_copy_for_matching_segments(seed_project):
+    project, render_service, *_ = seed_project(2500, title="Stitch")
+    jobs = render_service.create_chunked_jobs(_chunk_req(project.id))
+    _run_all(render_service, jobs)
+    listings = []
+
+    def _execute(self, plan, *, stage="render timeline", hint=None):
+        listings.append(Path(plan.meta["concat_list"]).read_text().splitlines())
+        return plan.output_path
+
+    render_service._execute_plan = types.MethodType(_execute, render_service)
+
+    result = render_service.stitch_segments(
+        StitchRequest(tenant_id="t_test", env="dev", user_id="u1", project_id=project.id, segment_job_ids=[j.id for j in jobs])
+    )
+    plan = result.plan_preview
+    args = plan.steps[0].ffmpeg_args
+    assert plan.meta["stitch_mode"] == "stream_copy"
+    assert args[args.index("-f") + 1] == "concat"
+    assert args[args.index("-c") + 1] == "copy"
+    assert "-filter_complex" not in args
+    directives = [line for line in listings[0] if not line.startswith("file ")]
+    assert directives == [
+        "outpoint 1.000000", "inpoint 0.100000", "outpoint 1.100000", "inpoint 0.100000", "outpoint 0.600000",
+    ]
+    # The concat list's temp dir is removed once the plan has run.
+    assert not Path(plan.meta["concat_list"]).parent.exists()
+
+
+def test_stitch_falls_back_to_reencode_when_codecs_differ(monkeypatch, seed_project):
+    project, render_service, *_ = seed_project(2500, title="Stitch")
+    jobs = render_service.create_chunked_jobs(_chunk_req(project.id))
+    _run_all(render_service, jobs)
+    signatures = iter([{"video": {"codec_name": "h264"}}, {"video": {"codec_name": "hevc"}}, {"video": {"codec_name": "h264"}}])
+    monkeypatch.setattr(render_service_module, "probe_stream_signature", lambda path: next(signatures))
+
+    result = render_service.stitch_segments(
+        StitchRequest(tenant_id="t_test", env="dev", user_id="u1", project_id=project.id, segment_job_ids=[j.id for j in jobs])
+    )
+    assert result.plan_preview.meta["stitch_mode"] == "reencode"
+    assert result.plan_preview.meta["stream_copy_fallback"] == "codec_parameters_differ"
+    assert "-filter_complex" in result.plan_preview.steps[0].ffmpeg_args
+
+
+def test_stitch_reencodes_segments_rendered_without_keyframe_alignment(seed_project):
+    project, render_service, *_ = seed_project(2500, title="Stitch")
+    jobs = render_service.create_chunked_jobs(_chunk_req(project.id, keyframe_aligned=False))
+    _run_all(render_service, jobs)
+
+    result = render_service.stitch_segments(
+        StitchRequest(tenant_id="t_test", env="dev", user_id="u1", project_id=project.id, segment_job_ids=[j.id for j in jobs])
+    )
+    assert result.plan_preview.meta["stitch_mode"] == "reencode"
+    assert result.plan_preview.meta["stream_copy_fallback"] == "segment_0_not_keyframe_aligned"
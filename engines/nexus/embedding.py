@@ -1,8 +1,32 @@
-"""Embedding adapter for Nexus pipelines."""
+"""Embedding adapter for Nexus pipelines.
+
+Text embeddings go through a shared pipeline (``BatchedEmbeddingAdapter``):
+
+* ``embed_texts_batch`` embeds many texts per model call, in chunks of
+  EMBED_BATCH_SIZE;
+* concurrent single ``embed_text`` calls for the same model are coalesced
+  into one batch, waiting at most EMBED_BATCH_MAX_WAIT_MS for company;
+* results are cached by sha256(model_id, normalized text) in a memory LRU of
+  EMBED_CACHE_SIZE entries backed by an on-disk store under EMBED_CACHE_DIR,
+  so repeated chunks and repeated queries never reach the model twice;
+* loaded model handles are cached per model id.
+"""
 from __future__ import annotations
 
+import hashlib
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
 from dataclasses import dataclass
-from typing import List, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from engines.common.identity import RequestContext
 from engines.common.selecta import get_selecta_resolver
@@ -26,10 +50,175 @@ class EmbeddingResult:
     model_id: str
 
 
+EMBED_BATCH_SIZE_ENV = "EMBED_BATCH_SIZE"
+EMBED_BATCH_MAX_WAIT_MS_ENV = "EMBED_BATCH_MAX_WAIT_MS"
+EMBED_CACHE_SIZE_ENV = "EMBED_CACHE_SIZE"
+EMBED_CACHE_DIR_ENV = "EMBED_CACHE_DIR"
+
+DEFAULT_EMBED_BATCH_SIZE = 64
+DEFAULT_EMBED_BATCH_MAX_WAIT_MS = 10
+DEFAULT_EMBED_CACHE_SIZE = 10_000
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys: NFC, trimmed, internal whitespace collapsed."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def embedding_cache_key(model_id: str, text: str) -> str:
+    return hashlib.sha256(f"{model_id}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Memory LRU in front of an optional on-disk store of vectors keyed by content hash."""
+
+    def __init__(self, max_entries: int = DEFAULT_EMBED_CACHE_SIZE, root: Optional[str] = None) -> None:
+        self._max_entries = max_entries
+        self._root = Path(root) if root else None
+        if self._root:
+            self._root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _disk_path(self, key: str) -> Path:
+        return self._root / key[:2] / f"{key}.json"  # type: ignore[operator]
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        if not self._max_entries:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str, count_miss: bool = True) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                return vector
+        if self._root:
+            path = self._disk_path(key)
+            if path.exists():
+                try:
+                    vector = json.loads(path.read_text(encoding="utf-8"))
+                except ValueError:
+                    vector = None
+                if vector is not None:
+                    with self._lock:
+                        self._remember(key, vector)
+                        self._stats["disk_hits"] += 1
+                    return vector
+        if count_miss:
+            with self._lock:
+                self._stats["misses"] += 1
+        return None
+
+    def put(self, key: str, vector: List[float]) -> None:
+        with self._lock:
+            self._remember(key, vector)
+        if self._root:
+            path = self._disk_path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(vector), encoding="utf-8")
+            os.replace(tmp, path)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._memory)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+
+class _MicroBatcher:
+    """Coalesces concurrent single-item submissions into one batch call per key.
+
+    The first submitter for a key becomes the leader: it waits until the batch
+    is full or the latency budget expires, then runs the batch for everyone.
+    """
+
+    def __init__(self, run_batch: Callable[[Any, List[Any]], List[Any]], max_size: int, max_wait: float) -> None:
+        self._run_batch = run_batch
+        self._max_size = max(1, max_size)
+        self._max_wait = max_wait
+        self._cond = threading.Condition()
+        self._pending: Dict[Any, List[Tuple[Any, Future]]] = {}
+
+    def submit(self, key: Any, item: Any) -> Any:
+        future: Future = Future()
+        with self._cond:
+            queue = self._pending.setdefault(key, [])
+            queue.append((item, future))
+            leader = len(queue) == 1
+            if len(queue) >= self._max_size:
+                self._cond.notify_all()
+        if not leader:
+            return future.result()
+        deadline = time.monotonic() + self._max_wait
+        with self._cond:
+            while len(self._pending[key]) < self._max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending.pop(key)
+        try:
+            results = self._run_batch(key, [entry for entry, _ in batch])
+        except BaseException as exc:
+            for _, waiter in batch:
+                waiter.set_exception(exc)
+        else:
+            for (_, waiter), result in zip(batch, results):
+                waiter.set_result(result)
+        return future.result()
+
+
+_default_cache: Optional[EmbeddingCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            root = os.getenv(EMBED_CACHE_DIR_ENV) or str(Path(tempfile.gettempdir()) / "embedding_cache")
+            _default_cache = EmbeddingCache(_env_int(EMBED_CACHE_SIZE_ENV, DEFAULT_EMBED_CACHE_SIZE), root=root)
+        return _default_cache
+
+
+def set_embedding_cache(cache: Optional[EmbeddingCache]) -> None:
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = cache
+
+
 class EmbeddingAdapter:
     def embed_text(self, text: str, model_id: Optional[str] = None, context: Optional[RequestContext] = None) -> EmbeddingResult:
         raise NotImplementedError
 
+    def embed_texts_batch(
+        self,
+        texts: Sequence[str],
+        model_id: Optional[str] = None,
+        context: Optional[RequestContext] = None,
+    ) -> List[EmbeddingResult]:
+        """Embed many texts; adapters without a native batch path embed one by one."""
+        if context is None:
+            return [self.embed_text(text, model_id=model_id) for text in texts]
+        return [self.embed_text(text, model_id=model_id, context=context) for text in texts]
+
     def embed_image(self, image_uri: str, model_id: Optional[str] = None, context: Optional[RequestContext] = None) -> EmbeddingResult:
         raise NotImplementedError
 
@@ -37,10 +226,134 @@ class EmbeddingAdapter:
         raise NotImplementedError
 
 
-class VertexEmbeddingAdapter(EmbeddingAdapter):
+class BatchedEmbeddingAdapter(EmbeddingAdapter):
+    """Text embedding pipeline: cache lookup, micro-batching and chunked model calls.
+
+    Subclasses implement ``_resolve_model`` and ``_embed_uncached``.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: Optional[int] = None,
+        max_wait_ms: Optional[int] = None,
+    ) -> None:
+        self._cache = cache or get_embedding_cache()
+        self._batch_size = max(1, batch_size or _env_int(EMBED_BATCH_SIZE_ENV, DEFAULT_EMBED_BATCH_SIZE))
+        wait_ms = _env_int(EMBED_BATCH_MAX_WAIT_MS_ENV, DEFAULT_EMBED_BATCH_MAX_WAIT_MS) if max_wait_ms is None else max_wait_ms
+        self._batcher = _MicroBatcher(self._embed_batch_for_model, self._batch_size, wait_ms / 1000.0)
+        self._stats_lock = threading.Lock()
+        self._model_calls = 0
+
+    def _resolve_model(self, model_id: Optional[str], context: Optional[RequestContext]) -> str:
+        raise NotImplementedError
+
+    def _embed_uncached(self, texts: List[str], model: str) -> List[List[float]]:
+        raise NotImplementedError
+
+    def _embed_batch_for_model(self, model: str, texts: List[str]) -> List[List[float]]:
+        """Resolve texts for one model through the cache; only misses reach the model."""
+        keys = [embedding_cache_key(model, text) for text in texts]
+        vectors: Dict[str, List[float]] = {}
+        misses: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in vectors or key in misses:
+                continue
+            cached = self._cache.get(key)
+            if cached is not None:
+                vectors[key] = cached
+            else:
+                misses[key] = normalize_text(text)
+        miss_keys = list(misses)
+        for start in range(0, len(miss_keys), self._batch_size):
+            chunk = miss_keys[start : start + self._batch_size]
+            with self._stats_lock:
+                self._model_calls += 1
+            embedded = self._embed_uncached([misses[key] for key in chunk], model)
+            if len(embedded) != len(chunk):
+                raise RuntimeError(f"embedding model {model} returned {len(embedded)} vectors for {len(chunk)} texts")
+            for key, vector in zip(chunk, embedded):
+                vector = [float(v) for v in vector]
+                self._cache.put(key, vector)
+                vectors[key] = vector
+        return [vectors[key] for key in keys]
+
+    def embed_text(self, text: str, model_id: Optional[str] = None, context: Optional[RequestContext] = None) -> EmbeddingResult:
+        model = self._resolve_model(model_id, context)
+        # Cached texts skip the batching window; misses are counted once, by the batch.
+        cached = self._cache.get(embedding_cache_key(model, text), count_miss=False)
+        if cached is not None:
+            return EmbeddingResult(vector=list(cached), model_id=model)
+        vector = self._batcher.submit(model, text)
+        return EmbeddingResult(vector=list(vector), model_id=model)
+
+    def embed_texts_batch(
+        self,
+        texts: Sequence[str],
+        model_id: Optional[str] = None,
+        context: Optional[RequestContext] = None,
+    ) -> List[EmbeddingResult]:
+        if not texts:
+            return []
+        model = self._resolve_model(model_id, context)
+        vectors = self._embed_batch_for_model(model, list(texts))
+        return [EmbeddingResult(vector=list(vector), model_id=model) for vector in vectors]
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            model_calls = self._model_calls
+        return {**self._cache.stats(), "model_calls": model_calls}
+
+
+class LocalHashEmbeddingAdapter(BatchedEmbeddingAdapter):
+    """Deterministic, dependency-free stand-in embedder for tests and benchmarks.
+
+    Hashes word tokens and character trigrams into a fixed number of buckets
+    and L2-normalizes, so texts sharing words land near each other.
+    """
+
+    def __init__(self, dimensions: int = 64, cache: Optional[EmbeddingCache] = None, **kwargs: Any) -> None:
+        super().__init__(cache=cache or EmbeddingCache(), **kwargs)
+        self.dimensions = dimensions
+        self.model_id = f"local-hash-{dimensions}"
+
+    def _resolve_model(self, model_id: Optional[str], context: Optional[RequestContext]) -> str:
+        return model_id or self.model_id
+
+    def _embed_uncached(self, texts: List[str], model: str) -> List[List[float]]:
+        return [self._vector(text) for text in texts]
+
+    def _vector(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        lowered = text.lower()
+        features = lowered.split() + [lowered[i : i + 3] for i in range(max(0, len(lowered) - 2))]
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "big") % self.dimensions
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+
+_text_models: Dict[str, Any] = {}
+_text_models_lock = threading.Lock()
+
+
+def _text_model(model: str):
+    """Process-wide cache of loaded Vertex text embedding model handles."""
+    with _text_models_lock:
+        handle = _text_models.get(model)
+        if handle is None:
+            handle = TextEmbeddingModel.from_pretrained(model)
+            _text_models[model] = handle
+        return handle
+
+
+class VertexEmbeddingAdapter(BatchedEmbeddingAdapter):
     """Minimal Vertex embedding adapter (text/image)."""
 
-    def __init__(self, client: Optional[object] = None) -> None:
+    def __init__(self, client: Optional[object] = None, cache: Optional[EmbeddingCache] = None) -> None:
+        super().__init__(cache=cache)
         self._selecta = get_selecta_resolver()
         self._client = client or self._init_client()
 
@@ -63,20 +376,19 @@ class VertexEmbeddingAdapter(EmbeddingAdapter):
             tenant = "t_dev"
         return RequestContext(request_id="selecta_embed", tenant_id=tenant, env=env)
 
-    def embed_text(self, text: str, model_id: Optional[str] = None, context: Optional[RequestContext] = None) -> EmbeddingResult:
-        ctx = context or self._default_ctx()
-        model = model_id or self._selecta.embed_config(ctx).model_id
+    def _resolve_model(self, model_id: Optional[str], context: Optional[RequestContext]) -> str:
+        model = model_id or self._selecta.embed_config(context or self._default_ctx()).model_id
         if self._client is None or model is None:
             raise RuntimeError("Vertex embedding client/model missing")
-        
+        return model
+
+    def _embed_uncached(self, texts: List[str], model: str) -> List[List[float]]:
         try:
-            embed_model = TextEmbeddingModel.from_pretrained(model)
             # Modern SDK: get_embeddings takes a list of strings
-            embeddings = embed_model.get_embeddings([text])
+            embeddings = _text_model(model).get_embeddings(texts)
             if not embeddings:
                 raise RuntimeError("Vertex returned no embeddings")
-            vector = embeddings[0].values
-            return EmbeddingResult(vector=list(vector), model_id=model)
+            return [list(embedding.values) for embedding in embeddings]
         except Exception as e:
             raise RuntimeError(f"Vertex text embedding failed for model {model}: {e}") from e
 
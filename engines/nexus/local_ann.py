@@ -0,0 +1,372 @@
+"""Embedded, disk-persisted approximate nearest neighbour index.
+
+Backs the ``local`` vector store backend for Nexus RAG and the Vector Explorer
+so small and mid-size tenants can be served in-process, without a network hop
+to Vertex Matching Engine.
+
+Vectors are partitioned by (tenant_id, env, namespace), where namespace is the
+Nexus kind or the explorer space; restrict filtering is therefore a partition
+lookup rather than a post-filter. Each partition is an IVF-flat index:
+
+* a compacted snapshot (``vectors.npy``) of unit-normalised float32 rows,
+  memory-mapped on load and ordered by k-means cluster so that each inverted
+  list is one contiguous slice;
+* a tail of rows written since the snapshot, always scanned exactly;
+* tombstones for deleted or overwritten rows, skipped at query time;
+* an append-only ``ops.jsonl`` log replayed on reload.
+
+Compaction drops tombstoned rows, retrains the coarse quantizer, rewrites the
+snapshot and truncates the log. It runs automatically once the tail or the
+tombstones grow past a fraction of the snapshot. Scores are cosine similarity
+(higher is closer).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import quote, unquote
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR_ENV = "LOCAL_VECTOR_INDEX_DIR"
+NPROBE_ENV = "LOCAL_VECTOR_NPROBE"
+
+DEFAULT_INDEX_DIR = "/tmp/nexus_local_ann"
+DEFAULT_NPROBE = 8
+# Below this many rows a partition is scanned exactly and no quantizer is trained.
+IVF_MIN_ROWS = 4096
+_KMEANS_ITERATIONS = 12
+_COMPACT_TAIL_MIN = 1024
+_COMPACT_FRACTION = 0.25
+
+PartitionKey = Tuple[str, str, str]
+
+
+class LocalAnnError(RuntimeError):
+    """Raised when the local ANN index cannot complete an operation."""
+
+
+def _normalise(vectors: "np.ndarray") -> "np.ndarray":
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+def _kmeans(vectors: "np.ndarray", nlist: int, seed: int = 0) -> "np.ndarray":
+    """Spherical k-means; returns unit-normalised centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=nlist, replace=False)].copy()
+    for _ in range(_KMEANS_ITERATIONS):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        empty = np.bincount(assign, minlength=nlist) == 0
+        sums[empty] = vectors[rng.choice(len(vectors), size=int(empty.sum()), replace=False)]
+        centroids = _normalise(sums)
+    return centroids
+
+
+class _Partition:
+    """One (tenant, env, namespace) IVF-flat index with its on-disk state."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.dim: Optional[int] = None
+        self.ids: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self.rows: Dict[str, int] = {}
+        self.dead: set[int] = set()
+        self.base = None  # snapshot matrix (memory-mapped)
+        self.centroids = None
+        self.list_offsets = None
+        self.tail: List["np.ndarray"] = []
+        self._tail_matrix = None
+        self.generation = 0
+        self._load()
+
+    # --- persistence ---
+    def _load(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.path / "index.json"
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            self.dim = manifest["dim"]
+            self.ids = manifest["ids"]
+            self.metadata = manifest["metadata"]
+            self.rows = {item_id: row for row, item_id in enumerate(self.ids)}
+            self.generation = manifest["generation"]
+            self.base = np.load(self.path / f"vectors.{self.generation}.npy", mmap_mode="r")
+            if manifest.get("nlist"):
+                self.centroids = np.load(self.path / f"centroids.{self.generation}.npy")
+                self.list_offsets = np.load(self.path / f"list_offsets.{self.generation}.npy")
+        ops_path = self.path / "ops.jsonl"
+        if ops_path.exists():
+            with ops_path.open("r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line from a crash mid-write
+                    if op["op"] == "upsert":
+                        self._apply_upsert(op["id"], np.asarray(op["vector"], dtype=np.float32), op.get("metadata") or {})
+                    elif op["op"] == "delete":
+                        self._apply_delete(op["id"])
+
+    def _append_log(self, ops: Iterable[Dict[str, Any]]) -> None:
+        with (self.path / "ops.jsonl").open("a", encoding="utf-8") as fh:
+            fh.write("".join(json.dumps(op) + "\n" for op in ops))
+
+    def compact(self) -> None:
+        live = [row for row in range(len(self.ids)) if row not in self.dead]
+        matrix = self._all_rows()[live] if live else np.zeros((0, self.dim or 0), dtype=np.float32)
+        ids = [self.ids[row] for row in live]
+        metadata = [self.metadata[row] for row in live]
+        nlist = 0
+        centroids = offsets = None
+        if len(live) >= IVF_MIN_ROWS:
+            nlist = int(np.sqrt(len(live)))
+            centroids = _kmeans(matrix, nlist)
+            assign = np.argmax(matrix @ centroids.T, axis=1)
+            order = np.argsort(assign, kind="stable")
+            matrix = matrix[order]
+            ids = [ids[i] for i in order]
+            metadata = [metadata[i] for i in order]
+            offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=nlist))]).astype(np.int64)
+
+        # Files of a new generation are written first; replacing index.json is the
+        # commit point. Replaying a stale log over the new snapshot is harmless.
+        generation = self.generation + 1
+        np.save(self.path / f"vectors.{generation}.npy", matrix)
+        if nlist:
+            np.save(self.path / f"centroids.{generation}.npy", centroids)
+            np.save(self.path / f"list_offsets.{generation}.npy", offsets)
+        manifest = {"dim": self.dim, "generation": generation, "ids": ids, "metadata": metadata, "nlist": nlist}
+        tmp = self.path / "index.json.tmp"
+        tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp, self.path / "index.json")
+        (self.path / "ops.jsonl").write_text("", encoding="utf-8")
+        for name in ("vectors", "centroids", "list_offsets"):
+            (self.path / f"{name}.{self.generation}.npy").unlink(missing_ok=True)
+        self.generation = generation
+
+        self.ids, self.metadata = ids, metadata
+        self.rows = {item_id: row for row, item_id in enumerate(ids)}
+        self.dead = set()
+        self.tail = []
+        self._tail_matrix = None
+        self.base = np.load(self.path / f"vectors.{generation}.npy", mmap_mode="r")
+        self.centroids = centroids
+        self.list_offsets = offsets
+
+    # --- mutation ---
+    @property
+    def base_rows(self) -> int:
+        return 0 if self.base is None else len(self.base)
+
+    def _apply_upsert(self, item_id: str, vector: "np.ndarray", metadata: Dict[str, Any]) -> None:
+        if self.dim is None:
+            self.dim = int(vector.shape[0])
+        if vector.shape[0] != self.dim:
+            raise LocalAnnError(f"vector dimension {vector.shape[0]} does not match index dimension {self.dim}")
+        self._apply_delete(item_id)
+        self.rows[item_id] = len(self.ids)
+        self.ids.append(item_id)
+        self.metadata.append(dict(metadata))
+        self.tail.append(_normalise(vector.reshape(1, -1))[0])
+        self._tail_matrix = None
+
+    def _apply_delete(self, item_id: str) -> bool:
+        row = self.rows.pop(item_id, None)
+        if row is None:
+            return False
+        self.dead.add(row)
+        return True
+
+    def upsert_many(self, items: Sequence[Tuple[str, Sequence[float], Dict[str, Any]]]) -> None:
+        dims = {len(vector) for _, vector, _ in items}
+        if self.dim is not None:
+            dims.add(self.dim)
+        if len(dims) > 1:
+            raise LocalAnnError(f"vector dimensions {sorted(dims)} do not match")
+        ops = []
+        for item_id, vector, metadata in items:
+            self._apply_upsert(item_id, np.asarray(vector, dtype=np.float32), metadata or {})
+            ops.append({"op": "upsert", "id": item_id, "vector": [float(v) for v in vector], "metadata": metadata or {}})
+        self._append_log(ops)
+        self._maybe_compact()
+
+    def delete(self, item_id: str) -> bool:
+        if not self._apply_delete(item_id):
+            return False
+        self._append_log([{"op": "delete", "id": item_id}])
+        self._maybe_compact()
+        return True
+
+    def _maybe_compact(self) -> None:
+        threshold = max(_COMPACT_TAIL_MIN, int(self.base_rows * _COMPACT_FRACTION))
+        if len(self.tail) >= threshold or len(self.dead) >= threshold:
+            self.compact()
+
+    # --- query ---
+    def _tail_rows(self) -> "np.ndarray":
+        if self._tail_matrix is None:
+            self._tail_matrix = np.stack(self.tail) if self.tail else np.zeros((0, self.dim or 0), dtype=np.float32)
+        return self._tail_matrix
+
+    def _all_rows(self) -> "np.ndarray":
+        parts = [self._tail_rows()]
+        if self.base_rows:
+            parts.insert(0, np.asarray(self.base))
+        return np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+    def vector(self, item_id: str) -> Optional["np.ndarray"]:
+        row = self.rows.get(item_id)
+        if row is None:
+            return None
+        if row < self.base_rows:
+            return np.asarray(self.base[row])
+        return self.tail[row - self.base_rows]
+
+    def search(self, vector: Sequence[float], top_k: int, nprobe: int, exclude: Optional[str] = None) -> List[Tuple[str, float, Dict[str, Any]]]:
+        if self.dim is None or top_k <= 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        if query.shape[0] != self.dim:
+            raise LocalAnnError(f"query dimension {query.shape[0]} does not match index dimension {self.dim}")
+        query = _normalise(query.reshape(1, -1))[0]
+
+        row_ids: List["np.ndarray"] = []
+        scores: List["np.ndarray"] = []
+        if self.base_rows:
+            if self.centroids is not None and nprobe < len(self.centroids):
+                probes = np.argpartition(-(self.centroids @ query), nprobe)[:nprobe]
+                spans = [(int(self.list_offsets[c]), int(self.list_offsets[c + 1])) for c in probes]
+            else:
+                spans = [(0, self.base_rows)]
+            for start, end in spans:
+                if end > start:
+                    row_ids.append(np.arange(start, end))
+                    scores.append(np.asarray(self.base[start:end]) @ query)
+        if self.tail:
+            row_ids.append(np.arange(self.base_rows, self.base_rows + len(self.tail)))
+            scores.append(self._tail_rows() @ query)
+        if not row_ids:
+            return []
+        rows = np.concatenate(row_ids)
+        sims = np.concatenate(scores)
+        skip = set(self.dead)
+        if exclude is not None and exclude in self.rows:
+            skip.add(self.rows[exclude])
+        if skip:
+            keep = ~np.isin(rows, np.fromiter(skip, dtype=np.int64))
+            rows, sims = rows[keep], sims[keep]
+        k = min(top_k, len(rows))
+        if k == 0:
+            return []
+        best = np.argpartition(-sims, k - 1)[:k]
+        best = best[np.argsort(-sims[best], kind="stable")]
+        return [(self.ids[int(rows[i])], float(sims[i]), self.metadata[int(rows[i])]) for i in best]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class LocalAnnIndex:
+    """Thread-safe collection of partitions rooted at one directory."""
+
+    def __init__(self, root: Optional[str] = None, nprobe: Optional[int] = None) -> None:
+        if np is None:
+            raise LocalAnnError("numpy is required for the local vector index backend")
+        self.root = Path(root or os.getenv(INDEX_DIR_ENV) or DEFAULT_INDEX_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.nprobe = nprobe or int(os.getenv(NPROBE_ENV, str(DEFAULT_NPROBE)))
+        self._lock = threading.RLock()
+        self._partitions: Dict[PartitionKey, _Partition] = {}
+        for path in self.root.glob("*/*/*"):
+            # Reload every persisted partition at startup.
+            if path.is_dir():
+                self._partition(tuple(unquote(part.name) for part in (path.parent.parent, path.parent, path)))
+
+    def _partition(self, key: PartitionKey) -> _Partition:
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = _Partition(self.root.joinpath(*(quote(part, safe="") for part in key)))
+            self._partitions[key] = partition
+        return partition
+
+    def upsert(
+        self,
+        key: PartitionKey,
+        items: Sequence[Tuple[str, Sequence[float], Optional[Dict[str, Any]]]],
+    ) -> None:
+        if not items:
+            return
+        with self._lock:
+            self._partition(key).upsert_many([(i, v, m or {}) for i, v, m in items])
+
+    def delete(self, item_id: str, key: PartitionKey) -> int:
+        """Tombstone item_id in one partition; returns 1 if it was live."""
+        with self._lock:
+            partition = self._partitions.get(key)
+            return int(bool(partition and partition.delete(item_id)))
+
+    def query(self, key: PartitionKey, vector: Sequence[float], top_k: int) -> List[Tuple[str, float, Dict[str, Any]]]:
+        with self._lock:
+            partition = self._partitions.get(key)
+            return partition.search(vector, top_k, self.nprobe) if partition else []
+
+    def query_by_id(self, key: PartitionKey, anchor_id: str, top_k: int) -> List[Tuple[str, float, Dict[str, Any]]]:
+        with self._lock:
+            partition = self._partitions.get(key)
+            anchor = partition.vector(anchor_id) if partition else None
+            if anchor is None:
+                raise LocalAnnError(f"datapoint {anchor_id} not found")
+            return partition.search(anchor, top_k, self.nprobe, exclude=anchor_id)
+
+    def compact(self, key: Optional[PartitionKey] = None) -> None:
+        with self._lock:
+            if key is None:
+                targets = list(self._partitions.values())
+            elif key in self._partitions:
+                targets = [self._partitions[key]]
+            else:
+                return
+            for partition in targets:
+                partition.compact()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "partitions": len(self._partitions),
+                "vectors": sum(len(p) for p in self._partitions.values()),
+                "tombstones": sum(len(p.dead) for p in self._partitions.values()),
+                "tail": sum(len(p.tail) for p in self._partitions.values()),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._partitions.clear()
+
+
+_indexes: Dict[str, LocalAnnIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def shared_index(root: Optional[str] = None) -> LocalAnnIndex:
+    """Process-wide index per root so Nexus and explorer stores share one copy."""
+    resolved = str(Path(root or os.getenv(INDEX_DIR_ENV) or DEFAULT_INDEX_DIR).resolve())
+    with _indexes_lock:
+        index = _indexes.get(resolved)
+        if index is None:
+            index = LocalAnnIndex(resolved)
+            _indexes[resolved] = index
+        return index
@@ -33,47 +33,67 @@ class NexusRagService:
         env: str,
         tags: Optional[Sequence[str]] = None,
     ) -> NexusEmbedding:
-        merged_tags = list(tags or [])
-        merged_tags.extend(doc.tags)
-        embedding_result = self._embedder.embed_text(doc.text)
-        self._log_model_call(
-            ModelCallLog(
-                tenant_id=tenant_id,
-                env=env,
-                model_id=embedding_result.model_id,
-                purpose="embed_upsert",
-                prompt=PromptSnapshot(text=doc.text),
-                output_dimensions=len(embedding_result.vector),
-                episode_id=doc.refs.get("episode_id") if hasattr(doc, "refs") else None,
+        return self.upsert_documents([doc], kind=kind, tenant_id=tenant_id, env=env, tags=tags)[0]
+
+    def upsert_documents(
+        self,
+        docs: Sequence[NexusDocument],
+        kind: NexusKind,
+        tenant_id: str,
+        env: str,
+        tags: Optional[Sequence[str]] = None,
+    ) -> List[NexusEmbedding]:
+        """Embed docs in one batched call, write snippets, then bulk-upsert vectors."""
+        if not docs:
+            return []
+        results = self._embedder.embed_texts_batch([doc.text for doc in docs])
+        embeddings: List[NexusEmbedding] = []
+        for doc, embedding_result in zip(docs, results):
+            merged_tags = list(tags or [])
+            merged_tags.extend(doc.tags)
+            self._log_model_call(
+                ModelCallLog(
+                    tenant_id=tenant_id,
+                    env=env,
+                    model_id=embedding_result.model_id,
+                    purpose="embed_upsert",
+                    prompt=PromptSnapshot(text=doc.text),
+                    output_dimensions=len(embedding_result.vector),
+                    episode_id=doc.refs.get("episode_id") if hasattr(doc, "refs") else None,
+                )
             )
-        )
-        emb = NexusEmbedding(
-            doc_id=doc.id,
-            tenant_id=tenant_id,
-            env=env,
-            kind=kind,
-            embedding=embedding_result.vector,
-            model_id=embedding_result.model_id,
-            dimensions=len(embedding_result.vector),
-            metadata=doc.metadata,
-        )
-        self._backend.write_snippet(
-            kind,
-            NexusDocument(
-                id=doc.id,
-                text=doc.text,
-                tenant_id=tenant_id,
-                env=env,
-                kind=kind,
+            embeddings.append(
+                NexusEmbedding(
+                    doc_id=doc.id,
+                    tenant_id=tenant_id,
+                    env=env,
+                    kind=kind,
+                    embedding=embedding_result.vector,
+                    model_id=embedding_result.model_id,
+                    dimensions=len(embedding_result.vector),
+                    metadata=doc.metadata,
+                )
+            )
+            self._backend.write_snippet(
+                kind,
+                NexusDocument(
+                    id=doc.id,
+                    text=doc.text,
+                    tenant_id=tenant_id,
+                    env=env,
+                    kind=kind,
+                    tags=list(merged_tags),
+                    metadata=doc.metadata,
+                    refs=doc.refs,
+                ),
                 tags=list(merged_tags),
-                metadata=doc.metadata,
-                refs=doc.refs,
-            ),
-            tags=list(merged_tags),
-        )
+            )
         # TODO: async queue for vector upsert; currently inline
-        self._vector_store.upsert(emb)
-        return emb
+        if len(embeddings) == 1:
+            self._vector_store.upsert(embeddings[0])
+        else:
+            self._vector_store.bulk_upsert(embeddings)
+        return embeddings
 
     def query(
         self,
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+from typing import List
+
+import pytest
+
+from engines.nexus import embedding as embedding_module
+from engines.nexus.embedding import EmbeddingCache, LocalHashEmbeddingAdapter
+from engines.nexus.rag_service import NexusRagService
+from engines.nexus.schemas import NexusDocument, NexusKind
+
+
+class CountingEmbedder(LocalHashEmbeddingAdapter):
+    def __init__(self, **kwargs):
+        super().__init__(dimensions=8, **kwargs)
+        self.batches: List[List[str]] = []
+
+    def _embed_uncached(self, texts, model):
+        self.batches.append(list(texts))
+        return super()._embed_uncached(texts, model)
+
+
+def test_local_embedder_is_deterministic():
+    a = LocalHashEmbeddingAdapter().embed_text("the quick brown fox")
+    b = LocalHashEmbeddingAdapter().embed_text("the quick brown fox")
+    assert a.vector == b.vector
+    assert a.model_id == "local-hash-64"
+    assert abs(sum(v * v for v in a.vector) - 1.0) < 1e-9
+
+
+def test_batch_dedupes_and_caches_normalized_text():
+    embedder = CountingEmbedder(batch_size=2)
+    results = embedder.embed_texts_batch(["alpha", "beta", " alpha  ", "gamma", "beta"])
+    assert embedder.batches == [["alpha", "beta"], ["gamma"]]
+    assert results[0].vector == results[2].vector
+
+    embedder.embed_texts_batch(["gamma", "alpha"])
+    embedder.embed_text("beta")
+    assert len(embedder.batches) == 2
+    assert embedder.stats()["model_calls"] == 2
+
+
+def test_disk_cache_survives_new_adapter(tmp_path):
+    first = CountingEmbedder(cache=EmbeddingCache(root=str(tmp_path)))
+    first.embed_texts_batch(["persisted chunk"])
+
+    second = CountingEmbedder(cache=EmbeddingCache(root=str(tmp_path)))
+    result = second.embed_text("persisted chunk")
+    assert second.batches == []
+    assert second.stats()["disk_hits"] == 1
+    assert result.vector == first.embed_text("persisted chunk").vector
+
+
+def test_concurrent_embed_text_calls_are_micro_batched():
+    embedder = CountingEmbedder(batch_size=8, max_wait_ms=200)
+    barrier = threading.Barrier(4)
+    out = {}
+
+    def worker(i):
+        barrier.wait()
+        out[i] = embedder.embed_text(f"text {i}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(embedder.batches) == 1
+    assert sorted(embedder.batches[0]) == [f"text {i}" for i in range(4)]
+    assert out[2].vector == embedder.embed_text("text 2").vector
+
+
+def test_batch_errors_reach_every_waiter():
+    class Failing(CountingEmbedder):
+        def _embed_uncached(self, texts, model):
+            raise RuntimeError("model down")
+
+    embedder = Failing(max_wait_ms=0)
+    with pytest.raises(RuntimeError, match="model down"):
+        embedder.embed_text("x")
+
+
+def test_vertex_model_handle_is_loaded_once(monkeypatch):
+    loads = []
+
+    class FakeModel:
+        def get_embeddings(self, texts):
+            return [type("E", (), {"values": [float(len(t))]})() for t in texts]
+
+    class FakeTextEmbeddingModel:
+        @staticmethod
+        def from_pretrained(model):
+            loads.append(model)
+            return FakeModel()
+
+    monkeypatch.setattr(embedding_module, "TextEmbeddingModel", FakeTextEmbeddingModel)
+    monkeypatch.setattr(embedding_module, "_text_models", {})
+    adapter = embedding_module.VertexEmbeddingAdapter(client={"project": "p"}, cache=EmbeddingCache())
+    results = adapter.embed_texts_batch(["a", "bb"], model_id="text-embed")
+    adapter.embed_texts_batch(["ccc"], model_id="text-embed")
+    assert [r.vector for r in results] == [[1.0], [2.0]]
+    assert loads == ["text-embed"]
+
+
+def test_rag_upsert_documents_embeds_in_one_batch():
+    class Backend:
+        def __init__(self):
+            self.snippets = {}
+
+        def write_snippet(self, kind, doc, tags=None):
+            self.snippets[doc.id] = doc
+
+    class Store:
+        def __init__(self):
+            self.bulk = []
+
+        def bulk_upsert(self, embeddings):
+            self.bulk.append(list(embeddings))
+
+    embedder = CountingEmbedder()
+    store = Store()
+    service = NexusRagService(embedder=embedder, vector_store=store, nexus_backend=Backend())
+    docs = [NexusDocument(id=f"d{i}", text=f"doc {i}") for i in range(3)]
+    embeddings = service.upsert_documents(docs, kind=NexusKind.data, tenant_id="t_demo", env="dev")
+    assert len(embedder.batches) == 1
+    assert [e.doc_id for e in store.bulk[0]] == ["d0", "d1", "d2"]
+    assert embeddings[0].dimensions == 8
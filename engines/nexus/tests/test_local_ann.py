@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from engines.nexus import local_ann
+from engines.nexus.local_ann import LocalAnnError, LocalAnnIndex
+from engines.nexus.schemas import NexusEmbedding, NexusKind
+from engines.nexus.vector_explorer.vector_store import LocalExplorerVectorStore, VectorStoreConfigError
+from engines.nexus.vector_store import LocalVectorStore, VectorStoreError
+
+KEY = ("t_demo", "dev", "space.s1")
+
+
+def _vectors(n: int, dim: int = 16, seed: int = 1):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+def test_restricts_partition_results(tmp_path):
+    index = LocalAnnIndex(str(tmp_path))
+    index.upsert(KEY, [("a", [1.0, 0.0], {"label": "a"})])
+    index.upsert(("t_other", "dev", "space.s1"), [("b", [1.0, 0.0], None)])
+    index.upsert(("t_demo", "prod", "space.s1"), [("c", [1.0, 0.0], None)])
+
+    hits = index.query(KEY, [0.9, 0.1], top_k=5)
+    assert [h[0] for h in hits] == ["a"]
+    assert hits[0][2] == {"label": "a"}
+    assert index.query(("t_demo", "dev", "space.missing"), [1.0, 0.0], top_k=5) == []
+
+
+def test_upsert_overwrites_and_delete_tombstones(tmp_path):
+    index = LocalAnnIndex(str(tmp_path))
+    index.upsert(KEY, [("a", [1.0, 0.0], None), ("b", [0.0, 1.0], None)])
+    index.upsert(KEY, [("a", [0.0, 1.0], None)])
+    assert index.stats()["tombstones"] == 1
+    assert {h[0] for h in index.query(KEY, [0.0, 1.0], top_k=5)} == {"a", "b"}
+
+    assert index.delete("b", KEY) == 1
+    assert [h[0] for h in index.query(KEY, [0.0, 1.0], top_k=5)] == ["a"]
+
+    # An unknown key is a no-op, not a compaction of every partition.
+    index.compact(("t_demo", "dev", "space.missing"))
+    assert index.stats()["tombstones"] == 2
+
+    index.compact(KEY)
+    assert index.stats() == {"partitions": 1, "vectors": 1, "tombstones": 0, "tail": 0}
+    assert [h[0] for h in index.query(KEY, [0.0, 1.0], top_k=5)] == ["a"]
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    index = LocalAnnIndex(str(tmp_path))
+    index.upsert(KEY, [("a", [1.0, 0.0], None)])
+    with pytest.raises(LocalAnnError):
+        index.upsert(KEY, [("b", [1.0, 0.0, 0.0], None)])
+    assert index.stats()["vectors"] == 1
+
+
+def test_reload_replays_snapshot_and_log(tmp_path):
+    index = LocalAnnIndex(str(tmp_path))
+    index.upsert(KEY, [(f"v{i}", vec, {"i": i}) for i, vec in enumerate(_vectors(50).tolist())])
+    index.compact()
+    index.upsert(KEY, [("late", [1.0] * 16, None)])
+    index.delete("v3", KEY)
+    expected = index.query(KEY, [1.0] * 16, top_k=5)
+
+    reloaded = LocalAnnIndex(str(tmp_path))
+    assert reloaded.stats()["vectors"] == 50
+    assert reloaded.query(KEY, [1.0] * 16, top_k=5) == expected
+    assert "v3" not in {h[0] for h in reloaded.query(KEY, [1.0] * 16, top_k=50)}
+
+
+def test_ivf_recall_against_exact_scan(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_ann, "IVF_MIN_ROWS", 1000)
+    data = _vectors(3000)
+    index = LocalAnnIndex(str(tmp_path), nprobe=12)
+    index.upsert(KEY, [(str(i), vec, None) for i, vec in enumerate(data.tolist())])
+    index.compact(KEY)
+    assert index._partitions[KEY].centroids is not None
+
+    unit = data / np.linalg.norm(data, axis=1, keepdims=True)
+    queries = _vectors(20, seed=2)
+    recall = 0
+    for q in queries:
+        exact = set(np.argsort(-(unit @ (q / np.linalg.norm(q))))[:10].astype(str))
+        recall += len(exact & {h[0] for h in index.query(KEY, q.tolist(), top_k=10)})
+    assert recall / 200 >= 0.8
+
+
+def test_explorer_store_anchor_query(tmp_path):
+    store = LocalExplorerVectorStore(index=LocalAnnIndex(str(tmp_path)))
+    store.bulk_upsert(
+        [("anchor", [1.0, 0.0], None), ("near", [0.9, 0.1], None), ("far", [-1.0, 0.0], None)],
+        tenant_id="t_demo",
+        env="dev",
+        space="s1",
+    )
+    hits = store.query_by_datapoint_id("anchor", tenant_id="t_demo", env="dev", space="s1", top_k=2)
+    assert [h.id for h in hits] == ["near", "far"]
+    with pytest.raises(VectorStoreConfigError):
+        store.query_by_datapoint_id("missing", tenant_id="t_demo", env="dev", space="s1")
+
+
+def test_nexus_store_query_and_delete(tmp_path):
+    store = LocalVectorStore(index=LocalAnnIndex(str(tmp_path)))
+    store.bulk_upsert(
+        [
+            NexusEmbedding(doc_id=f"d{i}", tenant_id="t_demo", env="dev", kind=NexusKind.data, embedding=vec, model_id="m")
+            for i, vec in enumerate([[1.0, 0.0], [0.0, 1.0]])
+        ]
+    )
+    hits = store.query([1.0, 0.1], tenant_id="t_demo", env="dev", kind=NexusKind.data, top_k=1)
+    assert hits[0].doc_id == "d0"
+    assert hits[0].metadata["tenant_id"] == "t_demo"
+
+    with pytest.raises(VectorStoreError):
+        store.delete("d0")
+    store.delete("d0", tenant_id="t_demo", env="dev")
+    hits = store.query([1.0, 0.1], tenant_id="t_demo", env="dev", kind=NexusKind.data, top_k=5)
+    assert [h.doc_id for h in hits] == ["d1"]
+
+
+def test_nexus_store_delete_is_scoped_to_tenant_and_env(tmp_path):
+    store = LocalVectorStore(index=LocalAnnIndex(str(tmp_path)))
+    store.bulk_upsert(
+        [
+            NexusEmbedding(doc_id="shared", tenant_id=tenant, env=env, kind=NexusKind.data, embedding=[1.0, 0.0], model_id="m")
+            for tenant, env in [("t_demo", "dev"), ("t_other", "dev"), ("t_demo", "prod")]
+        ]
+    )
+    store.delete("shared", kind=NexusKind.data, tenant_id="t_demo", env="dev")
+
+    assert store.query([1.0, 0.0], tenant_id="t_demo", env="dev", kind=NexusKind.data) == []
+    for tenant, env in [("t_other", "dev"), ("t_demo", "prod")]:
+        assert [h.doc_id for h in store.query([1.0, 0.0], tenant_id=tenant, env=env, kind=NexusKind.data)] == ["shared"]
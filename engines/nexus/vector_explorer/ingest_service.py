@@ -17,7 +17,11 @@ from engines.budget.models import UsageEvent
 from engines.nexus.embedding import EmbeddingAdapter, VertexEmbeddingAdapter
 from engines.nexus.vector_explorer.repository import FirestoreVectorCorpusRepository, VectorCorpusRepository
 from engines.nexus.vector_explorer.schemas import VectorExplorerItem
-from engines.nexus.vector_explorer.vector_store import ExplorerVectorStore, VertexExplorerVectorStore, VectorStoreConfigError
+from engines.nexus.vector_explorer.vector_store import (
+    ExplorerVectorStore,
+    VectorStoreConfigError,
+    explorer_vector_store_from_env,
+)
 from engines.storage.gcs_client import GcsClient
 
 
@@ -42,7 +46,7 @@ class VectorIngestService:
         budget_service: Optional[BudgetService] = None,
     ) -> None:
         self._corpus = corpus_repo or FirestoreVectorCorpusRepository()
-        self._vector_store = vector_store or VertexExplorerVectorStore()
+        self._vector_store = vector_store or explorer_vector_store_from_env()
         self._embedder = embedder or VertexEmbeddingAdapter()
         self._gcs = gcs_client or GcsClient()
         self._event_logger = event_logger or log_dataset_event
@@ -11,7 +11,7 @@ from engines.nexus.embedding import VertexEmbeddingAdapter
 from engines.nexus.vector_explorer.repository import FirestoreVectorCorpusRepository
 from engines.nexus.vector_explorer.schemas import QueryMode, VectorExplorerQuery
 from engines.nexus.vector_explorer.service import VectorExplorerService
-from engines.nexus.vector_explorer.vector_store import VectorStoreConfigError, VertexExplorerVectorStore
+from engines.nexus.vector_explorer.vector_store import VectorStoreConfigError, explorer_vector_store_from_env
 
 router = APIRouter()
 
@@ -23,7 +23,7 @@ def _get_service() -> VectorExplorerService:
     if _service is None:
         _service = VectorExplorerService(
             repository=FirestoreVectorCorpusRepository(),
-            vector_store=VertexExplorerVectorStore(),
+            vector_store=explorer_vector_store_from_env(),
             embedder=VertexEmbeddingAdapter(),
         )
     return _service
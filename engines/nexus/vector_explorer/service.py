@@ -21,7 +21,11 @@ from engines.nexus.vector_explorer.schemas import (
     VectorExplorerQuery,
     VectorExplorerResult,
 )
-from engines.nexus.vector_explorer.vector_store import ExplorerVectorStore, VertexExplorerVectorStore, VectorStoreConfigError
+from engines.nexus.vector_explorer.vector_store import (
+    ExplorerVectorStore,
+    VectorStoreConfigError,
+    explorer_vector_store_from_env,
+)
 from engines.scene_engine.core.types import Scene
 
 
@@ -43,7 +47,7 @@ class VectorExplorerService:
         budget_service: Optional[BudgetService] = None,
     ) -> None:
         self._repo = repository or FirestoreVectorCorpusRepository()
-        self._vector_store = vector_store or VertexExplorerVectorStore()
+        self._vector_store = vector_store or explorer_vector_store_from_env()
         self._embedder = embedder or VertexEmbeddingAdapter()
         resolved_logger = event_logger or log_dataset_event
         if compliance_run_enabled() and event_logger is None:
@@ -1,6 +1,7 @@
-"""Vector store adapter for Vector Explorer using Vertex Matching Engine."""
+"""Vector store adapters for Vector Explorer (Vertex Matching Engine and local ANN)."""
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
@@ -60,6 +61,19 @@ class ExplorerVectorStore:
     ) -> List[ExplorerVectorHit]:
         raise NotImplementedError
 
+    def bulk_upsert(
+        self,
+        items: Sequence[Tuple[str, Sequence[float], Optional[Dict[str, Any]]]],
+        tenant_id: str,
+        env: str,
+        space: str,
+    ) -> None:
+        for item_id, vector, metadata in items:
+            self.upsert(item_id, vector, tenant_id=tenant_id, env=env, space=space, metadata=metadata)
+
+    def delete(self, item_id: str, tenant_id: str, env: str, space: str) -> None:
+        raise NotImplementedError
+
 
 class VertexExplorerVectorStore(ExplorerVectorStore):
     """Vertex Matching Engine implementation."""
@@ -226,3 +240,85 @@ class VertexExplorerVectorStore(ExplorerVectorStore):
             self.deployed_index_id = self._derive_deployed_index_id()
         if not self.deployed_index_id:
             raise VectorStoreConfigError("Deployed index id is required for queries")
+
+
+class LocalExplorerVectorStore(ExplorerVectorStore):
+    """In-process ANN backend (see engines.nexus.local_ann); one partition per tenant/env/space."""
+
+    def __init__(self, index: Any = None, root: Optional[str] = None) -> None:
+        from engines.nexus.local_ann import LocalAnnError, shared_index
+
+        try:
+            self._index = index or shared_index(root)
+        except LocalAnnError as exc:
+            raise VectorStoreConfigError(str(exc)) from exc
+
+    @staticmethod
+    def _key(tenant_id: str, env: str, space: str) -> Tuple[str, str, str]:
+        return (tenant_id, env, f"space.{space}")
+
+    def upsert(
+        self,
+        item_id: str,
+        vector: Sequence[float],
+        tenant_id: str,
+        env: str,
+        space: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.bulk_upsert([(item_id, vector, metadata)], tenant_id=tenant_id, env=env, space=space)
+
+    def bulk_upsert(
+        self,
+        items: Sequence[Tuple[str, Sequence[float], Optional[Dict[str, Any]]]],
+        tenant_id: str,
+        env: str,
+        space: str,
+    ) -> None:
+        try:
+            self._index.upsert(self._key(tenant_id, env, space), list(items))
+        except Exception as exc:
+            raise VectorStoreConfigError(f"Local vector upsert failed: {exc}") from exc
+
+    def query(
+        self,
+        vector: Sequence[float],
+        tenant_id: str,
+        env: str,
+        space: str,
+        top_k: int = 10,
+    ) -> List[ExplorerVectorHit]:
+        try:
+            results = self._index.query(self._key(tenant_id, env, space), vector, top_k)
+        except Exception as exc:
+            raise VectorStoreConfigError(f"Local vector query failed: {exc}") from exc
+        return [ExplorerVectorHit(id=item_id, score=score, metadata=dict(meta)) for item_id, score, meta in results]
+
+    def query_by_datapoint_id(
+        self,
+        anchor_id: str,
+        tenant_id: str,
+        env: str,
+        space: str,
+        top_k: int = 10,
+    ) -> List[ExplorerVectorHit]:
+        try:
+            results = self._index.query_by_id(self._key(tenant_id, env, space), anchor_id, top_k)
+        except Exception as exc:
+            raise VectorStoreConfigError(f"Local vector anchor query failed: {exc}") from exc
+        return [ExplorerVectorHit(id=item_id, score=score, metadata=dict(meta)) for item_id, score, meta in results]
+
+    def delete(self, item_id: str, tenant_id: str, env: str, space: str) -> None:
+        self._index.delete(item_id, self._key(tenant_id, env, space))
+
+
+VECTOR_STORE_BACKEND_ENV = "VECTOR_STORE_BACKEND"
+
+
+def explorer_vector_store_from_env() -> ExplorerVectorStore:
+    backend = os.getenv(VECTOR_STORE_BACKEND_ENV, "vertex").lower()
+    if backend == "local":
+        return LocalExplorerVectorStore()
+    if backend == "vertex":
+        return VertexExplorerVectorStore()
+    raise VectorStoreConfigError(f"{VECTOR_STORE_BACKEND_ENV} must be vertex or local, got {backend}")
@@ -1,7 +1,8 @@
-"""Nexus vector store interfaces and Vertex AI implementation."""
+"""Nexus vector store interfaces with Vertex AI and local ANN implementations."""
 from __future__ import annotations
 
 import logging
+import os
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Sequence
 
@@ -49,7 +50,13 @@ class NexusVectorStore:
     ) -> List[VectorHit]:
         raise NotImplementedError
 
-    def delete(self, doc_id: str, kind: Optional[NexusKind] = None) -> None:
+    def delete(
+        self,
+        doc_id: str,
+        kind: Optional[NexusKind] = None,
+        tenant_id: Optional[str] = None,
+        env: Optional[str] = None,
+    ) -> None:
         raise NotImplementedError
 
     def health_check(self) -> bool:
@@ -155,7 +162,14 @@ class VertexVectorStore(NexusVectorStore):
             raise VectorStoreError(f"Vertex query failed: {exc}") from exc
         return self._parse_neighbors(response)
 
-    def delete(self, doc_id: str, kind: Optional[NexusKind] = None) -> None:
+    def delete(
+        self,
+        doc_id: str,
+        kind: Optional[NexusKind] = None,
+        tenant_id: Optional[str] = None,
+        env: Optional[str] = None,
+    ) -> None:
+        # Vertex datapoint ids are index-wide; tenant/env are restricts, not part of the id.
         namespace = kind.value if kind else None
         try:
             self._endpoint.remove_datapoints(  # type: ignore[attr-defined]
@@ -212,3 +226,81 @@ class VertexVectorStore(NexusVectorStore):
         aiplatform.init(project=self.project, location=self.location)
         endpoint_path = f"projects/{self.project}/locations/{self.location}/indexEndpoints/{self.endpoint_id}"
         self._endpoint = aiplatform.MatchingEngineIndexEndpoint(index_endpoint_name=endpoint_path)  # type: ignore[attr-defined]
+
+
+class LocalVectorStore(NexusVectorStore):
+    """In-process ANN backend (see engines.nexus.local_ann); restricts map to partitions."""
+
+    def __init__(self, index: Optional[Any] = None, root: Optional[str] = None) -> None:
+        from engines.nexus.local_ann import LocalAnnError, shared_index
+
+        try:
+            self._index = index or shared_index(root)
+        except LocalAnnError as exc:
+            raise VectorStoreError(str(exc)) from exc
+
+    @staticmethod
+    def _key(tenant_id: str, env: str, kind: NexusKind) -> tuple[str, str, str]:
+        return (tenant_id, env, f"kind.{kind.value}")
+
+    def upsert(self, embedding: NexusEmbedding) -> None:
+        self.bulk_upsert([embedding])
+
+    def bulk_upsert(self, embeddings: Sequence[NexusEmbedding]) -> None:
+        grouped: Dict[tuple[str, str, str], List[tuple[str, Sequence[float], Dict[str, Any]]]] = {}
+        for emb in embeddings:
+            metadata = {**emb.metadata, "tenant_id": emb.tenant_id, "env": emb.env, "kind": emb.kind.value}
+            grouped.setdefault(self._key(emb.tenant_id, emb.env, emb.kind), []).append(
+                (emb.doc_id, emb.embedding, metadata)
+            )
+        try:
+            for key, items in grouped.items():
+                self._index.upsert(key, items)
+        except Exception as exc:
+            raise VectorStoreError(f"Local vector upsert failed: {exc}") from exc
+
+    def query(
+        self,
+        vector: Sequence[float],
+        tenant_id: str,
+        env: str,
+        kind: NexusKind,
+        top_k: int = 5,
+    ) -> List[VectorHit]:
+        try:
+            results = self._index.query(self._key(tenant_id, env, kind), vector, top_k)
+        except Exception as exc:
+            raise VectorStoreError(f"Local vector query failed: {exc}") from exc
+        return [VectorHit(doc_id=doc_id, score=score, metadata=dict(meta)) for doc_id, score, meta in results]
+
+    def delete(
+        self,
+        doc_id: str,
+        kind: Optional[NexusKind] = None,
+        tenant_id: Optional[str] = None,
+        env: Optional[str] = None,
+    ) -> None:
+        # Partitions are per tenant/env, so the same doc_id may belong to another
+        # tenant; only the caller's partitions are touched.
+        if not tenant_id or not env:
+            raise VectorStoreError("tenant_id and env are required to delete from the local vector store")
+        try:
+            for k in [kind] if kind else list(NexusKind):
+                self._index.delete(doc_id, self._key(tenant_id, env, k))
+        except Exception as exc:
+            raise VectorStoreError(f"Local vector delete failed: {exc}") from exc
+
+    def health_check(self) -> bool:
+        return True
+
+
+VECTOR_STORE_BACKEND_ENV = "VECTOR_STORE_BACKEND"
+
+
+def vector_store_from_env() -> NexusVectorStore:
+    backend = os.getenv(VECTOR_STORE_BACKEND_ENV, "vertex").lower()
+    if backend == "local":
+        return LocalVectorStore()
+    if backend == "vertex":
+        return VertexVectorStore()
+    raise VectorStoreError(f"{VECTOR_STORE_BACKEND_ENV} must be vertex or local, got {backend}")
@@ -2,12 +2,32 @@
 
 Builder A: Append/list_after with last_event_id cursor support.
 Endpoints are routed via routing registry (resource_kind=event_stream).
+
+Each appended event carries a store-assigned, per-stream monotonically increasing
+`stream_seq`; list_after resolves the cursor event once and reads forward from its
+sequence number in bounded pages, so a resume costs O(events after the cursor) and
+ordering does not depend on producer clocks. Events written before sequence numbers
+existed have no `stream_seq` and are still served in `ts` order.
+
+Gap semantics. Firestore allocates the sequence number and writes the event in one
+transaction, so its sequences are gap-free. DynamoDB and Cosmos take the number from
+an atomic counter and insert the event in a later call, so seq N+1 can become
+visible before N, and an insert that fails after the bump leaves N missing for good.
+Readers therefore release events strictly in sequence order and hold back everything
+behind a missing number until the event after the gap is older than
+EVENT_STREAM_GAP_SETTLE_SECONDS. Only then is the gap treated as abandoned and
+skipped. A failed insert also writes a best-effort gap marker, which closes the
+hole at once.
 """
 from __future__ import annotations
 
 import json
 import logging
-from typing import Dict, List, Optional, Protocol
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Protocol
 
 from engines.common.identity import RequestContext
 from engines.realtime.contracts import StreamEvent
@@ -24,6 +44,101 @@ except Exception:  # pragma: no cover
 
 logger = logging.getLogger(__name__)
 
+SEQ_FIELD = "stream_seq"
+APPENDED_AT_FIELD = "stream_appended_ms"
+GAP_FIELD = "stream_gap"
+PAGE_SIZE_ENV = "EVENT_STREAM_PAGE_SIZE"
+DEFAULT_PAGE_SIZE = 500
+GAP_SETTLE_ENV = "EVENT_STREAM_GAP_SETTLE_SECONDS"
+DEFAULT_GAP_SETTLE_SECONDS = 5.0
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _gap_settle_ms() -> int:
+    try:
+        return int(max(0.0, float(os.getenv(GAP_SETTLE_ENV, str(DEFAULT_GAP_SETTLE_SECONDS)))) * 1000)
+    except ValueError:
+        return int(DEFAULT_GAP_SETTLE_SECONDS * 1000)
+
+
+class _SeqGate:
+    """Releases sequenced items in order, holding back everything behind an open gap.
+
+    A gap is open while the item after it was appended less than the settle window
+    ago; older gaps are treated as abandoned (failed inserts) and skipped. Gap
+    markers fill their number without being released.
+    """
+
+    def __init__(self, after_seq: int, settle_ms: Optional[int] = None, now_ms: Optional[int] = None) -> None:
+        self.expected = after_seq + 1
+        self.settle_ms = _gap_settle_ms() if settle_ms is None else settle_ms
+        self.now_ms = _now_ms() if now_ms is None else now_ms
+        self.blocked = False
+
+    def admit(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        released: List[Dict[str, Any]] = []
+        for item in items:
+            if self.blocked:
+                break
+            seq = int(item.get(SEQ_FIELD, 0))
+            if seq < self.expected:
+                continue
+            if seq > self.expected:
+                appended = item.get(APPENDED_AT_FIELD)
+                if appended is not None and self.now_ms - int(appended) < self.settle_ms:
+                    self.blocked = True
+                    break
+            self.expected = seq + 1
+            if not item.get(GAP_FIELD):
+                released.append(item)
+        return released
+
+
+def _page_size(page_size: Optional[int] = None) -> int:
+    if page_size:
+        return page_size
+    try:
+        return max(1, int(os.getenv(PAGE_SIZE_ENV, str(DEFAULT_PAGE_SIZE))))
+    except ValueError:
+        return DEFAULT_PAGE_SIZE
+
+
+def _decode_events(items: Iterable[Dict[str, Any]], events: List[StreamEvent], limit: Optional[int]) -> bool:
+    """Append decodable items to `events`; returns True once `limit` is reached."""
+    for item in items:
+        try:
+            events.append(StreamEvent(**item))
+        except Exception as exc:
+            logger.warning("Failed to deserialize event: %s", exc)
+            continue
+        if limit is not None and len(events) >= limit:
+            return True
+    return False
+
+
+def firestore_read_pages(
+    query: Any,
+    cursor: Any = None,
+    limit: Optional[int] = None,
+    page_size: Optional[int] = None,
+) -> List[StreamEvent]:
+    """Read an ordered Firestore query in bounded pages, starting after `cursor` (a snapshot)."""
+    events: List[StreamEvent] = []
+    size = _page_size(page_size)
+    while limit is None or len(events) < limit:
+        batch = size if limit is None else min(size, limit - len(events))
+        page = query.start_after(cursor) if cursor is not None else query
+        snaps = list(page.limit(batch).stream())
+        if _decode_events((snap.to_dict() or {} for snap in snaps), events, limit):
+            break
+        if len(snaps) < batch:
+            break
+        cursor = snaps[-1]
+    return events
+
 
 class EventStreamStore(Protocol):
     """Protocol for event stream backends."""
@@ -41,15 +156,37 @@ class EventStreamStore(Protocol):
         self, 
         stream_id: str, 
         after_event_id: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> List[StreamEvent]:
-        """List events after cursor (last_event_id)."""
+        """List events after cursor (last_event_id), at most `limit` of them."""
         ...
 
 
+@dataclass
+class _PendingAppend:
+    doc_data: Dict[str, Any]
+    event_ref: Any
+    wake: threading.Event = field(default_factory=threading.Event)
+    done: bool = False
+    lead: bool = False
+    error: Optional[Exception] = None
+
+
 class FirestoreEventStreamStore:
-    """Firestore-backed event stream with cursor support."""
+    """Firestore-backed event stream with cursor support.
+    
+    The stream document keeps the sequence counter (`last_seq`) and the field the
+    stream is ordered by. Sequence allocation and the event writes share one
+    transaction, so an event with seq N is never visible before N-1 is.
+    
+    Concurrent appends to the same stream are group-committed: one caller commits
+    everything queued behind it in a single transaction (up to 499 events plus the
+    counter), so a hot stream costs one stream-document write per batch instead of
+    one per event.
+    """
     
     _collection = "event_streams"
+    _max_batch = 499  # a Firestore transaction holds at most 500 writes
     
     def __init__(self, project: Optional[str] = None, client: Optional[object] = None) -> None:
         if firestore is None:
@@ -60,15 +197,24 @@ class FirestoreEventStreamStore:
         if not self._project:
             raise RuntimeError("GCP project is required for Firestore event stream")
         self._client = client or firestore.Client(project=self._project)  # type: ignore[arg-type]
+        self._pending: Dict[str, List[_PendingAppend]] = {}
+        self._committing: set[str] = set()
+        self._pending_lock = threading.Lock()
+    
+    def _stream_doc(self, stream_id: str):
+        return self._client.collection(self._collection).document(stream_id)
     
     def _event_collection(self, stream_id: str):
         """Get events subcollection for stream."""
-        return (
-            self._client
-            .collection(self._collection)
-            .document(stream_id)
-            .collection("events")
-        )
+        return self._stream_doc(stream_id).collection("events")
+    
+    def _order_field(self, stream_id: str) -> str:
+        snap = self._stream_doc(stream_id).get()
+        state = snap.to_dict() if snap.exists else None
+        if not state:
+            # No counter yet: either an empty stream or one written before sequence numbers.
+            return "ts"
+        return state.get("order_by") or SEQ_FIELD
     
     def append(
         self, 
@@ -83,55 +229,101 @@ class FirestoreEventStreamStore:
         # Store event as JSON doc with event_id as doc key
         doc_data = event.dict()
         doc_data["ts"] = event.ts  # Ensure timestamp ordering
+        entry = _PendingAppend(doc_data, self._event_collection(stream_id).document(event.event_id))
+        with self._pending_lock:
+            self._pending.setdefault(stream_id, []).append(entry)
+            entry.lead = stream_id not in self._committing
+            if entry.lead:
+                self._committing.add(stream_id)
+        if not entry.lead:
+            # Woken either with our event committed or promoted to commit the rest.
+            entry.wake.wait()
+        if not entry.done:
+            self._commit_pending(stream_id, entry)
+        if entry.error is not None:
+            raise RuntimeError(f"Failed to append event: {entry.error}") from entry.error
+    
+    def _commit_pending(self, stream_id: str, own: _PendingAppend) -> None:
+        """Commit queued appends batch by batch until `own` is done, then hand over."""
+        while True:
+            with self._pending_lock:
+                queue = self._pending.get(stream_id, [])
+                if own.done:
+                    if queue:
+                        # Hand the remaining queue to the oldest waiter.
+                        queue[0].lead = True
+                        queue[0].wake.set()
+                    else:
+                        self._pending.pop(stream_id, None)
+                        self._committing.discard(stream_id)
+                    return
+                batch = queue[: self._max_batch]
+                del queue[: self._max_batch]
+            try:
+                self._commit_batch(stream_id, batch)
+            except Exception as exc:
+                logger.error("Firestore event stream append failed: %s", exc)
+                for item in batch:
+                    item.error = exc
+            for item in batch:
+                item.done = True
+                if item is not own:
+                    item.wake.set()
+    
+    def _commit_batch(self, stream_id: str, batch: List[_PendingAppend]) -> None:
+        stream_ref = self._stream_doc(stream_id)
         
-        try:
-            self._event_collection(stream_id).document(event.event_id).set(doc_data)
-        except Exception as exc:
-            logger.error("Firestore event stream append failed: %s", exc)
-            raise RuntimeError(f"Failed to append event: {exc}") from exc
+        @firestore.transactional
+        def _append(transaction) -> None:
+            snap = stream_ref.get(transaction=transaction)
+            state = snap.to_dict() if snap.exists else None
+            if not state:
+                # Streams that already hold events keep ts ordering so none of them drop out.
+                legacy = bool(list(self._event_collection(stream_id).limit(1).stream()))
+                state = {"last_seq": 0, "order_by": "ts" if legacy else SEQ_FIELD}
+            seq = int(state.get("last_seq", 0))
+            for item in batch:
+                seq += 1
+                transaction.set(item.event_ref, {**item.doc_data, SEQ_FIELD: seq})
+            transaction.set(stream_ref, {"last_seq": seq, "order_by": state.get("order_by") or SEQ_FIELD}, merge=True)
+        
+        _append(self._client.transaction())
     
     def list_after(
         self, 
         stream_id: str, 
         after_event_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
     ) -> List[StreamEvent]:
         """List events from stream, optionally after cursor."""
-        events: List[StreamEvent] = []
-        
         try:
             collection = self._event_collection(stream_id)
-            query = collection.order_by("ts")
-            
-            # If cursor provided, find it first and return subsequent
+            cursor = None
             if after_event_id:
-                # Fetch all events and find cursor position
-                all_snaps = list(query.stream())
-                found = False
-                for snap in all_snaps:
-                    if found:
-                        try:
-                            events.append(StreamEvent(**snap.to_dict()))
-                        except Exception as exc:
-                            logger.warning("Failed to deserialize event: %s", exc)
-                    if snap.id == after_event_id:
-                        found = True
-            else:
-                # No cursor, return all events
-                for snap in query.stream():
-                    try:
-                        events.append(StreamEvent(**snap.to_dict()))
-                    except Exception as exc:
-                        logger.warning("Failed to deserialize event: %s", exc)
+                cursor = collection.document(after_event_id).get()
+                if not cursor.exists:
+                    return []
+            query = collection.order_by(self._order_field(stream_id))
+            return firestore_read_pages(query, cursor, limit=limit, page_size=page_size)
         except Exception as exc:
             logger.warning("Firestore event stream list failed: %s", exc)
-        
-        return events
+            return []
 
 
 class DynamoDBEventStreamStore:
-    """DynamoDB-backed event stream with cursor support."""
+    """DynamoDB-backed event stream with cursor support.
+    
+    Items of a stream share `pk`; event items use `sk = seq#<zero-padded stream_seq>`,
+    a `meta` item holds the atomic counter, and an `id#<event_id>` pointer item maps a
+    cursor to its sort key so list_after can query `sk > cursor` directly. Items written
+    before sequence numbers use `sk = event#<ts>#<event_id>` and are read first.
+    """
     
-    def __init__(self, table_name: Optional[str] = None, region: Optional[str] = None) -> None:
+    def __init__(self, table_name: Optional[str] = None, region: Optional[str] = None, table: Optional[object] = None) -> None:
+        if table is not None:
+            self._table = table
+            return
         if boto3 is None:
             raise RuntimeError("boto3 is required for DynamoDB event stream")
         
@@ -144,6 +336,19 @@ class DynamoDBEventStreamStore:
         except Exception as exc:
             raise RuntimeError(f"Failed to initialize DynamoDB table: {exc}") from exc
     
+    @staticmethod
+    def _seq_sk(seq: int) -> str:
+        return f"seq#{seq:020d}"
+    
+    def _next_seq(self, pk: str) -> int:
+        resp = self._table.update_item(
+            Key={"pk": pk, "sk": "meta"},
+            UpdateExpression="ADD last_seq :one",
+            ExpressionAttributeValues={":one": 1},
+            ReturnValues="UPDATED_NEW",
+        )
+        return int(resp["Attributes"]["last_seq"])
+    
     def append(
         self, 
         stream_id: str, 
@@ -154,70 +359,149 @@ class DynamoDBEventStreamStore:
         if context is None:
             raise RuntimeError("RequestContext is required for event stream append")
         
+        pk = f"stream#{stream_id}"
+        seq = None
         try:
+            seq = self._next_seq(pk)
             item = event.dict()
-            item["pk"] = f"stream#{stream_id}"
-            item["sk"] = f"event#{event.ts.timestamp()}#{event.event_id}"
+            item["pk"] = pk
+            item["sk"] = self._seq_sk(seq)
+            item[SEQ_FIELD] = seq
+            item[APPENDED_AT_FIELD] = _now_ms()
+            # Pointer first, so every event a reader can see is usable as a cursor.
+            self._table.put_item(Item={"pk": pk, "sk": f"id#{event.event_id}", "seq_sk": item["sk"]})
             self._table.put_item(Item=item)
         except Exception as exc:
             logger.error("DynamoDB event stream append failed: %s", exc)
+            if seq is not None:
+                self._mark_gap(pk, seq)
             raise RuntimeError(f"Failed to append event: {exc}") from exc
     
+    def _mark_gap(self, pk: str, seq: int) -> None:
+        """Best-effort: fill an abandoned seq so readers skip it without waiting out the settle window."""
+        try:
+            self._table.put_item(
+                Item={"pk": pk, "sk": self._seq_sk(seq), SEQ_FIELD: seq, GAP_FIELD: True, APPENDED_AT_FIELD: _now_ms()},
+                ConditionExpression="attribute_not_exists(sk)",
+            )
+        except Exception as exc:
+            logger.warning("DynamoDB event stream gap marker for seq %s failed: %s", seq, exc)
+    
+    def _query_pages(
+        self,
+        events: List[StreamEvent],
+        limit: Optional[int],
+        page_size: Optional[int],
+        gate: Optional[_SeqGate] = None,
+        **kwargs: Any,
+    ) -> bool:
+        size = _page_size(page_size)
+        while True:
+            batch = size if limit is None else min(size, limit - len(events))
+            response = self._table.query(ScanIndexForward=True, Limit=batch, **kwargs)
+            items = response.get("Items", [])
+            if gate is not None:
+                items = gate.admit(items)
+            if _decode_events(items, events, limit) or (gate is not None and gate.blocked):
+                return True
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return False
+            kwargs["ExclusiveStartKey"] = last_key
+    
     def list_after(
         self, 
         stream_id: str, 
         after_event_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
     ) -> List[StreamEvent]:
         """List events from DynamoDB, optionally after cursor."""
         events: List[StreamEvent] = []
+        if limit is not None and limit <= 0:
+            return events
         
         try:
             pk = f"stream#{stream_id}"
-            response = self._table.query(
-                KeyConditionExpression="pk = :pk",
-                ExpressionAttributeValues={":pk": pk},
-                ScanIndexForward=True,  # Sort ascending by sk (timestamp)
-            )
-            
-            items = response.get("Items", [])
-            
-            # If cursor provided, skip until found
+            after_seq = 0
             if after_event_id:
-                found = False
-                for item in items:
-                    if found:
-                        try:
-                            events.append(StreamEvent(**item))
-                        except Exception as exc:
-                            logger.warning("Failed to deserialize event: %s", exc)
-                    if item.get("event_id") == after_event_id:
-                        found = True
+                pointer = self._table.get_item(Key={"pk": pk, "sk": f"id#{after_event_id}"}).get("Item")
+                if pointer:
+                    after_seq = int(pointer["seq_sk"].split("#", 1)[1])
+                else:
+                    return self._list_after_legacy(pk, after_event_id, limit, page_size)
             else:
-                for item in items:
-                    try:
-                        events.append(StreamEvent(**item))
-                    except Exception as exc:
-                        logger.warning("Failed to deserialize event: %s", exc)
+                done = self._query_pages(
+                    events, limit, page_size,
+                    KeyConditionExpression="pk = :pk AND begins_with(sk, :prefix)",
+                    ExpressionAttributeValues={":pk": pk, ":prefix": "event#"},
+                )
+                if done:
+                    return events
+            # seq# keys sort after the event#/id#/meta items, so `sk > cursor` only yields events.
+            self._query_pages(
+                events, limit, page_size, _SeqGate(after_seq),
+                KeyConditionExpression="pk = :pk AND sk > :after",
+                ExpressionAttributeValues={":pk": pk, ":after": self._seq_sk(after_seq)},
+            )
         except Exception as exc:
             logger.warning("DynamoDB event stream list failed: %s", exc)
         
         return events
+    
+    def _list_after_legacy(
+        self, pk: str, after_event_id: str, limit: Optional[int], page_size: Optional[int]
+    ) -> List[StreamEvent]:
+        """Cursor written before sequence numbers: walk the legacy items, then every sequenced one."""
+        legacy: List[StreamEvent] = []
+        self._query_pages(
+            legacy, None, page_size,
+            KeyConditionExpression="pk = :pk AND begins_with(sk, :prefix)",
+            ExpressionAttributeValues={":pk": pk, ":prefix": "event#"},
+        )
+        for idx, ev in enumerate(legacy):
+            if ev.event_id == after_event_id:
+                events = legacy[idx + 1 :]
+                break
+        else:
+            return []
+        if limit is not None and len(events) >= limit:
+            return events[:limit]
+        self._query_pages(
+            events, limit, page_size, _SeqGate(0),
+            KeyConditionExpression="pk = :pk AND sk > :after",
+            ExpressionAttributeValues={":pk": pk, ":after": self._seq_sk(0)},
+        )
+        return events
 
 
 class CosmosEventStreamStore:
-    """Azure Cosmos DB-backed event stream with cursor support."""
+    """Azure Cosmos DB-backed event stream with cursor support.
+    
+    A per-stream counter document (`id = __seq__`) is incremented with a patch `incr`
+    operation; events carry the result as `stream_seq` and list_after queries
+    `stream_seq > cursor` in the stream's partition, released through the gap gate.
+    """
+    
+    _SEQ_DOC_ID = "__seq__"
+    _GAP_DOC_PREFIX = "__gap__"
     
     def __init__(
         self, 
         endpoint: Optional[str] = None, 
         key: Optional[str] = None,
         database: str = "event_streams",
+        container: Optional[object] = None,
     ) -> None:
         """Initialize Cosmos client.
         
         Endpoint and key can be provided or read from environment:
         AZURE_COSMOSDB_ENDPOINT, AZURE_COSMOSDB_KEY
         """
+        self._partition_key_path = "/stream_id"
+        if container is not None:
+            self._container = container
+            return
         try:
             from azure.cosmos import CosmosClient, PartitionKey  # type: ignore
         except ImportError:
@@ -226,10 +510,8 @@ class CosmosEventStreamStore:
         self._endpoint = endpoint
         self._key = key
         self._database_name = database
-        self._partition_key_path = "/stream_id"
         
         if not self._endpoint or not self._key:
-            import os
             self._endpoint = os.getenv("AZURE_COSMOSDB_ENDPOINT")
             self._key = os.getenv("AZURE_COSMOSDB_KEY")
         
@@ -243,6 +525,21 @@ class CosmosEventStreamStore:
         except Exception as exc:
             raise RuntimeError(f"Failed to initialize Cosmos client: {exc}") from exc
     
+    def _next_seq(self, stream_id: str) -> int:
+        incr = [{"op": "incr", "path": "/last_seq", "value": 1}]
+        try:
+            doc = self._container.patch_item(item=self._SEQ_DOC_ID, partition_key=stream_id, patch_operations=incr)
+        except Exception as exc:
+            if getattr(exc, "status_code", None) != 404:
+                raise
+            try:
+                self._container.create_item(body={"id": self._SEQ_DOC_ID, "stream_id": stream_id, "last_seq": 0})
+            except Exception as create_exc:
+                if getattr(create_exc, "status_code", None) != 409:  # created concurrently
+                    raise
+            doc = self._container.patch_item(item=self._SEQ_DOC_ID, partition_key=stream_id, patch_operations=incr)
+        return int(doc["last_seq"])
+    
     def append(
         self, 
         stream_id: str, 
@@ -253,46 +550,92 @@ class CosmosEventStreamStore:
         if context is None:
             raise RuntimeError("RequestContext is required for event stream append")
         
+        seq = None
         try:
             item = event.dict()
             item["stream_id"] = stream_id
             item["id"] = event.event_id
+            seq = self._next_seq(stream_id)
+            item[SEQ_FIELD] = seq
+            item[APPENDED_AT_FIELD] = _now_ms()
             self._container.create_item(body=item)
         except Exception as exc:
             logger.error("Cosmos event stream append failed: %s", exc)
+            if seq is not None:
+                self._mark_gap(stream_id, seq)
             raise RuntimeError(f"Failed to append event: {exc}") from exc
     
+    def _mark_gap(self, stream_id: str, seq: int) -> None:
+        """Best-effort: fill an abandoned seq so readers skip it without waiting out the settle window."""
+        try:
+            self._container.create_item(
+                body={
+                    "id": f"{self._GAP_DOC_PREFIX}{seq}",
+                    "stream_id": stream_id,
+                    SEQ_FIELD: seq,
+                    GAP_FIELD: True,
+                    APPENDED_AT_FIELD: _now_ms(),
+                }
+            )
+        except Exception as exc:
+            logger.warning("Cosmos event stream gap marker for seq %s failed: %s", seq, exc)
+    
+    def _query(self, query: str, params: List[Dict[str, Any]], stream_id: str, page_size: Optional[int]):
+        return self._container.query_items(
+            query=query,
+            parameters=params,
+            partition_key=stream_id,
+            max_item_count=_page_size(page_size),
+        )
+    
     def list_after(
         self, 
         stream_id: str, 
         after_event_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
     ) -> List[StreamEvent]:
         """List events from Cosmos, optionally after cursor."""
         events: List[StreamEvent] = []
+        if limit is not None and limit <= 0:
+            return events
         
         try:
-            query = "SELECT * FROM c WHERE c.stream_id = @stream_id ORDER BY c.ts"
             params = [{"name": "@stream_id", "value": stream_id}]
+            legacy_query = (
+                "SELECT * FROM c WHERE c.stream_id = @stream_id AND NOT IS_DEFINED(c.stream_seq) "
+                "AND c.id != @seq_doc ORDER BY c.ts"
+            )
+            legacy_params = params + [{"name": "@seq_doc", "value": self._SEQ_DOC_ID}]
+            seq_query = "SELECT * FROM c WHERE c.stream_id = @stream_id AND c.stream_seq > @after ORDER BY c.stream_seq"
+            after_seq = 0
             
-            items = list(self._container.query_items(query=query, parameters=params))
-            
-            # If cursor provided, skip until found
             if after_event_id:
-                found = False
-                for item in items:
-                    if found:
-                        try:
-                            events.append(StreamEvent(**item))
-                        except Exception as exc:
-                            logger.warning("Failed to deserialize event: %s", exc)
-                    if item.get("event_id") == after_event_id:
-                        found = True
+                try:
+                    cursor = self._container.read_item(item=after_event_id, partition_key=stream_id)
+                except Exception as exc:
+                    if getattr(exc, "status_code", None) == 404:
+                        return []
+                    raise
+                if SEQ_FIELD in cursor:
+                    after_seq = int(cursor[SEQ_FIELD])
+                else:
+                    # Cursor predates sequence numbers: skip through the legacy events to it.
+                    found = False
+                    for item in self._query(legacy_query, legacy_params, stream_id, page_size):
+                        if found:
+                            if _decode_events([item], events, limit):
+                                return events
+                        elif item.get("event_id") == after_event_id:
+                            found = True
             else:
-                for item in items:
-                    try:
-                        events.append(StreamEvent(**item))
-                    except Exception as exc:
-                        logger.warning("Failed to deserialize event: %s", exc)
+                if _decode_events(self._query(legacy_query, legacy_params, stream_id, page_size), events, limit):
+                    return events
+            
+            gate = _SeqGate(after_seq)
+            for item in self._query(seq_query, params + [{"name": "@after", "value": after_seq}], stream_id, page_size):
+                if _decode_events(gate.admit([item]), events, limit) or gate.blocked:
+                    break
         except Exception as exc:
             logger.warning("Cosmos event stream list failed: %s", exc)
         
@@ -1,14 +1,18 @@
 """Filesystem-backed timeline store for realtime stream events (Lane 2 adapter).
 
-Provides durable event storage using filesystem append-log pattern.
-Location: var/event_stream/{tenant_id}/{mode_or_env}/{surface_id or "global"}/events.jsonl
+Provides durable event storage using a segmented filesystem append-log pattern.
+Location: var/event_stream/{tenant_id}/{mode_or_env}/{surface_id or "global"}/{stream_id}/segment-NNNNNN.jsonl
 """
 from __future__ import annotations
 
 import json
 import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from engines.common.identity import RequestContext
 from engines.common.surface_normalizer import normalize_surface_id
@@ -16,22 +20,216 @@ from engines.realtime.contracts import StreamEvent
 
 logger = logging.getLogger(__name__)
 
+SEGMENT_MAX_BYTES_ENV = "EVENT_STREAM_SEGMENT_MAX_BYTES"
+DEFAULT_SEGMENT_MAX_BYTES = 8 * 1024 * 1024
+LEGACY_EVENTS_FILE = "events.jsonl"
+OPEN_LOGS_ENV = "EVENT_STREAM_OPEN_LOGS"
+DEFAULT_OPEN_LOGS = 256
+# Positions of the most recently appended/resolved ids kept per stream (reconnects
+# usually resume near the tail).
+RECENT_POSITIONS = 1024
+
+
+def _segment_name(index: int) -> str:
+    return f"segment-{index:06d}"
+
+
+def _default_segment_max_bytes() -> int:
+    try:
+        return max(1, int(os.getenv(SEGMENT_MAX_BYTES_ENV, str(DEFAULT_SEGMENT_MAX_BYTES))))
+    except ValueError:
+        return DEFAULT_SEGMENT_MAX_BYTES
+
+
+def _max_open_logs() -> int:
+    try:
+        return max(1, int(os.getenv(OPEN_LOGS_ENV, str(DEFAULT_OPEN_LOGS))))
+    except ValueError:
+        return DEFAULT_OPEN_LOGS
+
+
+@dataclass
+class _SegmentLog:
+    """Offset index of one stream directory.
+
+    Each `segment-NNNNNN.jsonl` has a sidecar `segment-NNNNNN.idx` with one
+    `event_id<TAB>byte_offset` line per event. The sidecars stay on disk: a cursor
+    lookup searches them newest segment first (plain text, no event decoding) and
+    stops at the first segment holding the id. Only the positions of recently
+    appended or resolved ids are kept in memory, in a bounded LRU.
+    """
+
+    directory: Path
+    lock: threading.RLock = field(default_factory=threading.RLock)
+    recent: "OrderedDict[str, Tuple[int, int]]" = field(default_factory=OrderedDict)
+    segments: List[int] = field(default_factory=list)
+    idx_read: Dict[int, int] = field(default_factory=dict)
+
+    def segment_path(self, index: int) -> Path:
+        return self.directory / f"{_segment_name(index)}.jsonl"
+
+    def index_path(self, index: int) -> Path:
+        return self.directory / f"{_segment_name(index)}.idx"
+
+    def refresh(self) -> None:
+        if not self.directory.exists():
+            return
+        self._migrate_legacy_file()
+        on_disk = sorted(
+            int(p.stem.split("-", 1)[1]) for p in self.directory.glob("segment-*.jsonl") if p.stem.split("-", 1)[1].isdigit()
+        )
+        for seg in on_disk:
+            if seg not in self.idx_read:
+                self.segments.append(seg)
+                self._repair_index(seg)
+                # History is looked up on disk; only follow entries written from now on.
+                self.idx_read[seg] = self._index_size(seg)
+            self._follow_index(seg)
+
+    def locate(self, event_id: str) -> Optional[Tuple[int, int]]:
+        """(segment, byte offset) of an event, or None if the stream does not hold it."""
+        position = self.recent.get(event_id)
+        if position is not None:
+            self.recent.move_to_end(event_id)
+            return position
+        needle = event_id.encode("utf-8") + b"\t"
+        for seg in reversed(self.segments):
+            try:
+                data = self.index_path(seg).read_bytes()
+            except FileNotFoundError:
+                continue
+            at = data.find(b"\n" + needle)
+            at = 0 if data.startswith(needle) else (at + 1 if at >= 0 else -1)
+            if at < 0:
+                continue
+            line_end = data.find(b"\n", at)
+            offset = data[at + len(needle) : line_end if line_end >= 0 else len(data)]
+            if offset.isdigit():
+                self._remember(event_id, (seg, int(offset)))
+                return seg, int(offset)
+        return None
+
+    def _remember(self, event_id: str, position: Tuple[int, int]) -> None:
+        self.recent[event_id] = position
+        self.recent.move_to_end(event_id)
+        while len(self.recent) > RECENT_POSITIONS:
+            self.recent.popitem(last=False)
+
+    def _index_size(self, seg: int) -> int:
+        try:
+            return self.index_path(seg).stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _migrate_legacy_file(self) -> None:
+        legacy = self.directory / LEGACY_EVENTS_FILE
+        if legacy.exists() and not self.segment_path(0).exists():
+            os.replace(legacy, self.segment_path(0))
+
+    def _follow_index(self, seg: int) -> None:
+        size = self._index_size(seg)
+        start = self.idx_read[seg]
+        if size <= start:
+            return
+        with open(self.index_path(seg), "rb") as fh:
+            fh.seek(start)
+            chunk = fh.read(size - start)
+        # Only consume complete lines; a concurrent writer may be mid-line.
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            event_id, _, offset = line.decode("utf-8").partition("\t")
+            if event_id and offset.isdigit():
+                self._remember(event_id, (seg, int(offset)))
+        self.idx_read[seg] = start + end
+
+    def _last_indexed_offset(self, seg: int) -> int:
+        """Offset of the last complete sidecar entry, reading only the sidecar's tail."""
+        size = self._index_size(seg)
+        if not size:
+            return -1
+        block = 4096
+        with open(self.index_path(seg), "rb") as fh:
+            while True:
+                start = max(0, size - block)
+                fh.seek(start)
+                tail = fh.read(size - start)
+                lines = tail.split(b"\n")
+                if start > 0:
+                    lines = lines[1:]  # first piece may be a partial line
+                for line in reversed(lines):
+                    _, _, offset = line.decode("utf-8", errors="replace").partition("\t")
+                    if offset.isdigit():
+                        return int(offset)
+                if start == 0:
+                    return -1
+                block *= 4
+
+    def _repair_index(self, seg: int) -> None:
+        """Index events a crashed writer appended to the segment but not to its sidecar."""
+        data_path, idx_path = self.segment_path(seg), self.index_path(seg)
+        last_offset = self._last_indexed_offset(seg)
+        missing = []
+        with open(data_path, "rb") as fh:
+            if last_offset >= 0:
+                fh.seek(last_offset)
+                fh.readline()
+            while True:
+                offset = fh.tell()
+                line = fh.readline()
+                if not line:
+                    break
+                if not line.endswith(b"\n"):
+                    break  # torn trailing write; appends continue after it
+                try:
+                    event_id = json.loads(line).get("event_id")
+                except Exception:
+                    continue
+                if event_id:
+                    missing.append(f"{event_id}\t{offset}\n")
+        if missing:
+            with open(idx_path, "a", encoding="utf-8") as fh:
+                fh.write("".join(missing))
+
+
+# Open stream logs are cached per process and evicted least-recently-used; an evicted
+# log is rebuilt from disk (segment list + sidecar tails) on its next use.
+_LOGS: "OrderedDict[Path, _SegmentLog]" = OrderedDict()
+_LOGS_LOCK = threading.Lock()
+
+
+def _segment_log(directory: Path) -> _SegmentLog:
+    with _LOGS_LOCK:
+        log = _LOGS.get(directory)
+        if log is None:
+            log = _LOGS[directory] = _SegmentLog(directory)
+            while len(_LOGS) > _max_open_logs():
+                _LOGS.popitem(last=False)
+        else:
+            _LOGS.move_to_end(directory)
+        return log
+
 
 class FileSystemTimelineStore:
-    """Filesystem-backed timeline store using JSONL append-log pattern.
+    """Filesystem-backed timeline store using a segmented JSONL append-log pattern.
     
     Path structure:
-      var/event_stream/{tenant_id}/{env}/{surface_id or "_"}/events.jsonl
+      var/event_stream/{tenant_id}/{env}/{surface_id or "_"}/{stream_id}/segment-NNNNNN.jsonl
+      (+ segment-NNNNNN.idx sidecar: event_id -> byte offset)
     
     Guarantees:
       - Append-only (never overwrites existing events)
       - Survive restart (persisted to disk)
-      - Monotonic by append order (file position = event order)
+      - Monotonic by append order (segment number, then file position = event order)
+      - list_after seeks straight to the cursor and only decodes events after it
+    
+    Segments roll over once they exceed `segment_max_bytes`. A legacy single
+    `events.jsonl` is adopted as segment 0 the first time the stream is touched.
     """
     
-    def __init__(self, base_dir: Optional[str | Path] = None) -> None:
+    def __init__(self, base_dir: Optional[str | Path] = None, segment_max_bytes: Optional[int] = None) -> None:
         self._base_dir = Path(base_dir or Path.cwd() / "var" / "event_stream")
         self._base_dir.mkdir(parents=True, exist_ok=True)
+        self._segment_max_bytes = segment_max_bytes or _default_segment_max_bytes()
     
     def _stream_dir(self, stream_id: str, context: RequestContext) -> Path:
         """Deterministic directory path for a stream.
@@ -48,9 +246,8 @@ class FileSystemTimelineStore:
         
         return self._base_dir / tenant / env / surface / safe_stream_id
     
-    def _events_file(self, stream_id: str, context: RequestContext) -> Path:
-        """Full path to the JSONL events file."""
-        return self._stream_dir(stream_id, context) / "events.jsonl"
+    def _log(self, stream_id: str, context: RequestContext) -> _SegmentLog:
+        return _segment_log(self._stream_dir(stream_id, context))
     
     def append(self, stream_id: str, event: StreamEvent, context: RequestContext) -> None:
         """Append a StreamEvent to the timeline (append-only).
@@ -77,26 +274,47 @@ class FileSystemTimelineStore:
         if routing.mode and routing.mode != context.mode:
             raise RuntimeError("Timeline routing mode mismatch")
         
-        # Ensure directory exists
-        file_path = self._events_file(stream_id, context)
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        log = self._log(stream_id, context)
+        log.directory.mkdir(parents=True, exist_ok=True)
+        line = (json.dumps(event.model_dump(mode="json")) + "\n").encode("utf-8")
         
-        # Append event as JSON line (append-only, no overwrite)
-        try:
-            with open(file_path, "a") as f:
-                # Use mode='json' for Pydantic v2 serialization
-                f.write(json.dumps(event.model_dump(mode="json")) + "\n")
-        except Exception as exc:
-            logger.error(f"Failed to append timeline event to {file_path}: {exc}")
-            raise RuntimeError(f"Timeline append failed: {exc}") from exc
+        # Append event as JSON line (append-only, no overwrite), then its index entry
+        with log.lock:
+            try:
+                log.refresh()
+                seg = log.segments[-1] if log.segments else 0
+                file_path = log.segment_path(seg)
+                if file_path.exists() and file_path.stat().st_size >= self._segment_max_bytes:
+                    seg += 1
+                    file_path = log.segment_path(seg)
+                with open(file_path, "ab") as f:
+                    offset = f.tell()
+                    if offset and not self._ends_with_newline(file_path):
+                        # Never glue a new event onto a torn trailing write.
+                        f.write(b"\n")
+                        offset += 1
+                    f.write(line)
+                with open(log.index_path(seg), "a", encoding="utf-8") as idx:
+                    idx.write(f"{event.event_id}\t{offset}\n")
+                log.refresh()
+            except Exception as exc:
+                logger.error(f"Failed to append timeline event to {log.directory}: {exc}")
+                raise RuntimeError(f"Timeline append failed: {exc}") from exc
+    
+    @staticmethod
+    def _ends_with_newline(path: Path) -> bool:
+        with open(path, "rb") as fh:
+            fh.seek(-1, os.SEEK_END)
+            return fh.read(1) == b"\n"
     
     def list_after(
         self, 
         stream_id: str, 
         after_event_id: Optional[str] = None,
         context: Optional[RequestContext] = None,
+        limit: Optional[int] = None,
     ) -> List[StreamEvent]:
-        """List events in order, optionally after a specific event_id."""
+        """List events in order, optionally after a specific event_id, at most `limit` of them."""
         # Note: for filesystem, we need context to know the path
         # If not provided, we cannot reliably determine the correct file path
         # For backward compat, we accept None but log a warning
@@ -108,40 +326,63 @@ class FileSystemTimelineStore:
             from engines.common.identity import RequestContext as RC
             context = RC(tenant_id="t_system", env="dev")
         
-        events: List[StreamEvent] = []
-        file_path = self._events_file(stream_id, context)
+        log = self._log(stream_id, context)
+        if not log.directory.exists():
+            return []
         
-        if not file_path.exists():
-            return events
+        with log.lock:
+            try:
+                log.refresh()
+            except Exception as exc:
+                logger.error(f"Failed to load timeline index from {log.directory}: {exc}")
+                return []
+            segments = list(log.segments)
+            start: Optional[Tuple[int, int]] = None
+            if after_event_id:
+                start = log.locate(after_event_id)
+                if start is None:
+                    # Event not found; return all events (conservative)
+                    logger.warning(
+                        f"Requested event_id {after_event_id} not found in stream {stream_id}; "
+                        "returning all events"
+                    )
         
         try:
-            with open(file_path, "r") as f:
-                for line in f:
-                    line = line.strip()
+            return self._read_from(log, segments, start, limit)
+        except Exception as exc:
+            logger.error(f"Failed to read timeline from {log.directory}: {exc}")
+            return []
+    
+    def _read_from(
+        self,
+        log: _SegmentLog,
+        segments: List[int],
+        start: Optional[Tuple[int, int]],
+        limit: Optional[int],
+    ) -> List[StreamEvent]:
+        """Decode events after `start` (segment, offset of the cursor event), or from the beginning."""
+        events: List[StreamEvent] = []
+        if limit is not None and limit <= 0:
+            return events
+        for seg in segments:
+            if start is not None and seg < start[0]:
+                continue
+            file_path = log.segment_path(seg)
+            with open(file_path, "rb") as f:
+                if start is not None and seg == start[0]:
+                    f.seek(start[1])
+                    f.readline()  # the cursor event itself
+                for raw in f:
+                    line = raw.strip()
                     if not line:
                         continue
+                    if not raw.endswith(b"\n"):
+                        break  # partially written tail
                     try:
-                        data = json.loads(line)
-                        event = StreamEvent(**data)
-                        events.append(event)
+                        events.append(StreamEvent(**json.loads(line)))
                     except Exception as exc:
                         logger.warning(f"Skipping malformed timeline line in {file_path}: {exc}")
                         continue
-        except Exception as exc:
-            logger.error(f"Failed to read timeline from {file_path}: {exc}")
-            return []
-        
-        # Filter to events after specified event_id
-        if not after_event_id:
-            return events
-        
-        for idx, ev in enumerate(events):
-            if ev.event_id == after_event_id:
-                return events[idx + 1 :]
-        
-        # Event not found; return all events (conservative)
-        logger.warning(
-            f"Requested event_id {after_event_id} not found in stream {stream_id}; "
-            "returning all events"
-        )
+                    if limit is not None and len(events) >= limit:
+                        return events
         return events
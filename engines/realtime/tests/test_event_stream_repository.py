@@ -0,0 +1,214 @@
+"""Tests for sequence-based cursor seeks in the cloud event stream stores."""
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from engines.common.identity import RequestContext
+from engines.realtime import event_stream_repository
+from engines.realtime.contracts import ActorType, RoutingKeys, StreamEvent
+from engines.realtime.event_stream_repository import DynamoDBEventStreamStore, FirestoreEventStreamStore
+
+
+def _ctx():
+    return RequestContext(tenant_id="t_demo", env="dev", mode="lab")
+
+
+def _event(n: int) -> StreamEvent:
+    return StreamEvent(
+        type="canvas_commit",
+        event_id=f"ev-{n:04d}",
+        routing=RoutingKeys(tenant_id="t_demo", env="dev", actor_id="u1", actor_type=ActorType.HUMAN),
+        data={"n": n},
+    )
+
+
+class FakeTable:
+    """Just enough of a DynamoDB Table resource for the store's key-condition queries."""
+
+    def __init__(self):
+        self.items = {}
+        self.queries = []
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues, ReturnValues):
+        item = self.items.setdefault((Key["pk"], Key["sk"]), dict(Key))
+        item["last_seq"] = item.get("last_seq", 0) + ExpressionAttributeValues[":one"]
+        return {"Attributes": {"last_seq": item["last_seq"]}}
+
+    def put_item(self, Item, ConditionExpression=None):
+        key = (Item["pk"], Item["sk"])
+        if ConditionExpression and key in self.items:
+            raise RuntimeError("ConditionalCheckFailedException")
+        self.items[key] = dict(Item)
+
+    def get_item(self, Key):
+        item = self.items.get((Key["pk"], Key["sk"]))
+        return {"Item": dict(item)} if item else {}
+
+    def query(self, KeyConditionExpression, ExpressionAttributeValues, ScanIndexForward, Limit, ExclusiveStartKey=None):
+        self.queries.append(KeyConditionExpression)
+        values = ExpressionAttributeValues
+        if "begins_with" in KeyConditionExpression:
+            match = lambda sk: sk.startswith(values[":prefix"])  # noqa: E731
+        else:
+            match = lambda sk: sk > values[":after"]  # noqa: E731
+        keys = sorted(sk for pk, sk in self.items if pk == values[":pk"] and match(sk))
+        if ExclusiveStartKey:
+            keys = [sk for sk in keys if sk > ExclusiveStartKey["sk"]]
+        page = keys[:Limit]
+        response = {"Items": [dict(self.items[(values[":pk"], sk)]) for sk in page]}
+        if len(keys) > Limit:
+            response["LastEvaluatedKey"] = {"pk": values[":pk"], "sk": page[-1]}
+        return response
+
+
+def _store(count):
+    table = FakeTable()
+    store = DynamoDBEventStreamStore(table=table)
+    for n in range(count):
+        store.append("s1", _event(n), _ctx())
+    return store, table
+
+
+def test_dynamo_append_assigns_increasing_sequence():
+    store, table = _store(3)
+    seqs = [item["stream_seq"] for (_, sk), item in sorted(table.items.items()) if sk.startswith("seq#")]
+    assert seqs == [1, 2, 3]
+    assert table.items[("stream#s1", "id#ev-0001")]["seq_sk"] == "seq#" + "2".zfill(20)
+
+
+def test_dynamo_list_after_seeks_from_cursor_in_pages():
+    store, table = _store(25)
+    table.queries.clear()
+    events = store.list_after("s1", after_event_id="ev-0009", page_size=4)
+    assert [e.data["n"] for e in events] == list(range(10, 25))
+    assert all("sk > :after" in q for q in table.queries)
+    assert len(table.queries) == 4
+
+
+def test_dynamo_list_after_respects_limit_and_unknown_cursor():
+    store, _ = _store(10)
+    assert [e.data["n"] for e in store.list_after("s1", limit=3)] == [0, 1, 2]
+    assert [e.data["n"] for e in store.list_after("s1", after_event_id="ev-0007")] == [8, 9]
+    assert store.list_after("s1", after_event_id="missing") == []
+
+
+def test_dynamo_legacy_items_are_served_before_sequenced_ones():
+    table = FakeTable()
+    for n in range(2):
+        ev = _event(n)
+        table.put_item({**ev.dict(), "pk": "stream#s1", "sk": f"event#{ev.ts.isoformat()}#{ev.event_id}"})
+    store = DynamoDBEventStreamStore(table=table)
+    store.append("s1", _event(2), _ctx())
+    assert [e.data["n"] for e in store.list_after("s1")] == [0, 1, 2]
+    assert [e.data["n"] for e in store.list_after("s1", after_event_id="ev-0000")] == [1, 2]
+
+
+def test_dynamo_holds_back_events_behind_an_open_gap(monkeypatch):
+    store, table = _store(2)
+    store._next_seq("stream#s1")  # seq 3 allocated, insert still in flight
+    store.append("s1", _event(3), _ctx())
+    assert [e.data["n"] for e in store.list_after("s1")] == [0, 1]
+    assert [e.data["n"] for e in store.list_after("s1", after_event_id="ev-0001")] == []
+
+    # Once the gap is older than the settle window it is treated as abandoned.
+    monkeypatch.setenv("EVENT_STREAM_GAP_SETTLE_SECONDS", "0")
+    assert [e.data["n"] for e in store.list_after("s1", after_event_id="ev-0001")] == [3]
+
+
+def test_dynamo_failed_insert_leaves_a_gap_marker_readers_skip():
+    store, table = _store(1)
+    put_item = table.put_item
+
+    def failing_put(Item, ConditionExpression=None):
+        if Item.get("event_id") == "ev-0001":
+            raise RuntimeError("throttled")
+        put_item(Item, ConditionExpression)
+
+    table.put_item = failing_put
+    with pytest.raises(RuntimeError):
+        store.append("s1", _event(1), _ctx())
+    table.put_item = put_item
+    store.append("s1", _event(2), _ctx())
+
+    assert table.items[("stream#s1", "seq#" + "2".zfill(20))]["stream_gap"] is True
+    assert [e.data["n"] for e in store.list_after("s1")] == [0, 2]
+    assert [e.data["n"] for e in store.list_after("s1", after_event_id="ev-0000")] == [2]
+
+
+class FakeDoc:
+    def __init__(self, db, path):
+        self.db, self.path = db, path
+
+    def collection(self, name):
+        return FakeCollection(self.db, f"{self.path}/{name}")
+
+    def get(self, transaction=None):
+        data = self.db.docs.get(self.path)
+        return SimpleNamespace(exists=data is not None, to_dict=lambda: dict(data) if data else None)
+
+
+class FakeCollection:
+    def __init__(self, db, path):
+        self.db, self.path = db, path
+
+    def document(self, name):
+        return FakeDoc(self.db, f"{self.path}/{name}")
+
+    def limit(self, n):
+        return SimpleNamespace(stream=lambda: [p for p in self.db.docs if p.startswith(self.path + "/")][:n])
+
+
+class FakeTransaction:
+    def __init__(self, db):
+        self.db = db
+
+    def set(self, ref, data, merge=False):
+        self.db.docs[ref.path] = {**self.db.docs.get(ref.path, {}), **data} if merge else dict(data)
+
+
+class FakeFirestore:
+    def __init__(self):
+        self.docs = {}
+        self.commits = 0
+        self.release = threading.Event()
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+
+def _transactional(fn):
+    def run(transaction):
+        db = transaction.db
+        db.commits += 1
+        if db.commits == 1:
+            db.release.wait(5)  # hold the first commit so the other appends queue up behind it
+        return fn(transaction)
+
+    return run
+
+
+def test_firestore_concurrent_appends_are_group_committed(monkeypatch):
+    monkeypatch.setattr(event_stream_repository, "firestore", SimpleNamespace(transactional=_transactional))
+    db = FakeFirestore()
+    store = FirestoreEventStreamStore(project="p", client=db)
+    threads = [threading.Thread(target=store.append, args=("s1", _event(n), _ctx())) for n in range(20)]
+    threads[0].start()
+    while db.commits == 0:
+        pass
+    for t in threads[1:]:
+        t.start()
+    while sum(len(q) for q in store._pending.values()) < 19:
+        pass
+    db.release.set()
+    for t in threads:
+        t.join(5)
+
+    assert db.commits == 2
+    seqs = sorted(d["stream_seq"] for p, d in db.docs.items() if "/events/" in p)
+    assert seqs == list(range(1, 21))
+    assert db.docs["event_streams/s1"]["last_seq"] == 20
+    assert store._pending == {} and store._committing == set()
@@ -0,0 +1,117 @@
+"""Tests for the segmented filesystem timeline store."""
+import json
+from unittest.mock import patch
+
+import pytest
+
+from engines.common.identity import RequestContext
+from engines.realtime.contracts import ActorType, RoutingKeys, StreamEvent
+from engines.realtime.filesystem_timeline import FileSystemTimelineStore
+
+
+def _ctx():
+    return RequestContext(tenant_id="t_demo", env="dev", mode="lab")
+
+
+def _event(n: int) -> StreamEvent:
+    return StreamEvent(
+        type="canvas_commit",
+        event_id=f"ev-{n:04d}",
+        routing=RoutingKeys(tenant_id="t_demo", env="dev", actor_id="u1", actor_type=ActorType.HUMAN),
+        data={"n": n, "pad": "x" * 40},
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FileSystemTimelineStore(base_dir=tmp_path, segment_max_bytes=1024)
+
+
+def _fill(store, count):
+    for n in range(count):
+        store.append("canvas-1", _event(n), _ctx())
+
+
+def test_rolls_segments_and_lists_in_order(store, tmp_path):
+    _fill(store, 40)
+    stream_dir = next(tmp_path.rglob("canvas-1"))
+    assert len(list(stream_dir.glob("segment-*.jsonl"))) > 1
+    events = store.list_after("canvas-1", context=_ctx())
+    assert [e.data["n"] for e in events] == list(range(40))
+
+
+def test_list_after_seeks_to_cursor_and_respects_limit(store):
+    _fill(store, 40)
+    with patch("engines.realtime.filesystem_timeline.StreamEvent", wraps=StreamEvent) as decoded:
+        tail = store.list_after("canvas-1", after_event_id="ev-0035", context=_ctx())
+    assert [e.event_id for e in tail] == ["ev-0036", "ev-0037", "ev-0038", "ev-0039"]
+    assert decoded.call_count == 4
+
+    page = store.list_after("canvas-1", after_event_id="ev-0010", context=_ctx(), limit=3)
+    assert [e.event_id for e in page] == ["ev-0011", "ev-0012", "ev-0013"]
+    assert store.list_after("canvas-1", after_event_id="ev-0039", context=_ctx()) == []
+
+
+def test_unknown_cursor_returns_everything(store):
+    _fill(store, 3)
+    assert len(store.list_after("canvas-1", after_event_id="missing", context=_ctx())) == 3
+
+
+def test_new_process_reloads_index_and_repairs_missing_entries(tmp_path):
+    writer = FileSystemTimelineStore(base_dir=tmp_path, segment_max_bytes=1024)
+    _fill(writer, 5)
+    stream_dir = next(tmp_path.rglob("canvas-1"))
+    # Simulate a crash between writing the event and its index entry.
+    last_segment = sorted(stream_dir.glob("segment-*.jsonl"))[-1]
+    with open(last_segment, "a") as fh:
+        fh.write(json.dumps(_event(5).model_dump(mode="json")) + "\n")
+
+    from engines.realtime import filesystem_timeline
+
+    filesystem_timeline._LOGS.clear()
+    reader = FileSystemTimelineStore(base_dir=tmp_path, segment_max_bytes=1024)
+    tail = reader.list_after("canvas-1", after_event_id="ev-0004", context=_ctx())
+    assert [e.event_id for e in tail] == ["ev-0005"]
+    assert [e.event_id for e in reader.list_after("canvas-1", after_event_id="ev-0005", context=_ctx())] == []
+
+
+def test_legacy_events_file_is_adopted(tmp_path):
+    store = FileSystemTimelineStore(base_dir=tmp_path)
+    stream_dir = store._stream_dir("legacy-stream", _ctx())
+    stream_dir.mkdir(parents=True)
+    with open(stream_dir / "events.jsonl", "w") as fh:
+        for n in range(3):
+            fh.write(json.dumps(_event(n).model_dump(mode="json")) + "\n")
+    store.append("legacy-stream", _event(3), _ctx())
+    tail = store.list_after("legacy-stream", after_event_id="ev-0001", context=_ctx())
+    assert [e.event_id for e in tail] == ["ev-0002", "ev-0003"]
+
+
+def test_old_cursors_resolve_from_disk_with_bounded_memory(store, monkeypatch):
+    from engines.realtime import filesystem_timeline
+
+    monkeypatch.setattr(filesystem_timeline, "RECENT_POSITIONS", 4)
+    _fill(store, 40)
+    log = store._log("canvas-1", _ctx())
+    assert len(log.recent) == 4
+    assert "ev-0003" not in log.recent
+
+    # Resolved from the on-disk sidecar of the segment holding it.
+    tail = store.list_after("canvas-1", after_event_id="ev-0003", context=_ctx(), limit=2)
+    assert [e.event_id for e in tail] == ["ev-0004", "ev-0005"]
+    assert len(log.recent) == 4 and "ev-0003" in log.recent
+
+
+def test_open_stream_logs_are_evicted_lru(tmp_path, monkeypatch):
+    from engines.realtime import filesystem_timeline
+
+    monkeypatch.setattr(filesystem_timeline, "_LOGS", filesystem_timeline.OrderedDict())
+    monkeypatch.setenv(filesystem_timeline.OPEN_LOGS_ENV, "2")
+    store = FileSystemTimelineStore(base_dir=tmp_path)
+    for name in ["s1", "s2", "s3"]:
+        store.append(name, _event(0), _ctx())
+        store.append(name, _event(1), _ctx())
+    assert len(filesystem_timeline._LOGS) == 2
+
+    # An evicted stream reopens from disk.
+    assert [e.event_id for e in store.list_after("s1", after_event_id="ev-0000", context=_ctx())] == ["ev-0001"]
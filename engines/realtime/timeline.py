@@ -7,6 +7,7 @@ from typing import Dict, List, Optional, Protocol
 from engines.common.identity import RequestContext
 from engines.config import runtime_config
 from engines.realtime.contracts import StreamEvent
+from engines.realtime.event_stream_repository import firestore_read_pages
 
 try:  # pragma: no cover - optional dependency
     from google.cloud import firestore  # type: ignore
@@ -18,7 +19,7 @@ logger = logging.getLogger(__name__)
 
 class TimelineStore(Protocol):
     def append(self, stream_id: str, event: StreamEvent, context: RequestContext) -> None: ...
-    def list_after(self, stream_id: str, after_event_id: Optional[str] = None) -> List[StreamEvent]: ...
+    def list_after(self, stream_id: str, after_event_id: Optional[str] = None, limit: Optional[int] = None) -> List[StreamEvent]: ...
 
 
 class InMemoryTimelineStore:
@@ -41,14 +42,16 @@ class InMemoryTimelineStore:
         bucket = self._storage.setdefault(stream_id, [])
         bucket.append(event)
 
-    def list_after(self, stream_id: str, after_event_id: Optional[str] = None) -> List[StreamEvent]:
+    def list_after(self, stream_id: str, after_event_id: Optional[str] = None, limit: Optional[int] = None) -> List[StreamEvent]:
         events = list(self._storage.get(stream_id, []))
-        if not after_event_id:
-            return events
-        for idx, ev in enumerate(events):
-            if ev.event_id == after_event_id:
-                return events[idx + 1 :]
-        return []
+        if after_event_id:
+            for idx, ev in enumerate(events):
+                if ev.event_id == after_event_id:
+                    events = events[idx + 1 :]
+                    break
+            else:
+                return []
+        return events if limit is None else events[:limit]
 
 
 class FirestoreTimelineStore:
@@ -70,28 +73,19 @@ class FirestoreTimelineStore:
             raise RuntimeError("RequestContext is required for timeline append")
         self._event_collection(stream_id).document(event.event_id).set(event.dict())  # type: ignore[attr-defined]
 
-    def list_after(self, stream_id: str, after_event_id: Optional[str] = None) -> List[StreamEvent]:
-        events: List[StreamEvent] = []
-        query = self._event_collection(stream_id).order_by("ts")
+    def list_after(self, stream_id: str, after_event_id: Optional[str] = None, limit: Optional[int] = None) -> List[StreamEvent]:
+        collection = self._event_collection(stream_id)
         try:
-            snaps = query.stream()
+            # Seek from the cursor snapshot instead of streaming the whole timeline.
+            cursor = None
+            if after_event_id:
+                cursor = collection.document(after_event_id).get()
+                if not cursor.exists:
+                    return []
+            return firestore_read_pages(collection.order_by("ts"), cursor, limit=limit)
         except Exception as exc:  # pragma: no cover
             logger.warning("Firestore timeline query failed: %s", exc)
-            return events
-        for snap in snaps:
-            data = snap.to_dict() or {}
-            try:
-                ev = StreamEvent(**data)
-            except Exception as exc:  # pragma: no cover
-                logger.warning("Skipping invalid timeline event: %s", exc)
-                continue
-            events.append(ev)
-        if not after_event_id:
-            return events
-        for idx, ev in enumerate(events):
-            if ev.event_id == after_event_id:
-                return events[idx + 1 :]
-        return []
+            return []
 
 
 def _default_timeline_store() -> TimelineStore:
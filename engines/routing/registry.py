@@ -6,15 +6,20 @@ No behavior/business logic changes; only backend selection/validation.
 from __future__ import annotations
 
 import json
+import logging
 import os
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, Protocol
+from typing import Any, Callable, Dict, Optional, Protocol, Tuple
 
 from pydantic import BaseModel, Field
 
 from engines.common.surface_normalizer import normalize_surface_id
 
+logger = logging.getLogger(__name__)
+
 
 def _now() -> datetime:
     return datetime.now(timezone.utc)
@@ -183,6 +188,11 @@ class FirestoreRoutingRegistry:
         for d in docs.stream():
             d.reference.delete()
 
+    def watch(self, on_change: Callable[[], None]) -> Callable[[], None]:
+        """Call on_change whenever any route document changes (snapshot listener)."""
+        watch = self._client.collection(self._collection).on_snapshot(lambda *_: on_change())
+        return watch.unsubscribe
+
 
 # ===== Filesystem Implementation =====
 
@@ -193,9 +203,40 @@ class FileSystemRoutingRegistry:
     var/routing/{resource_kind}/{tenant_id}/{env}/{project_id or "_"}.json
     """
     
+    _change_marker = ".routes_version"
+
     def __init__(self, base_dir: Optional[str | Path] = None):
         self._base_dir = Path(base_dir or Path.cwd() / "var" / "routing")
         self._base_dir.mkdir(parents=True, exist_ok=True)
+
+    def _touch_change_marker(self) -> None:
+        """Bump the marker file other processes watch for route changes."""
+        marker = self._base_dir / self._change_marker
+        marker.write_text(str(time.time_ns()))
+
+    def watch(self, on_change: Callable[[], None], interval: float = 1.0) -> Callable[[], None]:
+        """Poll the change marker's mtime and call on_change when it moves."""
+        marker = self._base_dir / self._change_marker
+        stop = threading.Event()
+
+        def _mtime() -> Optional[int]:
+            try:
+                return marker.stat().st_mtime_ns
+            except OSError:
+                return None
+
+        last = _mtime()
+
+        def _poll() -> None:
+            nonlocal last
+            while not stop.wait(interval):
+                current = _mtime()
+                if current != last:
+                    last = current
+                    on_change()
+
+        threading.Thread(target=_poll, name="routing-registry-watch", daemon=True).start()
+        return stop.set
     
     def _route_path(
         self, 
@@ -218,6 +259,7 @@ class FileSystemRoutingRegistry:
         
         with open(path, "w") as f:
             json.dump(route.model_dump(mode="json"), f, indent=2)
+        self._touch_change_marker()
         return route
     
     def get_route(
@@ -290,13 +332,138 @@ class FileSystemRoutingRegistry:
         path = self._route_path(resource_kind, tenant_id, env, project_id)
         if path.exists():
             path.unlink()
+            self._touch_change_marker()
+
+
+
+
+# ===== Caching Layer =====
+
+ROUTING_CACHE_TTL_ENV = "ROUTING_CACHE_TTL_SECONDS"
+ROUTING_CACHE_NEGATIVE_TTL_ENV = "ROUTING_CACHE_NEGATIVE_TTL_SECONDS"
+ROUTING_CACHE_ENABLED_ENV = "ROUTING_CACHE_ENABLED"
+ROUTING_CACHE_WATCH_ENV = "ROUTING_CACHE_WATCH"
+DEFAULT_ROUTING_CACHE_TTL = 30.0
+DEFAULT_ROUTING_CACHE_NEGATIVE_TTL = 5.0
+
+
+def _env_seconds(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+class CachedRoutingRegistry:
+    """Read-through cache in front of a durable routing registry.
+
+    get_route is a dict lookup while an entry is fresh. Each entry carries its
+    own expiry: found routes live for ``ttl`` seconds, misses for the shorter
+    ``negative_ttl`` so a newly configured route is picked up quickly.
+
+    Local writes (upsert_route/delete_route) evict their key and bump a version
+    counter; a lookup that raced with a write does not store its result. When
+    the inner registry supports ``watch`` (Firestore snapshot listener, file
+    mtime poll), changes made by other processes clear the cache as well.
+    """
+
+    def __init__(
+        self,
+        inner: RoutingRegistry,
+        ttl: Optional[float] = None,
+        negative_ttl: Optional[float] = None,
+        watch: bool = True,
+    ) -> None:
+        self._inner = inner
+        self._ttl = _env_seconds(ROUTING_CACHE_TTL_ENV, DEFAULT_ROUTING_CACHE_TTL) if ttl is None else ttl
+        self._negative_ttl = (
+            _env_seconds(ROUTING_CACHE_NEGATIVE_TTL_ENV, DEFAULT_ROUTING_CACHE_NEGATIVE_TTL)
+            if negative_ttl is None
+            else negative_ttl
+        )
+        self._entries: Dict[tuple, Tuple[Optional[ResourceRoute], float]] = {}
+        self._lock = threading.Lock()
+        self._version = 0
+        self._stats: Dict[str, int] = {"hits": 0, "negative_hits": 0, "misses": 0, "invalidations": 0}
+        self._unwatch: Optional[Callable[[], None]] = None
+        if watch and hasattr(inner, "watch"):
+            try:
+                self._unwatch = inner.watch(self.invalidate_all)
+            except Exception as exc:
+                logger.warning(f"Routing registry change watch unavailable; relying on TTL: {exc}")
+
+    @property
+    def inner(self) -> RoutingRegistry:
+        return self._inner
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _key(self, resource_kind: str, tenant_id: str, env: str, project_id: Optional[str] = None) -> tuple:
+        return (resource_kind, tenant_id, env, project_id or "")
+
+    def get_route(self, resource_kind: str, tenant_id: str, env: str, project_id: Optional[str] = None) -> Optional[ResourceRoute]:
+        key = self._key(resource_kind, tenant_id, env, project_id)
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            route = entry[0]
+            self._stats["hits" if route is not None else "negative_hits"] += 1
+            return route
+
+        self._stats["misses"] += 1
+        version = self._version
+        route = self._inner.get_route(resource_kind, tenant_id, env, project_id)
+        ttl = self._ttl if route is not None else self._negative_ttl
+        with self._lock:
+            if version == self._version and ttl > 0:
+                self._entries[key] = (route, time.monotonic() + ttl)
+        return route
+
+    def upsert_route(self, route: ResourceRoute) -> ResourceRoute:
+        result = self._inner.upsert_route(route)
+        self._evict(self._key(route.resource_kind, route.tenant_id, route.env, route.project_id))
+        return result
+
+    def delete_route(self, resource_kind: str, tenant_id: str, env: str, project_id: Optional[str] = None) -> None:
+        self._inner.delete_route(resource_kind, tenant_id, env, project_id)
+        self._evict(self._key(resource_kind, tenant_id, env, project_id))
+
+    def list_routes(self, resource_kind: Optional[str] = None, tenant_id: Optional[str] = None) -> list[ResourceRoute]:
+        return self._inner.list_routes(resource_kind=resource_kind, tenant_id=tenant_id)
 
+    def _evict(self, key: tuple) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.pop(key, None)
+            self._stats["invalidations"] += 1
 
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "entries": len(self._entries), "version": self._version}
+
+    def close(self) -> None:
+        if self._unwatch is not None:
+            self._unwatch()
+            self._unwatch = None
 
 
 _routing_registry: Optional[RoutingRegistry] = None
 
 
+def _with_cache(registry: RoutingRegistry) -> RoutingRegistry:
+    """Wrap a durable registry in CachedRoutingRegistry unless ROUTING_CACHE_ENABLED=0."""
+    if os.getenv(ROUTING_CACHE_ENABLED_ENV, "1").lower() in {"0", "false", "no"}:
+        return registry
+    watch = os.getenv(ROUTING_CACHE_WATCH_ENV, "1").lower() not in {"0", "false", "no"}
+    return CachedRoutingRegistry(registry, watch=watch)
+
+
 def routing_registry() -> RoutingRegistry:
     """Get or initialize the routing registry singleton.
     
@@ -305,15 +472,16 @@ def routing_registry() -> RoutingRegistry:
     - In development/local: ROUTING_REGISTRY_BACKEND=filesystem
     - In tests: explicitly set via set_routing_registry() before use
     - Prevents silent fallback to InMemory in prod paths
+    - Durable backends are wrapped in CachedRoutingRegistry (see ROUTING_CACHE_*)
     """
     global _routing_registry
     if _routing_registry is None:
         backend = os.getenv("ROUTING_REGISTRY_BACKEND", "filesystem").lower()
         
         if backend == "firestore":
-            _routing_registry = FirestoreRoutingRegistry()
+            _routing_registry = _with_cache(FirestoreRoutingRegistry())
         elif backend == "filesystem":
-            _routing_registry = FileSystemRoutingRegistry()
+            _routing_registry = _with_cache(FileSystemRoutingRegistry())
         elif backend == "memory":
             # Memory only allowed if explicitly set for tests
             _routing_registry = InMemoryRoutingRegistry()
@@ -328,4 +496,6 @@ def routing_registry() -> RoutingRegistry:
 def set_routing_registry(registry: RoutingRegistry) -> None:
     """Set the routing registry (for testing)."""
     global _routing_registry
+    if isinstance(_routing_registry, CachedRoutingRegistry) and _routing_registry is not registry:
+        _routing_registry.close()
     _routing_registry = registry
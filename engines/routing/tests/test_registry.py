@@ -6,6 +6,8 @@ from engines.routing.registry import (
     ResourceRoute,
     InMemoryRoutingRegistry,
     MissingRoutingConfig,
+    CachedRoutingRegistry,
+    FileSystemRoutingRegistry,
 )
 
 
@@ -202,3 +204,80 @@ def test_upsert_updates_existing(registry):
     # Should have updated config
     retrieved = registry.get_route("feature_flags", "t_system", "prod")
     assert retrieved.config["collection"] == "new"
+
+
+class _CountingRegistry(InMemoryRoutingRegistry):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get_route(self, resource_kind, tenant_id, env, project_id=None):
+        self.reads += 1
+        return super().get_route(resource_kind, tenant_id, env, project_id)
+
+
+def _flags_route(collection: str) -> ResourceRoute:
+    return ResourceRoute(
+        id="route-cached",
+        resource_kind="feature_flags",
+        tenant_id="t_system",
+        env="prod",
+        backend_type="firestore",
+        config={"collection": collection},
+    )
+
+
+def test_cached_registry_serves_repeat_lookups_from_memory():
+    """Repeat lookups (including misses) do not reach the backing registry."""
+    inner = _CountingRegistry()
+    cached = CachedRoutingRegistry(inner, ttl=60, negative_ttl=60)
+    inner.upsert_route(_flags_route("a"))
+
+    for _ in range(5):
+        assert cached.get_route("feature_flags", "t_system", "prod").config["collection"] == "a"
+        assert cached.get_route("missing", "t_system", "prod") is None
+
+    assert inner.reads == 2
+    stats = cached.stats()
+    assert (stats["hits"], stats["negative_hits"], stats["misses"]) == (4, 4, 2)
+
+
+def test_cached_registry_local_writes_invalidate_immediately():
+    """upsert/delete through the cache evict the key and bump the version."""
+    cached = CachedRoutingRegistry(_CountingRegistry(), ttl=60, negative_ttl=60)
+    assert cached.get_route("feature_flags", "t_system", "prod") is None
+
+    cached.upsert_route(_flags_route("a"))
+    assert cached.get_route("feature_flags", "t_system", "prod").config["collection"] == "a"
+    cached.upsert_route(_flags_route("b"))
+    assert cached.get_route("feature_flags", "t_system", "prod").config["collection"] == "b"
+
+    cached.delete_route("feature_flags", "t_system", "prod")
+    assert cached.get_route("feature_flags", "t_system", "prod") is None
+    assert cached.version == 3
+
+
+def test_cached_registry_entries_expire():
+    """Entries with a zero TTL are never stored."""
+    inner = _CountingRegistry()
+    cached = CachedRoutingRegistry(inner, ttl=0, negative_ttl=0)
+    cached.get_route("feature_flags", "t_system", "prod")
+    cached.get_route("feature_flags", "t_system", "prod")
+    assert inner.reads == 2
+
+
+def test_cached_registry_sees_other_process_writes_via_file_watch(tmp_path):
+    """A write from another registry instance clears the cache through the change marker."""
+    import time
+
+    cached = CachedRoutingRegistry(FileSystemRoutingRegistry(tmp_path), ttl=60, negative_ttl=60, watch=False)
+    stop = cached.inner.watch(cached.invalidate_all, interval=0.01)
+    try:
+        assert cached.get_route("feature_flags", "t_system", "prod") is None
+        FileSystemRoutingRegistry(tmp_path).upsert_route(_flags_route("remote"))
+        deadline = time.time() + 2
+        while cached.get_route("feature_flags", "t_system", "prod") is None and time.time() < deadline:
+            time.sleep(0.01)
+        assert cached.get_route("feature_flags", "t_system", "prod").config["collection"] == "remote"
+    finally:
+        stop()
@@ -5,8 +5,9 @@ import copy
 import uuid
 from typing import List, Tuple, Dict, Optional
 
-from engines.scene_engine.core.scene_v2 import SceneV2, SceneNodeV2
-from engines.scene_engine.core.geometry import Vector3, EulerAngles
+from engines.scene_engine.core.instancing import instance_node_id
+from engines.scene_engine.core.scene_v2 import SceneV2, SceneNodeV2, SceneInstanceV2, ScenePrototypeV2
+from engines.scene_engine.core.geometry import Vector3, EulerAngles, Transform
 from engines.scene_engine.avatar.models import AvatarRigDefinition, AvatarBone
 
 def _generate_id_map(nodes: List[SceneNodeV2], suffix: str) -> Dict[str, str]:
@@ -43,6 +44,62 @@ def _clone_and_rename_nodes(nodes: List[SceneNodeV2], id_map: Dict[str, str]) ->
         result.append(recurse(n))
     return result
 
+def instance_rig(
+    template_rig: AvatarRigDefinition,
+    instance_id: str,
+    id_map: Optional[Dict[str, str]] = None
+) -> AvatarRigDefinition:
+    """Rig for one instance: bone/node ids suffixed with the instance id."""
+    new_bones = []
+    for bone in template_rig.bones:
+        new_node_id = id_map.get(bone.node_id) if id_map is not None else instance_node_id(bone.node_id, instance_id)
+        if new_node_id:
+            new_bones.append(AvatarBone(
+                id=f"{bone.id}_{instance_id}",
+                node_id=new_node_id,
+                part=bone.part,
+                parent_id=f"{bone.parent_id}_{instance_id}" if bone.parent_id else None
+            ))
+            
+    new_root_id = f"{template_rig.root_bone_id}_{instance_id}"
+    
+    # Remap Attachments
+    new_attachments = []
+    for att in template_rig.attachments:
+        new_attachments.append(att.model_copy(update={"bone_id": f"{att.bone_id}_{instance_id}"}, deep=True))
+    
+    return AvatarRigDefinition(
+        root_bone_id=new_root_id if new_root_id else template_rig.root_bone_id,
+        bones=new_bones,
+        attachments=new_attachments
+    )
+
+def add_avatar_prototype(scene: SceneV2, template_nodes: List[SceneNodeV2]) -> ScenePrototypeV2:
+    """Registers template nodes as a shared prototype (nodes are referenced, not copied)."""
+    prototype = ScenePrototypeV2(id=f"proto_{uuid.uuid4().hex[:6]}", nodes=list(template_nodes))
+    scene.prototypes.append(prototype)
+    return prototype
+
+def place_avatar_instance(
+    scene: SceneV2,
+    prototype: ScenePrototypeV2,
+    template_rig: AvatarRigDefinition,
+    position: Vector3,
+    rotation_y_deg: float = 0.0
+) -> Tuple[SceneInstanceV2, AvatarRigDefinition]:
+    """Adds a lightweight instance of a prototype; node ids resolve as f"{node_id}_{instance_id}"."""
+    instance = SceneInstanceV2(
+        id=uuid.uuid4().hex[:8],
+        prototype_id=prototype.id,
+        transform=Transform(
+            position=Vector3(x=position.x, y=position.y, z=position.z),
+            rotation=EulerAngles(x=0.0, y=rotation_y_deg, z=0.0),
+            scale=Vector3(x=1.0, y=1.0, z=1.0)
+        )
+    )
+    scene.instances.append(instance)
+    return instance, instance_rig(template_rig, instance.id)
+
 def add_avatar_instance(
     scene: SceneV2, 
     template_nodes: List[SceneNodeV2], # Usually just [root_node]
@@ -77,30 +134,7 @@ def add_avatar_instance(
              node.transform.rotation.y += rotation_y_deg
              
     # 4. Create New Rig Def
-    new_bones = []
-    for bone in template_rig.bones:
-        new_node_id = id_map.get(bone.node_id)
-        if new_node_id:
-            new_bones.append(AvatarBone(
-                id=f"{bone.id}_{instance_id}",
-                node_id=new_node_id,
-                part=bone.part,
-                parent_id=f"{bone.parent_id}_{instance_id}" if bone.parent_id else None
-            ))
-            
-    new_root_id = f"{template_rig.root_bone_id}_{instance_id}"
-    
-    # 4b. Remap Attachments
-    new_attachments = []
-    for att in template_rig.attachments:
-        new_attachments.append(copy.deepcopy(att))
-        new_attachments[-1].bone_id = f"{att.bone_id}_{instance_id}"
-    
-    new_rig = AvatarRigDefinition(
-        root_bone_id=new_root_id if new_root_id else template_rig.root_bone_id,
-        bones=new_bones,
-        attachments=new_attachments
-    )
+    new_rig = instance_rig(template_rig, instance_id, id_map)
     
     # 5. Add to Scene
     # Note: We do NOT add meshes/materials to scene because we assume they are already there 
@@ -120,11 +154,20 @@ def generate_crowd(
     template_rig: AvatarRigDefinition,
     count: int,
     width: float = 10.0,
-    depth: float = 10.0
+    depth: float = 10.0,
+    instanced: bool = True
 ) -> Tuple[SceneV2, List[AvatarRigDefinition]]:
-    """Generates a grid/crowd of avatars."""
+    """Generates a grid/crowd of avatars.
+
+    By default the template becomes one shared prototype and each avatar is a
+    SceneInstanceV2 (root transform only). instanced=False deep-clones the
+    template per avatar via add_avatar_instance.
+    """
     
     rigs = []
+    # Snapshot: template_nodes is often scene.nodes itself, which the clone path appends to.
+    template_nodes = list(template_nodes)
+    prototype = add_avatar_prototype(scene, template_nodes) if instanced else None
     
     import math
     cols = int(math.sqrt(count))
@@ -149,13 +192,16 @@ def generate_crowd(
             z=start_z + (row * spacing_z)
         )
         
-        current_scene, new_rig = add_avatar_instance(
-            current_scene,
-            template_nodes,
-            template_rig,
-            pos,
-            rotation_y_deg=0.0
-        )
+        if prototype is not None:
+            _, new_rig = place_avatar_instance(current_scene, prototype, template_rig, pos)
+        else:
+            current_scene, new_rig = add_avatar_instance(
+                current_scene,
+                template_nodes,
+                template_rig,
+                pos,
+                rotation_y_deg=0.0
+            )
         rigs.append(new_rig)
         
     return current_scene, rigs
@@ -0,0 +1,183 @@
+"""Instance resolution for SceneV2 prototypes.
+
+A ``SceneInstanceV2`` places a shared ``ScenePrototypeV2`` subtree with its own
+root transform and optional per-node overrides. Consumers either resolve
+instances into per-mesh batches of world matrices (``resolve_instances``; view
+and glTF export) or, when they need real nodes, materialise them with
+``expand_instances``.
+
+Matrix conventions differ between services (e.g. Euler units), so callers
+pass their own ``local_matrix(transform) -> 4x4`` function.
+"""
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from engines.scene_engine.core.geometry import Transform
+from engines.scene_engine.core.scene_v2 import SceneInstanceV2, SceneNodeV2, SceneV2
+
+LocalMatrixFn = Callable[[Transform], np.ndarray]
+
+
+def instance_node_id(node_id: str, instance_id: str) -> str:
+    return f"{node_id}_{instance_id}"
+
+
+@dataclass
+class InstancedMesh:
+    """One prototype mesh node drawn once per instance in ``instance_ids``."""
+    prototype_id: str
+    node: SceneNodeV2
+    mesh_id: str
+    material_id: Optional[str]
+    instance_ids: List[str] = field(default_factory=list)
+    matrices: List[np.ndarray] = field(default_factory=list)  # batches of (K, 4, 4) world matrices
+
+    def world_matrices(self) -> np.ndarray:
+        if not self.matrices:
+            return np.zeros((0, 4, 4))
+        return np.concatenate(self.matrices)
+
+
+def _walk(
+    nodes: List[SceneNodeV2],
+    instance: Optional[SceneInstanceV2],
+    local_matrix: LocalMatrixFn,
+    parent: np.ndarray,
+    out: List[Tuple[SceneNodeV2, np.ndarray, Optional[str]]],
+) -> None:
+    for node in nodes:
+        override = instance.overrides.get(node.id) if instance is not None else None
+        if node.meta.get("visible", True) is False or (override is not None and override.visible is False):
+            continue
+        transform = override.transform if override is not None and override.transform is not None else node.transform
+        world = parent @ local_matrix(transform)
+        if node.mesh_id:
+            material_id = override.material_id if override is not None and override.material_id else node.material_id
+            out.append((node, world, material_id))
+        _walk(node.children, instance, local_matrix, world, out)
+
+
+def resolve_instances(scene: SceneV2, local_matrix: LocalMatrixFn) -> List[InstancedMesh]:
+    """Groups every visible instanced mesh node by (prototype, node, material).
+
+    Prototype-relative matrices are computed once per prototype; instances
+    without overrides only cost one batched matrix product per mesh node.
+    """
+    prototypes = {p.id: p for p in scene.prototypes}
+    by_prototype: Dict[str, List[SceneInstanceV2]] = {}
+    for instance in scene.instances:
+        if instance.meta.get("visible", True) is False or instance.prototype_id not in prototypes:
+            continue
+        by_prototype.setdefault(instance.prototype_id, []).append(instance)
+
+    groups: Dict[Tuple[str, str, Optional[str]], InstancedMesh] = {}
+
+    def add(prototype_id: str, node: SceneNodeV2, material_id: Optional[str], ids: List[str], matrices: np.ndarray) -> None:
+        key = (prototype_id, node.id, material_id)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = InstancedMesh(prototype_id, node, node.mesh_id, material_id)
+        group.instance_ids.extend(ids)
+        group.matrices.append(matrices)
+
+    for prototype_id, instances in by_prototype.items():
+        nodes = prototypes[prototype_id].nodes
+        roots = np.stack([local_matrix(i.transform) for i in instances])
+        plain = [k for k, i in enumerate(instances) if not i.overrides]
+        if plain:
+            base: List[Tuple[SceneNodeV2, np.ndarray, Optional[str]]] = []
+            _walk(nodes, None, local_matrix, np.eye(4), base)
+            plain_ids = [instances[k].id for k in plain]
+            for node, relative, material_id in base:
+                add(prototype_id, node, material_id, plain_ids, roots[plain] @ relative)
+        for k, instance in enumerate(instances):
+            if not instance.overrides:
+                continue
+            entries: List[Tuple[SceneNodeV2, np.ndarray, Optional[str]]] = []
+            _walk(nodes, instance, local_matrix, roots[k], entries)
+            for node, world, material_id in entries:
+                add(prototype_id, node, material_id, [instance.id], world[None])
+
+    return list(groups.values())
+
+
+def _clone_for_instance(node: SceneNodeV2, instance: SceneInstanceV2) -> Optional[SceneNodeV2]:
+    override = instance.overrides.get(node.id)
+    if override is not None and override.visible is False:
+        return None
+    clone = node.model_copy(update={
+        "id": instance_node_id(node.id, instance.id),
+        "transform": copy.deepcopy(override.transform if override is not None and override.transform else node.transform),
+        "material_id": override.material_id if override is not None and override.material_id else node.material_id,
+        "meta": {**node.meta, "instance_id": instance.id},
+        "children": [],
+    })
+    clone.children = [c for c in (_clone_for_instance(child, instance) for child in node.children) if c is not None]
+    return clone
+
+
+def expand_instance(scene: SceneV2, instance: SceneInstanceV2) -> Optional[SceneNodeV2]:
+    """Materialises one instance as a group node (id = instance id) over renamed prototype clones."""
+    prototype = next((p for p in scene.prototypes if p.id == instance.prototype_id), None)
+    if prototype is None:
+        return None
+    children = [c for c in (_clone_for_instance(n, instance) for n in prototype.nodes) if c is not None]
+    return SceneNodeV2(
+        id=instance.id,
+        name=f"{prototype.id}_{instance.id}",
+        transform=copy.deepcopy(instance.transform),
+        children=children,
+        meta={**instance.meta, "prototype_id": prototype.id},
+    )
+
+
+def expand_instances(scene: SceneV2) -> SceneV2:
+    """Copy of the scene with instances replaced by ordinary nodes (for instance-unaware consumers)."""
+    if not scene.instances:
+        return scene
+    expanded = [n for n in (expand_instance(scene, i) for i in scene.instances) if n is not None]
+    return scene.model_copy(update={"nodes": list(scene.nodes) + expanded, "prototypes": [], "instances": []})
+
+
+def decompose_matrices(matrices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Splits (K, 4, 4) affine matrices into translations, xyzw quaternions and scales.
+
+    Shear (from non-uniform scale under rotation) cannot be represented in TRS
+    and is dropped.
+    """
+    translation = matrices[:, :3, 3]
+    linear = matrices[:, :3, :3]
+    scale = np.linalg.norm(linear, axis=1)
+    # A mirrored basis keeps a proper rotation by flipping the x scale.
+    scale[:, 0] *= np.where(np.linalg.det(linear) < 0, -1.0, 1.0)
+    r = linear / np.where(scale == 0, 1.0, scale)[:, None, :]
+
+    trace = r[:, 0, 0] + r[:, 1, 1] + r[:, 2, 2]
+    quats = np.empty((len(r), 4))
+    # Shepperd's method: pick the largest of w, x, y, z as the pivot for stability.
+    pivots = np.stack([trace, r[:, 0, 0], r[:, 1, 1], r[:, 2, 2]], axis=1).argmax(axis=1)
+    for pivot in range(4):
+        sel = pivots == pivot
+        if not sel.any():
+            continue
+        m = r[sel]
+        if pivot == 0:
+            s = np.sqrt(1.0 + trace[sel]) * 2.0
+            q = [(m[:, 2, 1] - m[:, 1, 2]) / s, (m[:, 0, 2] - m[:, 2, 0]) / s, (m[:, 1, 0] - m[:, 0, 1]) / s, 0.25 * s]
+        elif pivot == 1:
+            s = np.sqrt(1.0 + m[:, 0, 0] - m[:, 1, 1] - m[:, 2, 2]) * 2.0
+            q = [0.25 * s, (m[:, 0, 1] + m[:, 1, 0]) / s, (m[:, 0, 2] + m[:, 2, 0]) / s, (m[:, 2, 1] - m[:, 1, 2]) / s]
+        elif pivot == 2:
+            s = np.sqrt(1.0 + m[:, 1, 1] - m[:, 0, 0] - m[:, 2, 2]) * 2.0
+            q = [(m[:, 0, 1] + m[:, 1, 0]) / s, 0.25 * s, (m[:, 1, 2] + m[:, 2, 1]) / s, (m[:, 0, 2] - m[:, 2, 0]) / s]
+        else:
+            s = np.sqrt(1.0 + m[:, 2, 2] - m[:, 0, 0] - m[:, 1, 1]) * 2.0
+            q = [(m[:, 0, 2] + m[:, 2, 0]) / s, (m[:, 1, 2] + m[:, 2, 1]) / s, 0.25 * s, (m[:, 1, 0] - m[:, 0, 1]) / s]
+        quats[sel] = np.stack(q, axis=1)
+    quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+    return translation, quats, scale
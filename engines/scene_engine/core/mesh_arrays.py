@@ -0,0 +1,140 @@
+"""Structure-of-arrays mesh representation for Scene Engine geometry ops.
+
+``Mesh`` keeps one Pydantic ``Vector3`` per vertex, which is what the API and
+storage layers speak but is far too heavy for per-vertex math on imported
+assets. ``MeshArrays`` holds the same data as contiguous NumPy buffers:
+
+* ``positions`` float32 (N, 3)
+* ``normals``   float32 (N, 3) or None
+* ``uvs``       float32 (N, 2) or None
+* ``indices``   uint32  (M,)
+
+Mesh ops convert once at the API boundary and work on arrays in between;
+callers that already hold ``MeshArrays`` pass them straight through, and
+buffers an op does not touch are shared rather than copied.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple
+
+import numpy as np
+
+from engines.scene_engine.core.geometry import UV, EulerAngles, Mesh, Quaternion, Transform, Vector3
+
+
+@dataclass(frozen=True)
+class MeshArrays:
+    positions: np.ndarray
+    indices: np.ndarray
+    normals: Optional[np.ndarray] = None
+    uvs: Optional[np.ndarray] = None
+
+    @property
+    def vertex_count(self) -> int:
+        return int(self.positions.shape[0])
+
+    @property
+    def triangle_count(self) -> int:
+        return int(self.indices.shape[0]) // 3
+
+    def with_(self, **changes) -> "MeshArrays":
+        return replace(self, **changes)
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        if not self.vertex_count:
+            zero = np.zeros(3, dtype=np.float32)
+            return zero, zero
+        return self.positions.min(axis=0), self.positions.max(axis=0)
+
+    @classmethod
+    def empty(cls) -> "MeshArrays":
+        return cls(positions=np.zeros((0, 3), dtype=np.float32), indices=np.zeros(0, dtype=np.uint32))
+
+    @classmethod
+    def from_mesh(cls, mesh: Mesh) -> "MeshArrays":
+        positions = _vec3_array(mesh.vertices)
+        normals = _vec3_array(mesh.normals) if mesh.normals else None
+        uvs = None
+        if mesh.uvs:
+            uvs = np.array([(uv.u, uv.v) for uv in mesh.uvs], dtype=np.float32).reshape(-1, 2)
+        return cls(
+            positions=positions,
+            indices=np.asarray(mesh.indices, dtype=np.uint32),
+            normals=normals,
+            uvs=uvs,
+        )
+
+    def to_mesh(self, template: Optional[Mesh] = None, **fields) -> Mesh:
+        """Materialise a Mesh; id/name/primitive_source come from template unless overridden."""
+        data = {}
+        if template is not None:
+            data.update(id=template.id, name=template.name, primitive_source=template.primitive_source)
+            if template.bounds_min is not None or template.bounds_max is not None:
+                lo, hi = self.bounds()
+                data.update(bounds_min=_vec3(lo), bounds_max=_vec3(hi))
+        data.update(fields)
+        data.setdefault("vertices", [Vector3(x=x, y=y, z=z) for x, y, z in self.positions.tolist()])
+        data.setdefault("indices", self.indices.tolist())
+        if self.normals is not None:
+            data.setdefault("normals", [Vector3(x=x, y=y, z=z) for x, y, z in self.normals.tolist()])
+        if self.uvs is not None:
+            data.setdefault("uvs", [UV(u=u, v=v) for u, v in self.uvs.tolist()])
+        return Mesh(**data)
+
+
+def _vec3_array(values) -> np.ndarray:
+    return np.array([(v.x, v.y, v.z) for v in values], dtype=np.float32).reshape(-1, 3)
+
+
+def _vec3(values) -> Vector3:
+    return Vector3(x=float(values[0]), y=float(values[1]), z=float(values[2]))
+
+
+def euler_matrix(euler: EulerAngles) -> np.ndarray:
+    """3x3 rotation for Scene Engine Euler angles (radians): R = Rx @ Ry @ Rz."""
+    cx, sx = math.cos(euler.x), math.sin(euler.x)
+    cy, sy = math.cos(euler.y), math.sin(euler.y)
+    cz, sz = math.cos(euler.z), math.sin(euler.z)
+    rx = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    ry = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    rz = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return rx @ ry @ rz
+
+
+def quaternion_matrix(q: Quaternion) -> np.ndarray:
+    norm = math.sqrt(q.x * q.x + q.y * q.y + q.z * q.z + q.w * q.w) or 1.0
+    x, y, z, w = q.x / norm, q.y / norm, q.z / norm, q.w / norm
+    return np.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+
+
+def rotation_matrix(rotation) -> np.ndarray:
+    if isinstance(rotation, Quaternion):
+        return quaternion_matrix(rotation)
+    return euler_matrix(rotation)
+
+
+def linear_matrix(transform: Transform) -> np.ndarray:
+    """Upper 3x3 of T*R*S (rotation times scale), float64."""
+    scale = np.array([transform.scale.x, transform.scale.y, transform.scale.z])
+    return rotation_matrix(transform.rotation) * scale  # scales columns: R @ diag(s)
+
+
+def normal_matrix(linear: np.ndarray) -> np.ndarray:
+    """Inverse-transpose of the linear part; pseudo-inverse for degenerate (zero) scale."""
+    try:
+        return np.linalg.inv(linear).T
+    except np.linalg.LinAlgError:
+        return np.linalg.pinv(linear).T
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
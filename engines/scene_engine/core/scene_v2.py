@@ -45,9 +45,34 @@ class ConstructionOp(BaseModel):
     result_node_id: Optional[str] = None
 
 
+class ScenePrototypeV2(BaseModel):
+    """A node subtree shared by many instances (e.g. an avatar template)."""
+    id: str
+    nodes: List[SceneNodeV2] = Field(default_factory=list)
+    meta: Dict[str, Any] = Field(default_factory=dict)
+
+
+class InstanceOverride(BaseModel):
+    """Per-instance changes to one prototype node, keyed by the template node id."""
+    transform: Optional[Transform] = None  # replaces the node's local transform
+    material_id: Optional[str] = None
+    visible: Optional[bool] = None
+
+
+class SceneInstanceV2(BaseModel):
+    """Placement of a prototype; expanded node ids are ``f"{node.id}_{instance.id}"``."""
+    id: str
+    prototype_id: str
+    transform: Transform
+    overrides: Dict[str, InstanceOverride] = Field(default_factory=dict)
+    meta: Dict[str, Any] = Field(default_factory=dict)
+
+
 class SceneV2(BaseModel):
     id: str
     nodes: List[SceneNodeV2] = Field(default_factory=list)
+    prototypes: List[ScenePrototypeV2] = Field(default_factory=list)
+    instances: List[SceneInstanceV2] = Field(default_factory=list)
     meshes: List[Mesh] = Field(default_factory=list)
     materials: List[Material] = Field(default_factory=list)
     camera: Optional[Camera] = None
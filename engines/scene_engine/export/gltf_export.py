@@ -2,12 +2,18 @@
 from __future__ import annotations
 
 import base64
+import io
 import json
+import os
 import struct
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
 
 from engines.scene_engine.core.scene_v2 import SceneV2, SceneNodeV2
 from engines.scene_engine.core.geometry import Mesh, Vector3, Quaternion, EulerAngles
+from engines.scene_engine.core.instancing import decompose_matrices, expand_instances, resolve_instances
+from engines.scene_engine.core.mesh_arrays import MeshArrays, quaternion_matrix
 
 def _vec3_to_list(v: Vector3) -> List[float]:
     return [v.x, v.y, v.z]
@@ -33,6 +39,32 @@ def _euler_to_quat(e: EulerAngles) -> List[float]:
     
     return [x, y, z, w]
 
+def _rotation_to_quat(rotation) -> List[float]:
+    if isinstance(rotation, Quaternion):
+        return [rotation.x, rotation.y, rotation.z, rotation.w]
+    return _euler_to_quat(rotation)
+
+
+GLB_MAGIC = 0x46546C67
+GLB_VERSION = 2
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+INSTANCING_EXTENSION = "EXT_mesh_gpu_instancing"
+
+
+def _trs_matrix(transform) -> np.ndarray:
+    """4x4 T*R*S for a node transform, using the exporter's rotation convention."""
+    x, y, z, w = _rotation_to_quat(transform.rotation)
+    m = np.eye(4)
+    m[:3, :3] = quaternion_matrix(Quaternion(x=x, y=y, z=z, w=w)) * [transform.scale.x, transform.scale.y, transform.scale.z]
+    m[:3, 3] = [transform.position.x, transform.position.y, transform.position.z]
+    return m
+
+
 class GltfWriter:
     def __init__(self):
         self.buffers = []
@@ -42,20 +74,32 @@ class GltfWriter:
         self.nodes = []
         self.scenes = [{"nodes": []}]
         self.materials = []
-        self.bin_data = bytearray()
+        # Binary payload kept as a list of padded segments so GLB output can
+        # stream them straight to the file without one big concatenation.
+        self.bin_chunks: List[bytes] = []
+        self.bin_length = 0
+        self._mesh_cache: Dict[str, int] = {}
+        self._mesh_lookup: Dict[str, Mesh] = {}
+        self.extensions_used: Set[str] = set()
+
+    @property
+    def bin_data(self) -> bytes:
+        return b"".join(self.bin_chunks)
         
     def add_buffer_data(self, data: bytes) -> int:
         """Appends data to main binary buffer, returns byteOffset."""
-        offset = len(self.bin_data)
+        offset = self.bin_length
         
         # Padding to 4 bytes
         padding = (4 - (len(data) % 4)) % 4
-        self.bin_data.extend(data)
-        self.bin_data.extend(b'\x00' * padding)
+        self.bin_chunks.append(data)
+        if padding:
+            self.bin_chunks.append(b'\x00' * padding)
+        self.bin_length += len(data) + padding
         
         return offset
 
-    def create_accessor(self, data_bytes: bytes, count: int, comp_type: int, type_str: str, min_v=None, max_v=None) -> int:
+    def create_accessor(self, data_bytes: bytes, count: int, comp_type: int, type_str: str, min_v=None, max_v=None, target: int = ARRAY_BUFFER) -> int:
         offset = self.add_buffer_data(data_bytes)
         length = len(data_bytes)
         
@@ -64,14 +108,14 @@ class GltfWriter:
             "buffer": 0,
             "byteOffset": offset,
             "byteLength": length,
-            "target": 34962 if type_str == "SCALAR" and comp_type == 5123 else 34962 # Array Buffer usually
+            "target": target
         })
         
         acc_idx = len(self.accessors)
         acc = {
             "bufferView": view_idx,
             "byteOffset": 0,
-            "componentType": comp_type, # 5126=FLOAT, 5123=USHORT
+            "componentType": comp_type, # 5126=FLOAT, 5123=USHORT, 5125=UINT
             "count": count,
             "type": type_str
         }
@@ -82,37 +126,36 @@ class GltfWriter:
 
     def process_mesh(self, mesh: Mesh) -> int:
         # P0: Only Positions and Indices
+        arrays = MeshArrays.from_mesh(mesh)
         
         # 1. Positions (Vec3 Float)
-        pos_bytes = bytearray()
-        min_p = [float('inf')]*3
-        max_p = [float('-inf')]*3
-        
-        for v in mesh.vertices:
-            pos_bytes.extend(struct.pack('<fff', v.x, v.y, v.z))
-            for i, c in enumerate([v.x, v.y, v.z]):
-                min_p[i] = min(min_p[i], c)
-                max_p[i] = max(max_p[i], c)
+        positions = np.ascontiguousarray(arrays.positions, dtype="<f4")
+        min_p, max_p = None, None
+        if arrays.vertex_count:
+            lo, hi = arrays.bounds()
+            min_p, max_p = lo.tolist(), hi.tolist()
                 
         pos_acc = self.create_accessor(
-            pos_bytes, 
-            len(mesh.vertices), 
+            positions.tobytes(),
+            arrays.vertex_count,
             5126, # FLOAT 
             "VEC3",
             min_v=min_p, 
             max_v=max_p
         )
         
-        # 2. Indices (Scalar UShort)
-        idx_bytes = bytearray()
-        for idx in mesh.indices:
-            idx_bytes.extend(struct.pack('<H', idx))
+        # 2. Indices (Scalar): UShort when every vertex fits, UInt otherwise
+        if arrays.vertex_count <= 0xFFFF:
+            idx_data, idx_type = arrays.indices.astype("<u2"), 5123 # UNSIGNED_SHORT
+        else:
+            idx_data, idx_type = arrays.indices.astype("<u4"), 5125 # UNSIGNED_INT
             
         idx_acc = self.create_accessor(
-            idx_bytes,
-            len(mesh.indices),
-            5123, # UNSIGNED_SHORT
-            "SCALAR"
+            idx_data.tobytes(),
+            len(idx_data),
+            idx_type,
+            "SCALAR",
+            target=ELEMENT_ARRAY_BUFFER
         )
         
         mesh_idx = len(self.meshes)
@@ -126,23 +169,61 @@ class GltfWriter:
         })
         return mesh_idx
 
+    def mesh_index(self, mesh_id: str, scene: SceneV2) -> Optional[int]:
+        # Nodes sharing a mesh id share one glTF mesh (and its buffer data).
+        m_idx = self._mesh_cache.get(mesh_id)
+        if m_idx is None:
+            if not self._mesh_lookup:
+                self._mesh_lookup = {m.id: m for m in scene.meshes}
+            mesh_obj = self._mesh_lookup.get(mesh_id)
+            if mesh_obj:
+                m_idx = self.process_mesh(mesh_obj)
+                self._mesh_cache[mesh_id] = m_idx
+        return m_idx
+
+    def process_instances(self, scene: SceneV2) -> None:
+        """Emits one EXT_mesh_gpu_instancing node per instanced (prototype node, material).
+
+        Only mesh-bearing prototype nodes are written; each instance's world
+        transform goes into the TRANSLATION/ROTATION/SCALE attribute accessors.
+        """
+        for group in resolve_instances(scene, _trs_matrix):
+            m_idx = self.mesh_index(group.mesh_id, scene)
+            matrices = group.world_matrices()
+            if m_idx is None or not len(matrices):
+                continue
+            translation, rotation, scale = decompose_matrices(matrices)
+            count = len(matrices)
+            attributes = {
+                "TRANSLATION": self.create_accessor(np.ascontiguousarray(translation, dtype="<f4").tobytes(), count, 5126, "VEC3"),
+                "ROTATION": self.create_accessor(np.ascontiguousarray(rotation, dtype="<f4").tobytes(), count, 5126, "VEC4"),
+                "SCALE": self.create_accessor(np.ascontiguousarray(scale, dtype="<f4").tobytes(), count, 5126, "VEC3"),
+            }
+            for view in self.buffer_views[-3:]:
+                view.pop("target", None) # Instance attributes are not vertex buffers
+            
+            idx = len(self.nodes)
+            self.nodes.append({
+                "name": f"{group.node.id}_{group.prototype_id}",
+                "mesh": m_idx,
+                "extensions": {INSTANCING_EXTENSION: {"attributes": attributes}},
+                "extras": {"prototype_id": group.prototype_id, "prototype_node_id": group.node.id, "instances": count},
+            })
+            self.scenes[0]["nodes"].append(idx)
+            self.extensions_used.add(INSTANCING_EXTENSION)
+
     def process_node(self, node: SceneNodeV2, scene: SceneV2, parent_idx: Optional[int] = None) -> int:
         idx = len(self.nodes)
         gltf_node = {
             "name": node.id,
             "translation": _vec3_to_list(node.transform.position),
-            "rotation": _euler_to_quat(node.transform.rotation),
+            "rotation": _rotation_to_quat(node.transform.rotation),
             "scale": _vec3_to_list(node.transform.scale)
         }
         
         if node.mesh_id:
-            # Find mesh object in scene to process
-            mesh_obj = next((m for m in scene.meshes if m.id == node.mesh_id), None)
-            if mesh_obj:
-                # Deduplicate? For P0, re-process mesh every node or map IDs?
-                # Let's map IDs to avoid bloating
-                # ... skipping cache logic for brevity P0
-                m_idx = self.process_mesh(mesh_obj)
+            m_idx = self.mesh_index(node.mesh_id, scene)
+            if m_idx is not None:
                 gltf_node["mesh"] = m_idx
 
         self.nodes.append(gltf_node)
@@ -159,19 +240,15 @@ class GltfWriter:
             self.process_node(child, scene, idx)
             
         return idx
+
+    def document(self, buffer_uri: Optional[str] = None) -> Dict[str, Any]:
+        """glTF JSON; the buffer has no uri when it is the GLB BIN chunk."""
+        buffer: Dict[str, Any] = {"byteLength": self.bin_length}
+        if buffer_uri is not None:
+            buffer["uri"] = buffer_uri
+        self.buffers = [buffer] if self.bin_length or buffer_uri is not None else []
         
-    def build(self) -> Dict[str, Any]:
-        
-        # Setup buffer
-        encoded = base64.b64encode(self.bin_data).decode('utf-8')
-        uri = f"data:application/octet-stream;base64,{encoded}"
-        
-        self.buffers = [{
-            "byteLength": len(self.bin_data),
-            "uri": uri
-        }]
-        
-        return {
+        doc = {
             "asset": {"version": "2.0"},
             "scene": 0,
             "scenes": self.scenes,
@@ -181,11 +258,53 @@ class GltfWriter:
             "bufferViews": self.buffer_views,
             "buffers": self.buffers
         }
+        if self.extensions_used:
+            doc["extensionsUsed"] = sorted(self.extensions_used)
+        return doc
+        
+    def build(self) -> Dict[str, Any]:
+        
+        # Setup buffer
+        encoded = base64.b64encode(self.bin_data).decode('utf-8')
+        uri = f"data:application/octet-stream;base64,{encoded}"
+        return self.document(buffer_uri=uri)
 
-def export_scene_to_gltf(scene: SceneV2) -> Dict[str, Any]:
+    def write_glb(self, stream: BinaryIO, extras: Optional[Dict[str, Any]] = None) -> int:
+        """Writes a GLB container (header, JSON chunk, BIN chunk) to stream; returns bytes written."""
+        doc = self.document()
+        if extras:
+            doc["extras"] = extras
+        # Scene meta may carry arbitrary objects; stringify rather than fail the export.
+        json_bytes = json.dumps(doc, separators=(",", ":"), default=str).encode("utf-8")
+        json_bytes += b" " * ((4 - len(json_bytes) % 4) % 4)
+        
+        total = 12 + 8 + len(json_bytes)
+        if self.bin_length:
+            total += 8 + self.bin_length
+        
+        stream.write(struct.pack("<III", GLB_MAGIC, GLB_VERSION, total))
+        stream.write(struct.pack("<II", len(json_bytes), CHUNK_JSON))
+        stream.write(json_bytes)
+        if self.bin_length:
+            stream.write(struct.pack("<II", self.bin_length, CHUNK_BIN))
+            for chunk in self.bin_chunks:
+                stream.write(chunk)
+        return total
+
+
+def _build_writer(scene: SceneV2, instancing: bool = True) -> GltfWriter:
+    if not instancing:
+        scene = expand_instances(scene)
     writer = GltfWriter()
     for node in scene.nodes:
         writer.process_node(node, scene)
+    writer.process_instances(scene)
+    return writer
+
+
+def export_scene_to_gltf(scene: SceneV2, instancing: bool = True) -> Dict[str, Any]:
+    """Scene instances use EXT_mesh_gpu_instancing; pass instancing=False to write them as plain nodes."""
+    writer = _build_writer(scene, instancing)
     out = writer.build()
 
     # Include scene-level metadata (extras) if present in SceneV2.meta
@@ -195,3 +314,22 @@ def export_scene_to_gltf(scene: SceneV2) -> Dict[str, Any]:
         out["extras"] = scene.meta
 
     return out
+
+
+def export_scene_to_glb(scene: SceneV2, target: Union[str, os.PathLike, BinaryIO], instancing: bool = True) -> int:
+    """Streams the scene as binary glTF (.glb) to a path or writable binary stream.
+
+    Returns the number of bytes written.
+    """
+    writer = _build_writer(scene, instancing)
+    extras = getattr(scene, "meta", None) or None
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "wb") as f:
+            return writer.write_glb(f, extras=extras)
+    return writer.write_glb(target, extras=extras)
+
+
+def export_scene_to_glb_bytes(scene: SceneV2, instancing: bool = True) -> bytes:
+    buf = io.BytesIO()
+    export_scene_to_glb(scene, buf, instancing)
+    return buf.getvalue()
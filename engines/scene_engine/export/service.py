@@ -2,20 +2,23 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Any, Dict
+from typing import Any, Dict, Union
 
 from engines.scene_engine.core.scene_v2 import SceneV2
-from engines.scene_engine.export.gltf_export import export_scene_to_gltf
+from engines.scene_engine.export.gltf_export import export_scene_to_glb_bytes, export_scene_to_gltf
 
 
 class ExportFormat(str, Enum):
     GLTF_JSON = "gltf_json"
-    GLTF_BINARY = "gltf_binary" # Not imp yet, defaulting to JSON with buffer uri
+    GLTF_BINARY = "gltf_binary" # .glb container bytes
     # USDZ = "usdz" # Future
 
 
-def export_scene(scene: SceneV2, fmt: ExportFormat = ExportFormat.GLTF_JSON) -> Dict[str, Any]:
+def export_scene(scene: SceneV2, fmt: ExportFormat = ExportFormat.GLTF_JSON) -> Union[Dict[str, Any], bytes]:
     if fmt == ExportFormat.GLTF_JSON:
         return export_scene_to_gltf(scene)
+    if fmt == ExportFormat.GLTF_BINARY:
+        # Use gltf_export.export_scene_to_glb to stream large scenes to a file instead.
+        return export_scene_to_glb_bytes(scene)
     
     raise NotImplementedError(f"Format {fmt} not supported yet.")
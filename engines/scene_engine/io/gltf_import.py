@@ -8,6 +8,7 @@ import math
 from typing import Any, Dict, List, Optional, Tuple, Union
 from enum import Enum
 
+import numpy as np
 from pydantic import BaseModel
 
 from engines.scene_engine.core.geometry import (
@@ -17,10 +18,10 @@ from engines.scene_engine.core.geometry import (
     PrimitiveParams,
     Transform,
     Vector3,
-    UV, # Was Vector2
     Quaternion,
     EulerAngles,
 )
+from engines.scene_engine.core.mesh_arrays import MeshArrays
 from engines.scene_engine.core.scene_v2 import (
     SceneV2,
     SceneNodeV2,
@@ -58,6 +59,17 @@ COMPONENT_SIZE = {
     5125: 4, 5126: 4
 }
 
+# Little-endian NumPy dtypes per component type
+COMPONENT_DTYPE = {
+    5120: np.dtype("<i1"), 5121: np.dtype("<u1"),
+    5122: np.dtype("<i2"), 5123: np.dtype("<u2"),
+    5125: np.dtype("<u4"), 5126: np.dtype("<f4"),
+}
+
+TYPE_COMPONENTS = {
+    "SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16
+}
+
 
 class MinimalGltfParser:
     """Minimal GLTF/GLB Parser for in-memory bytes."""
@@ -105,11 +117,12 @@ class MinimalGltfParser:
             if offset + chunk_len > file_len:
                 raise ValueError("GLB chunk truncated")
                 
-            chunk_data = self.data[offset:offset+chunk_len]
+            # memoryview keeps the BIN chunk zero-copy; accessors decode straight from it.
+            chunk_data = memoryview(self.data)[offset:offset+chunk_len]
             offset += chunk_len
             
             if chunk_type == CHUNK_JSON:
-                self.json_data = json.loads(chunk_data.decode("utf-8"))
+                self.json_data = json.loads(bytes(chunk_data).decode("utf-8"))
             elif chunk_type == CHUNK_BIN:
                 # Store binary buffer. 
                 # Note: GLB usually has one binary buffer which is refined by BufferViews.
@@ -150,75 +163,88 @@ class MinimalGltfParser:
 
     def read_accessor(self, accessor_idx: int) -> List[Any]:
         """Reads accessor data and returns list of values (tuples for vectors)."""
+        arr = self.read_accessor_array(accessor_idx)
+        if arr.ndim == 1:
+            return arr.tolist()
+        return [tuple(row) for row in arr.tolist()]
+
+    def read_accessor_array(self, accessor_idx: int) -> np.ndarray:
+        """Decodes an accessor into an (count,) or (count, components) array.
+
+        Tightly packed and interleaved (byteStride) views are read in place with
+        np.frombuffer; sparse substitutions are applied on top of the base
+        values, and normalized integer accessors are returned as float32.
+        """
         accessors = self.json_data.get("accessors", [])
         acc = accessors[accessor_idx]
-        
+
+        component_type = acc.get("componentType", GltfComponentType.FLOAT)
+        count = acc.get("count", 0)
+        num_comp = TYPE_COMPONENTS.get(acc.get("type", "SCALAR"), 1)
+        dtype = COMPONENT_DTYPE.get(component_type, np.dtype("<f4"))
+
         buffer_view_idx = acc.get("bufferView")
         if buffer_view_idx is None:
-             # Sparse accessor or initialization with zeros? P0: unsupported/zeros
-             count = acc.get("count", 0)
-             type_str = acc.get("type", "SCALAR")
-             # Return zeros
-             return self._zeros(count, type_str)
+            # No bufferView: values are zeros, optionally patched by a sparse block.
+            values = np.zeros((count, num_comp), dtype=dtype)
+        else:
+            values = self._read_view(buffer_view_idx, acc.get("byteOffset", 0), count, num_comp, dtype)
+
+        sparse = acc.get("sparse")
+        if sparse:
+            values = self._apply_sparse(values, sparse, num_comp, dtype)
+
+        if acc.get("normalized") and dtype.kind in "iu":
+            values = _normalize_integers(values, dtype)
+
+        return values[:, 0] if num_comp == 1 else values
 
+    def _read_view(self, buffer_view_idx: int, byte_offset: int, count: int, num_comp: int, dtype: np.dtype) -> np.ndarray:
         bv_data = self.get_buffer_view_data(buffer_view_idx)
-        
-        byte_offset = acc.get("byteOffset", 0)
-        component_type = acc.get("componentType")
-        count = acc.get("count")
-        type_str = acc.get("type")
-        
-        comp_size = COMPONENT_SIZE.get(component_type, 1)
-        
-        # Num components per element
-        num_comp = {
-            "SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT4": 16
-        }.get(type_str, 1)
-        
-        # Default stride = tightly packed
-        stride = num_comp * comp_size
-        
-        # Check if bufferView has byteStride?
-        views = self.json_data.get("bufferViews", [])
-        view = views[buffer_view_idx]
-        if "byteStride" in view:
-            stride = view["byteStride"]
-            
-        # Parse format
-        # struct fmt chars: b/B (byte), h/H (short), i/I (int), f (float)
-        fmt_char = {
-            5120: 'b', 5121: 'B',
-            5122: 'h', 5123: 'H',
-            5125: 'I', # unsigned Int
-            5126: 'f'
-        }.get(component_type, 'f')
-        
-        values = []
-        current_offset = byte_offset
-        
-        # Struct format for one element
-        elem_fmt = "<" + (fmt_char * num_comp)
-        
-        for _ in range(count):
-            # Check bounds
-            if current_offset + (num_comp * comp_size) > len(bv_data):
-                break
-                
-            elem_data = bv_data[current_offset : current_offset + (num_comp * comp_size)]
-            val = struct.unpack(elem_fmt, elem_data)
-            if len(val) == 1:
-                values.append(val[0])
-            else:
-                values.append(val)
-                
-            current_offset += stride
-            
-        return values
+        view = self.json_data.get("bufferViews", [])[buffer_view_idx]
+        elem_size = num_comp * dtype.itemsize
+        stride = view.get("byteStride") or elem_size
 
-    def _zeros(self, count, type_str):
-        num_comp = {"SCALAR": 1, "VEC3": 3}.get(type_str, 1) # simple fallback
-        if num_comp == 1: return [0] * count
-        return [(0,) * num_comp] * count
+        # Truncated views yield the elements that fit, as the old per-element reader did.
+        available = len(bv_data) - byte_offset
+        if available < elem_size:
+            return np.zeros((0, num_comp), dtype=dtype)
+        count = min(count, (available - elem_size) // stride + 1)
+
+        if stride == elem_size:
+            flat = np.frombuffer(bv_data, dtype=dtype, count=count * num_comp, offset=byte_offset)
+            return flat.reshape(count, num_comp)
+        # Interleaved attributes: strided view over the shared bytes, no copy.
+        return np.ndarray(
+            shape=(count, num_comp),
+            dtype=dtype,
+            buffer=bv_data,
+            offset=byte_offset,
+            strides=(stride, dtype.itemsize),
+        )
+
+    def _apply_sparse(self, values: np.ndarray, sparse: Dict[str, Any], num_comp: int, dtype: np.dtype) -> np.ndarray:
+        sparse_count = sparse.get("count", 0)
+        idx_def = sparse["indices"]
+        val_def = sparse["values"]
+        idx_dtype = COMPONENT_DTYPE[idx_def["componentType"]]
+        bv = self.get_buffer_view_data(idx_def["bufferView"])
+        indices = np.frombuffer(bv, dtype=idx_dtype, count=sparse_count, offset=idx_def.get("byteOffset", 0))
+        bv = self.get_buffer_view_data(val_def["bufferView"])
+        patch = np.frombuffer(bv, dtype=dtype, count=sparse_count * num_comp, offset=val_def.get("byteOffset", 0))
+        # Base values may be a read-only view into the source buffer.
+        out = np.array(values, copy=True)
+        out[indices.astype(np.intp)] = patch.reshape(sparse_count, num_comp)
+        return out
+
+
+def _normalize_integers(values: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    # glTF 2.0 spec 3.11: unsigned c / max, signed max(c / max, -1).
+    scale = float(np.iinfo(dtype).max)
+    out = values.astype(np.float32) / scale
+    if dtype.kind == "i":
+        np.maximum(out, -1.0, out=out)
+    return out
 
 
 # --- Conversion Logic ---
@@ -367,46 +393,47 @@ def _parse_primitive(parser: MinimalGltfParser, prim: Dict, mesh_idx: int, prim_
     if pos_idx is None:
         raise ValueError(f"Mesh {mesh_idx} primitive {prim_idx} missing POSITION")
     
-    positions = parser.read_accessor(pos_idx) # List of (x,y,z)
+    positions = parser.read_accessor_array(pos_idx).reshape(-1, 3)
     
     # Normals
-    normals = []
+    normals = None
     norm_idx = attrs.get("NORMAL")
     if norm_idx is not None:
-        normals = parser.read_accessor(norm_idx)
+        normals = parser.read_accessor_array(norm_idx).reshape(-1, 3)
     
     # UVs
-    uvs = []
+    uvs = None
     tex_idx = attrs.get("TEXCOORD_0")
     if tex_idx is not None:
-        uvs = parser.read_accessor(tex_idx)
+        uvs = parser.read_accessor_array(tex_idx).reshape(-1, 2)
         
     # Indices
     indices_idx = prim.get("indices")
     if indices_idx is not None:
-        indices = parser.read_accessor(indices_idx)
+        indices = parser.read_accessor_array(indices_idx).reshape(-1)
     else:
         # Non-indexed? Generate sequential
-        indices = list(range(len(positions)))
+        indices = np.arange(len(positions))
         
     # Build Mesh
-    
-    verts_v3 = [Vector3(x=p[0], y=p[1], z=p[2]) for p in positions]
-    norms_v3 = [Vector3(x=n[0], y=n[1], z=n[2]) for n in normals] if normals else []
-    
-    # uvs are Vector2 (now UV)
-    uvs_obj = [UV(u=u[0], v=u[1]) for u in uvs] if uvs else []
-    
+    arrays = MeshArrays(
+        positions=positions.astype(np.float32, copy=False),
+        indices=indices.astype(np.uint32, copy=False),
+        normals=normals.astype(np.float32, copy=False) if normals is not None and len(normals) else None,
+        uvs=uvs.astype(np.float32, copy=False) if uvs is not None and len(uvs) else None,
+    )
     mat_id = mat_map.get(prim.get("material"))
     
-    return Mesh(
+    extra = {}
+    if arrays.normals is None:
+        extra["normals"] = []
+    if arrays.uvs is None:
+        extra["uvs"] = []
+    return arrays.to_mesh(
         id=f"mesh_{mesh_idx}_p{prim_idx}",
-        vertices=verts_v3,
-        indices=indices,
-        normals=norms_v3,
-        uvs=uvs_obj,
         material_id=mat_id,
-        primitive_source=None # Generic mesh
+        primitive_source=None, # Generic mesh
+        **extra,
     )
 
 def _apply_post_processing(scene: SceneV2, options: GltfImportOptions):
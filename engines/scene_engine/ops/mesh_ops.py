@@ -1,107 +1,54 @@
 """Mesh Operations Module.
 
 Provides utilities for cleaning, combining, and manipulating meshes in-memory.
+
+Every op accepts either a ``Mesh`` or a ``MeshArrays`` and returns the same
+kind. Work is done on NumPy arrays (see ``core.mesh_arrays``); a ``Mesh`` is
+converted once on the way in and once on the way out, so chains of ops on
+large assets should pass ``MeshArrays`` between steps.
 """
 from __future__ import annotations
 
-import copy
-import math
 import uuid
-from typing import Dict, List, Tuple
+from typing import List, Sequence, TypeVar, Union
+
+import numpy as np
 
 from engines.scene_engine.core.geometry import Mesh, Vector3, Transform, EulerAngles
+from engines.scene_engine.core.mesh_arrays import MeshArrays, linear_matrix, normal_matrix, normalize_rows
+
+MeshLike = TypeVar("MeshLike", Mesh, MeshArrays)
+
+
+def _arrays(mesh: Union[Mesh, MeshArrays]) -> MeshArrays:
+    return mesh if isinstance(mesh, MeshArrays) else MeshArrays.from_mesh(mesh)
+
+
+def _result(source: Union[Mesh, MeshArrays], arrays: MeshArrays) -> Union[Mesh, MeshArrays]:
+    return arrays if isinstance(source, MeshArrays) else arrays.to_mesh(template=source)
+
+
+def transform_arrays(arrays: MeshArrays, transform: Transform) -> MeshArrays:
+    """Bakes T*R*S into positions and the inverse-transpose into normals."""
+    linear = linear_matrix(transform)
+    translation = np.array([transform.position.x, transform.position.y, transform.position.z])
+    positions = (arrays.positions @ linear.T.astype(np.float32)) + translation.astype(np.float32)
+    normals = None
+    if arrays.normals is not None:
+        normals = normalize_rows(arrays.normals @ normal_matrix(linear).T.astype(np.float32))
+    indices = arrays.indices
+    if np.linalg.det(linear) < 0 and indices.size % 3 == 0:
+        # A mirroring transform flips handedness; swap winding to keep faces front-facing.
+        indices = indices.reshape(-1, 3)[:, [0, 2, 1]].reshape(-1)
+    return arrays.with_(positions=positions.astype(np.float32, copy=False), normals=normals, indices=indices)
 
-def transform_mesh(mesh: Mesh, transform: Transform) -> Mesh:
+
+def transform_mesh(mesh: MeshLike, transform: Transform) -> MeshLike:
     """Bakes a transform into the mesh vertices and normals."""
-    new_mesh = copy.deepcopy(mesh)
-    
-    # Precompute matrix-ish things
-    # Translation
-    tx, ty, tz = transform.position.x, transform.position.y, transform.position.z
-    sx, sy, sz = transform.scale.x, transform.scale.y, transform.scale.z
-    
-    # Rotation (Euler XYZ)
-    # Simple rotation matrix application
-    # Ideally should use Matrix4 logic but kept simple/explicit here to avoid deps
-    # Or use Quaternion if transform has it. Transform uses Union. 
-    # For P0 let's assume Euler or convert. 
-    # Actually Transform usually has rotation as EulerAngles or Quaternion.
-    # We should normalize.
-    
-    rx, ry, rz = 0.0, 0.0, 0.0
-    if isinstance(transform.rotation, EulerAngles):
-        rx, ry, rz = transform.rotation.x, transform.rotation.y, transform.rotation.z
-    else:
-        # TODO: Quaternion support
-        pass
-        
-    cx, sx_ = math.cos(rx), math.sin(rx)
-    cy, sy_ = math.cos(ry), math.sin(ry)
-    cz, sz_ = math.cos(rz), math.sin(rz)
-    
-    # Vertex Transform loop
-    for v in new_mesh.vertices:
-        # Scale
-        x = v.x * sx
-        y = v.y * sy
-        z = v.z * sz
-        
-        # Rotate Z
-        x_ = x * cz - y * sz_
-        y_ = x * sz_ + y * cz
-        x, y = x_, y_
-        
-        # Rotate Y
-        x_ = x * cy + z * sy_
-        z_ = -x * sy_ + z * cy
-        x, z = x_, z_
-        
-        # Rotate X
-        y_ = y * cx - z * sx_
-        z_ = y * sx_ + z * cx
-        y, z = y_, z_
-        
-        # Translate
-        v.x = x + tx
-        v.y = y + ty
-        v.z = z + tz
-        
-    # Normal Transform loop (Rotate only, handle scale inverse transpose if non-uniform)
-    # For now assuming uniform scale or ignoring normal skew
-    if new_mesh.normals:
-        for n in new_mesh.normals:
-            x, y, z = n.x, n.y, n.z
-            
-            # Rotate Z
-            x_ = x * cz - y * sz_
-            y_ = x * sz_ + y * cz
-            x, y = x_, y_
-            
-            # Rotate Y
-            x_ = x * cy + z * sy_
-            z_ = -x * sy_ + z * cy
-            x, z = x_, z_
-            
-            # Rotate X
-            y_ = y * cx - z * sx_
-            z_ = y * sx_ + z * cx
-            y, z = y_, z_
-            
-            n.x, n.y, n.z = x, y, z
-            n.normalize() # In-place if implemented, or reassign
-            # Since Vector3 is pydantic, modifying fields works.
-            # But normalize returns new vector.
-            # n = n.normalize() doesn't update list item ref?
-            # Pydantic items in list are mutable objects.
-            normalized = n.normalize()
-            n.x = normalized.x
-            n.y = normalized.y
-            n.z = normalized.z
-            
-    return new_mesh
+    return _result(mesh, transform_arrays(_arrays(mesh), transform))
 
 
-def scale_mesh(mesh: Mesh, factor: float) -> Mesh:
+def scale_mesh(mesh: MeshLike, factor: float) -> MeshLike:
     """Uniformly scales a mesh."""
     t = Transform(
         position=Vector3(x=0,y=0,z=0),
@@ -111,188 +58,92 @@ def scale_mesh(mesh: Mesh, factor: float) -> Mesh:
     return transform_mesh(mesh, t)
 
 
-def recenter_mesh(mesh: Mesh) -> Mesh:
+def recenter_mesh(mesh: MeshLike) -> MeshLike:
     """Moves mesh centroid to origin."""
-    if not mesh.vertices:
+    arrays = _arrays(mesh)
+    if not arrays.vertex_count:
         return mesh
-        
-    # Calc Centroid
-    cx, cy, cz = 0.0, 0.0, 0.0
-    for v in mesh.vertices:
-        cx += v.x
-        cy += v.y
-        cz += v.z
-    
-    count = len(mesh.vertices)
-    cx /= count
-    cy /= count
-    cz /= count
-    
-    t = Transform(
-        position=Vector3(x=-cx, y=-cy, z=-cz),
-        rotation=EulerAngles(x=0,y=0,z=0),
-        scale=Vector3(x=1,y=1,z=1)
+    centroid = arrays.positions.mean(axis=0, dtype=np.float64)
+    positions = (arrays.positions - centroid).astype(np.float32)
+    return _result(mesh, arrays.with_(positions=positions))
+
+
+def combine_arrays(meshes: Sequence[MeshArrays]) -> MeshArrays:
+    if not meshes:
+        return MeshArrays.empty()
+    # If any source has normals/uvs, we keep them and pad the others with defaults.
+    has_normals = any(m.normals is not None and len(m.normals) for m in meshes)
+    has_uvs = any(m.uvs is not None and len(m.uvs) for m in meshes)
+    offsets = np.cumsum([0] + [m.vertex_count for m in meshes[:-1]]).astype(np.uint32)
+
+    normals = None
+    if has_normals:
+        up = np.array([0, 1, 0], dtype=np.float32)
+        normals = np.concatenate(
+            [m.normals if m.normals is not None and len(m.normals) else np.tile(up, (m.vertex_count, 1)) for m in meshes]
+        )
+    uvs = None
+    if has_uvs:
+        uvs = np.concatenate(
+            [m.uvs if m.uvs is not None and len(m.uvs) else np.zeros((m.vertex_count, 2), dtype=np.float32) for m in meshes]
+        )
+    return MeshArrays(
+        positions=np.concatenate([m.positions for m in meshes]),
+        indices=np.concatenate([m.indices + offset for m, offset in zip(meshes, offsets)]).astype(np.uint32),
+        normals=normals,
+        uvs=uvs,
     )
-    return transform_mesh(mesh, t)
 
 
-def combine_meshes(meshes: List[Mesh]) -> Mesh:
+def combine_meshes(meshes: List[MeshLike]) -> MeshLike:
     """Combines multiple meshes into one."""
+    if meshes and all(isinstance(m, MeshArrays) for m in meshes):
+        return combine_arrays(meshes)
     if not meshes:
         return Mesh(id=uuid.uuid4().hex, vertices=[], indices=[])
-        
-    combined = Mesh(
-        id=str(uuid.uuid4()),
-        name="CombinedMesh",
-        vertices=[],
-        normals=[],
-        uvs=[],
-        indices=[]
-    )
-    
-    # If any source has normals/uvs, we attempt to keep them.
-    # If a source lacks them, we pad with zero/default.
-    has_normals = any(m.normals for m in meshes)
-    has_uvs = any(m.uvs for m in meshes)
-    
-    if has_normals: combined.normals = []
-    if has_uvs: combined.uvs = []
-    
-    vertex_offset = 0
-    
-    for m in meshes:
-        # Verts
-        combined.vertices.extend([copy.deepcopy(v) for v in m.vertices])
-        
-        # Normals
-        if has_normals:
-            if m.normals:
-                combined.normals.extend([copy.deepcopy(n) for n in m.normals])
-            else:
-                # Pad
-                combined.normals.extend([Vector3(x=0,y=1,z=0) for _ in m.vertices])
-                
-        # UVs
-        if has_uvs:
-            if m.uvs:
-                combined.uvs.extend([copy.deepcopy(u) for u in m.uvs])
-            else:
-                from engines.scene_engine.core.geometry import UV
-                combined.uvs.extend([UV(u=0,v=0) for _ in m.vertices])
-        
-        # Indices
-        shifted_indices = [i + vertex_offset for i in m.indices]
-        combined.indices.extend(shifted_indices)
-        
-        vertex_offset += len(m.vertices)
-        
-    return combined
+    combined = combine_arrays([_arrays(m) for m in meshes])
+    # Sources without normals/uvs yield empty lists rather than None.
+    extra = {}
+    if combined.normals is None:
+        extra["normals"] = []
+    if combined.uvs is None:
+        extra["uvs"] = []
+    return combined.to_mesh(id=str(uuid.uuid4()), name="CombinedMesh", **extra)
 
 
-def merge_vertices(mesh: Mesh, epsilon: float = 1e-5) -> Mesh:
+def merge_vertices(mesh: MeshLike, epsilon: float = 1e-5) -> MeshLike:
     """Merges vertices that are within epsilon distance."""
-    new_mesh = Mesh(
-        id=mesh.id,
-        name=mesh.name,
-        vertices=[],
-        normals=[] if mesh.normals else None,
-        uvs=[] if mesh.uvs else None,
-        indices=[]
+    arrays = _arrays(mesh)
+    if not arrays.vertex_count:
+        return _result(mesh, arrays)
+    # Quantize (truncating toward zero) and keep the first vertex of each cell.
+    keys = np.trunc(arrays.positions.astype(np.float64) * (1.0 / epsilon)).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    # np.unique sorts cells; renumber them in first-occurrence order.
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    old_to_new = rank[inverse.reshape(-1)]
+    keep = first[order]
+    merged = MeshArrays(
+        positions=arrays.positions[keep],
+        indices=old_to_new[arrays.indices].astype(np.uint32),
+        normals=arrays.normals[keep] if arrays.normals is not None else None,
+        uvs=arrays.uvs[keep] if arrays.uvs is not None else None,
     )
-    
-    # Map (x,y,z) quantized -> new_index
-    # We use a string key or tuple for hashing
-    unique_map: Dict[Tuple[int, int, int], int] = {}
-    
-    inv_eps = 1.0 / epsilon
-    
-    def quantize(v: Vector3):
-        return (int(v.x * inv_eps), int(v.y * inv_eps), int(v.z * inv_eps))
-    
-    for i, v in enumerate(mesh.vertices):
-        key = quantize(v)
-        
-        if key in unique_map:
-            # Re-use
-            new_idx = unique_map[key]
-            # Accumulate normal/uv? 
-            # Simple merge: first one wins.
-        else:
-            new_idx = len(new_mesh.vertices)
-            unique_map[key] = new_idx
-            new_mesh.vertices.append(copy.deepcopy(v))
-            if mesh.normals:
-                new_mesh.normals.append(copy.deepcopy(mesh.normals[i]))
-            if mesh.uvs:
-                new_mesh.uvs.append(copy.deepcopy(mesh.uvs[i]))
-                
-        # Remap index buffer? 
-        # Wait, the iteration above is over vertices.
-        # Indices refer to original vertices.
-        # We need a mapping: old_index -> new_index.
-    
-    # We must iterate original vertices to build the map 'old_idx -> new_idx'
-    old_to_new = {}
-    
-    # Reset and do it properly with map
-    new_mesh.vertices = []
-    if mesh.normals: new_mesh.normals = []
-    if mesh.uvs: new_mesh.uvs = []
-    unique_map = {}
-    
-    for i, v in enumerate(mesh.vertices):
-        key = quantize(v)
-        if key in unique_map:
-             old_to_new[i] = unique_map[key]
-        else:
-            new_idx = len(new_mesh.vertices)
-            unique_map[key] = new_idx
-            old_to_new[i] = new_idx
-            
-            new_mesh.vertices.append(copy.deepcopy(v))
-            if mesh.normals:
-                new_mesh.normals.append(copy.deepcopy(mesh.normals[i]))
-            if mesh.uvs:
-                new_mesh.uvs.append(copy.deepcopy(mesh.uvs[i]))
-                
-    # Rebuild indices
-    for idx in mesh.indices:
-        new_mesh.indices.append(old_to_new[idx])
-        
-    return new_mesh
+    return _result(mesh, merged)
 
 
-def recompute_normals(mesh: Mesh) -> Mesh:
+def recompute_normals(mesh: MeshLike) -> MeshLike:
     """Recomputes flat face normals. (Smooth requires smoothing groups logic)."""
-    if len(mesh.indices) % 3 != 0:
+    arrays = _arrays(mesh)
+    if arrays.indices.size % 3 != 0:
         return mesh # Invalid topo
-        
-    new_mesh = copy.deepcopy(mesh)
-    
-    # Init zero normals
-    new_mesh.normals = [Vector3(x=0,y=0,z=0) for _ in new_mesh.vertices]
-    
-    # Accumulate face normals
-    for i in range(0, len(mesh.indices), 3):
-        i0, i1, i2 = mesh.indices[i], mesh.indices[i+1], mesh.indices[i+2]
-        v0 = new_mesh.vertices[i0]
-        v1 = new_mesh.vertices[i1]
-        v2 = new_mesh.vertices[i2]
-        
-        # Edge vectors
-        e1 = v1.sub(v0)
-        e2 = v2.sub(v0)
-        
-        normal = e1.cross(e2).normalize()
-        
-        # Add to all 3 verts (weighted by area? No, simple average)
-        new_mesh.normals[i0] = new_mesh.normals[i0].add(normal)
-        new_mesh.normals[i1] = new_mesh.normals[i1].add(normal)
-        new_mesh.normals[i2] = new_mesh.normals[i2].add(normal)
-        
-    # Normalize result
-    for n in new_mesh.normals:
-        normalized = n.normalize()
-        n.x, n.y, n.z = normalized.x, normalized.y, normalized.z
-        
-    return new_mesh
+    tris = arrays.indices.reshape(-1, 3).astype(np.int64)
+    p = arrays.positions.astype(np.float64)
+    face = normalize_rows(np.cross(p[tris[:, 1]] - p[tris[:, 0]], p[tris[:, 2]] - p[tris[:, 0]]))
+    # Each face contributes its unit normal to its three vertices (simple average).
+    accum = np.zeros_like(p)
+    for corner in range(3):
+        np.add.at(accum, tris[:, corner], face)
+    return _result(mesh, arrays.with_(normals=normalize_rows(accum).astype(np.float32)))
@@ -76,3 +76,96 @@ def test_generate_crowd():
     for r in rigs:
         root_ids.add(r.root_bone_id)
     assert len(root_ids) == 4
+
+
+def _count_nodes(nodes):
+    return len(nodes) + sum(_count_nodes(n.children) for n in nodes)
+
+
+def test_generate_crowd_instanced_shares_template():
+    scene, rig = build_default_avatar()
+    total_nodes = _count_nodes(scene.nodes)
+
+    final_scene, rigs = generate_crowd(scene, scene.nodes, rig, 50)
+
+    # One prototype referencing the template, one small record per avatar
+    assert _count_nodes(final_scene.nodes) == total_nodes
+    assert len(final_scene.prototypes) == 1
+    assert final_scene.prototypes[0].nodes[0] is scene.nodes[0]
+    assert len(final_scene.instances) == 50
+    assert len({i.id for i in final_scene.instances}) == 50
+
+    # Rig node ids match the expanded instance node ids
+    from engines.scene_engine.core.instancing import expand_instances
+    expanded = expand_instances(final_scene)
+    assert _count_nodes(expanded.nodes) == total_nodes * 51 + 50 # + one group node per instance
+    first = expand_instances(final_scene).nodes[len(scene.nodes)]
+    ids = set()
+    stack = [first]
+    while stack:
+        n = stack.pop()
+        ids.add(n.id)
+        stack.extend(n.children)
+    assert all(b.node_id in ids for b in rigs[0].bones)
+
+
+def test_generate_crowd_clone_mode_does_not_compound():
+    scene, rig = build_default_avatar()
+    total_nodes = _count_nodes(scene.nodes)
+    final_scene, rigs = generate_crowd(scene, scene.nodes, rig, 3, instanced=False)
+    assert _count_nodes(final_scene.nodes) == total_nodes * 4
+    assert not final_scene.instances
+
+
+def test_instanced_crowd_export_and_view_match_expanded():
+    import numpy as np
+    from engines.scene_engine.core.instancing import expand_instances
+    from engines.scene_engine.core.scene_v2 import InstanceOverride
+    from engines.scene_engine.core.geometry import Transform, EulerAngles
+    from engines.scene_engine.export.gltf_export import export_scene_to_gltf
+    from engines.scene_engine.view.models import ViewAnalysisRequest, ViewportSpec
+    from engines.scene_engine.view.service import analyze_view
+
+    scene, rig = build_default_avatar()
+    template = list(scene.nodes)
+    scene.nodes = []
+    final_scene, _ = generate_crowd(scene, template, rig, 9, width=6, depth=6)
+    # Hide one mesh node and re-pose another on a single instance
+    mesh_nodes = []
+    stack = list(template)
+    while stack:
+        n = stack.pop()
+        if n.mesh_id:
+            mesh_nodes.append(n)
+        stack.extend(n.children)
+    leaf = next(n for n in mesh_nodes if not n.children)
+    posed = next(n for n in mesh_nodes if n is not leaf)
+    inst = final_scene.instances[0]
+    inst.overrides[leaf.id] = InstanceOverride(visible=False)
+    inst.overrides[posed.id] = InstanceOverride(transform=Transform(
+        position=Vector3(x=0, y=3, z=0), rotation=EulerAngles(x=0, y=0, z=0), scale=Vector3(x=1, y=1, z=1)))
+
+    # View: instanced and expanded scenes give identical per-node results
+    viewport = ViewportSpec(camera_position=Vector3(x=0, y=5, z=15), camera_target=Vector3(x=0, y=0, z=0),
+                            screen_width=100, screen_height=100)
+    inst_view = {n.node_id: n for n in analyze_view(ViewAnalysisRequest(scene=final_scene, viewport=viewport)).nodes}
+    flat_view = {n.node_id: n for n in analyze_view(ViewAnalysisRequest(scene=expand_instances(final_scene), viewport=viewport)).nodes}
+    assert set(inst_view) == set(flat_view)
+    assert len(inst_view) == 9 * len(mesh_nodes) - 1
+    for node_id, info in flat_view.items():
+        assert inst_view[node_id].visible == info.visible
+        if info.visible:
+            assert np.allclose(inst_view[node_id].screen_bbox, info.screen_bbox)
+
+    # Export: one instanced glTF node per prototype mesh node
+    gltf = export_scene_to_gltf(final_scene)
+    assert gltf["extensionsUsed"] == ["EXT_mesh_gpu_instancing"]
+    instanced = [n for n in gltf["nodes"] if "extensions" in n]
+    assert len(instanced) == len(mesh_nodes)
+    counts = sorted(n["extras"]["instances"] for n in instanced)
+    assert counts[0] == 8 and counts[-1] == 9
+    attrs = instanced[0]["extensions"]["EXT_mesh_gpu_instancing"]["attributes"]
+    assert gltf["accessors"][attrs["ROTATION"]]["type"] == "VEC4"
+    flat = export_scene_to_gltf(final_scene, instancing=False)
+    assert "extensionsUsed" not in flat
+    assert len(flat["nodes"]) > len(gltf["nodes"])
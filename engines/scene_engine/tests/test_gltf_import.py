@@ -154,3 +154,82 @@ def test_gltf_import_hierarchy():
     child = root.children[0]
     assert child.name == "Child"
     assert child.transform.position.y == 5.0
+
+
+def _gltf_with_buffer(buffer_data: bytes, buffer_views, accessors, attributes, indices=None) -> bytes:
+    prim = {"attributes": attributes}
+    if indices is not None:
+        prim["indices"] = indices
+    gltf = {
+        "asset": {"version": "2.0"},
+        "buffers": [{
+            "uri": "data:application/octet-stream;base64," + base64.b64encode(buffer_data).decode("utf-8"),
+            "byteLength": len(buffer_data)
+        }],
+        "bufferViews": buffer_views,
+        "accessors": accessors,
+        "meshes": [{"primitives": [prim]}],
+        "nodes": [{"name": "N", "mesh": 0}],
+        "scene": 0,
+        "scenes": [{"nodes": [0]}]
+    }
+    return json.dumps(gltf).encode("utf-8")
+
+
+def test_gltf_import_interleaved_normalized_and_sparse():
+    from engines.scene_engine.io.gltf_import import MinimalGltfParser
+    # Interleaved: position (3 x float32) + uv (2 x uint16 normalized) + 4 bytes pad = 24 byte stride
+    verts = [((0.0, 0.0, 0.0), (0, 0)), ((1.0, 0.0, 0.0), (65535, 0)), ((0.0, 1.0, 0.0), (0, 32768))]
+    interleaved = b"".join(struct.pack("<fffHH8x", *p, *uv) for p, uv in verts)
+    # Sparse block: move vertex 2 to z=5
+    sparse_idx = struct.pack("<H", 2) + b"\x00\x00"
+    sparse_val = struct.pack("<fff", 0.0, 1.0, 5.0)
+    data = interleaved + sparse_idx + sparse_val
+    views = [
+        {"buffer": 0, "byteOffset": 0, "byteLength": len(interleaved), "byteStride": 24},
+        {"buffer": 0, "byteOffset": len(interleaved), "byteLength": 4},
+        {"buffer": 0, "byteOffset": len(interleaved) + 4, "byteLength": 12},
+    ]
+    accessors = [
+        {"bufferView": 0, "byteOffset": 0, "componentType": 5126, "count": 3, "type": "VEC3",
+         "sparse": {"count": 1,
+                    "indices": {"bufferView": 1, "componentType": 5123},
+                    "values": {"bufferView": 2}}},
+        {"bufferView": 0, "byteOffset": 12, "componentType": 5123, "count": 3, "type": "VEC2", "normalized": True},
+    ]
+    raw = _gltf_with_buffer(data, views, accessors, {"POSITION": 0, "TEXCOORD_0": 1})
+
+    parser = MinimalGltfParser(raw)
+    positions = parser.read_accessor_array(0)
+    assert positions.shape == (3, 3)
+    assert positions[2].tolist() == [0.0, 1.0, 5.0]
+    assert positions[1].tolist() == [1.0, 0.0, 0.0]
+    uvs = parser.read_accessor_array(1)
+    assert uvs.dtype.kind == "f"
+    assert abs(uvs[1][0] - 1.0) < 1e-6
+    assert abs(uvs[2][1] - 32768 / 65535) < 1e-6
+
+    mesh = gltf_bytes_to_scene_v2(raw).meshes[0]
+    assert mesh.indices == [0, 1, 2] # non-indexed -> sequential
+    assert mesh.vertices[2].z == 5.0
+    assert abs(mesh.uvs[1].u - 1.0) < 1e-6
+
+
+def test_gltf_import_sparse_without_buffer_view_and_signed_normalized():
+    from engines.scene_engine.io.gltf_import import MinimalGltfParser
+    data = struct.pack("<I", 1) + struct.pack("<bbb", -128, 127, 0) + b"\x00"
+    views = [
+        {"buffer": 0, "byteOffset": 0, "byteLength": 4},
+        {"buffer": 0, "byteOffset": 4, "byteLength": 4},
+    ]
+    accessors = [
+        {"componentType": 5120, "normalized": True, "count": 2, "type": "VEC3",
+         "sparse": {"count": 1,
+                    "indices": {"bufferView": 0, "componentType": 5125},
+                    "values": {"bufferView": 1}}},
+    ]
+    parser = MinimalGltfParser(_gltf_with_buffer(data, views, accessors, {"POSITION": 0}))
+    values = parser.read_accessor_array(0)
+    assert values[0].tolist() == [0.0, 0.0, 0.0]
+    assert values[1].tolist() == [-1.0, 1.0, 0.0]
+    assert parser.read_accessor(0)[1] == (-1.0, 1.0, 0.0)
@@ -54,3 +54,59 @@ def test_gltf_export_structure():
     b64_data = uri.split(",")[1]
     data = base64.b64decode(b64_data)
     assert len(data) == gltf["buffers"][0]["byteLength"]
+
+
+def _two_node_scene():
+    mesh = Mesh(
+        id="m1",
+        vertices=[Vector3(x=0,y=0,z=0), Vector3(x=1,y=0,z=0), Vector3(x=0,y=1,z=0)],
+        indices=[0, 1, 2]
+    )
+    nodes = [
+        SceneNodeV2(
+            id=f"n{i}",
+            mesh_id="m1",
+            transform=Transform(
+                position=Vector3(x=10 * i,y=0,z=0),
+                rotation=EulerAngles(x=0,y=0,z=0),
+                scale=Vector3(x=1,y=1,z=1)
+            )
+        )
+        for i in range(2)
+    ]
+    return SceneV2(id="s1", nodes=nodes, meshes=[mesh], meta={"source": "test"})
+
+
+def test_glb_export_round_trips_through_importer(tmp_path):
+    from engines.scene_engine.export.gltf_export import export_scene_to_glb
+    from engines.scene_engine.io.gltf_import import gltf_bytes_to_scene_v2, GltfImportOptions
+
+    path = tmp_path / "scene.glb"
+    written = export_scene_to_glb(_two_node_scene(), str(path))
+    data = path.read_bytes()
+    assert written == len(data)
+
+    magic, version, length = struct.unpack("<III", data[:12])
+    assert (magic, version, length) == (0x46546C67, 2, len(data))
+    json_len, json_type = struct.unpack("<II", data[12:20])
+    assert json_type == 0x4E4F534A
+    doc = json.loads(data[20:20 + json_len])
+    assert "uri" not in doc["buffers"][0]
+    assert doc["extras"] == {"source": "test"}
+    # Both nodes reference the same glTF mesh
+    assert len(doc["meshes"]) == 1
+    assert [n["mesh"] for n in doc["nodes"]] == [0, 0]
+
+    scene = gltf_bytes_to_scene_v2(data, GltfImportOptions(center_scene=False))
+    assert [n.transform.position.x for n in scene.nodes] == [0, 10]
+    assert [(v.x, v.y) for v in scene.meshes[0].vertices] == [(0, 0), (1, 0), (0, 1)]
+
+
+def test_glb_is_smaller_than_embedded_json():
+    from engines.scene_engine.export.service import export_scene, ExportFormat
+
+    scene = _two_node_scene()
+    glb = export_scene(scene, ExportFormat.GLTF_BINARY)
+    as_json = json.dumps(export_scene(scene, ExportFormat.GLTF_JSON)).encode("utf-8")
+    assert isinstance(glb, bytes)
+    assert len(glb) < len(as_json)
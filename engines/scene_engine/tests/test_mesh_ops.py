@@ -107,3 +107,68 @@ def test_recompute_normals():
     
     # Check orientation (RH rule)
     # 0->1 is +X. 0->2 is +Y. Cross(X, Y) = Z. Correct.
+
+def test_transform_mesh_quaternion_rotation():
+    from engines.scene_engine.core.geometry import Quaternion
+    m = _create_tri()
+    # 90 degrees about Z: +X -> +Y
+    t = Transform(
+        position=Vector3(x=0, y=0, z=0),
+        rotation=Quaternion(x=0, y=0, z=0.7071067811865476, w=0.7071067811865476),
+        scale=Vector3(x=1, y=1, z=1)
+    )
+    rotated = transform_mesh(m, t)
+    assert abs(rotated.vertices[1].x) < 1e-5
+    assert abs(rotated.vertices[1].y - 1.0) < 1e-5
+    assert abs(rotated.normals[0].z - 1.0) < 1e-5
+
+def test_non_uniform_scale_uses_inverse_transpose_for_normals():
+    # Normal of the plane x + y = 0 is (1,1,0)/sqrt(2); scaling x by 2 tilts it toward y.
+    n = 2 ** -0.5
+    m = Mesh(
+        id="plane",
+        vertices=[Vector3(x=0, y=0, z=0), Vector3(x=1, y=-1, z=0), Vector3(x=0, y=0, z=1)],
+        indices=[0, 1, 2],
+        normals=[Vector3(x=n, y=n, z=0) for _ in range(3)]
+    )
+    t = Transform(
+        position=Vector3(x=0, y=0, z=0),
+        rotation=EulerAngles(x=0, y=0, z=0),
+        scale=Vector3(x=2, y=1, z=1)
+    )
+    scaled = transform_mesh(m, t)
+    edge = (scaled.vertices[1].x - scaled.vertices[0].x, scaled.vertices[1].y - scaled.vertices[0].y)
+    normal = scaled.normals[0]
+    # Still perpendicular to the transformed surface, and unit length.
+    assert abs(edge[0] * normal.x + edge[1] * normal.y) < 1e-5
+    assert abs(normal.x ** 2 + normal.y ** 2 + normal.z ** 2 - 1.0) < 1e-5
+
+def test_mesh_arrays_pass_through_without_materialising():
+    from engines.scene_engine.core.mesh_arrays import MeshArrays
+    arrays = MeshArrays.from_mesh(_create_tri())
+    moved = scale_mesh(recenter_mesh(arrays), 2.0)
+    assert isinstance(moved, MeshArrays)
+    # Untouched buffers are shared, not copied.
+    assert moved.indices is arrays.indices
+    merged = merge_vertices(combine_meshes([moved, moved]))
+    assert isinstance(merged, MeshArrays)
+    assert merged.vertex_count == 3
+    assert merged.indices.tolist() == [0, 1, 2, 0, 1, 2]
+
+def test_large_grid_recompute_and_merge():
+    import numpy as np
+    from engines.scene_engine.core.mesh_arrays import MeshArrays
+    n = 200
+    xs, ys = np.meshgrid(np.arange(n, dtype=np.float32), np.arange(n, dtype=np.float32))
+    positions = np.stack([xs.ravel(), ys.ravel(), np.zeros(n * n, dtype=np.float32)], axis=1)
+    cells = (np.arange(n - 1)[None, :] + n * np.arange(n - 1)[:, None]).ravel()
+    tris = np.concatenate([
+        np.stack([cells, cells + 1, cells + n], axis=1),
+        np.stack([cells + 1, cells + n + 1, cells + n], axis=1),
+    ]).astype(np.uint32).ravel()
+    grid = MeshArrays(positions=positions, indices=tris)
+    doubled = combine_meshes([grid, grid])
+    merged = merge_vertices(doubled)
+    assert merged.vertex_count == n * n
+    normals = recompute_normals(merged).normals
+    assert np.allclose(normals, [0, 0, 1], atol=1e-6)
@@ -135,3 +135,73 @@ def test_picking_miss():
     res = pick_node(req)
     
     assert res.node_id is None
+
+
+def _front_viewport() -> ViewportSpec:
+    return ViewportSpec(
+        camera_position=Vector3(x=0, y=0, z=5),
+        camera_target=Vector3(x=0, y=0, z=0),
+        fov_y_degrees=60.0,
+        aspect_ratio=1.0,
+        screen_width=100,
+        screen_height=100
+    )
+
+
+def test_picking_returns_world_normal():
+    res = pick_node(PickNodeRequest(scene=_make_simple_scene(), viewport=_front_viewport(), screen_x=0.5, screen_y=0.5))
+    assert res.hit_normal is not None
+    assert abs(res.hit_normal.z - 1.0) < 1e-6
+    assert abs(res.meta["distance"] - 4.5) < 1e-6
+
+
+def test_picking_scaled_translated_node_uses_model_space_ray():
+    scene = _make_simple_scene()
+    scene.nodes[0].transform = Transform(
+        position=Vector3(x=0, y=0, z=1),
+        rotation=EulerAngles(x=0, y=0, z=0),
+        scale=Vector3(x=1, y=1, z=2)
+    )
+    res = pick_node(PickNodeRequest(scene=scene, viewport=_front_viewport(), screen_x=0.5, screen_y=0.5))
+    assert res.node_id == "box1"
+    # Front face at z = 1 + 0.5 * 2
+    assert abs(res.hit_position.z - 2.0) < 1e-6
+    assert abs(res.hit_normal.z - 1.0) < 1e-6
+
+
+def test_batch_pick_picks_nearest_node_per_point():
+    from engines.scene_engine.view.models import BatchPickRequest
+    from engines.scene_engine.view.service import pick_nodes
+
+    scene = _make_simple_scene()
+    mesh_id = scene.meshes[0].id
+    for i, z in enumerate([-3.0, 2.0]):
+        scene.nodes.append(SceneNodeV2(
+            id=f"box_{i}",
+            transform=Transform(
+                position=Vector3(x=0, y=0, z=z),
+                rotation=EulerAngles(x=0, y=0, z=0),
+                scale=Vector3(x=0.2, y=0.2, z=0.2)
+            ),
+            mesh_id=mesh_id
+        ))
+    res = pick_nodes(BatchPickRequest(scene=scene, viewport=_front_viewport(), points=[(0.5, 0.5), (0.0, 0.0), (0.55, 0.5)]))
+    assert [r.node_id for r in res.results] == ["box_1", None, "box1"]
+
+
+def test_mesh_bvh_cache_survives_scene_copies():
+    import copy
+    from engines.scene_engine.view.bvh import MeshBVHCache
+    from engines.scene_engine.view.service import ScenePicker
+
+    cache = MeshBVHCache(max_entries=4)
+    scene = _make_simple_scene()
+    ScenePicker(scene, cache=cache)
+    ScenePicker(scene, cache=cache)
+    ScenePicker(copy.deepcopy(scene), cache=cache)
+    assert cache.stats() == {"entries": 1, "hits": 2, "misses": 1, "builds": 1}
+
+    edited = copy.deepcopy(scene)
+    edited.meshes[0].vertices[0] = Vector3(x=-2, y=-2, z=-2)
+    ScenePicker(edited, cache=cache)
+    assert cache.stats()["builds"] == 2
@@ -0,0 +1,331 @@
+"""Bounding volume hierarchies for picking in the 3D View Engine.
+
+Two levels are used:
+
+* ``MeshBVH`` - built once per mesh (cached by mesh id + content digest) over
+  its triangles in model space. Rays are transformed into model space rather
+  than transforming vertices into world space.
+* ``BVH`` over node world bounds - built per pick call from the renderable
+  nodes, so only nodes whose boxes the ray enters are tested.
+
+Both use the same Morton-ordered implicit tree (see ``BVH``).
+
+Leaves are tested with a vectorised Möller–Trumbore over all their triangles.
+Since the inverse world transform is affine, the ray parameter ``t`` found in
+model space is the same ``t`` along the world ray.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from engines.scene_engine.core.geometry import Mesh
+from engines.scene_engine.core.mesh_arrays import MeshArrays
+
+BVH_CACHE_SIZE_ENV = "SCENE_BVH_CACHE_SIZE"
+DEFAULT_BVH_CACHE_SIZE = 64
+LEAF_SIZE = 16
+EPSILON = 1e-7
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def ray_triangle_intersect(
+    origin: np.ndarray,
+    direction: np.ndarray,
+    v0: np.ndarray,
+    e1: np.ndarray,
+    e2: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Möller–Trumbore against K triangles at once; returns (hit mask, t)."""
+    h = np.cross(direction, e2)
+    a = np.einsum("ij,ij->i", e1, h)
+    valid = np.abs(a) > EPSILON
+    f = 1.0 / np.where(valid, a, 1.0)
+    s = origin - v0
+    u = f * np.einsum("ij,ij->i", s, h)
+    q = np.cross(s, e1)
+    v = f * (q @ direction)
+    t = f * np.einsum("ij,ij->i", e2, q)
+    hit = valid & (u >= 0.0) & (u <= 1.0) & (v >= 0.0) & (u + v <= 1.0) & (t > EPSILON)
+    return hit, t
+
+
+def _safe_inverse(direction: np.ndarray) -> np.ndarray:
+    # Avoid inf*0 = nan in the slab test for axis-parallel rays.
+    return 1.0 / np.where(direction == 0.0, 1e-30, direction)
+
+
+def _morton_codes(points: np.ndarray) -> np.ndarray:
+    """30-bit Morton codes (10 bits per axis) of points normalised to their bounding box."""
+    lo = points.min(axis=0)
+    extent = points.max(axis=0) - lo
+    q = ((points - lo) / np.where(extent > 0, extent, 1.0) * 1023.0).astype(np.uint32)
+    code = np.zeros(len(points), dtype=np.uint32)
+    for axis in range(3):
+        v = q[:, axis]
+        v = (v | (v << 16)) & 0x030000FF
+        v = (v | (v << 8)) & 0x0300F00F
+        v = (v | (v << 4)) & 0x030C30C3
+        v = (v | (v << 2)) & 0x09249249
+        code |= v << (2 - axis)
+    return code
+
+
+class BVH:
+    """Binary BVH over axis-aligned primitive boxes.
+
+    Primitives are sorted along a Morton curve and grouped into leaves of
+    ``leaf_size``; internal nodes form an implicit complete binary tree
+    (children of ``i`` are ``2i+1``/``2i+2``), so the whole build is a sort
+    plus one vectorised min/max reduction per level.
+    """
+
+    def __init__(self, lo: np.ndarray, hi: np.ndarray, leaf_size: int = LEAF_SIZE):
+        count = len(lo)
+        self.leaf_size = leaf_size
+        self.primitive_count = count
+        if not count:
+            self.order = np.zeros(0, dtype=np.int64)
+            self.depth = 0
+            self.node_lo = self.node_hi = np.zeros((0, 3))
+            self.empty = np.zeros(0, dtype=bool)
+            return
+
+        self.order = np.argsort(_morton_codes((lo + hi) * 0.5), kind="stable")
+        leaves = -(-count // leaf_size)
+        self.depth = max(0, int(np.ceil(np.log2(leaves))))
+        width = 1 << self.depth
+        first_leaf = width - 1
+
+        # Leaf bounds: reduce each leaf_size run of sorted primitives.
+        starts = np.arange(leaves) * leaf_size
+        sorted_lo, sorted_hi = lo[self.order], hi[self.order]
+        node_lo = np.zeros((first_leaf + width, 3))
+        node_hi = np.zeros((first_leaf + width, 3))
+        empty = np.ones(first_leaf + width, dtype=bool)
+        node_lo[first_leaf:first_leaf + leaves] = np.minimum.reduceat(sorted_lo, starts, axis=0)
+        node_hi[first_leaf:first_leaf + leaves] = np.maximum.reduceat(sorted_hi, starts, axis=0)
+        empty[first_leaf:first_leaf + leaves] = False
+
+        # Internal levels, bottom-up. Empty children are ignored via +/-inf.
+        level_start = first_leaf
+        while level_start > 0:
+            parent_start = (level_start - 1) // 2
+            children = np.arange(level_start, 2 * level_start + 1)
+            c_lo = np.where(empty[children, None], np.inf, node_lo[children]).reshape(-1, 2, 3)
+            c_hi = np.where(empty[children, None], -np.inf, node_hi[children]).reshape(-1, 2, 3)
+            parents = slice(parent_start, level_start)
+            empty[parents] = empty[children].reshape(-1, 2).all(axis=1)
+            node_lo[parents] = np.where(empty[parents, None], 0.0, c_lo.min(axis=1))
+            node_hi[parents] = np.where(empty[parents, None], 0.0, c_hi.max(axis=1))
+            level_start = parent_start
+
+        self.node_lo = node_lo
+        self.node_hi = node_hi
+        self.empty = empty
+
+    @property
+    def node_count(self) -> int:
+        return len(self.empty)
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.node_lo[0], self.node_hi[0]
+
+    def _entry(self, nodes, origin: np.ndarray, inv_dir: np.ndarray) -> np.ndarray:
+        t1 = (self.node_lo[nodes] - origin) * inv_dir
+        t2 = (self.node_hi[nodes] - origin) * inv_dir
+        t_near = np.maximum(np.minimum(t1, t2).max(axis=1), 0.0)
+        t_far = np.maximum(t1, t2).min(axis=1)
+        return np.where(~self.empty[nodes] & (t_far >= t_near), t_near, np.inf)
+
+    def traverse(
+        self,
+        origin: np.ndarray,
+        direction: np.ndarray,
+        leaf_fn: Callable[[int, int, float], float],
+        t_max: float = np.inf,
+    ) -> float:
+        """Visits leaves near-to-far, pruning boxes beyond the closest hit so far.
+
+        ``leaf_fn(start, end, t_best)`` tests ``order[start:end]`` and returns
+        the new closest ``t`` (or ``t_best`` when nothing closer was hit).
+        """
+        if not self.node_count:
+            return t_max
+        inv_dir = _safe_inverse(direction)
+        if self._entry([0], origin, inv_dir)[0] >= t_max:
+            return t_max
+        first_leaf = (1 << self.depth) - 1
+        best = t_max
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if node >= first_leaf:
+                start = (node - first_leaf) * self.leaf_size
+                best = leaf_fn(start, min(start + self.leaf_size, self.primitive_count), best)
+                continue
+            children = [2 * node + 1, 2 * node + 2]
+            near, far = self._entry(children, origin, inv_dir)
+            # Push the far child first so the near one is popped next.
+            if far < near:
+                near, far = far, near
+                children = children[::-1]
+            if far < best:
+                stack.append(children[1])
+            if near < best:
+                stack.append(children[0])
+        return best
+
+
+@dataclass(frozen=True)
+class MeshHit:
+    t: float
+    triangle: int
+    normal: np.ndarray  # unit geometric normal in model space (winding order)
+
+
+class MeshBVH:
+    """Triangle BVH in model space; triangles stored in BVH leaf order."""
+
+    def __init__(self, arrays: MeshArrays, leaf_size: int = LEAF_SIZE):
+        usable = arrays.indices.size - arrays.indices.size % 3
+        tris = arrays.indices[:usable].reshape(-1, 3).astype(np.int64)
+        p = arrays.positions.astype(np.float64)
+        a, b, c = p[tris[:, 0]], p[tris[:, 1]], p[tris[:, 2]]
+        self.bvh = BVH(np.minimum(np.minimum(a, b), c), np.maximum(np.maximum(a, b), c), leaf_size)
+        order = self.bvh.order
+        self.triangle_ids = order
+        self.v0 = np.ascontiguousarray(a[order])
+        self.e1 = np.ascontiguousarray(b[order] - a[order])
+        self.e2 = np.ascontiguousarray(c[order] - a[order])
+
+    @property
+    def triangle_count(self) -> int:
+        return len(self.v0)
+
+    def bounds(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        return self.bvh.bounds() if self.triangle_count else None
+
+    def intersect(self, origin: np.ndarray, direction: np.ndarray, t_max: float = np.inf) -> Optional[MeshHit]:
+        found = {}
+
+        def leaf(start: int, end: int, best: float) -> float:
+            hit, t = ray_triangle_intersect(origin, direction, self.v0[start:end], self.e1[start:end], self.e2[start:end])
+            t = np.where(hit, t, np.inf)
+            i = int(np.argmin(t))
+            if t[i] < best:
+                found["slot"] = start + i
+                return float(t[i])
+            return best
+
+        best = self.bvh.traverse(origin, direction, leaf, t_max)
+        if "slot" not in found:
+            return None
+        slot = found["slot"]
+        normal = np.cross(self.e1[slot], self.e2[slot])
+        length = np.linalg.norm(normal)
+        return MeshHit(
+            t=best,
+            triangle=int(self.triangle_ids[slot]),
+            normal=normal / length if length > 0 else normal,
+        )
+
+
+class MeshBVHCache:
+    """LRU of MeshBVHs keyed by (mesh id, content digest).
+
+    Meshes are compared by content, so deep-copied scenes (as produced by the
+    edit service) still hit. The same Mesh object seen again skips the digest
+    entirely; callers that mutate a Mesh's vertices in place should call
+    ``invalidate(mesh_id)``.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or _env_int(BVH_CACHE_SIZE_ENV, DEFAULT_BVH_CACHE_SIZE)
+        self._entries: "OrderedDict[Tuple[str, str], MeshBVH]" = OrderedDict()
+        self._seen: Dict[int, Tuple[weakref.ref, int, int, Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+
+    def _known_key(self, mesh: Mesh) -> Optional[Tuple[str, str]]:
+        seen = self._seen.get(id(mesh))
+        if seen is None:
+            return None
+        ref, n_verts, n_idx, key = seen
+        if ref() is not mesh or n_verts != len(mesh.vertices) or n_idx != len(mesh.indices) or key[0] != mesh.id:
+            return None
+        return key
+
+    def get(self, mesh: Mesh) -> MeshBVH:
+        with self._lock:
+            key = self._known_key(mesh)
+            if key is not None and key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        arrays = MeshArrays.from_mesh(mesh)
+        digest = hashlib.blake2b(arrays.positions.tobytes(), digest_size=16)
+        digest.update(arrays.indices.tobytes())
+        key = (mesh.id, digest.hexdigest())
+        with self._lock:
+            self._remember(mesh, key)
+            bvh = self._entries.get(key)
+            if bvh is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return bvh
+            self.misses += 1
+
+        bvh = MeshBVH(arrays)
+        with self._lock:
+            self.builds += 1
+            self._entries[key] = bvh
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return bvh
+
+    def _remember(self, mesh: Mesh, key: Tuple[str, str]) -> None:
+        mesh_ref = id(mesh)
+        self._seen[mesh_ref] = (weakref.ref(mesh, lambda _r, k=mesh_ref: self._seen.pop(k, None)), len(mesh.vertices), len(mesh.indices), key)
+
+    def invalidate(self, mesh_id: Optional[str] = None) -> None:
+        with self._lock:
+            if mesh_id is None:
+                self._entries.clear()
+                self._seen.clear()
+                return
+            for key in [k for k in self._entries if k[0] == mesh_id]:
+                del self._entries[key]
+            for ref_id in [r for r, seen in self._seen.items() if seen[3][0] == mesh_id]:
+                del self._seen[ref_id]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "builds": self.builds}
+
+
+_mesh_bvh_cache = MeshBVHCache()
+
+
+def get_mesh_bvh_cache() -> MeshBVHCache:
+    return _mesh_bvh_cache
+
+
+def invalidate_mesh_bvh(mesh_id: Optional[str] = None) -> None:
+    _mesh_bvh_cache.invalidate(mesh_id)
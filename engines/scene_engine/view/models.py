@@ -60,3 +60,13 @@ class PickNodeResult(BaseModel):
     hit_position: Optional[Vector3] = None
     hit_normal: Optional[Vector3] = None
     meta: Dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchPickRequest(BaseModel):
+    scene: SceneV2
+    viewport: ViewportSpec
+    points: List[Tuple[float, float]]  # (screen_x, screen_y) in [0, 1]
+
+
+class BatchPickResult(BaseModel):
+    results: List[PickNodeResult]
@@ -2,23 +2,26 @@
 from __future__ import annotations
 
 import math
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
-from engines.scene_engine.core.geometry import EulerAngles, Mesh, Vector3
+import numpy as np
+
+from engines.scene_engine.core.geometry import EulerAngles, Mesh, Transform, Vector3
+from engines.scene_engine.core.instancing import instance_node_id, resolve_instances
 from engines.scene_engine.core.scene_v2 import SceneNodeV2, SceneV2
+from engines.scene_engine.view.bvh import BVH, MeshBVH, MeshBVHCache, get_mesh_bvh_cache
 from engines.scene_engine.view.math_utils import (
     Matrix4,
-    add,
     compose_trs,
     cross,
-    dot,
     look_at,
     normalize,
     perspective,
-    scale_vec,
     subtract,
 )
 from engines.scene_engine.view.models import (
+    BatchPickRequest,
+    BatchPickResult,
     NodeViewInfo,
     PickNodeRequest,
     PickNodeResult,
@@ -28,10 +31,10 @@ from engines.scene_engine.view.models import (
 )
 
 
-def _get_node_world_transform(node: SceneNodeV2, parent_transform: Matrix4 = None) -> Matrix4:
+def _transform_matrix(transform: Transform) -> Matrix4:
     # Convert Transform to Matrix
     # Convert degrees to radians for math_utils
-    rot = node.transform.rotation
+    rot = transform.rotation
     rx, ry, rz = 0.0, 0.0, 0.0
     if isinstance(rot, EulerAngles):
         rx = math.radians(rot.x)
@@ -39,12 +42,15 @@ def _get_node_world_transform(node: SceneNodeV2, parent_transform: Matrix4 = Non
         rz = math.radians(rot.z)
     # Quaternion support TODO: add if needed, defaulting to euler 0,0,0 if not euler
     
-    local = compose_trs(
-        node.transform.position,
+    return compose_trs(
+        transform.position,
         Vector3(x=rx, y=ry, z=rz),
-        node.transform.scale
+        transform.scale
     )
-    
+
+
+def _get_node_world_transform(node: SceneNodeV2, parent_transform: Matrix4 = None) -> Matrix4:
+    local = _transform_matrix(node.transform)
     if parent_transform:
         return parent_transform * local
     return local
@@ -66,6 +72,29 @@ def _collect_renderbale_nodes(
         _collect_renderbale_nodes(node.children, world, flat_list)
 
 
+class _Renderable(NamedTuple):
+    node_id: str
+    mesh_id: str
+    meta: Dict[str, Any]
+    world: np.ndarray
+
+
+def _collect_renderables(scene: SceneV2) -> List[_Renderable]:
+    """Scene nodes with meshes plus one entry per (instance, prototype mesh node)."""
+    flat: List[Tuple[SceneNodeV2, Matrix4]] = []
+    _collect_renderbale_nodes(scene.nodes, Matrix4.identity(), flat)
+    renderables = [_Renderable(node.id, node.mesh_id, node.meta, _matrix_array(world)) for node, world in flat]
+    for group in resolve_instances(scene, lambda t: _matrix_array(_transform_matrix(t))):
+        for instance_id, world in zip(group.instance_ids, group.world_matrices()):
+            renderables.append(_Renderable(
+                instance_node_id(group.node.id, instance_id),
+                group.mesh_id,
+                {**group.node.meta, "instance_id": instance_id},
+                world,
+            ))
+    return renderables
+
+
 def _build_camera_matrices(scene: SceneV2, viewport: ViewportSpec) -> Tuple[Matrix4, Matrix4, Vector3]:
     """Returns (ViewMatrix, ProjectionMatrix, CameraPos)."""
     eye = viewport.camera_position or Vector3(x=0, y=0, z=5)
@@ -97,285 +126,205 @@ def _build_camera_matrices(scene: SceneV2, viewport: ViewportSpec) -> Tuple[Matr
     return view_mat, proj_mat, eye
 
 
+def _matrix_array(m: Matrix4) -> np.ndarray:
+    return np.array(m.m, dtype=np.float64).reshape(4, 4)
+
+
+def _projection_points(mesh: Mesh) -> np.ndarray:
+    """Bounds corners (8) if the mesh has bounds, else up to its first 8 vertices."""
+    if mesh.bounds_min and mesh.bounds_max:
+        lo, hi = mesh.bounds_min, mesh.bounds_max
+        return np.array([
+            [lo.x, lo.y, lo.z], [hi.x, lo.y, lo.z], [hi.x, hi.y, lo.z], [lo.x, hi.y, lo.z],
+            [lo.x, lo.y, hi.z], [hi.x, lo.y, hi.z], [hi.x, hi.y, hi.z], [lo.x, hi.y, hi.z],
+        ], dtype=np.float64)
+    return np.array([(v.x, v.y, v.z) for v in mesh.vertices[:8]], dtype=np.float64).reshape(-1, 3)
+
+
 def analyze_view(req: ViewAnalysisRequest) -> ViewAnalysisResult:
     # 1. Setup Camera
     view_mat, proj_mat, cam_pos = _build_camera_matrices(req.scene, req.viewport)
-    vp = req.viewport
     
     # 2. Collect nodes with transforms
-    renderables: List[Tuple[SceneNodeV2, Matrix4]] = []
-    _collect_renderbale_nodes(req.scene.nodes, Matrix4.identity(), renderables)
-    
-    # 3. Project
-    results: List[NodeViewInfo] = []
     mesh_map: Dict[str, Mesh] = {m.id: m for m in req.scene.meshes}
+    renderables = [r for r in _collect_renderables(req.scene) if r.mesh_id in mesh_map]
+    if not renderables:
+        return ViewAnalysisResult(nodes=[], meta={"count": 0})
     
-    view_proj = proj_mat * view_mat
+    # 3. Project all nodes' points in one batch: (N, 8, 4) homogeneous points x (N, 4, 4) MVPs.
+    # Nodes with fewer than 8 points repeat their first point, which leaves min/max unchanged.
+    points = np.zeros((len(renderables), 8, 4))
+    points[..., 3] = 1.0
+    has_points = np.zeros(len(renderables), dtype=bool)
+    for i, item in enumerate(renderables):
+        p = _projection_points(mesh_map[item.mesh_id])
+        if len(p):
+            points[i, :, :3] = p[np.minimum(np.arange(8), len(p) - 1)]
+            has_points[i] = True
     
-    for node, world_mat in renderables:
-        mesh = mesh_map.get(node.mesh_id)
-        if not mesh:
-            continue
-            
-        # Transform bounds vertices (usually 8 corners)
-        # Using mesh.vertices is expensive if high poly.
-        # Use bounds if available.
-        # Primitives usually have 8 vertices which is same as bounds.
-        # If mesh has bounds_min/max, use those 8 corners.
-        
-        points_to_project = []
-        if mesh.bounds_min and mesh.bounds_max:
-            # Construct 8 corners
-            min_v = mesh.bounds_min
-            max_v = mesh.bounds_max
-            points_to_project = [
-                Vector3(x=min_v.x, y=min_v.y, z=min_v.z),
-                Vector3(x=max_v.x, y=min_v.y, z=min_v.z),
-                Vector3(x=max_v.x, y=max_v.y, z=min_v.z),
-                Vector3(x=min_v.x, y=max_v.y, z=min_v.z),
-                Vector3(x=min_v.x, y=min_v.y, z=max_v.z),
-                Vector3(x=max_v.x, y=min_v.y, z=max_v.z),
-                Vector3(x=max_v.x, y=max_v.y, z=max_v.z),
-                Vector3(x=min_v.x, y=max_v.y, z=max_v.z),
-            ]
-        else:
-            points_to_project = mesh.vertices[:8] # Fallback
-            
-        min_ndc_x, max_ndc_x = 1.0, -1.0
-        min_ndc_y, max_ndc_y = 1.0, -1.0
-        min_depth, max_depth = float('inf'), float('-inf')
-        
-        any_visible = False
-        
-        mvp = view_proj * world_mat
-        
-        for p in points_to_project:
-            rx, ry, rz, rw = mvp.multiply_vector(p, 1.0)
-            
-            if rw != 0:
-                nx = rx / rw
-                ny = ry / rw
-                nz = rz / rw
-            else:
-                nx, ny, nz = 0, 0, 0 # Singularity
-            
-            # Check frustum (NDC -1 to 1)
-            # Actually we just track min/max and then check overlap
-            # But simple check: if any point in range, or bounding box overlaps
-            
-            # Record depth (nz)
-            # OpenGL NDC z is -1 to 1? or 0 to 1? usually -1 to 1.
-            # Perspective divide done.
-            
-            # Screen space [0, 1] with 0,0 top-left?
-            # NDC y is usually up.
-            # Convert NDC to 0..1
-            sx = (nx * 0.5) + 0.5
-            sy = (1.0 - ((ny * 0.5) + 0.5)) # Flip Y for screen coords
-            
-            if sx < min_ndc_x: min_ndc_x = sx
-            if sx > max_ndc_x: max_ndc_x = sx
-            if sy < min_ndc_y: min_ndc_y = sy
-            if sy > max_ndc_y: max_ndc_y = sy
-            
-            # Basic visibility check: is the point in front of camera?
-            # w > 0 means in front
-            if rw > 0 and -1 <= nx <= 1 and -1 <= ny <= 1 and -1 <= nz <= 1:
-                any_visible = True
-            
-            # Avg depth calc? Use rw (linear-ish depth before divide) or nz (non-linear)
-            # Use rw for sorting usually.
-            if rw > 0:
-                if rw < min_depth: min_depth = rw
-        
-        # If bounding box is valid
-        if min_ndc_x <= max_ndc_x:
-            # Check if off-screen
-            # If max < 0 or min > 1 -> off screen
-            if max_ndc_x < 0 or min_ndc_x > 1 or max_ndc_y < 0 or min_ndc_y > 1:
-                any_visible = False
-
-        if any_visible:
-            # Clamp to 0-1 for cleanliness? Or keep off-screen bounds?
-            # User output wants screen_bbox in [0, 1].
-            # Let's clamp for output
-            c_min_x = max(0.0, min(1.0, min_ndc_x))
-            c_max_x = max(0.0, min(1.0, max_ndc_x))
-            c_min_y = max(0.0, min(1.0, min_ndc_y))
-            c_max_y = max(0.0, min(1.0, max_ndc_y))
-            
-            area = (c_max_x - c_min_x) * (c_max_y - c_min_y)
-            
+    view_proj = _matrix_array(proj_mat * view_mat)
+    mvp = view_proj @ np.stack([item.world for item in renderables])
+    clip = np.einsum("nij,nkj->nki", mvp, points)
+    rw = clip[..., 3]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ndc = np.where((rw != 0)[..., None], clip[..., :3] / rw[..., None], 0.0) # Singularity -> 0
+    
+    # Screen space [0, 1] with 0,0 top-left; NDC y is up.
+    sx = ndc[..., 0] * 0.5 + 0.5
+    sy = 1.0 - (ndc[..., 1] * 0.5 + 0.5)
+    min_x = np.minimum(sx.min(axis=1), 1.0)
+    max_x = np.maximum(sx.max(axis=1), -1.0)
+    min_y = np.minimum(sy.min(axis=1), 1.0)
+    max_y = np.maximum(sy.max(axis=1), -1.0)
+    
+    # A node is visible if any point is in front of the camera (w > 0) and inside the NDC cube,
+    # unless its whole screen box lies off-screen.
+    in_frustum = (rw > 0) & np.all(np.abs(ndc) <= 1.0, axis=2)
+    visible = has_points & in_frustum.any(axis=1)
+    off_screen = (min_x <= max_x) & ((max_x < 0) | (min_x > 1) | (max_y < 0) | (min_y > 1))
+    visible &= ~off_screen
+    # Depth: nearest positive w (linear-ish depth before divide).
+    min_depth = np.where(rw > 0, rw, np.inf).min(axis=1)
+    
+    area = (np.clip(max_x, 0.0, 1.0) - np.clip(min_x, 0.0, 1.0)) * (np.clip(max_y, 0.0, 1.0) - np.clip(min_y, 0.0, 1.0))
+    
+    results: List[NodeViewInfo] = []
+    for i, item in enumerate(renderables):
+        if visible[i]:
             results.append(NodeViewInfo(
-                node_id=node.id,
+                node_id=item.node_id,
                 visible=True,
-                screen_bbox=(min_ndc_x, min_ndc_y, max_ndc_x, max_ndc_y),
-                screen_area_fraction=area,
-                average_depth=min_depth if min_depth != float('inf') else 0.0,
-                meta=node.meta
+                screen_bbox=(float(min_x[i]), float(min_y[i]), float(max_x[i]), float(max_y[i])),
+                screen_area_fraction=float(area[i]),
+                average_depth=float(min_depth[i]) if np.isfinite(min_depth[i]) else 0.0,
+                meta=item.meta
             ))
         else:
-            # Not visible
             results.append(NodeViewInfo(
-                node_id=node.id,
+                node_id=item.node_id,
                 visible=False,
-                meta=node.meta
+                meta=item.meta
             ))
 
     return ViewAnalysisResult(nodes=results, meta={"count": len(results)})
 
 
-def _ray_intersects_triangle(
-    ray_origin: Vector3, 
-    ray_dir: Vector3, 
-    v0: Vector3, 
-    v1: Vector3, 
-    v2: Vector3
-) -> Tuple[bool, float]:
-    """Möller–Trumbore intersection algorithm."""
-    epsilon = 0.0000001
-    edge1 = subtract(v1, v0)
-    edge2 = subtract(v2, v0)
-    h = cross(ray_dir, edge2)
-    a = dot(edge1, h)
+def _camera_rays(viewport: ViewportSpec, screen_points: Sequence[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """World-space ray origin and unit directions (N, 3) for normalised screen points."""
+    eye = viewport.camera_position or Vector3(x=0, y=0, z=5)
+    target = viewport.camera_target or Vector3(x=0, y=0, z=0)
+    # Camera basis matching look_at: s (right), u (up), f (forward, camera looks down -Z in view space).
+    f = normalize(subtract(target, eye))
+    s = normalize(cross(f, normalize(viewport.up)))
+    u = cross(s, f)
+    basis = np.array([[s.x, s.y, s.z], [u.x, u.y, u.z], [f.x, f.y, f.z]])
     
-    if -epsilon < a < epsilon:
-        return False, 0.0 # Parallel
+    pts = np.asarray(screen_points, dtype=np.float64).reshape(-1, 2)
+    ndc_x = (pts[:, 0] - 0.5) * 2.0
+    ndc_y = (1.0 - pts[:, 1] - 0.5) * 2.0 # Flip Y back
+    tan_half_fov = math.tan(math.radians(viewport.fov_y_degrees) / 2.0)
+    view_dirs = np.stack([ndc_x * viewport.aspect_ratio * tan_half_fov, ndc_y * tan_half_fov, np.ones(len(pts))], axis=1)
+    world_dirs = view_dirs @ basis
+    world_dirs /= np.linalg.norm(world_dirs, axis=1, keepdims=True)
+    return np.array([eye.x, eye.y, eye.z], dtype=np.float64), world_dirs
+
+
+class _PickTarget:
+    __slots__ = ("node_id", "mesh_bvh", "inverse", "normal_matrix")
+
+    def __init__(self, node_id: str, mesh_bvh: MeshBVH, inverse: np.ndarray):
+        self.node_id = node_id
+        self.mesh_bvh = mesh_bvh
+        self.inverse = inverse
+        # Model-space normals go to world space with the inverse-transpose of the world matrix.
+        self.normal_matrix = inverse[:3, :3].T
+
+
+class ScenePicker:
+    """Ray picking against a scene: node-bounds BVH on top of cached per-mesh BVHs.
+
+    Build once per scene state and reuse it for many rays (e.g. hover picking
+    or marquee sampling); mesh BVHs are shared across pickers via the cache.
+    Instances are picked by their expanded node ids.
+    """
+
+    def __init__(self, scene: SceneV2, cache: Optional[MeshBVHCache] = None):
+        cache = cache or get_mesh_bvh_cache()
+        mesh_map = {m.id: m for m in scene.meshes}
+        mesh_bvhs: Dict[str, Optional[MeshBVH]] = {}
         
-    f = 1.0 / a
-    s = subtract(ray_origin, v0)
-    u = f * dot(s, h)
-    
-    if u < 0.0 or u > 1.0:
-        return False, 0.0
+        candidates: List[Tuple[_Renderable, MeshBVH]] = []
+        for item in _collect_renderables(scene):
+            if item.mesh_id not in mesh_bvhs:
+                mesh = mesh_map.get(item.mesh_id)
+                mesh_bvhs[item.mesh_id] = cache.get(mesh) if mesh and mesh.indices else None
+            mesh_bvh = mesh_bvhs[item.mesh_id]
+            if mesh_bvh is not None and mesh_bvh.bounds() is not None:
+                candidates.append((item, mesh_bvh))
         
-    q = cross(s, edge1)
-    v = f * dot(ray_dir, q)
-    
-    if v < 0.0 or u + v > 1.0:
-        return False, 0.0
+        self.targets: List[_PickTarget] = []
+        if not candidates:
+            self.bvh = BVH(np.zeros((0, 3)), np.zeros((0, 3)))
+            return
+        worlds = np.stack([item.world for item, _ in candidates])
+        # Degenerate (zero-scale) nodes can't be hit.
+        usable = np.abs(np.linalg.det(worlds[:, :3, :3])) > 1e-12
+        inverses = np.zeros_like(worlds)
+        inverses[usable] = np.linalg.inv(worlds[usable])
         
-    t = f * dot(edge2, q)
-    
-    if t > epsilon:
-        return True, t
+        lows, highs = [], []
+        for k, (item, mesh_bvh) in enumerate(candidates):
+            if not usable[k]:
+                continue
+            lo, hi = mesh_bvh.bounds()
+            corners = np.array([[x, y, z] for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])])
+            world_corners = corners @ worlds[k, :3, :3].T + worlds[k, :3, 3]
+            lows.append(world_corners.min(axis=0))
+            highs.append(world_corners.max(axis=0))
+            self.targets.append(_PickTarget(item.node_id, mesh_bvh, inverses[k]))
         
-    return False, 0.0
+        self.bvh = BVH(np.array(lows).reshape(-1, 3), np.array(highs).reshape(-1, 3), leaf_size=4)
+
+    def cast(self, origin: np.ndarray, direction: np.ndarray) -> PickNodeResult:
+        found = {}
+
+        def leaf(start: int, end: int, best: float) -> float:
+            for target_idx in self.bvh.order[start:end]:
+                target = self.targets[target_idx]
+                inv = target.inverse
+                # Ray into model space; t is preserved by the affine map.
+                hit = target.mesh_bvh.intersect(inv[:3, :3] @ origin + inv[:3, 3], inv[:3, :3] @ direction, best)
+                if hit is not None:
+                    best = hit.t
+                    found["hit"] = (target, hit)
+            return best
+
+        self.bvh.traverse(origin, direction, leaf)
+        if "hit" not in found:
+            return PickNodeResult()
+        target, hit = found["hit"]
+        position = origin + direction * hit.t
+        normal = target.normal_matrix @ hit.normal
+        length = np.linalg.norm(normal)
+        if length > 0:
+            normal = normal / length
+        return PickNodeResult(
+            node_id=target.node_id,
+            hit_position=Vector3(x=float(position[0]), y=float(position[1]), z=float(position[2])),
+            hit_normal=Vector3(x=float(normal[0]), y=float(normal[1]), z=float(normal[2])),
+            meta={"distance": hit.t, "triangle_index": hit.triangle},
+        )
+
+    def pick(self, viewport: ViewportSpec, screen_points: Sequence[Tuple[float, float]]) -> List[PickNodeResult]:
+        origin, directions = _camera_rays(viewport, screen_points)
+        return [self.cast(origin, d) for d in directions]
 
 
 def pick_node(req: PickNodeRequest) -> PickNodeResult:
-    view_mat, proj_mat, cam_pos = _build_camera_matrices(req.scene, req.viewport)
-    
-    # Unproject screen point to ray
-    # NDC
-    ndc_x = (req.screen_x - 0.5) * 2.0
-    ndc_y = (1.0 - req.screen_y - 0.5) * 2.0 # Flip Y back
-    
-    # Unprojection requires Inverse Matrix, which is heavy to implement manually perfectly.
-    # Simple approach: 
-    # Ray in View space:
-    # tan(fov/2) stuff.
-    
-    aspect = req.viewport.aspect_ratio
-    fov = math.radians(req.viewport.fov_y_degrees)
-    
-    # View space dir
-    # px = ndc_x * aspect * tan(fov/2)
-    # py = ndc_y * tan(fov/2)
-    # pz = -1
-    
-    tan_half_fov = math.tan(fov / 2.0)
-    vx = ndc_x * aspect * tan_half_fov
-    vy = ndc_y * tan_half_fov
-    vz = -1.0
-    
-    ray_dir_view = normalize(Vector3(x=vx, y=vy, z=vz))
-    
-    # Transform to World space using Inverse View Matrix
-    # Inverse of LookAt is roughly Transpose of rotation + translation handling.
-    # View Mat: [ R   T ]
-    #           [ 0   1 ]
-    # Inv:      [ R^T  -R^T * T ]
-    # Since we have cam_pos separately, we can just rotate the ray direction by the camera's rotation.
-    # The 'LookAt' constructs axes s (right), u (up), -f (view).
-    # World Ray Dir = ray_dir_view.x * s + ray_dir_view.y * u + ray_dir_view.z * (-f)
-    
-    # Reconstruct axes matching look_at logic
-    target = req.viewport.camera_target or Vector3(x=0, y=0, z=0)
-    up = req.viewport.up
-    f = normalize(subtract(target, cam_pos))
-    s = normalize(cross(f, normalize(up)))
-    u = cross(s, f)
-    
-    # Transform Dir
-    # ray_view = (vx, vy, vz)
-    # world = vx * s + vy * u + vz * (-f) -> wait, look_at defined -f as +Z in view space?
-    # standard look_at puts camera looking down -Z.
-    # So view direction is -Z.
-    # Our simple projection assumed -1 Z.
-    # So forward is f.
-    
-    # World Dir
-    wd = add(add(scale_vec(s, vx), scale_vec(u, vy)), scale_vec(f, vz * -1.0)) # vz is -1, so f * 1
-    # Check vz sign. In view space, looking down -Z. So forward is (0,0,-1).
-    # f vector is Cam -> Target.
-    # So (0,0,-1) view space should map to f world space.
-    # (0,0,-1) is vx=0, vy=0, vz=-1.
-    # Formula: vx*s + vy*u + (-vz)*f ? 
-    # If vz=-1 -> 1*f. Correct.
-    
-    ray_dir_world = normalize(wd)
-    ray_origin = cam_pos
-    
-    # Raycast scene
-    renderables: List[Tuple[SceneNodeV2, Matrix4]] = []
-    _collect_renderbale_nodes(req.scene.nodes, Matrix4.identity(), renderables)
-    mesh_map = {m.id: m for m in req.scene.meshes}
-    
-    closest_t = float('inf')
-    hit_node_id = None
-    hit_pos = None
-    # hit_normal = ... todo
-    
-    for node, world_mat in renderables:
-        mesh = mesh_map.get(node.mesh_id)
-        if not mesh:
-            continue
-            
-        # Brute force triangles
-        # indices assumed triangles
-        if not mesh.indices:
-            continue
-            
-        # Transform vertices to world once?
-        # Or transform ray to model space? 
-        # Transforming vertices to world is easier to reason about for P0 vs inverse matrix stability.
-        # But inefficient. P0 says "brute force ok".
-        
-        world_verts = []
-        for v in mesh.vertices:
-            wx, wy, wz, ww = world_mat.multiply_vector(v, 1.0)
-            world_verts.append(Vector3(x=wx, y=wy, z=wz))
-            
-        for i in range(0, len(mesh.indices), 3):
-            if i + 2 >= len(mesh.indices):
-                break
-            i0, i1, i2 = mesh.indices[i], mesh.indices[i+1], mesh.indices[i+2]
-            v0 = world_verts[i0]
-            v1 = world_verts[i1]
-            v2 = world_verts[i2]
-            
-            hit, t = _ray_intersects_triangle(ray_origin, ray_dir_world, v0, v1, v2)
-            if hit and t < closest_t:
-                closest_t = t
-                hit_node_id = node.id
-                # Calculate hit pos
-                # P = O + tD
-                hit_pos = add(ray_origin, scale_vec(ray_dir_world, t))
-                
-    return PickNodeResult(
-        node_id=hit_node_id,
-        hit_position=hit_pos,
-        # hit_normal not implemented in P0 brute force unless requested for verification
-        # The interface asks for it. Defaults to None.
-    )
+    return ScenePicker(req.scene).pick(req.viewport, [(req.screen_x, req.screen_y)])[0]
+
+
+def pick_nodes(req: BatchPickRequest) -> BatchPickResult:
+    """Picks many screen points against one scene, sharing the scene and mesh BVHs."""
+    picker = ScenePicker(req.scene)
+    return BatchPickResult(results=picker.pick(req.viewport, req.points))
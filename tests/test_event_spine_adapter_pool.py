@@ -0,0 +1,84 @@
+import pytest
+
+from engines.common.identity import RequestContext
+from engines.event_spine import adapter_pool as pool_module
+from engines.event_spine import cloud_event_spine_store
+from engines.event_spine.emitters import SafetyEmitter
+from engines.event_spine.service_reject import EventSpineServiceRejectOnMissing, MissingEventSpineRoute
+from engines.routing.registry import InMemoryRoutingRegistry, ResourceRoute, routing_registry, set_routing_registry
+
+
+class _FakeStore:
+    instances = 0
+
+    def __init__(self, project=None):
+        type(self).instances += 1
+        self.project = project
+        self.events = []
+
+    def append(self, event, context):
+        self.events.append(event)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    _FakeStore.instances = 0
+    monkeypatch.setattr(cloud_event_spine_store, "FirestoreEventSpineStore", _FakeStore)
+    pool_module.adapter_pool().clear()
+    previous = routing_registry()
+    reg = InMemoryRoutingRegistry()
+    set_routing_registry(reg)
+    yield reg
+    set_routing_registry(previous)
+    pool_module.adapter_pool().clear()
+
+
+def _route(project: str, tenant_id: str = "t_pool") -> ResourceRoute:
+    return ResourceRoute(
+        id=f"event_spine-{tenant_id}",
+        resource_kind="event_spine",
+        tenant_id=tenant_id,
+        env="dev",
+        project_id="p_pool",
+        backend_type="firestore",
+        config={"project": project},
+    )
+
+
+def _ctx(tenant_id: str = "t_pool") -> RequestContext:
+    return RequestContext(tenant_id=tenant_id, env="dev", mode="saas", project_id="p_pool", request_id="r1")
+
+
+def test_emitters_share_one_adapter_per_route(registry):
+    registry.upsert_route(_route("gcp-a"))
+    registry.upsert_route(_route("gcp-a", tenant_id="t_other"))
+
+    for _ in range(5):
+        SafetyEmitter(_ctx()).emit_safety_decision("run-1", "allow", "gate", {})
+    SafetyEmitter(_ctx("t_other")).emit_safety_decision("run-2", "block", "gate", {})
+    svc = EventSpineServiceRejectOnMissing(_ctx())
+
+    assert _FakeStore.instances == 1
+    assert len(svc._adapter.events) == 6
+
+
+def test_route_change_replaces_adapter(registry):
+    registry.upsert_route(_route("gcp-a"))
+    first = EventSpineServiceRejectOnMissing(_ctx())._adapter
+
+    registry.upsert_route(_route("gcp-b"))
+    second = EventSpineServiceRejectOnMissing(_ctx())._adapter
+
+    assert first is not second
+    assert second.project == "gcp-b"
+    assert len(pool_module.adapter_pool()) == 1
+
+
+def test_unsupported_backend_is_not_pooled(registry):
+    route = _route("gcp-a")
+    route.backend_type = "filesystem"
+    registry.upsert_route(route)
+
+    with pytest.raises(MissingEventSpineRoute):
+        EventSpineServiceRejectOnMissing(_ctx())
+    assert len(pool_module.adapter_pool()) == 0
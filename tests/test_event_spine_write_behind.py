@@ -0,0 +1,217 @@
+import json
+import threading
+
+import pytest
+
+from engines.common.identity import RequestContext
+from engines.event_spine import adapter_pool as pool_module
+from engines.event_spine import cloud_event_spine_store, write_behind
+from engines.event_spine.cloud_event_spine_store import SpineEvent, _require_append_fields
+from engines.event_spine.emitters import SafetyEmitter
+from engines.event_spine.validation_service import EventSpineServiceWithValidation
+from engines.event_spine.write_behind import WriteBehindWriter
+from engines.routing.registry import InMemoryRoutingRegistry, ResourceRoute, routing_registry, set_routing_registry
+
+
+class _BatchStore:
+    def __init__(self, project=None):
+        self.appended = []
+        self.batches = []
+        self.fail_batches = 0
+        self.lock = threading.Lock()
+
+    def append(self, event, context):
+        self.appended.append(event)
+
+    def append_batch(self, events):
+        for event in events:
+            _require_append_fields(event)
+        with self.lock:
+            if self.fail_batches:
+                self.fail_batches -= 1
+                raise RuntimeError("backend unavailable")
+            self.batches.append(list(events))
+
+    def list_events(self, tenant_id, run_id, event_type=None, after_event_id=None, limit=100):
+        written = [e for batch in self.batches for e in batch] + self.appended
+        return [e for e in written if e.run_id == run_id]
+
+
+@pytest.fixture
+def spine(monkeypatch, tmp_path):
+    monkeypatch.setattr(cloud_event_spine_store, "FirestoreEventSpineStore", _BatchStore)
+    monkeypatch.setenv("EVENT_SPINE_WRITE_MODE", "write_behind")
+    monkeypatch.setenv("EVENT_SPINE_SPILL_DIR", str(tmp_path))
+    monkeypatch.setenv("EVENT_SPINE_FLUSH_INTERVAL_MS", "5000")
+    monkeypatch.setenv("EVENT_SPINE_BATCH_SIZE", "50")
+    pool_module.adapter_pool().clear()
+    previous = routing_registry()
+    reg = InMemoryRoutingRegistry()
+    reg.upsert_route(
+        ResourceRoute(
+            id="event_spine-wb",
+            resource_kind="event_spine",
+            tenant_id="t_wb",
+            env="dev",
+            project_id="p_wb",
+            backend_type="firestore",
+            config={"project": "gcp-wb"},
+        )
+    )
+    set_routing_registry(reg)
+    yield
+    write_behind.shutdown_write_behind()
+    set_routing_registry(previous)
+    pool_module.adapter_pool().clear()
+
+
+def _ctx() -> RequestContext:
+    return RequestContext(tenant_id="t_wb", env="dev", mode="saas", project_id="p_wb", request_id="r1")
+
+
+def _event(i: int) -> SpineEvent:
+    return SpineEvent(tenant_id="t_wb", mode="saas", event_type="rl", source="agent", run_id="run-wb", payload={"i": i})
+
+
+def test_emits_are_batched_and_safety_stays_synchronous(spine):
+    svc = EventSpineServiceWithValidation(_ctx())
+    for i in range(120):
+        svc.emit(event_type="rl", source="agent", run_id="run-wb", payload={"i": i})
+    SafetyEmitter(_ctx()).emit_safety_decision("run-wb", "block", "gate", {})
+
+    store = svc._adapter
+    assert [e.event_type for e in store.appended] == ["safety"]
+
+    events = svc.list_events("run-wb")  # reads flush queued events first
+    assert len(events) == 121
+    assert [len(b) for b in store.batches] == [50, 50, 20]
+
+
+def test_failed_flush_is_retried(spine):
+    svc = EventSpineServiceWithValidation(_ctx())
+    svc._adapter.fail_batches = 1
+    svc.emit(event_type="rl", source="agent", run_id="run-wb")
+    write_behind.flush_pending(svc._adapter, timeout=5)
+    assert sum(len(b) for b in svc._adapter.batches) == 1
+
+
+def test_spill_file_replays_unflushed_events(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    lost = [_event(i) for i in range(3)]
+    spill.write_text("".join(json.dumps(e.to_dict()) + "\n" for e in lost) + '{"torn":')
+
+    store = _BatchStore()
+    writer = WriteBehindWriter(store, spill, flush_interval=60)
+    writer.submit(_event(3))
+    assert writer.close(timeout=5)
+
+    written = [e.payload["i"] for batch in store.batches for e in batch]
+    assert written == [0, 1, 2, 3]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_live_writers_journal_separately_and_never_replay_each_other(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    first_store, second_store = _BatchStore(), _BatchStore()
+    first = WriteBehindWriter(first_store, spill, flush_interval=60)
+    first.submit(_event(0))
+
+    second = WriteBehindWriter(second_store, spill, flush_interval=60)
+    assert second.stats()["recovered"] == 0
+    second.submit(_event(1))
+    assert second.close(timeout=5)
+    assert [e.payload["i"] for b in second_store.batches for e in b] == [1]
+
+    assert first.close(timeout=5)
+    assert [e.payload["i"] for b in first_store.batches for e in b] == [0]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_segments_rotate_and_written_ones_are_removed(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    store = _BatchStore()
+    writer = WriteBehindWriter(store, spill, batch_size=5, flush_interval=60)
+    for round_no in range(4):
+        for i in range(5):
+            writer.submit(_event(round_no * 5 + i))
+        assert writer.flush(timeout=5)
+        # Only the fresh, empty active segment is left once everything is written.
+        journals = list(tmp_path.glob("spill.*.jsonl"))
+        assert len(journals) == 1 and journals[0].read_text() == ""
+    assert writer.stats()["segments"] == 5
+    assert writer.close(timeout=5)
+
+
+def test_orphaned_segment_of_a_failed_writer_is_replayed(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    failing = _BatchStore()
+    failing.fail_batches = 10**6
+    writer = WriteBehindWriter(failing, spill, flush_interval=60)
+    writer.submit(_event(7))
+    assert not writer.close(timeout=0.5)
+    assert len(list(tmp_path.glob("spill.*.jsonl"))) == 1
+
+    store = _BatchStore()
+    replay = WriteBehindWriter(store, spill, flush_interval=60)
+    assert replay.stats()["recovered"] == 1
+    assert replay.close(timeout=5)
+    assert [e.payload["i"] for b in store.batches for e in b] == [7]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_full_queue_falls_back_to_synchronous_append(spine, monkeypatch):
+    monkeypatch.setenv("EVENT_SPINE_QUEUE_MAX", "2")
+    svc = EventSpineServiceWithValidation(_ctx())
+    for i in range(5):
+        svc.emit(event_type="rl", source="agent", run_id="run-wb", payload={"i": i})
+    assert len(svc._adapter.appended) == 3
+    assert len(svc.list_events("run-wb")) == 5
+
+
+def test_malformed_event_is_rejected_at_emit_time(spine):
+    svc = EventSpineServiceWithValidation(_ctx())
+    bad = SpineEvent(tenant_id="t_wb", mode="", event_type="rl", source="agent", run_id="run-wb")
+    with pytest.raises(ValueError):
+        write_behind.append_event(svc._adapter, bad, _ctx())
+    write_behind.append_event(svc._adapter, _event(1), _ctx())
+    write_behind.flush_pending(svc._adapter, timeout=5)
+    assert [e.payload["i"] for b in svc._adapter.batches for e in b] == [1]
+
+
+def test_batch_rejected_with_value_error_is_not_retried_forever(tmp_path):
+    store = _BatchStore()
+    writer = WriteBehindWriter(store, tmp_path / "spill.jsonl", flush_interval=60)
+    writer.submit(SpineEvent(tenant_id="t_wb", mode="", event_type="rl", source="agent", run_id="run-wb"))
+    writer.submit(_event(1))
+    assert writer.flush(timeout=5)
+    stats = writer.stats()
+    assert (stats["written"], stats["rejected"], stats["failures"]) == (1, 1, 0)
+    assert [e.payload["i"] for b in store.batches for e in b] == [1]
+    assert writer.close(timeout=5)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rebuilt_adapter_swaps_writer_without_waiting_for_old_flush(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_SPINE_SPILL_DIR", str(tmp_path))
+    monkeypatch.setattr(write_behind, "_REPLACED_WRITER_CLOSE_TIMEOUT", 0.2)
+    key = ("firestore", "t_wb", "dev")
+    monkeypatch.setattr(pool_module.adapter_pool(), "key_for", lambda adapter: key)
+    dead = _BatchStore()
+    dead.fail_batches = 10**6
+    old = WriteBehindWriter(dead, tmp_path / "old.jsonl", flush_interval=60)
+    old.submit(_event(0))
+    monkeypatch.setitem(write_behind._writers, key, old)
+
+    replacement = _BatchStore()
+    done = threading.Event()
+    result = {}
+
+    def _swap():
+        result["writer"] = write_behind._writer_for(replacement)
+        done.set()
+
+    threading.Thread(target=_swap, daemon=True).start()
+    assert done.wait(1.0)
+    assert result["writer"] is not old and result["writer"]._adapter is replacement
+    assert write_behind._writers[key] is result["writer"]
+    assert result["writer"].close(timeout=5)